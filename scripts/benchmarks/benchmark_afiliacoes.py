@@ -0,0 +1,156 @@
+# scripts/benchmarks/benchmark_afiliacoes.py
+"""
+Verifica a paridade e mede a vazão da normalização de afiliações (utils/afiliacoes.py): a função
+original de processar_scopus.py aplicada com `Series.apply` contra `normalizar_afiliacoes` sem cache,
+com o cache persistente vazio e com o cache já preenchido (execução repetida).
+
+Os textos são sintéticos (nomes com acentos, siglas soltas e entre parênteses, pontuação, espaços
+irregulares, textos sem vírgula ou vazios), somados às afiliações reais dos CSVs brutos da Scopus
+quando existirem. Qualquer divergência em nome_normalizado, endereco ou sigla encerra com erro.
+
+Uso:
+    python scripts/benchmarks/benchmark_afiliacoes.py --textos 300000 --repeticoes 3
+"""
+import argparse
+import contextlib
+import io
+import random
+import re
+import sys
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from utils.afiliacoes import COLUNAS_RESULTADO, normalizar_afiliacoes  # noqa: E402
+from utils.constants import CAMINHO_DADOS_RAW  # noqa: E402
+
+PALAVRAS = [
+    'Universidade', 'Federal', 'do', 'Amazonas', 'Instituto', 'Nacional', 'de', 'Pesquisas', 'da', 'Amazônia',
+    'Departamento', 'Botânica', 'Laboratório', 'Ecologia', 'Faculdade', 'Ciências', 'Agrárias', 'Museu',
+    'Paraense', 'Emílio', 'Goeldi', 'Empresa', 'Brasileira', 'Pesquisa', 'Agropecuária', 'São', 'Paulo',
+    'Université', 'Montréal', 'Zürich', 'ETH', 'Centro', "d'Estudos", 'Programa', 'Pós-Graduação', 'Jr.',
+]
+SIGLAS = ['UFAM', 'INPA', 'EMBRAPA', 'USP', 'UEA', 'UFPA', 'MPEG', 'CNPq', 'ICMBio', 'UNICAMP', 'AB', 'X', 'UFOPA']
+ENDERECOS = ['Manaus, AM, Brazil', 'Belém, PA, Brazil', 'São Paulo, SP, Brazil', 'Zürich, Switzerland', 'Brazil', '']
+ESPACOS = [' ', ' ', ' ', '  ', '\t', ' ', ' ']
+
+
+def _parse_e_normalizar_afiliacao(texto_afiliacao):
+    """Cópia literal da função substituída em processar_scopus.py (referência da paridade)."""
+    if not isinstance(texto_afiliacao, str):
+        return 'NAO_INFORMADO', 'NAO_INFORMADO', 'NAO_INFORMADO'
+    partes = texto_afiliacao.split(',', 1)
+    nome_instituicao = partes[0].strip()
+    endereco = partes[1].strip() if len(partes) > 1 else 'NAO_INFORMADO'
+    texto_sem_acentos = unicodedata.normalize('NFKD', nome_instituicao).encode('ascii', 'ignore').decode('utf-8')
+    nome_normalizado = re.sub(r'[.,;:"()]', '', texto_sem_acentos.upper())
+    nome_normalizado = re.sub(r'\s+', ' ', nome_normalizado).strip()
+    siglas = re.findall(r'\b([A-Z]{2,6})\b', nome_instituicao)
+    if siglas:
+        sigla = siglas[-1]
+    else:
+        siglas_parenteses = re.findall(r'\(([A-Z\.]+)\)', nome_instituicao)
+        sigla = siglas_parenteses[-1].replace('.', '') if siglas_parenteses else 'SEM SIGLA'
+    return nome_normalizado, endereco, sigla
+
+
+def gerar_textos(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    textos = []
+    for _ in range(quantidade):
+        palavras = aleatorio.choices(PALAVRAS, k=aleatorio.randint(1, 7))
+        if aleatorio.random() < 0.4:
+            palavras.insert(aleatorio.randint(0, len(palavras)), aleatorio.choice(SIGLAS))
+        if aleatorio.random() < 0.3:
+            sigla = aleatorio.choice(SIGLAS + ['U.F.A.M.', 'I.N.P.A', 'UFAM2', 'AB_CD'])
+            palavras.append(f'({sigla})')
+        if aleatorio.random() < 0.1:
+            palavras.append(aleatorio.choice(['"Campus"', 'Sala;3', 'Bloco:A', 'ÇÃO', 'Ωmega', 'ab-CD']))
+        nome = ''.join(palavra + aleatorio.choice(ESPACOS) for palavra in palavras)
+        if aleatorio.random() < 0.2:
+            nome = aleatorio.choice(ESPACOS) + nome
+        sorteio = aleatorio.random()
+        if sorteio < 0.8:
+            texto = f'{nome}, {aleatorio.choice(ENDERECOS)}'
+        elif sorteio < 0.95:
+            texto = nome
+        else:
+            texto = aleatorio.choice(['', ',', ' , ', nome + ',', ', ' + nome])
+        textos.append(texto)
+    return textos
+
+
+def afiliacoes_reais():
+    caminho = CAMINHO_DADOS_RAW / 'scopus_input'
+    textos = []
+    for arquivo in sorted(caminho.rglob('*.csv')):
+        coluna = pd.read_csv(arquivo, dtype=str, usecols=lambda nome: nome == 'Affiliations')
+        if 'Affiliations' in coluna:
+            textos.extend(coluna['Affiliations'].dropna().str.split('; ').explode().tolist())
+    return textos
+
+
+def medir(funcao, repeticoes, preparar=None):
+    melhor, resultado = float('inf'), None
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--textos', type=int, default=300000, help="Quantidade de textos sintéticos.")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    textos = pd.Series(gerar_textos(args.textos) + afiliacoes_reais() + [None, float('nan')])
+    unicos = pd.Series(textos.drop_duplicates().to_numpy())
+    print(f"{len(textos)} textos ({len(unicos)} únicos)")
+
+    # --- Paridade (sem cache e após a ida e volta pelo cache em disco) ---
+    esperado = pd.DataFrame(textos.apply(_parse_e_normalizar_afiliacao).tolist(), columns=COLUNAS_RESULTADO)
+    with tempfile.TemporaryDirectory() as pasta_temp:
+        caminho_cache = Path(pasta_temp) / 'afiliacoes.pkl'
+        with contextlib.redirect_stdout(io.StringIO()):
+            normalizar_afiliacoes(unicos.iloc[::2], caminho_cache=caminho_cache)
+            obtidos = {
+                'sem cache': normalizar_afiliacoes(textos, caminho_cache=None),
+                'com cache': normalizar_afiliacoes(textos, caminho_cache=caminho_cache),
+            }
+    for nome, obtido in obtidos.items():
+        divergentes = ~(esperado == obtido).all(axis=1)
+        if divergentes.any():
+            print(f"ERRO ({nome}): {int(divergentes.sum())} textos divergentes. Exemplos:")
+            for indice in divergentes[divergentes].index[:5]:
+                print(f"  {textos[indice]!r}: {tuple(esperado.loc[indice])} != {tuple(obtido.loc[indice])}")
+            sys.exit(1)
+    print("Paridade: OK (nome_normalizado, endereco e sigla idênticos à função original)")
+
+    # --- Vazão sobre os textos distintos (como em _ocorrencias_afiliacoes) ---
+    with tempfile.TemporaryDirectory() as pasta_temp:
+        caminho_cache = Path(pasta_temp) / 'afiliacoes.pkl'
+        casos = [
+            ('apply', lambda: unicos.apply(_parse_e_normalizar_afiliacao), None),
+            ('sem_cache', lambda: normalizar_afiliacoes(unicos, caminho_cache=None), None),
+            ('cache_vazio', lambda: normalizar_afiliacoes(unicos, caminho_cache=caminho_cache),
+             lambda: caminho_cache.unlink(missing_ok=True)),
+            ('cache_cheio', lambda: normalizar_afiliacoes(unicos, caminho_cache=caminho_cache), None),
+        ]
+        print(f"{'versao':<12} {'tempo':>8} {'textos/s':>11}")
+        for nome, funcao, preparar in casos:
+            segundos, _ = medir(funcao, args.repeticoes, preparar)
+            print(f"{nome:<12} {segundos:>7.3f}s {len(unicos) / segundos:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
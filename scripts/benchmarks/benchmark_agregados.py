@@ -0,0 +1,118 @@
+# scripts/benchmarks/benchmark_agregados.py
+"""
+Compara a atualização incremental do cubo `agg_patentes_especie_pais_ano` (criar_agregados.py)
+com a recontagem completa, em entradas sintéticas gravadas só em CSV (--formatos csv, o caminho
+sem o pyarrow, em que o cubo anterior é relido com os anos com nulos como float).
+
+Depois da primeira contagem, parte das patentes muda de ano de prioridade (e algumas ficam sem
+ano). A paridade é verificada comparando, como texto, o cubo incremental com o recontado do zero.
+Os arquivos ficam numa pasta temporária (OBSERVATORIO_PASTA_DADOS).
+
+Uso:
+    python scripts/benchmarks/benchmark_agregados.py --patentes 200000 --fracao 0.01
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Antes de importar os módulos do projeto, que fixam as pastas ao serem importados: as entradas,
+# os cubos e o estado ficam na pasta temporária
+_PASTA_TEMPORARIA = tempfile.TemporaryDirectory()
+os.environ['OBSERVATORIO_PASTA_DADOS'] = _PASTA_TEMPORARIA.name
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from criar_agregados import CAMINHO_AGREGADOS, criar_agregados  # noqa: E402
+from utils.constants import CAMINHO_DADOS_PROCESSADOS  # noqa: E402
+from utils.data_processing import FORMATOS_SUPORTADOS, VARIAVEL_FORMATOS_SAIDA, salvar_tabelas  # noqa: E402
+
+CUBO = 'agg_patentes_especie_pais_ano'
+PAISES = [('BR', 'Brasil'), ('US', 'Estados Unidos'), ('FR', 'França'), ('JP', 'Japão'), ('DE', 'Alemanha')]
+ORIGENS = ['Publication', 'Applicant', 'Inventor']
+
+
+def gerar_entradas(patentes, especies=2000, semente=42):
+    """Tabelas de entrada do cubo, como as grava o pipeline (anos de prioridade com nulos)."""
+    gerador = np.random.default_rng(semente)
+    numeros = [f'BR{numero:09d}A1' for numero in range(patentes)]
+    especie_ids = pd.array(np.arange(especies, dtype=np.int64) * 104729 + 7, dtype='Int64')
+    dim_country = pd.DataFrame({
+        'country_id': pd.array(np.arange(len(PAISES)) + 100, dtype='Int64'),
+        'country_code': [codigo for codigo, _ in PAISES], 'country_name': [nome for _, nome in PAISES],
+    })
+    anos = pd.Series(gerador.integers(1990, 2025, patentes), dtype='Int64')
+    anos[gerador.random(patentes) < 0.05] = pd.NA
+    return {
+        'espacenet/pon_patente_especie': pd.DataFrame({
+            'publication_number': numeros, 'especie_id': especie_ids[gerador.integers(0, especies, patentes)], 'tipo_ligacao': 'manual',
+        }),
+        'espacenet/pon_patente_country': pd.DataFrame({
+            'publication_number': numeros,
+            'country_id': dim_country['country_id'].to_numpy()[gerador.integers(0, len(PAISES), patentes)],
+            'origin': np.array(ORIGENS)[gerador.integers(0, len(ORIGENS), patentes)],
+        }),
+        'espacenet/dim_country': dim_country,
+        'espacenet/pon_patente_ano_prioridade': pd.DataFrame({'publication_number': numeros, 'ano': anos}),
+        'dim_especies_mestre': pd.DataFrame({'especie_id': especie_ids, 'nome_cientifico': [f'Genero{i % 50} especie{i}' for i in range(especies)]}),
+    }
+
+
+def gravar(tabelas):
+    for caminho, df in tabelas.items():
+        pasta, nome = (CAMINHO_DADOS_PROCESSADOS / caminho).parent, Path(caminho).name
+        salvar_tabelas({nome: df}, pasta)
+
+
+def mudar_anos(anos, fracao, semente=43):
+    """Move `fracao` das patentes para outro ano (um décimo delas fica sem ano)."""
+    gerador = np.random.default_rng(semente)
+    anos = anos.copy()
+    sorteadas = gerador.choice(len(anos), max(1, int(len(anos) * fracao)), replace=False)
+    anos.loc[sorteadas, 'ano'] = pd.array(gerador.integers(1990, 2025, len(sorteadas)), dtype='Int64')
+    anos.loc[sorteadas[::10], 'ano'] = pd.NA
+    return anos
+
+
+def contar(completo):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        criar_agregados.__wrapped__(completo=completo)
+    return time.perf_counter() - inicio, pd.read_csv(CAMINHO_AGREGADOS / f'{CUBO}.csv', dtype=str, keep_default_na=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patentes', type=int, default=200000)
+    parser.add_argument('--fracao', type=float, default=0.01)
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS_SUPORTADOS, default=['csv'])
+    args = parser.parse_args()
+    os.environ[VARIAVEL_FORMATOS_SAIDA] = ','.join(args.formatos)
+
+    entradas = gerar_entradas(args.patentes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        gravar(entradas)
+    segundos_primeira, _ = contar(completo=False)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        gravar({'espacenet/pon_patente_ano_prioridade': mudar_anos(entradas['espacenet/pon_patente_ano_prioridade'], args.fracao)})
+    segundos_incremental, incremental = contar(completo=False)
+    segundos_completo, completo = contar(completo=True)
+
+    print(f"{args.patentes} patentes, formatos {', '.join(args.formatos)}, {args.fracao:.1%} com o ano alterado")
+    print(f"primeira contagem: {segundos_primeira:.2f}s; incremental: {segundos_incremental:.2f}s; completa: {segundos_completo:.2f}s")
+    if not incremental.equals(completo):
+        print(f"ERRO: o cubo incremental ({len(incremental)} linhas) difere do recontado ({len(completo)} linhas).")
+        sys.exit(1)
+    print(f"Paridade: OK ({len(completo)} linhas iguais às da recontagem completa)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# scripts/benchmarks/benchmark_autores.py
+"""
+Compara o alinhamento de autores da Scopus (processar_scopus._ocorrencias_autores, uma passada por
+artigo) com a versão anterior (três explodes, dois cumcount e dois merges), copiada abaixo: tempo,
+pico de memória alocada (tracemalloc) e igualdade de dim_autores / pon_artigo_autores.
+
+O corpus sintético tem artigos com 1 a 15 autores e uma fração de anomalias: listas de tamanhos
+diferentes, IDs fora de ordem, nomes sem ID e autoria não informada.
+
+Uso:
+    python scripts/benchmarks/benchmark_autores.py --artigos 300000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from processar_scopus import _modelo_autores, _ocorrencias_autores  # noqa: E402
+
+
+def _ocorrencias_autores_anterior(df_limpo):
+    """Versão anterior de _ocorrencias_autores (referência)."""
+    colunas_autores = ['eid', 'authors', 'authors_id', 'author_full_names']
+    if not all(col in df_limpo.columns for col in colunas_autores):
+        return None
+    df_autores_trab = df_limpo[colunas_autores].copy()
+    df_sobrenomes = df_autores_trab[['eid', 'authors']].copy()
+    df_sobrenomes['authors'] = df_sobrenomes['authors'].str.replace(r'\s*\(\d+\)', '', regex=True)
+    df_sobrenomes['authors'] = df_sobrenomes['authors'].str.split(r'\s*;\s*', regex=True)
+    df_sobrenomes = df_sobrenomes.explode('authors').dropna(subset=['authors'])
+    df_sobrenomes['author_index'] = df_sobrenomes.groupby('eid').cumcount()
+    df_nomes_completos = df_autores_trab[['eid', 'author_full_names']].copy()
+    df_nomes_completos['author_full_names'] = df_nomes_completos['author_full_names'].str.split(r'\s*;\s*', regex=True)
+    df_nomes_completos = df_nomes_completos.explode('author_full_names').dropna(subset=['author_full_names'])
+    df_nomes_completos['author_index'] = df_nomes_completos.groupby('eid').cumcount()
+    df_nomes_completos['id_from_name'] = df_nomes_completos['author_full_names'].str.extract(r'\((\d+)\)')
+    df_nomes_completos['author_full_names'] = df_nomes_completos['author_full_names'].str.replace(r'\s*\(\d+\)$', '', regex=True).str.strip()
+    df_ids = df_autores_trab[['eid', 'authors_id']].copy()
+    df_ids['authors_id'] = df_ids['authors_id'].str.split(r'\s*;\s*', regex=True)
+    df_ids = df_ids.explode('authors_id').dropna(subset=['authors_id'])
+    df_nomes_alinhados = pd.merge(df_sobrenomes, df_nomes_completos, on=['eid', 'author_index'], how='outer')
+    df_alinhado = pd.merge(
+        df_nomes_alinhados, df_ids,
+        left_on=['eid', 'id_from_name'], right_on=['eid', 'authors_id'],
+        how='right'
+    )
+    df_alinhado['author_full_names'] = df_alinhado['author_full_names'].fillna(df_alinhado['authors'])
+    df_alinhado['author_full_names'] = df_alinhado['author_full_names'].str.upper()
+    return df_alinhado[['eid', 'authors_id', 'author_full_names']]
+
+
+def gerar_artigos(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    sobrenomes = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Ferreira', 'Costa', 'Rodrigues', 'Almeida']
+    prenomes = ['Ana', 'João', 'Maria', 'José', 'Carla', 'Paulo', 'Luiza', 'Pedro']
+    linhas = []
+    for i in range(quantidade):
+        autores = []
+        for _ in range(aleatorio.randint(1, 15)):
+            id_autor = str(aleatorio.randrange(5 * quantidade) + 57000000000)
+            sobrenome, prenome = aleatorio.choice(sobrenomes), aleatorio.choice(prenomes)
+            autores.append((id_autor, f'{sobrenome} {prenome[0]}.', f'{sobrenome}, {prenome} ({id_autor})'))
+        ids = [a[0] for a in autores]
+        curtos = [a[1] for a in autores]
+        completos = [a[2] for a in autores]
+        sorteio = aleatorio.random()
+        if sorteio < 0.01:
+            completos = completos[:-1]
+        elif sorteio < 0.02:
+            aleatorio.shuffle(completos)
+        elif sorteio < 0.03:
+            completos[0] = completos[0].rsplit(' (', 1)[0]
+        elif sorteio < 0.04:
+            ids = completos = curtos = ['nao_informado']
+        linhas.append((f'2-s2.0-{85000000000 + i}', '; '.join(curtos), '; '.join(ids), '; '.join(completos)))
+    return pd.DataFrame(linhas, columns=['eid', 'authors', 'authors_id', 'author_full_names'])
+
+
+def executar(funcao, df):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _modelo_autores(funcao(df))
+
+
+def medir(funcao, df):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = executar(funcao, df)
+    segundos = time.perf_counter() - inicio
+    del resultado
+    gc.collect()
+    tracemalloc.start()
+    executar(funcao, df)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--artigos', type=int, default=300000)
+    args = parser.parse_args()
+
+    df = gerar_artigos(args.artigos)
+    autorias = int(df['authors_id'].str.count(';').sum()) + len(df)
+    print(f"{len(df)} artigos, {autorias} autorias")
+
+    esperado = executar(_ocorrencias_autores_anterior, df)
+    obtido = executar(_ocorrencias_autores, df)
+    for nome, a, b in zip(('dim_autores', 'pon_artigo_autores'), esperado, obtido):
+        if not a.reset_index(drop=True).equals(b.reset_index(drop=True)):
+            print(f"ERRO: {nome} difere da versão anterior.")
+            sys.exit(1)
+    print("Paridade: OK (dim_autores e pon_artigo_autores idênticas)")
+
+    print(f"{'versao':<10} {'tempo':>8} {'pico_mb':>9}")
+    for nome, funcao in (('anterior', _ocorrencias_autores_anterior), ('atual', _ocorrencias_autores)):
+        segundos, pico = medir(funcao, df)
+        print(f"{nome:<10} {segundos:>7.2f}s {pico / 2**20:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
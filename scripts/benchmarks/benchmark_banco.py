@@ -0,0 +1,92 @@
+# scripts/benchmarks/benchmark_banco.py
+"""
+Monta o banco analítico (criar_banco.py) a partir das tabelas da pasta de dados atual e mede a
+latência das consultas de scripts/consultas.py: mediana de várias execuções de cada consulta,
+para espécies sorteadas, e as varreduras completas (SCAN) no plano de execução do SQLite. A
+tabela de partida da consulta pode ser varrida; uma ponte varrida no meio da junção indica um
+índice faltando.
+
+Para medir em escala, gere dados sintéticos e rode o pipeline antes:
+    python scripts/benchmarks/gerar_dados_sinteticos.py /tmp/dados_x10 --escala 10
+    OBSERVATORIO_PASTA_DADOS=/tmp/dados_x10 python scripts/main.py
+    OBSERVATORIO_PASTA_DADOS=/tmp/dados_x10 python scripts/benchmarks/benchmark_banco.py
+"""
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import consultas  # noqa: E402
+from criar_banco import criar_banco  # noqa: E402
+
+
+def varreduras(conexao, funcao, parametros):
+    """Varreduras completas (SCAN, sem índice) nos planos das consultas SQL executadas pela função."""
+    executadas = []
+    conexao.set_trace_callback(executadas.append)
+    funcao(conexao, **parametros)
+    conexao.set_trace_callback(None)
+    encontradas = []
+    for consulta in executadas:
+        for *_, detalhe in conexao.execute(f'EXPLAIN QUERY PLAN {consulta}'):
+            if detalhe.startswith('SCAN ') and 'USING' not in detalhe:
+                encontradas.append(detalhe)
+    return encontradas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_banco_') as pasta:
+        caminho_banco = Path(pasta) / 'observatorio.sqlite'
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            linhas = criar_banco(caminho_banco)
+        print(f"Banco: {sum(linhas.values())} linhas em {len(linhas)} tabelas, "
+              f"montado em {time.perf_counter() - inicio:.2f}s ({caminho_banco.stat().st_size / 2**20:.1f} MB)")
+
+        with contextlib.closing(consultas.conectar(caminho_banco)) as conexao:
+            especies = [nome for (nome,) in conexao.execute(
+                "SELECT DISTINCT e.nome_cientifico FROM dim_especies_mestre e "
+                "JOIN pon_patente_especie p ON p.especie_id = e.especie_id"
+            )]
+            pais = conexao.execute("SELECT country_code FROM dim_country LIMIT 1").fetchone()[0]
+            aleatorio = random.Random(args.semente)
+
+            casos = [
+                ('ameacadas-com-patentes', consultas.especies_ameacadas_com_patentes, lambda: {}),
+                ('todas-as-fontes', consultas.especies_em_todas_as_fontes, lambda: {}),
+                ('resumo', consultas.resumo_especie, lambda: {'nome_cientifico': aleatorio.choice(especies)}),
+                ('artigos', consultas.artigos_da_especie, lambda: {'nome_cientifico': aleatorio.choice(especies)}),
+                ('patentes', consultas.patentes_da_especie, lambda: {'nome_cientifico': aleatorio.choice(especies), 'pais': pais}),
+                ('por-pais', consultas.especies_por_pais, lambda: {'pais': pais}),
+            ]
+            print(f"{'consulta':<24} {'mediana_ms':>11} {'max_ms':>9} {'linhas':>8}  varreduras")
+            lentas = False
+            for nome, funcao, sortear in casos:
+                tempos, resultado = [], None
+                for _ in range(args.repeticoes):
+                    parametros = sortear()
+                    inicio = time.perf_counter()
+                    resultado = funcao(conexao, **parametros)
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+                varridas = varreduras(conexao, funcao, parametros)
+                lentas = lentas or max(tempos) >= 1000
+                print(f"{nome:<24} {statistics.median(tempos):>11.2f} {max(tempos):>9.2f} {len(resultado):>8}  {', '.join(varridas) or '-'}")
+
+    if lentas:
+        print("AVISO: alguma consulta levou 1 segundo ou mais.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# scripts/benchmarks/benchmark_busca_aproximada.py
+"""
+Mede a busca aproximada de espécies (utils/busca_aproximada.py) em corpora sintéticos de tamanho
+crescente: tempo de extração dos candidatos, pares pontuados e tempo de pontuação, tempo total e
+por mil textos, e a fração das citações abreviadas ou com erro de grafia inseridas que foram
+ligadas à espécie certa. Para comparação, pontua também sem blocagem (cada forma candidata contra
+todas as espécies, custo proporcional a espécies x candidatos); essa versão é pulada nos tamanhos
+acima de --limite-sem-blocagem.
+
+Uso:
+    python scripts/benchmarks/benchmark_busca_aproximada.py --textos 2000 --escalas 1 2 4 8 --especies 5000
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+
+from utils import busca_aproximada  # noqa: E402
+from utils.busca_aproximada import (  # noqa: E402
+    LIMIAR_SIMILARIDADE, extrair_candidatos, indexar_especies, ligar_especies_aproximadas, pontuar_candidatos,
+)
+
+PALAVRAS = (
+    'the of and in to a is was for with on by from as at this that were are species forest data '
+    'amazon study results analysis samples growth soil plants leaves seeds fruits water effect'
+).split()
+
+
+def gerar_especies(quantidade, aleatorio):
+    silabas = ['ba', 'ca', 'ra', 'te', 'li', 'mo', 'nu', 'pe', 'si', 'to', 'xa', 'ru', 'de', 'fo', 'gi', 'lo']
+    especies, vistos = [], set()
+    while len(especies) < quantidade:
+        genero = ''.join(aleatorio.choices(silabas, k=aleatorio.randint(2, 4))).capitalize()
+        epiteto = ''.join(aleatorio.choices(silabas, k=aleatorio.randint(3, 5))) + aleatorio.choice(['a', 'um', 'is', 'ensis'])
+        if (genero, epiteto) not in vistos:
+            vistos.add((genero, epiteto))
+            especies.append(f'{genero} {epiteto}')
+    return especies
+
+
+def errar_grafia(palavra, aleatorio):
+    """Troca uma letra depois do prefixo usado na blocagem."""
+    posicao = aleatorio.randrange(busca_aproximada.TAMANHO_PREFIXO_EPITETO, len(palavra))
+    return palavra[:posicao] + aleatorio.choice(string.ascii_lowercase.replace(palavra[posicao], '')) + palavra[posicao + 1:]
+
+
+def gerar_corpus(quantidade, especies, aleatorio, palavras_por_texto=150):
+    """Textos com frases iniciadas em maiúscula e citações exatas, abreviadas e com erro de grafia."""
+    textos, esperados = [], []
+    for posicao in range(quantidade):
+        palavras = aleatorio.choices(PALAVRAS, k=palavras_por_texto)
+        for inicio in range(0, palavras_por_texto, 12):
+            palavras[inicio] = palavras[inicio].capitalize()
+        for _ in range(aleatorio.randint(0, 3)):
+            especie = aleatorio.choice(especies)
+            genero, epiteto = especie.split()
+            forma = aleatorio.choice(['exata', 'abreviada', 'errada'])
+            if forma == 'abreviada':
+                citacao = f'{genero[0]}. {epiteto}'
+            elif forma == 'errada':
+                citacao = f'{genero} {errar_grafia(epiteto, aleatorio)}'
+            else:
+                citacao = especie
+            palavras.insert(aleatorio.randrange(len(palavras)), citacao)
+            if forma != 'exata':
+                esperados.append((posicao, especie))
+        textos.append(' '.join(palavras))
+    return textos, esperados
+
+
+def bloco_unico(blocos):
+    """Todas as espécies em um único bloco: cada forma candidata é pontuada contra todas."""
+    unico = {'nomes': [], 'extenso': [], 'abreviado': []}
+    for bloco in blocos.values():
+        for chave in unico:
+            unico[chave].extend(bloco[chave])
+    return {'todos': unico}
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--textos', type=int, default=2000, help="Textos na escala 1.")
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--especies', type=int, default=5000)
+    parser.add_argument('--limiar', type=float, default=LIMIAR_SIMILARIDADE)
+    parser.add_argument('--limite-sem-blocagem', type=int, default=8000, help="Maior corpus em que a versão sem blocagem roda.")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    especies = gerar_especies(args.especies, aleatorio)
+    blocos = indexar_especies(especies)
+    print(f"{len(especies)} espécies, {len(blocos)} blocos")
+    todos = bloco_unico(blocos)
+    print(
+        f"{'textos':>8} {'formas':>7} {'extracao':>9} {'pares':>9} {'pontuacao':>10} "
+        f"{'pares_sem_bloco':>16} {'pontuacao_sem_bloco':>20} {'total':>7} {'ms/1k':>7} {'recall':>7}"
+    )
+    for escala in args.escalas:
+        textos, esperados = gerar_corpus(args.textos * escala, especies, aleatorio)
+        t_extracao, candidatos = medir(lambda: extrair_candidatos(textos, blocos))
+        formas = {(bloco, abreviado, forma) for _, bloco, abreviado, forma in candidatos}
+        pares = sum(len(blocos[bloco]['nomes']) for bloco, _, _ in formas)
+        t_pontuacao, _ = medir(lambda: pontuar_candidatos(candidatos, blocos, args.limiar))
+        pares_sem_bloco, t_sem_bloco = len(formas) * len(todos['todos']['nomes']), '-'
+        if len(textos) <= args.limite_sem_blocagem:
+            sem_bloco = [(posicao, 'todos', abreviado, forma) for posicao, _, abreviado, forma in candidatos]
+            t_sem_bloco = f"{medir(lambda: pontuar_candidatos(sem_bloco, todos, args.limiar))[0]:.3f}s"
+
+        t_total, ligacoes = medir(lambda: ligar_especies_aproximadas(textos, especies, limiar=args.limiar))
+        encontrados = set(zip(ligacoes['posicao'], ligacoes['nome_cientifico']))
+        recall = np.mean([esperado in encontrados for esperado in esperados]) if esperados else float('nan')
+        print(
+            f"{len(textos):>8} {len(formas):>7} {t_extracao:>8.3f}s {pares:>9} {t_pontuacao:>9.3f}s "
+            f"{pares_sem_bloco:>16} {t_sem_bloco:>20} {t_total:>6.2f}s {1e6 * t_total / len(textos):>7.1f} {recall:>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
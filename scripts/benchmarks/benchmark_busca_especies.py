@@ -0,0 +1,80 @@
+# scripts/benchmarks/benchmark_busca_especies.py
+"""
+Compara a busca de espécies por regex (alternação gigante, caminho antigo de unificar_fontes.py)
+com o autômato Aho-Corasick de utils/busca_especies.py, conferindo que os resultados são idênticos.
+
+Uso:
+    python scripts/benchmarks/benchmark_busca_especies.py --especies 10000 100000 --documentos 500
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.busca_especies import AutomatoEspecies, buscar_especies  # noqa: E402
+
+SILABAS = ['ca', 'ja', 'ru', 'te', 'pi', 'ma', 'lo', 'si', 'na', 'bu', 've', 'xo', 'qua', 'ri', 'mo', 'len']
+
+
+def gerar_especies(quantidade, semente=42):
+    rnd = random.Random(semente)
+    palavra = lambda a, b: ''.join(rnd.choice(SILABAS) for _ in range(rnd.randint(a, b)))
+    generos = [palavra(2, 3).capitalize() for _ in range(max(10, quantidade // 20))]
+    especies = set()
+    while len(especies) < quantidade:
+        especies.add(f"{rnd.choice(generos)} {palavra(2, 4)}")
+    return sorted(especies)
+
+
+def gerar_documentos(especies, quantidade, semente=7):
+    rnd = random.Random(semente)
+    documentos = []
+    for _ in range(quantidade):
+        palavras = [''.join(rnd.choice(SILABAS) for _ in range(rnd.randint(1, 3))) for _ in range(rnd.randint(150, 250))]
+        for especie in rnd.sample(especies, rnd.randint(0, 3)):
+            palavras.insert(rnd.randrange(len(palavras) + 1), rnd.choice([especie, especie.upper(), especie.lower()]))
+        documentos.append(' '.join(palavras))
+    return documentos
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--especies', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--documentos', type=int, default=500)
+    parser.add_argument('--processos', type=int, default=None, help="Processos para o autômato (padrão: todos os núcleos).")
+    parser.add_argument('--sem-regex', action='store_true', help="Não executa o caminho antigo (útil em escalas muito grandes).")
+    args = parser.parse_args()
+
+    print(f"{'especies':>10} {'docs':>6} {'regex_compila':>14} {'regex_busca':>12} {'ac_constroi':>12} {'ac_busca':>10} {'ganho':>7}")
+    for n_especies in args.especies:
+        especies = gerar_especies(n_especies)
+        documentos = gerar_documentos(especies, args.documentos)
+
+        automato, t_constroi = medir(lambda: AutomatoEspecies(especies))
+        obtido, t_busca = medir(lambda: buscar_especies(documentos, automato, n_processos=args.processos, tamanho_bloco=max(1, args.documentos // 8)))
+
+        if args.sem_regex:
+            print(f"{n_especies:>10} {args.documentos:>6} {'-':>14} {'-':>12} {t_constroi:>11.2f}s {t_busca:>9.2f}s {'-':>7}")
+            continue
+
+        padrao, t_compila = medir(lambda: re.compile(r'\b(' + '|'.join(re.escape(nome) for nome in especies) + r')\b', re.IGNORECASE))
+        esperado, t_regex = medir(lambda: [padrao.findall(texto) for texto in documentos])
+        if esperado != obtido:
+            print(f"ERRO: resultados divergentes para {n_especies} espécies.")
+            sys.exit(1)
+        ganho = (t_compila + t_regex) / (t_constroi + t_busca)
+        print(f"{n_especies:>10} {args.documentos:>6} {t_compila:>13.2f}s {t_regex:>11.2f}s {t_constroi:>11.2f}s {t_busca:>9.2f}s {ganho:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# scripts/benchmarks/benchmark_carregamento.py
+"""
+Compara a carga original dos CSVs brutos (pd.read_csv serial de todas as colunas + concat) com a
+carga de utils/carregamento.py (pool de processos, projeção de colunas e descarte de chaves
+repetidas antes do concat): tempo total, vazão e memória ocupada pelo DataFrame consolidado.
+
+Uso:
+    python scripts/benchmarks/benchmark_carregamento.py --fonte scopus --repeticoes 3 --processos 4
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+import processar_espacenet  # noqa: E402
+import processar_scopus  # noqa: E402
+from utils.carregamento import COLUNA_ORIGEM, carregar_csvs  # noqa: E402
+from utils.constants import CAMINHO_DADOS_RAW  # noqa: E402
+
+FONTES = {
+    'scopus': {
+        'arquivos': lambda: processar_scopus.listar_arquivos_scopus(CAMINHO_DADOS_RAW / 'scopus_input'),
+        'original': lambda arquivos: pd.concat([pd.read_csv(f, dtype=str) for f in arquivos], ignore_index=True),
+        'opcoes': dict(
+            coluna_chave='eid', selecionar_coluna=processar_scopus._coluna_usada,
+            padronizar_coluna=processar_scopus._padronizar_nome_coluna, coluna_origem=COLUNA_ORIGEM,
+        ),
+    },
+    'espacenet': {
+        'arquivos': lambda: sorted((CAMINHO_DADOS_RAW / 'espacenet_input').glob('*.csv')),
+        'original': lambda arquivos: pd.concat([pd.read_csv(f, sep=';') for f in arquivos], ignore_index=True),
+        'opcoes': dict(
+            coluna_chave='publication_number', separador=';', selecionar_coluna=processar_espacenet._coluna_usada,
+            padronizar_coluna=processar_espacenet._padronizar_nome_coluna, coluna_origem=COLUNA_ORIGEM,
+        ),
+    },
+}
+
+
+def medir(funcao, repeticoes):
+    melhor, resultado = float('inf'), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fonte', choices=sorted(FONTES), default='scopus')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--processos', type=int, default=None, help="Tamanho do pool (padrão: núcleos disponíveis).")
+    parser.add_argument('--max-em-voo', type=int, default=None, help="Máximo de arquivos em leitura/espera ao mesmo tempo.")
+    args = parser.parse_args()
+
+    fonte = FONTES[args.fonte]
+    arquivos = fonte['arquivos']()
+    if not arquivos:
+        print(f"ERRO: nenhum CSV bruto da fonte '{args.fonte}' encontrado.")
+        sys.exit(1)
+    megabytes = sum(Path(f).stat().st_size for f in arquivos) / 2**20
+    print(f"{len(arquivos)} arquivos, {megabytes:.1f} MB")
+
+    casos = {
+        'original': lambda: fonte['original'](arquivos),
+        'carregamento': lambda: carregar_csvs(
+            arquivos, n_processos=args.processos, max_em_voo=args.max_em_voo, **fonte['opcoes']
+        ),
+    }
+    print(f"{'carga':<14} {'tempo':>8} {'MB/s':>8} {'linhas':>9} {'colunas':>8} {'memoria_mb':>11}")
+    for nome, funcao in casos.items():
+        segundos, df = medir(funcao, args.repeticoes)
+        memoria = df.memory_usage(deep=True).sum() / 2**20
+        print(f"{nome:<14} {segundos:>7.3f}s {megabytes / segundos:>8.1f} {len(df):>9} {df.shape[1]:>8} {memoria:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
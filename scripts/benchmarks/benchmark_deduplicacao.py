@@ -0,0 +1,152 @@
+# scripts/benchmarks/benchmark_deduplicacao.py
+"""
+Compara a remoção de linhas repetidas da limpeza da Scopus por impressão digital de 64 bits
+(utils/deduplicacao.linhas_repetidas) com a versão anterior (df.duplicated() seguido de
+drop_duplicates(), que compara o texto de todas as colunas duas vezes), numa tabela larga com
+resumos, títulos e afiliações.
+
+Também verifica que a consolidação sem coluna de recência (utils/carregamento.consolidar_sem_repetidos)
+continua mantendo a primeira cópia de cada chave, como a versão anterior copiada abaixo, e que
+com a coluna de recência fica a cópia de maior valor.
+
+Uso:
+    python scripts/benchmarks/benchmark_deduplicacao.py --linhas 200000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from utils.carregamento import consolidar_sem_repetidos  # noqa: E402
+from utils.deduplicacao import linhas_repetidas  # noqa: E402
+
+
+def _sem_repetidas_anterior(df):
+    """Versão anterior do descarte de linhas repetidas em limpar_dataframe_scopus (referência)."""
+    num_duplicatas = df.duplicated().sum()
+    if num_duplicatas > 0:
+        df = df.drop_duplicates(keep='first')
+    return df
+
+
+def _sem_repetidas_atual(df):
+    repetidas = linhas_repetidas(df)
+    return df[~repetidas] if repetidas.any() else df
+
+
+def _consolidar_anterior(dfs, coluna_chave):
+    """Versão anterior de utils/carregamento.consolidar_sem_repetidos (referência)."""
+    partes, vistos = [], set()
+    for df in dfs:
+        chaves = df[coluna_chave]
+        repetidas = chaves.notna() & (chaves.duplicated() | chaves.isin(vistos))
+        vistos.update(chaves.dropna().unique())
+        partes.append(df[~repetidas])
+    return pd.concat(partes, ignore_index=True)
+
+
+def _texto(aleatorio, palavras, tamanho):
+    return ' '.join(aleatorio.choice(palavras) for _ in range(tamanho))
+
+
+def gerar_artigos(linhas, semente=42):
+    """Tabela limpa sintética da Scopus: colunas largas de texto, com ~5% de linhas repetidas."""
+    aleatorio = random.Random(semente)
+    palavras = [f'termo{i}' for i in range(5000)]
+    registros = []
+    for i in range(linhas):
+        if registros and aleatorio.random() < 0.05:
+            registros.append(aleatorio.choice(registros))
+            continue
+        registros.append((
+            f'2-s2.0-{85000000000 + i}', _texto(aleatorio, palavras, 12), _texto(aleatorio, palavras, 180),
+            _texto(aleatorio, palavras, 25), 'nao_informado' if aleatorio.random() < 0.1 else _texto(aleatorio, palavras, 6),
+            aleatorio.randint(1990, 2024), aleatorio.randint(0, 500),
+        ))
+    return pd.DataFrame(registros, columns=['eid', 'title', 'abstract', 'affiliations', 'author_keywords', 'year', 'cited_by'])
+
+
+def exportacoes_sobrepostas(artigos, arquivos=3, semente=42):
+    """Exportações (texto, como lidas) que repetem parte dos artigos, às vezes com mais citações."""
+    aleatorio = random.Random(semente)
+    bruto = artigos.drop_duplicates('eid').astype(str)
+    exportacoes = []
+    for _ in range(arquivos):
+        parte = bruto.sample(frac=0.5, random_state=aleatorio.randrange(2**31)).copy()
+        mais_citado = parte.index.to_series().map(lambda _: aleatorio.random() < 0.2)
+        parte.loc[mais_citado, 'cited_by'] = (parte.loc[mais_citado, 'cited_by'].astype(int) + 1).astype(str)
+        exportacoes.append(parte.reset_index(drop=True))
+    exportacoes[0].loc[0, 'eid'] = None
+    return exportacoes
+
+
+def _mais_recente_esperado(exportacoes):
+    """Cópia de maior cited_by de cada eid (a primeira no empate), na ordem de aparição."""
+    todas = pd.concat(exportacoes, ignore_index=True)
+    com_chave = todas[todas['eid'].notna()]
+    citacoes = pd.to_numeric(com_chave['cited_by'])
+    melhores = citacoes.groupby(com_chave['eid'], sort=False).idxmax()
+    return set(melhores) | set(todas.index[todas['eid'].isna()])
+
+
+def executar(funcao, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcao(*args)
+
+
+def medir(funcao, *args):
+    gc.collect()
+    inicio = time.perf_counter()
+    executar(funcao, *args)
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    tracemalloc.start()
+    executar(funcao, *args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=200000)
+    args = parser.parse_args()
+
+    artigos = gerar_artigos(args.linhas)
+    for numero, df in enumerate([artigos, artigos.drop_duplicates(), artigos.iloc[:0]], start=1):
+        if not _sem_repetidas_anterior(df).equals(_sem_repetidas_atual(df)):
+            print(f"ERRO: linhas repetidas do caso {numero} diferem da versão anterior.")
+            sys.exit(1)
+
+    exportacoes = exportacoes_sobrepostas(artigos)
+    if not executar(consolidar_sem_repetidos, exportacoes, 'eid').equals(_consolidar_anterior(exportacoes, 'eid')):
+        print("ERRO: a consolidação sem recência difere da versão anterior (primeira cópia).")
+        sys.exit(1)
+    consolidado = executar(consolidar_sem_repetidos, exportacoes, 'eid', 'cited_by')
+    todas = pd.concat(exportacoes, ignore_index=True)
+    esperado = todas.loc[sorted(_mais_recente_esperado(exportacoes))]
+    if set(map(tuple, consolidado.astype(str).values)) != set(map(tuple, esperado.astype(str).values)) or len(consolidado) != len(esperado):
+        print("ERRO: a consolidação com recência não manteve a cópia mais citada de cada eid.")
+        sys.exit(1)
+    print("Paridade: OK (mesmas linhas descartadas; consolidação mantém a primeira ou a cópia mais recente)")
+
+    repetidas = len(artigos) - len(_sem_repetidas_atual(artigos))
+    megabytes = artigos.memory_usage(deep=True).sum() / 2**20
+    print(f"{len(artigos)} linhas ({megabytes:.0f} MB), {repetidas} repetidas")
+    print(f"{'versao':<10} {'tempo':>8} {'pico_mb':>9}")
+    for versao, funcao in (('anterior', _sem_repetidas_anterior), ('atual', _sem_repetidas_atual)):
+        segundos, pico = medir(funcao, artigos)
+        print(f"{versao:<10} {segundos:>7.2f}s {pico / 2**20:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# scripts/benchmarks/benchmark_entidades.py
+"""
+Mede a resolução de organizações entre a Scopus e a Espacenet (utils/resolucao_entidades.py)
+em nomes sintéticos com gabarito: cada organização aparece como afiliação da Scopus (nome por
+extenso, às vezes com a sigla no fim) e como party da Espacenet (abreviado, com código de país
+e forma jurídica), com erros de digitação e palavras trocadas de ordem.
+
+Para cada volume são contados os pares possíveis e os pares candidatos da blocagem e medido o
+tempo. Até --exaustivo-ate registros, todos os pares são pontuados (process.cdist) para medir o
+recall exato da blocagem (pares acima do limiar que ela encontra) e a precisão e o recall dos
+grupos contra o gabarito.
+
+Uso:
+    python scripts/benchmarks/benchmark_entidades.py --registros 2000 10000 50000 200000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from utils.resolucao_entidades import (  # noqa: E402
+    LIMIAR_ORGANIZACAO, TOKENS_GENERICOS, fuzz, normalizar_organizacao, pares_candidatos, process, resolver_entidades,
+)
+
+SILABAS = ['ba', 'ca', 'ja', 'ru', 'te', 'pi', 'ma', 'lo', 'si', 'na', 'bu', 've', 'xo', 'qua', 'ri', 'mo', 'de', 'gu']
+PAISES = ['BR', 'US', 'FR', 'JP', 'DE']
+# (nome na Scopus, nome na Espacenet) de cada tipo de organização; {a} e {b} são palavras sorteadas
+MODELOS = [
+    ('UNIVERSIDADE FEDERAL DO {a} {b}', 'UNIV FED DO {a} {b}'),
+    ('UNIVERSIDADE ESTADUAL DE {a} {b}', 'UNIV EST {a} {b}'),
+    ('INSTITUTO NACIONAL DE PESQUISAS DA {a} {b}', 'INST NAC DE PESQUISAS DA {a} {b}'),
+    ('FUNDACAO {a} {b}', 'FUND {b} {a}'),
+    ('{a} {b} COSMETICOS', '{a} {b} COSMETICOS LTDA'),
+    ('LABORATORIO DE {a} {b}', '{a} {b} LABS INC'),
+    ('CENTRO DE TECNOLOGIA {a} {b}', 'CENT TECNOL {a} {b} SA'),
+]
+
+
+def _palavra(aleatorio):
+    return ''.join(aleatorio.choices(SILABAS, k=aleatorio.randint(3, 5))).upper()
+
+
+def _digitar_errado(nome, aleatorio):
+    """Troca uma letra de uma palavra longa (erro de digitação)."""
+    palavras = nome.split()
+    longas = [i for i, palavra in enumerate(palavras) if len(palavra) > 6]
+    if not longas:
+        return nome
+    i = aleatorio.choice(longas)
+    posicao = aleatorio.randrange(1, len(palavras[i]) - 1)
+    palavras[i] = palavras[i][:posicao] + aleatorio.choice('AEIOU') + palavras[i][posicao + 1:]
+    return ' '.join(palavras)
+
+
+def gerar_nomes(registros, semente=42):
+    """
+    Nomes sintéticos de organizações com o gabarito.
+
+    Returns:
+        (list[str], np.ndarray): Nome normalizado de cada registro (afiliações antes das
+        parties, como na resolução do pipeline) e a organização verdadeira de cada um.
+    """
+    aleatorio = random.Random(semente)
+    afiliacoes, parties = [], []
+    organizacao = 0
+    while len(afiliacoes) + len(parties) < registros:
+        scopus, espacenet = aleatorio.choice(MODELOS)
+        palavras = {'a': _palavra(aleatorio), 'b': _palavra(aleatorio)}
+        scopus, espacenet = scopus.format(**palavras), espacenet.format(**palavras)
+        sigla = ''.join(palavra[0] for palavra in scopus.split() if len(palavra) > 2)
+        for _ in range(aleatorio.randint(1, 3)):
+            nome = _digitar_errado(scopus, aleatorio) if aleatorio.random() < 0.2 else scopus
+            if aleatorio.random() < 0.3:
+                afiliacoes.append((normalizar_organizacao(f'{nome} {sigla}', sigla), organizacao))
+            else:
+                afiliacoes.append((normalizar_organizacao(nome), organizacao))
+        for _ in range(aleatorio.randint(0, 2)):
+            nome = _digitar_errado(espacenet, aleatorio) if aleatorio.random() < 0.2 else espacenet
+            parties.append((normalizar_organizacao(f'{nome} [{aleatorio.choice(PAISES)}]'), organizacao))
+        organizacao += 1
+    nomes, verdadeiras = zip(*(afiliacoes + parties)[:registros])
+    return list(nomes), np.array(verdadeiras)
+
+
+def _pares_no_mesmo_grupo(rotulos):
+    tamanhos = pd.Series(rotulos).value_counts().to_numpy()
+    return int((tamanhos * (tamanhos - 1) // 2).sum())
+
+
+def qualidade_grupos(grupos, verdadeiras):
+    """Precisão e recall dos pares de registros postos no mesmo grupo, contra o gabarito."""
+    acertos = _pares_no_mesmo_grupo(pd.Series(grupos).astype(str) + '|' + pd.Series(verdadeiras).astype(str))
+    previstos, esperados = _pares_no_mesmo_grupo(grupos), _pares_no_mesmo_grupo(verdadeiras)
+    return (acertos / previstos if previstos else 1.0), (acertos / esperados if esperados else 1.0)
+
+
+def recall_exato(nomes, limiar):
+    """Fração dos pares com score >= limiar (todos contra todos) que a blocagem propõe."""
+    i, j = pares_candidatos(nomes, genericos=TOKENS_GENERICOS)
+    candidatos = set(zip(i.tolist(), j.tolist()))
+    matriz = process.cdist(nomes, nomes, scorer=fuzz.token_sort_ratio, score_cutoff=limiar, workers=-1, dtype=np.uint8)
+    linhas, colunas = np.nonzero(np.triu(matriz >= limiar, k=1))
+    acima = list(zip(linhas.tolist(), colunas.tolist()))
+    encontrados = sum(par in candidatos for par in acima)
+    return (encontrados / len(acima) if acima else 1.0), len(acima)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registros', type=int, nargs='+', default=[2000, 10000, 50000, 200000])
+    parser.add_argument('--exaustivo-ate', type=int, default=10000)
+    parser.add_argument('--limiar', type=float, default=LIMIAR_ORGANIZACAO)
+    args = parser.parse_args()
+    if process is None:
+        print("ERRO: a resolução de entidades requer o rapidfuzz.")
+        sys.exit(1)
+
+    print(f"{'registros':>10} {'pares possíveis':>16} {'candidatos':>12} {'tempo':>8} {'s/mil reg.':>10} "
+          f"{'recall bloc.':>12} {'precisão':>9} {'recall':>7}")
+    for registros in args.registros:
+        nomes, verdadeiras = gerar_nomes(registros)
+        inicio = time.perf_counter()
+        resolvidos, estatisticas = resolver_entidades.__wrapped__(
+            nomes, limiar=args.limiar, genericos=TOKENS_GENERICOS, amostra_recall=0
+        )
+        segundos = time.perf_counter() - inicio
+        precisao, recall = qualidade_grupos(resolvidos['grupo'].to_numpy(), verdadeiras)
+        recall_blocagem = '-'
+        if registros <= args.exaustivo_ate:
+            valor, _ = recall_exato(nomes, args.limiar)
+            recall_blocagem = f'{valor:.2%}'
+        print(
+            f"{registros:>10} {estatisticas['pares_possiveis']:>16} {estatisticas['pares_candidatos']:>12} "
+            f"{segundos:>7.2f}s {segundos / registros * 1000:>10.3f} {recall_blocagem:>12} {precisao:>9.2%} {recall:>7.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
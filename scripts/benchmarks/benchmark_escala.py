@@ -0,0 +1,243 @@
+# scripts/benchmarks/benchmark_escala.py
+"""
+Mede cada função pública de processar_scopus.py, processar_cncflora.py, unificar_fontes.py e
+processar_espacenet.py sobre dados sintéticos (gerar_dados_sinteticos.py) em múltiplos do volume
+atual: tempo de relógio, tempo de CPU e pico de memória residente (RSS do processo e dos
+processos filhos, amostrado durante a chamada por utils/telemetria.py).
+
+Cada escala roda em um processo separado, com OBSERVATORIO_PASTA_DADOS apontando para os dados
+sintéticos (as tabelas do repositório não são tocadas). As funções são chamadas na ordem do
+pipeline, cada uma com a saída das anteriores. Funções públicas sem medição (ex: criadas depois
+deste script) são listadas no resultado.
+
+O resultado vai para um JSON em data/processed/benchmarks/ (ou --saida); com --comparar, cada
+função é comparada com a mesma função e escala de um resultado anterior.
+
+Uso:
+    python scripts/benchmarks/benchmark_escala.py --escalas 10 100 1000
+    python scripts/benchmarks/benchmark_escala.py --escalas 10 --comparar data/processed/benchmarks/escala_<data>.json
+"""
+import argparse
+import contextlib
+import datetime
+import inspect
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import psutil  # noqa: E402
+
+from gerar_dados_sinteticos import VOLUME_BASE, gerar_dados_brutos  # noqa: E402
+from utils.constants import CAMINHO_DADOS_PROCESSADOS, VARIAVEL_PASTA_DADOS  # noqa: E402
+from utils.telemetria import medir as abrir_medicao  # noqa: E402
+
+MODULOS_MEDIDOS = ['processar_scopus', 'processar_cncflora', 'unificar_fontes', 'processar_espacenet']
+# Pontos de entrada de linha de comando: repetem as etapas já medidas
+FUNCOES_IGNORADAS = {'main'}
+CAMINHO_RESULTADOS = CAMINHO_DADOS_PROCESSADOS / 'benchmarks'
+
+
+class Medidor:
+    """Executa funções registrando tempo, CPU e pico de RSS de cada chamada (utils/telemetria.py)."""
+
+    def __init__(self):
+        self.medicoes = []
+
+    def __call__(self, funcao, *args, rotulo=None, **kwargs):
+        nome = f'{funcao.__module__}.{funcao.__name__}'
+        with contextlib.redirect_stdout(io.StringIO()), abrir_medicao(rotulo or nome) as medicao:
+            resultado = funcao(*args, **kwargs)
+        self.medicoes.append({
+            'funcao': nome, 'rotulo': rotulo or nome, 'segundos': medicao.segundos,
+            'segundos_cpu': medicao.segundos_cpu, 'pico_rss_mb': medicao.pico_rss_mb,
+        })
+        print(f"  {rotulo or nome:<64} {medicao.segundos:>9.3f}s {medicao.pico_rss_mb or 0:>9.0f} MB", flush=True)
+        return resultado
+
+
+def medir_funcoes():
+    """
+    Chama as funções públicas na ordem do pipeline, sobre os dados de OBSERVATORIO_PASTA_DADOS.
+
+    Returns:
+        dict: 'medicoes' (uma por chamada) e 'nao_medidas' (funções públicas não chamadas).
+    """
+    import pandas as pd
+
+    import processar_cncflora
+    import processar_espacenet
+    import processar_scopus
+    import unificar_fontes
+    from utils.chaves import inserir_chave
+    from utils.constants import CAMINHO_DADOS_PROCESSADOS as processados, CAMINHO_DADOS_RAW as raw
+    from utils.intermediarios import materializar
+
+    medir = Medidor()
+    processados.mkdir(parents=True, exist_ok=True)
+
+    # --- Scopus ---
+    raw_scopus = raw / 'scopus_input'
+    arquivos = medir(processar_scopus.listar_arquivos_scopus, raw_scopus)
+    lidos = medir(processar_scopus.carregar_arquivos_scopus, arquivos, raw_scopus)
+    medir(processar_scopus.consolidar_dados, lidos)
+    descricoes = {arquivo.relative_to(raw_scopus).as_posix(): processar_scopus._descrever_conteudo(df) for arquivo, df in lidos.items()}
+    del lidos
+    df_raw = medir(processar_scopus.carregar_e_consolidar_dados, raw_scopus)
+    medir(processar_scopus.padronizar_nomes_colunas, df_raw.copy())
+    df_scopus = medir(processar_scopus.limpar_dataframe_scopus, df_raw)
+    del df_raw
+    medir(processar_scopus.relatorio_sobreposicao, descricoes, df_scopus)
+    medir(processar_scopus.criar_modelo_autores, df_scopus)
+    medir(processar_scopus.criar_modelo_afiliacoes, df_scopus)
+    medir(processar_scopus.criar_modelo_generico, df_scopus, 'author_keywords', 'keyword', rotulo='processar_scopus.criar_modelo_generico[author_keywords]')
+    medir(processar_scopus.criar_modelo_generico, df_scopus, 'index_keywords', 'index_keyword', rotulo='processar_scopus.criar_modelo_generico[index_keywords]')
+    ocorrencias = medir(processar_scopus.criar_ocorrencias_scopus, df_scopus)
+    medir(processar_scopus.criar_tabelas_scopus, ocorrencias)
+    del ocorrencias, df_scopus
+    scopus_limpo = medir(processar_scopus.executar_etapa_scopus)['scopus_dados_limpos']
+    medir(processar_scopus.atualizar_scopus_incremental, raw_scopus, processados, rotulo='processar_scopus.atualizar_scopus_incremental[sem alterações]')
+
+    # --- CNCFlora ---
+    lista_vermelha, termos = medir(processar_cncflora.carregar_dados_cncflora, raw / 'cncflora')
+    padronizado = medir(processar_cncflora.padronizar_colunas_cncflora, lista_vermelha)
+    cncflora_limpo = medir(processar_cncflora.limpar_dados_base_cncflora, padronizado)
+    medir(processar_cncflora.criar_dim_e_ponte, cncflora_limpo, 'avaliacao_id', 'classificacao_acoes_de_conservacao_iucn___acoes_de_conservacao', 'acao_conservacao')
+    dim_grupo = inserir_chave(pd.DataFrame(cncflora_limpo['grupo'].unique(), columns=['grupo_nome']), 'grupo_id', 'grupo_nome', 'grupo')
+    dim_categoria = inserir_chave(
+        pd.DataFrame(cncflora_limpo['categoria_de_risco_de_extincao'].unique(), columns=['categoria_risco']),
+        'categoria_risco_id', 'categoria_risco', 'categoria_risco'
+    )
+    dim_especies = inserir_chave(termos.rename(columns={'nome_cientifico_completo': 'nome_cientifico'}), 'especie_id', 'nome_cientifico', 'especie')
+    fato = medir(processar_cncflora.criar_tabela_fato_cncflora, cncflora_limpo, dim_grupo, dim_categoria, dim_especies)
+    medir(processar_cncflora.criar_saida_otimizada_looker, fato, {'grupo': dim_grupo, 'categoria_risco': dim_categoria, 'especie': dim_especies})
+    especies_cncflora = medir(processar_cncflora.executar_etapa_cncflora)['dim_especies_cncflora']
+
+    # --- Unificação ---
+    medir(unificar_fontes.unificar_fontes_e_criar_ligacoes, scopus_limpo, especies_cncflora)
+    dim_especies_mestre = medir(
+        unificar_fontes.executar_etapa_unificacao, scopus_limpo, especies_cncflora, busca_aproximada=True,
+        rotulo='unificar_fontes.executar_etapa_unificacao[busca_aproximada]'
+    )['dim_especies_mestre']
+    # As etapas devolvem a referência ao repositório de intermediárias; as funções recebem o DataFrame
+    dim_especies_mestre = materializar(dim_especies_mestre)
+
+    # --- Espacenet ---
+    df_espacenet = medir(processar_espacenet.carregar_dados_espacenet, raw / 'espacenet_input')
+    espacenet_limpo = medir(processar_espacenet.limpeza_inicial_espacenet, df_espacenet)
+    parties = medir(processar_espacenet.tokenizar_parties, espacenet_limpo)
+    medir(processar_espacenet.criar_modelo_parties, espacenet_limpo, parties)
+    medir(processar_espacenet.criar_modelo_country, espacenet_limpo, processar_espacenet.COUNTRY_CODES, parties)
+    medir(processar_espacenet.criar_modelo_ipc, espacenet_limpo)
+    df_manual = pd.read_csv(raw / 'espacenet_resumo_plantas.csv')
+    medir(processar_espacenet.ligar_especies_automaticamente, espacenet_limpo, dim_especies_mestre)
+    medir(processar_espacenet.criar_ligacao_especies_e_fato, espacenet_limpo, df_manual, dim_especies_mestre)
+    espacenet_limpo = medir(processar_espacenet.executar_etapa_base_espacenet)['espacenet_limpo']
+    medir(processar_espacenet.executar_etapa_dimensoes_espacenet, espacenet_limpo)
+    medir(processar_espacenet.executar_etapa_especies_espacenet, espacenet_limpo, dim_especies_mestre)
+
+    medidas = {medicao['funcao'] for medicao in medir.medicoes}
+    nao_medidas = []
+    for nome_modulo in MODULOS_MEDIDOS:
+        modulo = sys.modules[nome_modulo]
+        for nome, funcao in inspect.getmembers(modulo, inspect.isfunction):
+            if funcao.__module__ != nome_modulo or nome.startswith('_') or nome in FUNCOES_IGNORADAS:
+                continue
+            if f'{nome_modulo}.{nome}' not in medidas:
+                nao_medidas.append(f'{nome_modulo}.{nome}')
+    return {'medicoes': medir.medicoes, 'nao_medidas': nao_medidas}
+
+
+def medir_escala(escala, pasta_dados, semente):
+    """Gera os dados da escala e mede as funções em um processo separado."""
+    inicio = time.perf_counter()
+    volumes = gerar_dados_brutos(pasta_dados, escala, semente)
+    segundos_geracao = time.perf_counter() - inicio
+    print(
+        f"\nEscala {escala:g}: {volumes['artigos']} artigos, {volumes['patentes']} patentes, {volumes['especies']} espécies, "
+        f"{volumes['avaliacoes']} avaliações ({volumes['bytes'] / 2**20:.1f} MB, gerados em {segundos_geracao:.1f}s)"
+    )
+    caminho_medicao = Path(pasta_dados) / 'medicao.json'
+    ambiente = {**os.environ, VARIAVEL_PASTA_DADOS: str(pasta_dados)}
+    comando = [sys.executable, str(Path(__file__).resolve()), '--medir-pasta-atual', str(caminho_medicao)]
+    concluido = subprocess.run(comando, env=ambiente).returncode == 0
+    resultado = {'escala': escala, 'volumes': volumes, 'segundos_geracao': round(segundos_geracao, 2), 'concluido': concluido}
+    if caminho_medicao.exists():
+        resultado.update(json.loads(caminho_medicao.read_text(encoding='utf-8')))
+    if not concluido:
+        print(f"ERRO: a medição da escala {escala:g} não terminou (ver o erro acima).")
+    return resultado
+
+
+def comparar(resultado, caminho_anterior):
+    """Razão de tempo e de pico de RSS (atual / anterior) para cada função e escala em comum."""
+    anterior = json.loads(Path(caminho_anterior).read_text(encoding='utf-8'))
+    referencia = {
+        (escala['escala'], medicao['rotulo']): medicao
+        for escala in anterior['escalas'] for medicao in escala.get('medicoes', [])
+    }
+    print(f"\nComparação com {caminho_anterior} (atual / anterior):")
+    print(f"{'escala':>7} {'funcao':<64} {'tempo':>7} {'pico_rss':>9}")
+    for escala in resultado['escalas']:
+        for medicao in escala.get('medicoes', []):
+            antes = referencia.get((escala['escala'], medicao['rotulo']))
+            if antes is None or not antes['segundos'] or not antes['pico_rss_mb']:
+                continue
+            razao_tempo = medicao['segundos'] / antes['segundos']
+            razao_rss = medicao['pico_rss_mb'] / antes['pico_rss_mb']
+            print(f"{escala['escala']:>7g} {medicao['rotulo']:<64} {razao_tempo:>6.2f}x {razao_rss:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escalas', type=float, nargs='+', default=[10, 100, 1000], help="Múltiplos do volume atual.")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--pasta', type=Path, default=None, help="Onde gerar os dados sintéticos (padrão: pasta temporária, removida ao final).")
+    parser.add_argument('--saida', type=Path, default=None, help="JSON do resultado (padrão: data/processed/benchmarks/escala_<data>.json).")
+    parser.add_argument('--comparar', type=Path, default=None, help="JSON de uma execução anterior para comparação.")
+    parser.add_argument('--medir-pasta-atual', type=Path, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Processo filho: mede as funções sobre a pasta de dados do ambiente e grava as medições
+    if args.medir_pasta_atual is not None:
+        args.medir_pasta_atual.write_text(json.dumps(medir_funcoes(), ensure_ascii=False, indent=2), encoding='utf-8')
+        return
+
+    agora = datetime.datetime.now()
+    resultado = {
+        'data': agora.isoformat(timespec='seconds'), 'python': platform.python_version(), 'plataforma': platform.platform(),
+        'cpus': os.cpu_count(), 'memoria_total_mb': round(psutil.virtual_memory().total / 2**20),
+        'volume_base': VOLUME_BASE, 'semente': args.semente, 'escalas': [],
+    }
+    pasta_base = args.pasta or Path(tempfile.mkdtemp(prefix='benchmark_escala_'))
+    try:
+        for escala in args.escalas:
+            resultado['escalas'].append(medir_escala(escala, pasta_base / f'escala_{escala:g}', args.semente))
+    finally:
+        if args.pasta is None:
+            shutil.rmtree(pasta_base, ignore_errors=True)
+
+    caminho_saida = args.saida or CAMINHO_RESULTADOS / f"escala_{agora.strftime('%Y%m%d_%H%M%S')}.json"
+    caminho_saida.parent.mkdir(parents=True, exist_ok=True)
+    caminho_saida.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding='utf-8')
+    for escala in resultado['escalas']:
+        if escala.get('nao_medidas'):
+            print(f"Aviso: funções públicas sem medição: {', '.join(escala['nao_medidas'])}")
+            break
+    print(f"\nResultado salvo em: {caminho_saida}")
+    if args.comparar:
+        comparar(resultado, args.comparar)
+    if not all(escala['concluido'] for escala in resultado['escalas']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# scripts/benchmarks/benchmark_espacenet_blocos.py
+"""
+Compara o processamento da Espacenet em memória (etapas espacenet_base, espacenet_dimensoes e
+espacenet_especies) com o processamento em blocos (--espacenet-em-blocos) sobre exportações
+sintéticas (gerar_dados_sinteticos.py): tempo, pico de memória residente (RSS) e igualdade das
+tabelas gravadas (mesmas colunas e mesmas linhas, em qualquer ordem).
+
+Cada modo roda em um processo separado, com OBSERVATORIO_PASTA_DADOS apontando para uma pasta
+própria que compartilha os mesmos dados brutos.
+
+Uso:
+    python scripts/benchmarks/benchmark_espacenet_blocos.py --patentes 200000 --blocos 50000 10000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from gerar_dados_sinteticos import gerar_espacenet, gerar_especies  # noqa: E402
+from utils.constants import VARIAVEL_PASTA_DADOS  # noqa: E402
+
+
+def executar_modo(modo, tamanho_bloco, caminho_resultado):
+    """Executa um modo no processo atual (dados de OBSERVATORIO_PASTA_DADOS) e grava a medição."""
+    import contextlib
+    import io
+
+    import processar_espacenet
+    from utils.telemetria import medir
+
+    # A ponte patente-espécie depende da unificação; aqui ela sai vazia nos dois modos
+    dim_especies_mestre = pd.DataFrame({'especie_id': pd.Series(dtype='Int64'), 'nome_cientifico': pd.Series(dtype=object)})
+    with contextlib.redirect_stdout(io.StringIO()), medir(modo) as medicao:
+        if modo == 'memoria':
+            espacenet_limpo = processar_espacenet.executar_etapa_base_espacenet()['espacenet_limpo']
+            processar_espacenet.executar_etapa_dimensoes_espacenet(espacenet_limpo)
+            processar_espacenet.executar_etapa_especies_espacenet(espacenet_limpo, dim_especies_mestre)
+        else:
+            processar_espacenet.executar_etapa_espacenet_em_blocos(tamanho_bloco)
+            processar_espacenet.executar_etapa_ponte_especies_espacenet(dim_especies_mestre)
+    Path(caminho_resultado).write_text(json.dumps({'segundos': medicao.segundos, 'pico_rss_mb': medicao.pico_rss_mb}))
+
+
+def medir_modo(pasta, raw, modo, tamanho_bloco=0):
+    """Roda o modo em um processo separado, numa pasta de dados própria, e devolve a medição."""
+    pasta_dados = Path(pasta) / f'{modo}_{tamanho_bloco}'
+    pasta_dados.mkdir()
+    (pasta_dados / 'raw').symlink_to(raw, target_is_directory=True)
+    caminho_resultado = pasta_dados / 'medicao.json'
+    comando = [sys.executable, str(Path(__file__).resolve()), '--executar-modo', modo, str(tamanho_bloco), str(caminho_resultado)]
+    subprocess.run(comando, env={**os.environ, VARIAVEL_PASTA_DADOS: str(pasta_dados)}, check=True)
+    return json.loads(caminho_resultado.read_text()), pasta_dados / 'processed' / 'espacenet'
+
+
+def tabelas_diferentes(pasta_a, pasta_b):
+    """Tabelas (CSV) com colunas ou conjunto de linhas diferentes entre as duas pastas."""
+    diferentes = []
+    for caminho in sorted(Path(pasta_a).glob('*.csv')):
+        a = pd.read_csv(caminho, dtype=str, keep_default_na=False)
+        b = pd.read_csv(Path(pasta_b) / caminho.name, dtype=str, keep_default_na=False)
+        if list(a.columns) != list(b.columns) or sorted(a.itertuples(index=False)) != sorted(b.itertuples(index=False)):
+            diferentes.append(caminho.stem)
+    return diferentes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patentes', type=int, default=200000)
+    parser.add_argument('--blocos', type=int, nargs='+', default=[50000, 10000], help="Tamanhos de bloco medidos.")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--executar-modo', nargs=3, metavar=('MODO', 'BLOCO', 'JSON'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar_modo:
+        modo, tamanho_bloco, caminho_resultado = args.executar_modo
+        executar_modo(modo, int(tamanho_bloco), caminho_resultado)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_espacenet_') as pasta:
+        raw = Path(pasta) / 'raw'
+        aleatorio = random.Random(args.semente)
+        gerar_espacenet(raw, gerar_especies(2000, aleatorio), args.patentes, aleatorio)
+        megabytes = sum(caminho.stat().st_size for caminho in (raw / 'espacenet_input').glob('*.csv')) / 2**20
+        print(f"{args.patentes} patentes ({megabytes:.1f} MB de CSV)")
+
+        referencia, saida_memoria = medir_modo(pasta, raw, 'memoria')
+        linhas = [('memoria', '-', referencia, '-')]
+        falhou = False
+        for tamanho_bloco in args.blocos:
+            medicao, saida_blocos = medir_modo(pasta, raw, 'blocos', tamanho_bloco)
+            diferentes = tabelas_diferentes(saida_memoria, saida_blocos)
+            falhou = falhou or bool(diferentes)
+            linhas.append(('blocos', tamanho_bloco, medicao, 'OK' if not diferentes else ', '.join(diferentes)))
+
+    print(f"{'modo':<8} {'bloco':>7} {'tempo':>8} {'pico_rss_mb':>12}  igualdade")
+    for modo, tamanho_bloco, medicao, igualdade in linhas:
+        print(f"{modo:<8} {tamanho_bloco:>7} {medicao['segundos']:>7.2f}s {medicao['pico_rss_mb'] or 0:>12.0f}  {igualdade}")
+    if falhou:
+        print("ERRO: o processamento em blocos difere do processamento em memória.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# scripts/benchmarks/benchmark_exportacao.py
+"""
+Mede a exportação por diferença (utils/exportacao.py) de uma dimensão sintética em csv e parquet:
+
+  - primeira:   sem manifesto, todos os formatos são gravados (como era antes);
+  - inalterada: mesmo conteúdo, só o hash é calculado e nenhum arquivo é regravado;
+  - alterada:   uma fração das linhas inseridas, removidas ou alteradas, com o log de alterações.
+
+A paridade é verificada conferindo que a rodada inalterada mantém o mtime dos arquivos, que os
+arquivos da rodada alterada têm o conteúdo novo e que o log traz exatamente as chaves inseridas,
+removidas e alteradas. Os arquivos ficam numa pasta temporária (OBSERVATORIO_PASTA_DADOS).
+
+Uso:
+    python scripts/benchmarks/benchmark_exportacao.py --linhas 2000000 --fracao 0.01
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Antes de importar os módulos do projeto, que fixam as pastas ao serem importados: as tabelas,
+# os manifestos e o log ficam na pasta temporária
+_PASTA_TEMPORARIA = tempfile.TemporaryDirectory()
+os.environ['OBSERVATORIO_PASTA_DADOS'] = _PASTA_TEMPORARIA.name
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from utils.constants import CAMINHO_DADOS_PROCESSADOS  # noqa: E402
+from utils.data_processing import salvar_tabelas  # noqa: E402
+from utils.exportacao import CAMINHO_LOG_ALTERACOES, VARIAVEL_LOG_ALTERACOES  # noqa: E402
+
+FORMATOS = ['csv', 'parquet']
+
+
+def gerar_dimensao(linhas, semente=42):
+    """Dimensão sintética com chave única na primeira coluna, como as dim_* do pipeline."""
+    gerador = np.random.default_rng(semente)
+    return pd.DataFrame({
+        'especie_id': pd.array(np.arange(linhas, dtype=np.int64) * 7919 + 13, dtype='Int64'),
+        'nome_cientifico': [f'Genero{i % 5000} especie{i}' for i in range(linhas)],
+        'familia': pd.Series(gerador.integers(0, 400, linhas)).map(lambda n: f'Familia{n}aceae'),
+        'ano': gerador.integers(1900, 2025, linhas),
+        'score': gerador.random(linhas).round(4),
+    })
+
+
+def alterar(df, fracao, semente=43):
+    """Remove, altera e insere `fracao` das linhas cada; devolve a tabela nova e as chaves de cada caso."""
+    gerador = np.random.default_rng(semente)
+    quantidade = max(1, int(len(df) * fracao))
+    sorteadas = gerador.choice(len(df), 2 * quantidade, replace=False)
+    removidas, alteradas = sorteadas[:quantidade], sorteadas[quantidade:]
+    novo = df.copy()
+    novo.loc[alteradas, 'score'] = novo.loc[alteradas, 'score'] + 1
+    inseridas = df.iloc[:quantidade].assign(especie_id=pd.array(-np.arange(1, quantidade + 1), dtype='Int64'))
+    novo = pd.concat([novo.drop(index=removidas), inseridas], ignore_index=True)
+    gabarito = {
+        'inseridas': set(inseridas['especie_id'].tolist()),
+        'removidas': set(df['especie_id'].iloc[removidas].tolist()),
+        'alteradas': set(df['especie_id'].iloc[alteradas].tolist()),
+    }
+    return novo, gabarito
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcao()
+    return time.perf_counter() - inicio
+
+
+def mtimes(caminhos):
+    return [caminho.stat().st_mtime_ns for caminho in caminhos]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=2000000)
+    parser.add_argument('--fracao', type=float, default=0.01)
+    args = parser.parse_args()
+    os.environ[VARIAVEL_LOG_ALTERACOES] = '1'
+
+    df = gerar_dimensao(args.linhas)
+    pasta = CAMINHO_DADOS_PROCESSADOS / 'benchmark'
+    arquivos = [pasta / f'dim_benchmark.{formato}' for formato in FORMATOS]
+    salvar = lambda tabela: salvar_tabelas({'dim_benchmark': tabela}, pasta, formatos=FORMATOS)  # noqa: E731
+
+    print(f"{args.linhas} linhas, formatos {', '.join(FORMATOS)}")
+    print(f"{'rodada':>11} {'tempo':>8}")
+    print(f"{'primeira':>11} {medir(lambda: salvar(df)):>7.2f}s")
+
+    antes = mtimes(arquivos)
+    print(f"{'inalterada':>11} {medir(lambda: salvar(df)):>7.2f}s")
+    if mtimes(arquivos) != antes:
+        print("ERRO: a rodada inalterada regravou algum arquivo.")
+        sys.exit(1)
+
+    novo, gabarito = alterar(df, args.fracao)
+    print(f"{'alterada':>11} {medir(lambda: salvar(novo)):>7.2f}s")
+    for arquivo in arquivos:
+        lido = pd.read_parquet(arquivo) if arquivo.suffix == '.parquet' else pd.read_csv(arquivo)
+        if len(lido) != len(novo) or set(lido['especie_id'].tolist()) != set(novo['especie_id'].tolist()):
+            print(f"ERRO: {arquivo.name} não tem o conteúdo novo.")
+            sys.exit(1)
+
+    linhas_log = [json.loads(linha) for linha in CAMINHO_LOG_ALTERACOES.read_text(encoding='utf-8').splitlines()]
+    ultima = linhas_log[-1]
+    if ultima['recarga_completa'] or any(set(ultima[caso]) != esperadas for caso, esperadas in gabarito.items()):
+        print("ERRO: o log de alterações não traz as chaves esperadas.")
+        sys.exit(1)
+    print(f"Paridade: OK (inalterada sem regravar; log com {len(gabarito['inseridas'])} inseridas, "
+          f"{len(gabarito['removidas'])} removidas e {len(gabarito['alteradas'])} alteradas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# scripts/benchmarks/benchmark_formatos_saida.py
+"""
+Compara CSV e Parquet (utils/data_processing.py) para as tabelas geradas pelo pipeline: tempo de
+gravação, tempo de leitura completa, tempo de leitura de uma projeção (primeira coluna, como fazem
+as etapas seguintes) e tamanho em disco.
+
+Uso:
+    python scripts/benchmarks/benchmark_formatos_saida.py --pasta data/processed --repeticoes 3
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from utils.constants import CAMINHO_DADOS_PROCESSADOS  # noqa: E402
+from utils.data_processing import ler_tabela, pq, salvar_tabelas  # noqa: E402
+
+TABELAS_PADRAO = ['fato_gorda_cncflora', 'scopus_dados_limpos_temp', 'pon_*']
+
+
+def medir(funcao, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pasta', type=Path, default=CAMINHO_DADOS_PROCESSADOS, help="Pasta com os CSVs gerados pelo pipeline.")
+    parser.add_argument('--tabelas', nargs='+', default=TABELAS_PADRAO, help="Nomes (ou padrões glob) das tabelas.")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    if pq is None:
+        print("ERRO: o pyarrow não está instalado.")
+        sys.exit(1)
+
+    arquivos = sorted({f for padrao in args.tabelas for f in args.pasta.rglob(f'{padrao}.csv')})
+    if not arquivos:
+        print(f"ERRO: nenhuma tabela encontrada em '{args.pasta}'. Execute o pipeline antes.")
+        sys.exit(1)
+
+    print(f"{'tabela':<40} {'linhas':>9} {'formato':>8} {'grava':>8} {'le':>8} {'le_proj':>8} {'disco_kb':>9}")
+    totais = {'csv': [0.0, 0.0, 0.0, 0], 'parquet': [0.0, 0.0, 0.0, 0]}
+    with tempfile.TemporaryDirectory() as pasta_temp:
+        pasta_temp = Path(pasta_temp)
+        for arquivo in arquivos:
+            df = pd.read_csv(arquivo)
+            projecao = [df.columns[0]]
+            for formato in ('csv', 'parquet'):
+                pasta_formato = pasta_temp / formato
+                with contextlib.redirect_stdout(io.StringIO()):
+                    t_grava = medir(lambda: salvar_tabelas({arquivo.stem: df}, pasta_formato, formatos=[formato]), args.repeticoes)
+                caminho = pasta_formato / arquivo.stem
+                t_le = medir(lambda: ler_tabela(caminho), args.repeticoes)
+                t_proj = medir(lambda: ler_tabela(caminho, colunas=projecao), args.repeticoes)
+                tamanho = caminho.with_suffix(f'.{formato}').stat().st_size
+                for i, valor in enumerate((t_grava, t_le, t_proj, tamanho)):
+                    totais[formato][i] += valor
+                print(f"{arquivo.stem:<40} {len(df):>9} {formato:>8} {t_grava:>7.3f}s {t_le:>7.3f}s {t_proj:>7.3f}s {tamanho / 1024:>9.0f}")
+
+    print()
+    for formato, (t_grava, t_le, t_proj, tamanho) in totais.items():
+        print(f"{'TOTAL':<40} {'':>9} {formato:>8} {t_grava:>7.3f}s {t_le:>7.3f}s {t_proj:>7.3f}s {tamanho / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# scripts/benchmarks/benchmark_intermediarios.py
+"""
+Mede a passagem da tabela limpa da Scopus da etapa 'scopus' para a 'unificacao' em cada meio:
+
+  - csv:     to_csv + pd.read_csv com as colunas da busca de espécies (como era antes);
+  - parquet: salvar_parquet + leitura projetada (ler_tabela);
+  - arrow:   publicar_intermediaria + leitura mapeada em memória e projetada (utils.intermediarios);
+  - pickle:  o que atravessa o pool de processos do pipeline (DataFrame inteiro ou só a referência).
+
+A paridade é verificada comparando o DataFrame lido em cada meio com a projeção da tabela
+original. Os arquivos ficam numa pasta temporária (OBSERVATORIO_PASTA_DADOS).
+
+Uso:
+    python scripts/benchmarks/benchmark_intermediarios.py --artigos 200000
+"""
+import argparse
+import contextlib
+import io
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Antes de importar os módulos do projeto, que fixam as pastas ao serem importados: o repositório
+# de intermediárias fica na pasta temporária
+_PASTA_TEMPORARIA = tempfile.TemporaryDirectory()
+os.environ['OBSERVATORIO_PASTA_DADOS'] = _PASTA_TEMPORARIA.name
+
+import pandas as pd  # noqa: E402
+
+from unificar_fontes import COLUNAS_SCOPUS_BUSCA  # noqa: E402
+from utils.data_processing import ler_tabela, pa, salvar_parquet  # noqa: E402
+from utils.intermediarios import materializar, publicar_intermediaria  # noqa: E402
+
+PALAVRAS = ['plant', 'species', 'forest', 'amazon', 'leaf', 'extract', 'soil', 'growth', 'seed', 'native']
+
+
+def gerar_artigos(linhas, semente=42):
+    """Tabela limpa sintética da Scopus: metadados curtos e resumos de ~200 palavras."""
+    aleatorio = random.Random(semente)
+    return pd.DataFrame({
+        'eid': [f'2-s2.0-{85000000000 + i}' for i in range(linhas)],
+        'title': [' '.join(aleatorio.choices(PALAVRAS, k=12)).capitalize() for _ in range(linhas)],
+        'abstract': [' '.join(aleatorio.choices(PALAVRAS, k=200)) + '.' for _ in range(linhas)],
+        'authors': [f'Silva{aleatorio.randrange(9999)}; Souza{aleatorio.randrange(9999)}' for _ in range(linhas)],
+        'source_title': [f'Revista {aleatorio.randrange(500)}' for _ in range(linhas)],
+        'year': [aleatorio.randrange(1990, 2025) for _ in range(linhas)],
+        'cited_by': [aleatorio.randrange(300) for _ in range(linhas)],
+    })
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--artigos', type=int, default=200000)
+    args = parser.parse_args()
+    if pa is None:
+        print("ERRO: o repositório de intermediárias requer o pyarrow.")
+        sys.exit(1)
+
+    artigos = gerar_artigos(args.artigos)
+    esperado = artigos[[coluna for coluna in COLUNAS_SCOPUS_BUSCA if coluna in artigos.columns]]
+    caminho = Path(_PASTA_TEMPORARIA.name) / 'processed' / 'scopus_dados_limpos_temp'
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    meios = {
+        'csv': (
+            lambda: artigos.to_csv(caminho.with_suffix('.csv'), index=False),
+            lambda: pd.read_csv(caminho.with_suffix('.csv'), usecols=lambda coluna: coluna in COLUNAS_SCOPUS_BUSCA),
+            caminho.with_suffix('.csv'),
+        ),
+        'parquet': (
+            lambda: salvar_parquet(artigos, caminho.with_suffix('.parquet')),
+            lambda: ler_tabela(caminho, colunas=COLUNAS_SCOPUS_BUSCA),
+            caminho.with_suffix('.parquet'),
+        ),
+    }
+    referencia, _ = medir(lambda: publicar_intermediaria(artigos, caminho, exportada=True))
+    meios['arrow'] = (
+        lambda: publicar_intermediaria(artigos, caminho, exportada=True),
+        lambda: materializar(referencia, COLUNAS_SCOPUS_BUSCA),
+        referencia.caminho,
+    )
+
+    print(f"{args.artigos} artigos ({artigos.memory_usage(deep=True).sum() / 2**20:.0f} MB em memória)")
+    print(f"{'meio':>8} {'gravar':>8} {'ler':>8} {'arquivo':>10}")
+    for meio, (gravar, ler, arquivo) in meios.items():
+        _, segundos_gravacao = medir(gravar)
+        lido, segundos_leitura = medir(ler)
+        if not lido.equals(esperado):
+            print(f"ERRO: a tabela lida em {meio} difere da original.")
+            sys.exit(1)
+        print(f"{meio:>8} {segundos_gravacao:>7.2f}s {segundos_leitura:>7.2f}s {Path(arquivo).stat().st_size / 2**20:>8.0f}MB")
+    print("Paridade: OK (as colunas lidas em csv, parquet e arrow são iguais às da tabela original)")
+
+    for descricao, artefato in (('DataFrame', artigos), ('referência', referencia)):
+        dados, segundos = medir(lambda: pickle.dumps(artefato, protocol=pickle.HIGHEST_PROTOCOL))
+        _, segundos_carga = medir(lambda: pickle.loads(dados))
+        print(f"pickle entre processos ({descricao}): {len(dados) / 2**20:.1f} MB, {segundos + segundos_carga:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
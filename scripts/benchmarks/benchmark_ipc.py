@@ -0,0 +1,96 @@
+# scripts/benchmarks/benchmark_ipc.py
+"""
+Compara a contagem de patentes por nível IPC (seção, classe, subclasse e grupo principal) feita
+recortando o texto dos códigos a cada consulta (ponte patente-IPC + dim_ipc) com a feita sobre
+a ponte já agregada por nível (processar_espacenet.criar_hierarquia_ipc).
+
+A paridade é verificada comparando as contagens dos dois caminhos em cada nível; o tempo de
+montar a hierarquia é medido à parte (é pago uma vez, na etapa da Espacenet).
+
+Uso:
+    python scripts/benchmarks/benchmark_ipc.py --patentes 500000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from processar_espacenet import NIVEIS_IPC, criar_hierarquia_ipc  # noqa: E402
+
+# Recorte de texto de cada nível, como nas consultas do painel
+RECORTES = {
+    'secao': lambda codigos: codigos.str[:1],
+    'classe': lambda codigos: codigos.str[:3],
+    'subclasse': lambda codigos: codigos.str[:4],
+    'grupo_principal': lambda codigos: codigos.str.split('/').str[0] + '/00',
+}
+
+
+def gerar_ponte(patentes, codigos_distintos=20000, semente=42):
+    """dim_ipc e pon_patente_ipc sintéticas, com 1 a 5 códigos por patente."""
+    aleatorio = random.Random(semente)
+    codigos = sorted({
+        f"{aleatorio.choice('ABCDEFGH')}{aleatorio.randrange(1, 100):02d}{aleatorio.choice('ABCDFGHJKLMN')}"
+        f"{aleatorio.randrange(1, 200)}/{aleatorio.choice(['00', '02', '10', '185', '4709'])}"
+        for _ in range(codigos_distintos)
+    })
+    dim_ipc = pd.DataFrame({'ipc_id': pd.array(range(len(codigos)), dtype='Int64'), 'ipc_code': codigos})
+    publicacoes, ids = [], []
+    for numero in range(patentes):
+        for ipc_id in aleatorio.sample(range(len(codigos)), aleatorio.randint(1, 5)):
+            publicacoes.append(f'BR{numero:09d}A1')
+            ids.append(ipc_id)
+    return dim_ipc, pd.DataFrame({'publication_number': publicacoes, 'ipc_id': pd.array(ids, dtype='Int64')})
+
+
+def contar_por_recorte(dim_ipc, pon_patente_ipc, nivel):
+    """Patentes por código do nível, recortando o texto dos códigos na consulta."""
+    detalhe = pon_patente_ipc.merge(dim_ipc, on='ipc_id')
+    return detalhe.groupby(RECORTES[nivel](detalhe['ipc_code']))['publication_number'].nunique()
+
+
+def contar_por_chave(dim_ipc_niveis, pon_patente_ipc_nivel, nivel):
+    """
+    Patentes por código do nível, contando as linhas da ponte agregada (busca por chave); os nós
+    sem patentes ficam de fora, como no recorte.
+    """
+    nos = dim_ipc_niveis.loc[dim_ipc_niveis['nivel'] == nivel, ['ipc_nivel_id', 'codigo']]
+    contagens = pon_patente_ipc_nivel['ipc_nivel_id'].value_counts()
+    contagens = pd.Series(contagens.reindex(nos['ipc_nivel_id']).fillna(0).astype(int).to_numpy(), index=nos['codigo'])
+    return contagens[contagens > 0].sort_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patentes', type=int, default=500000)
+    args = parser.parse_args()
+
+    dim_ipc, pon_patente_ipc = gerar_ponte(args.patentes)
+    inicio = time.perf_counter()
+    dim_ipc_niveis, _, pon_patente_ipc_nivel = criar_hierarquia_ipc.__wrapped__(dim_ipc, pon_patente_ipc)
+    print(f"{args.patentes} patentes, {len(pon_patente_ipc)} linhas na ponte: hierarquia montada em "
+          f"{time.perf_counter() - inicio:.2f}s ({len(dim_ipc_niveis)} nós, {len(pon_patente_ipc_nivel)} linhas agregadas)")
+
+    print(f"{'nível':>16} {'recorte':>9} {'chave':>9}")
+    for nivel in NIVEIS_IPC[:-1]:
+        inicio = time.perf_counter()
+        por_recorte = contar_por_recorte(dim_ipc, pon_patente_ipc, nivel)
+        segundos_recorte = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        por_chave = contar_por_chave(dim_ipc_niveis, pon_patente_ipc_nivel, nivel)
+        segundos_chave = time.perf_counter() - inicio
+        por_recorte = por_recorte.sort_index()
+        if por_recorte.index.tolist() != por_chave.index.tolist() or por_recorte.tolist() != por_chave.tolist():
+            print(f"ERRO: as contagens por {nivel} diferem.")
+            sys.exit(1)
+        print(f"{nivel:>16} {segundos_recorte:>8.2f}s {segundos_chave:>8.2f}s")
+    print("Paridade: OK (mesmas contagens de patentes em cada nível)")
+
+
+if __name__ == "__main__":
+    main()
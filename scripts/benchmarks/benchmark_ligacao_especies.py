@@ -0,0 +1,107 @@
+# scripts/benchmarks/benchmark_ligacao_especies.py
+"""
+Mede a ligação automática patente-espécie da Espacenet (processar_espacenet.ligar_especies_automaticamente)
+em títulos e resumos sintéticos: tempo com um processo e com todos os núcleos, e ligações por
+segundo.
+
+A corretude é verificada numa amostra contra a busca por regex `\\b(nome1|nome2|...)\\b` com
+re.IGNORECASE (sem acentos nos dados sintéticos), com cada trecho levado ao nome da dimensão.
+
+Uso:
+    python scripts/benchmarks/benchmark_ligacao_especies.py --patentes 300000 --especies 5000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from processar_espacenet import ligar_especies_automaticamente  # noqa: E402
+from utils.chaves import inserir_chave  # noqa: E402
+
+SILABAS = ['ca', 'xo', 'ma', 'ri', 'te', 'ju', 'pa', 'no', 'le', 'vu', 'si', 'ro', 'ba', 'qui']
+
+
+def _palavra(aleatorio, silabas):
+    return ''.join(aleatorio.choice(SILABAS) for _ in range(silabas))
+
+
+def gerar_especies(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    nomes = {f'{_palavra(aleatorio, 3).capitalize()} {_palavra(aleatorio, 3)}' for _ in range(quantidade * 2)}
+    nomes = sorted(nomes)[:quantidade]
+    return inserir_chave(pd.DataFrame({'nome_cientifico': nomes}), 'especie_id', 'nome_cientifico', 'especie')
+
+
+def gerar_patentes(linhas, nomes, semente=42):
+    """Títulos em maiúsculas e resumos de ~150 palavras; ~30% das patentes citam uma ou duas espécies."""
+    aleatorio = random.Random(semente)
+    vocabulario = [_palavra(aleatorio, aleatorio.randint(1, 4)) for _ in range(3000)]
+    titulos, resumos = [], []
+    for _ in range(linhas):
+        palavras = [aleatorio.choice(vocabulario) for _ in range(150)]
+        titulo = 'COMPOSITION COMPRISING EXTRACT'
+        if aleatorio.random() < 0.3:
+            for _ in range(aleatorio.randint(1, 2)):
+                palavras.insert(aleatorio.randrange(len(palavras)), aleatorio.choice(nomes))
+            if aleatorio.random() < 0.5:
+                titulo = f'{titulo} OF {aleatorio.choice(nomes).upper()}'
+        titulos.append(titulo)
+        resumos.append(' '.join(palavras) + '.')
+    return pd.DataFrame({
+        'publication_number': [f'BR{100000000 + i}A1' for i in range(linhas)], 'title': titulos, 'abstract': resumos,
+    })
+
+
+def ligacoes_por_regex(patentes, dim_especies):
+    """Referência: re.findall sobre título + resumo, cada trecho levado ao nome da dimensão."""
+    nomes = dim_especies['nome_cientifico'].tolist()
+    padrao = re.compile(r'\b(' + '|'.join(map(re.escape, nomes)) + r')\b', re.IGNORECASE)
+    por_nome = {nome.lower(): nome for nome in reversed(nomes)}
+    ids = dict(zip(dim_especies['nome_cientifico'], dim_especies['especie_id']))
+    pares = []
+    for numero, titulo, resumo in zip(patentes['publication_number'], patentes['title'], patentes['abstract']):
+        for trecho in padrao.findall(f'{titulo} {resumo}'):
+            pares.append((numero, ids[por_nome[trecho.lower()]]))
+    return list(dict.fromkeys(pares))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patentes', type=int, default=300000)
+    parser.add_argument('--especies', type=int, default=5000)
+    parser.add_argument('--amostra', type=int, default=3000, help="Patentes comparadas com a busca por regex.")
+    args = parser.parse_args()
+
+    dim_especies = gerar_especies(args.especies)
+    patentes = gerar_patentes(args.patentes, dim_especies['nome_cientifico'].tolist())
+
+    amostra = patentes.iloc[:args.amostra]
+    with contextlib.redirect_stdout(io.StringIO()):
+        obtidas = ligar_especies_automaticamente.__wrapped__(amostra, dim_especies, n_processos=1)
+    if list(obtidas.itertuples(index=False, name=None)) != ligacoes_por_regex(amostra, dim_especies):
+        print("ERRO: as ligações da amostra diferem da busca por regex.")
+        sys.exit(1)
+    print(f"Paridade: OK ({len(obtidas)} ligações em {len(amostra)} patentes, iguais às do regex)")
+
+    caracteres = (patentes['title'].str.len() + patentes['abstract'].str.len()).sum()
+    print(f"{args.patentes} patentes ({caracteres / 2**20:.0f} M caracteres), {args.especies} espécies")
+    print(f"{'processos':>9} {'tempo':>8} {'ligacoes':>9} {'patentes/s':>11}")
+    for n_processos in dict.fromkeys([1, os.cpu_count() or 1]):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ligacoes = ligar_especies_automaticamente.__wrapped__(patentes, dim_especies, n_processos=n_processos)
+        segundos = time.perf_counter() - inicio
+        print(f"{n_processos:>9} {segundos:>7.1f}s {len(ligacoes):>9} {args.patentes / segundos:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
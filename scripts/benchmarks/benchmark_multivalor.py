@@ -0,0 +1,195 @@
+# scripts/benchmarks/benchmark_multivalor.py
+"""
+Compara o motor de dimensões/pontes de colunas multivaloradas (utils/multivalor.py) com as versões
+anteriores de cada fonte, copiadas abaixo (split, explode, strip, unique e merge de volta pelo
+texto): palavras-chave da Scopus, ações/ameaças da CNCFlora, parties e IPC da Espacenet.
+
+Para cada modelo: igualdade da dimensão e da ponte (valores, tipos e ordem), tempo e pico de
+memória alocada (tracemalloc). A coluna 'merge' mostra o tempo gasto só no merge de strings da
+versão anterior, o custo que o motor elimina.
+
+Uso:
+    python scripts/benchmarks/benchmark_multivalor.py --linhas 300000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from processar_cncflora import criar_dim_e_ponte  # noqa: E402
+from processar_espacenet import criar_modelo_ipc, criar_modelo_parties  # noqa: E402
+from processar_scopus import criar_modelo_generico  # noqa: E402
+from utils.chaves import inserir_chave  # noqa: E402
+
+# Tempo acumulado nos merges de string das versões anteriores
+_tempo_merge = [0.0]
+
+
+def _merge_medido(*args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = pd.merge(*args, **kwargs)
+    _tempo_merge[0] += time.perf_counter() - inicio
+    return resultado
+
+
+def _criar_modelo_generico_anterior(df_limpo, nome_coluna, nome_entidade):
+    """Versão anterior de processar_scopus.criar_modelo_generico (referência)."""
+    df_trab = df_limpo[['eid', nome_coluna]].copy()
+    df_trab = df_trab[df_trab[nome_coluna] != 'nao_informado']
+    df_trab[nome_coluna] = df_trab[nome_coluna].str.split(r'\s*;\s*', regex=True)
+    df_explodido = df_trab.explode(nome_coluna, ignore_index=True)
+    df_explodido.dropna(subset=[nome_coluna], inplace=True)
+    df_explodido[nome_coluna] = df_explodido[nome_coluna].str.upper().str.strip()
+    valores_unicos = df_explodido[nome_coluna].drop_duplicates().tolist()
+    dim_df = pd.DataFrame(valores_unicos, columns=[nome_entidade])
+    dim_df = inserir_chave(dim_df, f'{nome_entidade}_id', nome_entidade, nome_entidade)
+    pon_df = _merge_medido(df_explodido, dim_df, left_on=nome_coluna, right_on=nome_entidade, how='left')
+    pon_df = pon_df[['eid', f'{nome_entidade}_id']].drop_duplicates()
+    pon_df.rename(columns={'eid': 'article_id'}, inplace=True)
+    return dim_df, pon_df
+
+
+def _criar_dim_e_ponte_anterior(df_limpo, id_coluna, coluna_multivalor, nome_entidade, delimitador='|'):
+    """Versão anterior de processar_cncflora.criar_dim_e_ponte (referência)."""
+    df_trab = df_limpo[[id_coluna, coluna_multivalor]].copy()
+    df_trab = df_trab[df_trab[coluna_multivalor] != 'NAO INFORMADO']
+    df_trab[coluna_multivalor] = df_trab[coluna_multivalor].str.split(delimitador)
+    df_explodido = df_trab.explode(coluna_multivalor)
+    df_explodido[coluna_multivalor] = df_explodido[coluna_multivalor].str.strip()
+    df_explodido.dropna(subset=[coluna_multivalor], inplace=True)
+    df_explodido = df_explodido[df_explodido[coluna_multivalor] != '']
+    dim_df = pd.DataFrame(df_explodido[coluna_multivalor].unique(), columns=[nome_entidade])
+    dim_df = inserir_chave(dim_df, f'{nome_entidade}_id', nome_entidade, nome_entidade)
+    pon_df = _merge_medido(df_explodido, dim_df, left_on=coluna_multivalor, right_on=nome_entidade, how='left')
+    pon_df = pon_df[[id_coluna, f'{nome_entidade}_id']]
+    return dim_df, pon_df
+
+
+def _criar_modelo_parties_anterior(df_limpo):
+    """Versão anterior de processar_espacenet.criar_modelo_parties (referência)."""
+    df_melted = df_limpo.melt(id_vars=['publication_number'], value_vars=['inventors', 'applicants'], var_name='role', value_name='party_string')
+    df_melted = df_melted[df_melted['party_string'] != 'NAO INFORMADO']
+    df_melted['party_string'] = df_melted['party_string'].str.split(',')
+    df_explodido = df_melted.explode('party_string')
+    df_explodido['party_string'] = df_explodido['party_string'].str.strip()
+    df_explodido = df_explodido[df_explodido['party_string'] != '']
+    dim_parties = pd.DataFrame(df_explodido['party_string'].unique(), columns=['party_nome'])
+    dim_parties = inserir_chave(dim_parties, 'party_id', 'party_nome', 'party')
+    pon_patente_party = _merge_medido(df_explodido, dim_parties, left_on='party_string', right_on='party_nome', how='left')
+    pon_patente_party['role'] = pon_patente_party['role'].str.replace('s', '')
+    pon_patente_party = pon_patente_party[['publication_number', 'party_id', 'role']].drop_duplicates()
+    return dim_parties, pon_patente_party
+
+
+def _criar_modelo_ipc_anterior(df_limpo):
+    """Versão anterior de processar_espacenet.criar_modelo_ipc (referência)."""
+    def clean_ipc_code(ipc_code_str):
+        if pd.isna(ipc_code_str) or not isinstance(ipc_code_str, str): return None
+        return ipc_code_str.upper().strip().replace('-', '').replace(' ', '')
+
+    df_ipc_trab = df_limpo[['publication_number', 'ipc']].copy()
+    df_ipc_trab = df_ipc_trab[df_ipc_trab['ipc'] != 'NAO INFORMADO']
+    df_ipc_trab['ipc'] = df_ipc_trab['ipc'].str.split(',')
+    df_ipc_explodido = df_ipc_trab.explode('ipc')
+    df_ipc_explodido['ipc_code_normalizado'] = df_ipc_explodido['ipc'].apply(clean_ipc_code)
+    df_ipc_explodido.dropna(subset=['ipc_code_normalizado'], inplace=True)
+    df_ipc_explodido = df_ipc_explodido[df_ipc_explodido['ipc_code_normalizado'] != '']
+    dim_ipc = pd.DataFrame(df_ipc_explodido['ipc_code_normalizado'].unique(), columns=['ipc_code'])
+    dim_ipc = inserir_chave(dim_ipc, 'ipc_id', 'ipc_code', 'ipc')
+    pon_patente_ipc = _merge_medido(df_ipc_explodido, dim_ipc, left_on='ipc_code_normalizado', right_on='ipc_code', how='left')
+    pon_patente_ipc = pon_patente_ipc[['publication_number', 'ipc_id']].drop_duplicates()
+    return dim_ipc, pon_patente_ipc
+
+
+def _lista(aleatorio, vocabulario, maximo, separador):
+    return separador.join(aleatorio.choice(vocabulario) for _ in range(aleatorio.randint(1, maximo)))
+
+
+def gerar_tabelas(linhas, semente=42):
+    """Tabelas sintéticas com o formato de cada fonte após a limpeza (inclui ausentes e vazios)."""
+    aleatorio = random.Random(semente)
+    palavras = [f'palavra {i}' for i in range(linhas // 5)] + ['Amazônia', ' açaí ', 'BIOECONOMIA', '']
+    acoes = [f'Ação de conservação {i}' for i in range(40)] + ['']
+    pessoas = [f'SILVA PESSOA {i} [BR]' for i in range(linhas // 2)] + [f'EMPRESA {i} LTDA [US]' for i in range(linhas // 20)]
+    ipcs = [f'A{i % 99:02d}K {i % 90:2d}/{i % 97:02d}' for i in range(linhas // 10)] + ['a61k-36/00', ' ']
+
+    def ou_ausente(valor, ausente):
+        return ausente if aleatorio.random() < 0.05 else valor
+
+    scopus = pd.DataFrame({
+        'eid': [f'2-s2.0-{85000000000 + aleatorio.randrange(linhas)}' for _ in range(linhas)],
+        'author_keywords': [ou_ausente(_lista(aleatorio, palavras, 8, '; '), 'nao_informado') for _ in range(linhas)],
+    })
+    cncflora = pd.DataFrame({
+        'avaliacao_id': range(linhas),
+        'acoes': [ou_ausente(_lista(aleatorio, acoes, 6, ' | '), 'NAO INFORMADO') for _ in range(linhas)],
+    })
+    espacenet = pd.DataFrame({
+        'publication_number': [f'BR{100000000 + i}A1' for i in range(linhas)],
+        'inventors': [ou_ausente(_lista(aleatorio, pessoas, 6, ', '), 'NAO INFORMADO') for _ in range(linhas)],
+        'applicants': [ou_ausente(_lista(aleatorio, pessoas, 3, ', '), 'NAO INFORMADO') for _ in range(linhas)],
+        'ipc': [ou_ausente(_lista(aleatorio, ipcs, 5, ','), 'NAO INFORMADO') for _ in range(linhas)],
+    })
+    return scopus, cncflora, espacenet
+
+
+def executar(funcao, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcao(*args)
+
+
+def medir(funcao, *args):
+    gc.collect()
+    _tempo_merge[0] = 0.0
+    inicio = time.perf_counter()
+    resultado = executar(funcao, *args)
+    segundos, segundos_merge = time.perf_counter() - inicio, _tempo_merge[0]
+    del resultado
+    gc.collect()
+    tracemalloc.start()
+    executar(funcao, *args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, segundos_merge, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=300000)
+    args = parser.parse_args()
+
+    scopus, cncflora, espacenet = gerar_tabelas(args.linhas)
+    modelos = [
+        ('keywords', _criar_modelo_generico_anterior, criar_modelo_generico.__wrapped__, (scopus, 'author_keywords', 'keyword')),
+        ('acoes', _criar_dim_e_ponte_anterior, criar_dim_e_ponte.__wrapped__, (cncflora, 'avaliacao_id', 'acoes', 'acao_conservacao')),
+        ('parties', _criar_modelo_parties_anterior, criar_modelo_parties.__wrapped__, (espacenet,)),
+        ('ipc', _criar_modelo_ipc_anterior, criar_modelo_ipc.__wrapped__, (espacenet,)),
+    ]
+
+    for nome, anterior, atual, argumentos in modelos:
+        esperado, obtido = executar(anterior, *argumentos), executar(atual, *argumentos)
+        for tabela, a, b in zip(('dimensão', 'ponte'), esperado, obtido):
+            if not a.reset_index(drop=True).equals(b.reset_index(drop=True)):
+                print(f"ERRO: {tabela} de '{nome}' difere da versão anterior.")
+                sys.exit(1)
+    print("Paridade: OK (dimensões e pontes idênticas nos quatro modelos)")
+
+    print(f"{'modelo':<10} {'versao':<10} {'linhas_ponte':>13} {'tempo':>8} {'merge':>8} {'pico_mb':>9}")
+    for nome, anterior, atual, argumentos in modelos:
+        linhas_ponte = len(executar(atual, *argumentos)[1])
+        for versao, funcao in (('anterior', anterior), ('atual', atual)):
+            segundos, segundos_merge, pico = medir(funcao, *argumentos)
+            print(f"{nome:<10} {versao:<10} {linhas_ponte:>13} {segundos:>7.2f}s {segundos_merge:>7.2f}s {pico / 2**20:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
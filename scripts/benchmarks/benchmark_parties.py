@@ -0,0 +1,155 @@
+# scripts/benchmarks/benchmark_parties.py
+"""
+Compara os modelos de parties e de países da Espacenet montados a partir de uma única separação
+de inventores e requerentes (processar_espacenet.tokenizar_parties) com as versões anteriores,
+copiadas abaixo, em que cada modelo separava as duas colunas por conta própria e o de países
+extraía o código de cada fragmento e juntava os códigos à dimensão por merge.
+
+A paridade (dimensões e pontes com os mesmos valores, tipos e ordem) é verificada em dados com
+ausentes, nomes vazios, códigos fora do dicionário, minúsculos ou repetidos no mesmo nome; o
+tempo e o pico de memória alocada (tracemalloc) são medidos em exportações sintéticas.
+
+Uso:
+    python scripts/benchmarks/benchmark_parties.py --patentes 300000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from processar_espacenet import (  # noqa: E402
+    COUNTRY_CODES, PAPEIS_PARTIES, criar_modelo_country, criar_modelo_parties, tokenizar_parties,
+)
+from utils.chaves import inserir_chave  # noqa: E402
+from utils.multivalor import dimensao_e_ponte, explodir_multivalor  # noqa: E402
+
+
+def _criar_modelo_parties_anterior(df_limpo):
+    """Versão anterior de processar_espacenet.criar_modelo_parties (referência)."""
+    ocorrencias = explodir_multivalor(
+        df_limpo, 'publication_number', PAPEIS_PARTIES, ',', ausente='NAO INFORMADO', coluna_papel='role'
+    )
+    dim_parties, pon_patente_party = dimensao_e_ponte(ocorrencias, 'publication_number', 'valor', 'party', coluna_nome='party_nome')
+    return dim_parties, pon_patente_party[['publication_number', 'party_id', 'role']]
+
+
+def _criar_modelo_country_anterior(df_limpo, country_codes_dict):
+    """Versão anterior de processar_espacenet.criar_modelo_country (referência)."""
+    dim_country = pd.DataFrame(country_codes_dict.items(), columns=['country_code', 'country_name'])
+    dim_country = inserir_chave(dim_country, 'country_id', 'country_code', 'country')
+    df_from_pub = df_limpo[['publication_number']].copy(); df_from_pub['country_code'] = df_from_pub['publication_number'].str[:2]; df_from_pub['origin'] = 'Publication'
+    df_from_parties = df_limpo[['publication_number', 'inventors', 'applicants']].copy()
+    df_melted_parties = df_from_parties.melt(id_vars=['publication_number'], value_vars=['inventors', 'applicants'], var_name='origin')
+    df_melted_parties['value'] = df_melted_parties['value'].str.split(',')
+    df_exploded_parties = df_melted_parties.explode('value')
+    df_exploded_parties['country_code'] = df_exploded_parties['value'].str.extract(r'\[([A-Z]{2})\]')
+    df_exploded_parties['origin'] = df_exploded_parties['origin'].str.replace('s', '').str.capitalize()
+    df_relations = pd.concat([df_from_pub[['publication_number', 'country_code', 'origin']], df_exploded_parties[['publication_number', 'country_code', 'origin']]]).dropna(subset=['country_code'])
+    df_relations = df_relations[df_relations['country_code'].isin(country_codes_dict.keys())]
+    pon_patente_country = pd.merge(df_relations, dim_country, on='country_code', how='left')
+    pon_patente_country = pon_patente_country[['publication_number', 'country_id', 'origin']].drop_duplicates()
+    return dim_country, pon_patente_country
+
+
+def _modelos_anteriores(df_limpo):
+    return (*_criar_modelo_parties_anterior(df_limpo), *_criar_modelo_country_anterior(df_limpo, COUNTRY_CODES))
+
+
+def _modelos_atuais(df_limpo):
+    parties = tokenizar_parties.__wrapped__(df_limpo)
+    return (
+        *criar_modelo_parties.__wrapped__(df_limpo, parties),
+        *criar_modelo_country.__wrapped__(df_limpo, COUNTRY_CODES, parties),
+    )
+
+
+def gerar_patentes(linhas, semente=42):
+    """Inventores e requerentes no formato da exportação após a limpeza (nomes com país entre colchetes)."""
+    aleatorio = random.Random(semente)
+    paises = list(COUNTRY_CODES) + ['XX', 'PT', 'MX']
+    pessoas = [f'SILVA PESSOA {i} [{aleatorio.choice(paises)}]' for i in range(linhas // 2)]
+    pessoas += [f'EMPRESA {i} LTDA [{aleatorio.choice(paises)}]' for i in range(linhas // 20)] + ['SEM PAIS']
+
+    def lista(maximo):
+        if aleatorio.random() < 0.05:
+            return 'NAO INFORMADO'
+        return ', '.join(aleatorio.choice(pessoas) for _ in range(aleatorio.randint(1, maximo)))
+
+    return pd.DataFrame({
+        'publication_number': [f'{aleatorio.choice(paises)}{100000000 + aleatorio.randrange(linhas)}A1' for _ in range(linhas)],
+        'inventors': [lista(6) for _ in range(linhas)],
+        'applicants': [lista(3) for _ in range(linhas)],
+    })
+
+
+def casos_de_borda():
+    """Tabelas pequenas com as entradas que cada versão trata de forma particular."""
+    df = pd.DataFrame({
+        'publication_number': ['BR1A1', 'US2B2', 'nan', 'XX3A1', 'EP4A1', 'WO5A1'],
+        'inventors': ['SILVA [BR], SOUZA [br]', 'NAO INFORMADO', 'nan', ' , ,', 'A [US] [BR],A [US] [BR]', 'B [XX]'],
+        'applicants': ['EMPRESA [BR]', ' EMPRESA [BR] ', 'NAO INFORMADO', '[JP]', '', 'C[DE],D [ US]'],
+    })
+    so_ausentes = pd.DataFrame({
+        'publication_number': ['BR1A1', 'ZZ2A1'],
+        'inventors': ['NAO INFORMADO', 'NAO INFORMADO'],
+        'applicants': ['NAO INFORMADO', ''],
+    })
+    return [df, so_ausentes, df.iloc[:0]]
+
+
+def iguais(esperado, obtido):
+    return all(
+        a.reset_index(drop=True).equals(b.reset_index(drop=True)) and a.dtypes.equals(b.dtypes)
+        for a, b in zip(esperado, obtido)
+    )
+
+
+def executar(funcao, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcao(*args)
+
+
+def medir(funcao, *args):
+    gc.collect()
+    inicio = time.perf_counter()
+    executar(funcao, *args)
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    tracemalloc.start()
+    executar(funcao, *args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patentes', type=int, default=300000)
+    args = parser.parse_args()
+
+    patentes = gerar_patentes(args.patentes)
+    for numero, df in enumerate([*casos_de_borda(), patentes], start=1):
+        if not iguais(executar(_modelos_anteriores, df), executar(_modelos_atuais, df)):
+            print(f"ERRO: os modelos do caso {numero} diferem da versão anterior.")
+            sys.exit(1)
+    print("Paridade: OK (dim_parties, pon_patente_party, dim_country e pon_patente_country idênticas)")
+
+    _, pon_party, _, pon_country = executar(_modelos_atuais, patentes)
+    print(f"{args.patentes} patentes: {len(pon_party)} linhas em pon_patente_party, {len(pon_country)} em pon_patente_country")
+    print(f"{'versao':<10} {'tempo':>8} {'pico_mb':>9}")
+    for versao, funcao in (('anterior', _modelos_anteriores), ('atual', _modelos_atuais)):
+        segundos, pico = medir(funcao, patentes)
+        print(f"{versao:<10} {segundos:>7.2f}s {pico / 2**20:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# scripts/benchmarks/benchmark_pontes_data.py
+"""
+Compara a montagem das pontes patente-ano da Espacenet (processar_espacenet.criar_pontes_data,
+uma passada sobre as três colunas de data) com a versão anterior, copiada abaixo (split,
+explode e pd.to_datetime coluna a coluna).
+
+A paridade é verificada em dados com datas inválidas (30/02, ano fora dos limites do
+pd.Timestamp), meses e dias sem zero à esquerda, ausentes ('nan'), colunas sem nenhuma data e
+colunas em outros formatos (DD/MM/AAAA e formatos misturados); o tempo e o pico de memória
+alocada (tracemalloc) são medidos em exportações sintéticas.
+
+Uso:
+    python scripts/benchmarks/benchmark_pontes_data.py --patentes 300000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from processar_espacenet import COLUNAS_DE_DATA, _formato_datas, criar_pontes_data  # noqa: E402
+
+
+def _criar_pontes_data_anterior(df_limpo, formatos=None):
+    """Versão anterior de processar_espacenet.criar_pontes_data (referência)."""
+    formatos = {} if formatos is None else formatos
+    tabelas_ponte_data = {}
+    for col_original, nome_ponte in COLUNAS_DE_DATA.items():
+        if col_original in df_limpo.columns:
+            df_data_trab = df_limpo[['publication_number', col_original]].copy().dropna(subset=[col_original])
+            df_data_trab[col_original] = df_data_trab[col_original].astype(str).str.split(',')
+            df_data_explodido = df_data_trab.explode(col_original)
+            if formatos.get(col_original) is None:
+                formatos[col_original] = _formato_datas(df_data_explodido[col_original])
+            df_data_explodido['ano'] = pd.to_datetime(df_data_explodido[col_original], errors='coerce', format=formatos[col_original]).dt.year
+            df_data_explodido.dropna(subset=['ano'], inplace=True)
+            df_data_explodido['ano'] = df_data_explodido['ano'].astype(int)
+            tabelas_ponte_data[f'pon_patente_{nome_ponte}'] = df_data_explodido[['publication_number', 'ano']].drop_duplicates()
+    return tabelas_ponte_data
+
+
+def _data(aleatorio):
+    return f'{aleatorio.randint(1985, 2024)}-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d}'
+
+
+def gerar_patentes(linhas, semente=42):
+    """Colunas de data no formato da exportação (listas separadas por vírgula), com ausentes."""
+    aleatorio = random.Random(semente)
+
+    def lista(maximo):
+        if aleatorio.random() < 0.05:
+            return None
+        return ','.join(_data(aleatorio) for _ in range(aleatorio.randint(1, maximo)))
+
+    return pd.DataFrame({
+        'publication_number': [f'BR{100000000 + aleatorio.randrange(linhas)}A1' for _ in range(linhas)],
+        'earliest_priority': [lista(1) for _ in range(linhas)],
+        # A limpeza converte a data de publicação com astype(str): ausentes viram 'nan'
+        'publication_date': [str(lista(3)) if aleatorio.random() > 0.02 else 'nan' for _ in range(linhas)],
+        'earliest_publication': [lista(1) for _ in range(linhas)],
+    })
+
+
+def casos_de_borda():
+    """Tabelas pequenas com as entradas que o pd.to_datetime rejeita ou trata de forma especial."""
+    iso = pd.DataFrame({
+        'publication_number': ['A', 'B', 'C', 'D', 'E', 'F', 'nan', 'nan'],
+        'earliest_priority': ['2001-10-18', '2001-1-8', '2001-02-30,2000-02-29', '1900-02-29', ' 2001-10-18',
+                              '0999-01-01,2262-04-11,2262-04-12', None, '2001-10-18,2001-10-18'],
+        'publication_date': ['nan', '2005-06-22,2001-10-18', '2001-10-18T00:00', '20011018', '2001/10/18', '',
+                             '1677-09-21,1677-09-22', 'nan'],
+        'earliest_publication': [None] * 8,
+    })
+    outros_formatos = pd.DataFrame({
+        'publication_number': ['A', 'B', 'C', 'D'],
+        'earliest_priority': ['18/10/2001', '31/12/1999,01/01/2000', '2001-10-18', 'nan'],
+        'publication_date': ['nan', 'March 3 2004', '2004-03-03,nan', 'nan'],
+        'earliest_publication': ['nan', 'nan', 'nan', 'nan'],
+    })
+    return [iso, outros_formatos, iso.iloc[:0]]
+
+
+def iguais(esperado, obtido):
+    if list(esperado) != list(obtido):
+        return False
+    return all(
+        esperado[nome].reset_index(drop=True).equals(obtido[nome].reset_index(drop=True))
+        and esperado[nome].dtypes.equals(obtido[nome].dtypes)
+        for nome in esperado
+    )
+
+
+def executar(funcao, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcao(*args)
+
+
+def medir(funcao, *args):
+    gc.collect()
+    inicio = time.perf_counter()
+    executar(funcao, *args)
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    tracemalloc.start()
+    executar(funcao, *args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patentes', type=int, default=300000)
+    args = parser.parse_args()
+
+    patentes = gerar_patentes(args.patentes)
+    for numero, df in enumerate([*casos_de_borda(), patentes], start=1):
+        if not iguais(executar(_criar_pontes_data_anterior, df), executar(criar_pontes_data.__wrapped__, df)):
+            print(f"ERRO: as pontes do caso {numero} diferem da versão anterior.")
+            sys.exit(1)
+    # Formato fixado por um bloco anterior (processamento em blocos)
+    for formatos in ({'earliest_priority': '%d/%m/%Y'}, {'earliest_priority': 'mixed', 'publication_date': '%Y-%m-%d'}):
+        df = casos_de_borda()[0]
+        if not iguais(executar(_criar_pontes_data_anterior, df, dict(formatos)), executar(criar_pontes_data.__wrapped__, df, dict(formatos))):
+            print(f"ERRO: as pontes com formatos {formatos} diferem da versão anterior.")
+            sys.exit(1)
+    print("Paridade: OK (mesmas pontes, tipos e ordem)")
+
+    linhas_pontes = sum(len(ponte) for ponte in executar(criar_pontes_data.__wrapped__, patentes).values())
+    print(f"{args.patentes} patentes, {linhas_pontes} linhas nas três pontes")
+    print(f"{'versao':<10} {'tempo':>8} {'pico_mb':>9}")
+    for versao, funcao in (('anterior', _criar_pontes_data_anterior), ('atual', criar_pontes_data.__wrapped__)):
+        segundos, pico = medir(funcao, patentes)
+        print(f"{versao:<10} {segundos:>7.2f}s {pico / 2**20:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# scripts/benchmarks/benchmark_scopus_fragmentos.py
+"""
+Compara a montagem das ocorrências da Scopus (processar_scopus.criar_ocorrencias_scopus) num só
+processo com o modo particionado, em que os artigos são divididos pelo hash do eid e cada
+fragmento separa, normaliza e alinha autores, afiliações e palavras-chave num pool de processos.
+
+A paridade é verificada nas ocorrências (valores, tipos e ordem), nas dimensões e pontes
+(criar_tabelas_scopus) e no cache de afiliações gravado, com qualquer número de processos (mesmo
+acima dos núcleos disponíveis). O tempo é medido com o cache de afiliações vazio (primeira
+execução) de 1 processo até o número de núcleos.
+
+Os dados e o cache ficam numa pasta temporária (OBSERVATORIO_PASTA_DADOS).
+
+Uso:
+    python scripts/benchmarks/benchmark_scopus_fragmentos.py --artigos 200000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Antes de importar os módulos do projeto, que fixam as pastas ao serem importados: o cache de
+# afiliações fica na pasta temporária
+_PASTA_TEMPORARIA = tempfile.TemporaryDirectory()
+os.environ['OBSERVATORIO_PASTA_DADOS'] = _PASTA_TEMPORARIA.name
+
+import pandas as pd  # noqa: E402
+
+import processar_scopus  # noqa: E402
+from utils.afiliacoes import CAMINHO_CACHE_AFILIACOES, carregar_cache_afiliacoes  # noqa: E402
+
+
+def _nome(aleatorio):
+    return f"{aleatorio.choice(['Silva', 'Souza', 'Lima', 'Costa', 'Rocha'])}{aleatorio.randrange(20000)}"
+
+
+def gerar_artigos(linhas, semente=42):
+    """Tabela limpa sintética da Scopus, ordenada pelo eid, com autorias desalinhadas e ausentes."""
+    aleatorio = random.Random(semente)
+    instituicoes = [
+        f"Universidade {i} ({'UF' + chr(65 + i % 26) * 2}), Rua {i}, Cidade {i % 300}, Brasil" for i in range(linhas // 4)
+    ]
+    termos = [f'Termo {i}' for i in range(linhas // 2)]
+    registros = []
+    for i in range(linhas):
+        ids = [str(57000000000 + aleatorio.randrange(linhas * 2)) for _ in range(aleatorio.randint(1, 6))]
+        nomes = [f'{_nome(aleatorio)}, A. ({id_autor})' for id_autor in ids]
+        if aleatorio.random() < 0.02:
+            nomes = nomes[::-1]
+        elif aleatorio.random() < 0.02:
+            nomes = nomes[:-1] or nomes
+        autores = '; '.join(nome.split(',')[0] for nome in nomes)
+        registros.append((
+            f'2-s2.0-{85000000000 + i}',
+            'nao_informado' if aleatorio.random() < 0.03 else autores,
+            'nao_informado' if aleatorio.random() < 0.03 else '; '.join(ids),
+            '; '.join(nomes),
+            'nao_informado' if aleatorio.random() < 0.05 else '; '.join(aleatorio.sample(instituicoes, aleatorio.randint(1, 3))),
+            'nao_informado' if aleatorio.random() < 0.1 else '; '.join(aleatorio.sample(termos, aleatorio.randint(1, 5))),
+            'nao_informado' if aleatorio.random() < 0.1 else ';'.join(t.lower() for t in aleatorio.sample(termos, aleatorio.randint(1, 8))),
+        ))
+    colunas = ['eid', 'authors', 'authors_id', 'author_full_names', 'affiliations', 'author_keywords', 'index_keywords']
+    return processar_scopus._ordenar_por_eid(pd.DataFrame(registros, columns=colunas))
+
+
+def executar(n_processos, df):
+    """Ocorrências e tabelas finais partindo do cache de afiliações vazio; devolve também o cache gravado."""
+    CAMINHO_CACHE_AFILIACOES.unlink(missing_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ocorrencias = processar_scopus.criar_ocorrencias_scopus.__wrapped__(df, n_processos)
+        tabelas = processar_scopus.criar_tabelas_scopus.__wrapped__(ocorrencias)
+    return ocorrencias, tabelas, carregar_cache_afiliacoes()
+
+
+def _categorias(df):
+    return {coluna: list(df[coluna].cat.categories) for coluna in df.columns if isinstance(df[coluna].dtype, pd.CategoricalDtype)}
+
+
+def iguais(esperado, obtido):
+    ocorrencias_a, tabelas_a, cache_a = esperado
+    ocorrencias_b, tabelas_b, cache_b = obtido
+    for a, b in [*zip(ocorrencias_a.values(), ocorrencias_b.values()), *zip(tabelas_a.values(), tabelas_b.values())]:
+        # `equals` não compara a ordem das categorias, que fica no estado do modo incremental
+        if not (a.reset_index(drop=True).equals(b.reset_index(drop=True)) and a.dtypes.equals(b.dtypes)):
+            return False
+        if _categorias(a) != _categorias(b):
+            return False
+    return cache_a.sort_index().equals(cache_b.sort_index())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--artigos', type=int, default=200000)
+    parser.add_argument('--processos', type=int, nargs='+', default=None, help="Números de processos medidos (padrão: 1, 2, 4, 8 até os núcleos).")
+    args = parser.parse_args()
+
+    artigos = gerar_artigos(args.artigos)
+    amostra = gerar_artigos(max(processar_scopus.MINIMO_ARTIGOS_PARTICIONAR, 8000), semente=7)
+    # Fora da ordem do eid, como os artigos afetados do modo incremental
+    embaralhada = amostra.sample(frac=1, random_state=7)
+    for descricao, df in (('ordenada', amostra), ('embaralhada', embaralhada)):
+        referencia = executar(1, df)
+        for n_processos in (2, 3, 5):
+            if not iguais(referencia, executar(n_processos, df)):
+                print(f"ERRO: o modo particionado com {n_processos} processos (tabela {descricao}) difere da execução num só processo.")
+                sys.exit(1)
+    print("Paridade: OK (ocorrências, dimensões, pontes e cache de afiliações idênticos com 2, 3 e 5 processos)")
+
+    nucleos = os.cpu_count() or 1
+    print(f"{args.artigos} artigos, {nucleos} núcleos")
+    print(f"{'processos':>9} {'tempo':>8} {'artigos/s':>10} {'aceleracao':>11}")
+    base = None
+    for n_processos in args.processos or sorted({1, 2, 4, 8, nucleos} - {n for n in (2, 4, 8) if n > nucleos}):
+        inicio = time.perf_counter()
+        executar(n_processos, artigos)
+        segundos = time.perf_counter() - inicio
+        base = base or segundos
+        print(f"{n_processos:>9} {segundos:>7.2f}s {args.artigos / segundos:>10.0f} {base / segundos:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
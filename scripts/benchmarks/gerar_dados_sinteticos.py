@@ -0,0 +1,282 @@
+# scripts/benchmarks/gerar_dados_sinteticos.py
+"""
+Gera dados brutos sintéticos no mesmo formato das exportações lidas pelo pipeline, em qualquer
+múltiplo do volume atual (escala 1 ~ 800 artigos da Scopus, 115 patentes da Espacenet, 2.000
+espécies e 7.500 avaliações da CNCFlora):
+
+    <destino>/raw/
+    ├── cncflora/lista_vermelha_cnc_flora.csv     (vírgula; ações e ameaças separadas por '|')
+    ├── cncflora/termos_plantas.txt                (nome científico,grupo; sem cabeçalho)
+    ├── espacenet_input/espacenet_*.csv            (';'; partes com "[CC]", IPC e datas por vírgula)
+    ├── espacenet_resumo_plantas.csv               (lista manual patente -> espécie)
+    └── scopus_input/scopus_*.csv                  (autores, IDs e afiliações separados por ';')
+
+Os textos citam espécies da lista (por extenso, em outra caixa ou abreviadas), parte dos artigos
+aparece em mais de uma exportação da Scopus e há anomalias como na origem (nomes completos
+faltando, campos vazios). Com a mesma semente, os arquivos gerados são sempre os mesmos.
+
+Uso:
+    python scripts/benchmarks/gerar_dados_sinteticos.py /tmp/dados_x10 --escala 10
+    OBSERVATORIO_PASTA_DADOS=/tmp/dados_x10 python scripts/main.py
+"""
+import argparse
+import csv
+import random
+from pathlib import Path
+
+# Volume da escala 1 (próximo ao das tabelas atuais em data/processed/)
+VOLUME_BASE = {'artigos': 800, 'patentes': 115, 'especies': 2000, 'avaliacoes': 7500}
+
+ARQUIVOS_SCOPUS = ['scopus_angiospermas', 'scopus_briofitas', 'scopus_gimnospermas', 'scopus_samambaias_e_licofitas']
+ARQUIVOS_ESPACENET = ['espacenet_angiosperma', 'espacenet_samambaias_e_licofitas']
+# Fração dos artigos repetidos em uma segunda exportação da Scopus
+FRACAO_REPETIDOS = 0.08
+
+COLUNAS_SCOPUS = [
+    'Authors', 'Author full names', 'Author(s) ID', 'Title', 'Year', 'Source title', 'Volume', 'Issue', 'Art. No.',
+    'Page start', 'Page end', 'Page count', 'Cited by', 'DOI', 'Link', 'Affiliations', 'Authors with affiliations',
+    'Abstract', 'Author Keywords', 'Index Keywords', 'Funding Details', 'Funding Texts', 'References',
+    'Correspondence Address', 'Editors', 'Publisher', 'ISSN', 'Language of Original Document',
+    'Abbreviated Source Title', 'Document Type', 'Publication Stage', 'Open Access', 'Source', 'EID',
+]
+COLUNAS_ESPACENET = [
+    'No', 'Title', 'Inventors', 'Applicants', 'Publication number', 'Earliest priority', 'IPC', 'CPC',
+    'Publication date', 'Earliest publication', 'Family number',
+]
+COLUNAS_LISTA_VERMELHA = [
+    'Nome popular', 'Grupo', 'Categoria de risco de extinção', 'Data avaliação', 'Reavaliação',
+    'Histórico de avaliações', 'Nome avaliado (entrada sistema CNCFlora)',
+    'Classificação Ações de Conservação (IUCN) / Ações de Conservação',
+    'Classificação de Ameaças (Sistema IUCN) / Ameaças cadastradas',
+]
+
+SILABAS = ['ba', 'ca', 'ja', 'ru', 'te', 'pi', 'ma', 'lo', 'si', 'na', 'bu', 've', 'xo', 'qua', 'ri', 'mo', 'de', 'gu']
+PALAVRAS = (
+    'the of and in to a is was for with on by from as at this that were are species forest data amazon study '
+    'results analysis samples growth soil plants leaves seeds fruits water effect extract activity region '
+    'diversity populations community traits biomass rainfall floodplain terra firme'
+).split()
+INSTITUICOES = [
+    'Universidade Federal do Amazonas (UFAM)', 'Instituto Nacional de Pesquisas da Amazônia', 'Embrapa Amazônia Oriental',
+    'Universidade de São Paulo, USP', 'Museu Paraense Emílio Goeldi', 'INCT Madeiras da Amazônia/MCTI/CNPq/FAPEAM',
+    'Universidade Federal do Pará', 'Universidade do Estado do Amazonas (UEA)', 'Jardim Botânico do Rio de Janeiro',
+]
+CIDADES = [
+    'Manaus, Brazil', 'Belém, PA, Brazil', 'São Paulo, Brazil', 'Rio de Janeiro, RJ, Brazil', 'Santarém, Pará, Brazil',
+    'Av. André Araújo, 2.936, Petropolis, Amazonas, Manaus, 69067-375, Brazil',
+]
+GRUPOS = ['Angiospermas', 'Briófitas', 'Gimnospermas', 'Samambaias e Licófitas']
+CATEGORIAS_RISCO = ['LC', 'NT', 'VU', 'EN', 'CR', 'DD', 'EX']
+PAISES = ['US', 'BR', 'CN', 'JP', 'EP', 'WO', 'DE', 'KR', 'FR', 'GB', 'IN', 'CA', 'AU', 'XX']
+SUFIXOS_EMPRESA = ['INC', 'LTD', 'SA', 'GMBH', 'CO LTD', 'RES INST', 'UNIV']
+
+
+def _palavra(aleatorio, minimo=2, maximo=3):
+    return ''.join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(minimo, maximo)))
+
+
+def _data(aleatorio):
+    return f'{aleatorio.randint(1995, 2024)}-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d}'
+
+
+def _volume(chave, escala):
+    return max(1, round(VOLUME_BASE[chave] * escala))
+
+
+def gerar_especies(quantidade, aleatorio):
+    """Binômios distintos ("Gênero epíteto"), com cerca de seis espécies por gênero."""
+    generos = sorted({_palavra(aleatorio, 2, 4).capitalize() for _ in range(max(5, quantidade // 6))})
+    especies, vistas = [], set()
+    while len(especies) < quantidade:
+        especie = f'{aleatorio.choice(generos)} {_palavra(aleatorio, 2, 4)}'
+        if especie not in vistas:
+            vistas.add(especie)
+            especies.append(especie)
+    return especies
+
+
+def _citar(especie, aleatorio):
+    """Citação como nos textos: por extenso, em outra caixa ou com o gênero abreviado."""
+    sorteio = aleatorio.random()
+    if sorteio < 0.1:
+        return especie.upper()
+    if sorteio < 0.2:
+        return especie.lower()
+    if sorteio < 0.3:
+        genero, epiteto = especie.split(' ', 1)
+        return f'{genero[0]}. {epiteto}'
+    return especie
+
+
+def _escrever_csv(caminho, cabecalho, linhas, separador=','):
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo, delimiter=separador)
+        escritor.writerow(cabecalho)
+        escritor.writerows(linhas)
+
+
+def gerar_cncflora(caminho_raw, especies, quantidade_avaliacoes, aleatorio):
+    """Lista vermelha (várias avaliações por espécie, algumas com o autor no nome) e termos_plantas.txt."""
+    pasta = caminho_raw / 'cncflora'
+    pasta.mkdir(parents=True, exist_ok=True)
+    with open(pasta / 'termos_plantas.txt', 'w', encoding='utf-8') as arquivo:
+        for especie in especies:
+            arquivo.write(f'{especie},{aleatorio.choice(GRUPOS)}\n')
+
+    acoes = [f'{aleatorio.randint(1, 6)}.{aleatorio.randint(1, 9)} {_palavra(aleatorio).capitalize()} actions {i}' for i in range(100)]
+    ameacas = [f'{aleatorio.randint(1, 12)}.{aleatorio.randint(1, 9)}.{aleatorio.randint(1, 3)} {_palavra(aleatorio).capitalize()} threat {i}' for i in range(212)]
+
+    def avaliacoes():
+        for _ in range(quantidade_avaliacoes):
+            especie = aleatorio.choice(especies)
+            yield [
+                aleatorio.choice(['', '', 'açaí', 'buriti', 'castanheira', 'andiroba']),
+                aleatorio.choice(GRUPOS), aleatorio.choice(CATEGORIAS_RISCO),
+                aleatorio.choice(['2012', '2013', '2018', '2021', '']), aleatorio.choice(['Não', 'Sim', 'Não se aplica']),
+                aleatorio.choice(['Inéditas não ameaçadas (NT, DD, LC)', 'Continuou na mesma categoria de ameaça', '']),
+                especie if aleatorio.random() < 0.7 else f'{especie} Mart.',
+                '|'.join(aleatorio.sample(acoes, aleatorio.randint(0, 4))),
+                ' | '.join(aleatorio.sample(ameacas, aleatorio.randint(0, 5))),
+            ]
+
+    _escrever_csv(pasta / 'lista_vermelha_cnc_flora.csv', COLUNAS_LISTA_VERMELHA, avaliacoes())
+
+
+def gerar_scopus(caminho_raw, especies, quantidade_artigos, aleatorio):
+    """Exportações da Scopus; cada artigo vai para uma exportação e parte dele também para outra."""
+    autores = [
+        (str(57000000000 + i), _palavra(aleatorio).capitalize(), _palavra(aleatorio).capitalize())
+        for i in range(quantidade_artigos * 2 + 10)
+    ]
+    instituicoes = INSTITUICOES + [f'Laboratório de {_palavra(aleatorio, 3, 4).capitalize()}' for _ in range(max(30, quantidade_artigos))]
+    palavras_chave = [_palavra(aleatorio, 2, 4) for _ in range(max(200, quantidade_artigos * 3))]
+
+    def artigo(indice):
+        autores_artigo = aleatorio.sample(autores, aleatorio.randint(1, 12))
+        citadas = aleatorio.sample(especies, aleatorio.randint(0, 3))
+        nomes_completos = [f'{sobrenome}, {nome} ({id_autor})' for id_autor, sobrenome, nome in autores_artigo]
+        if aleatorio.random() < 0.02:
+            nomes_completos = nomes_completos[:-1]
+        afiliacoes = [
+            f'{aleatorio.choice(instituicoes)}, {aleatorio.choice(CIDADES)}'
+            for _ in range(aleatorio.randint(1, 4))
+        ]
+        resumo = aleatorio.choices(PALAVRAS, k=aleatorio.randint(80, 200))
+        for especie in citadas:
+            resumo.insert(aleatorio.randrange(len(resumo)), _citar(especie, aleatorio))
+        titulo = f"{aleatorio.choice(['Ecology', 'Chemistry', 'Genetics', 'Uses'])} of {' and '.join(citadas) or 'Amazonian plants'}"
+        referencias = '; '.join(
+            f'{_palavra(aleatorio).capitalize()} A., {" ".join(aleatorio.choices(PALAVRAS, k=12))} ({aleatorio.randint(1950, 2024)})'
+            for _ in range(aleatorio.randint(5, 15))
+        )
+        return [
+            '; '.join(f'{sobrenome} {nome[0]}.' for _, sobrenome, nome in autores_artigo),
+            '; '.join(nomes_completos), '; '.join(id_autor for id_autor, _, _ in autores_artigo),
+            titulo, str(aleatorio.randint(1990, 2025)), aleatorio.choice(['Acta Amazonica', 'Forest Ecology and Management', 'Rodriguésia']),
+            str(aleatorio.randint(1, 60)) if aleatorio.random() < 0.9 else '',
+            str(aleatorio.randint(1, 12)) if aleatorio.random() < 0.6 else '', '',
+            str(aleatorio.randint(1, 300)) if aleatorio.random() < 0.8 else '', '', '',
+            str(aleatorio.randint(0, 150)) if aleatorio.random() < 0.7 else '',
+            f'10.1590/{indice}', f'https://www.scopus.com/inward/record.uri?eid=2-s2.0-{85000000000 + indice}',
+            '; '.join(afiliacoes), '; '.join(f'{a[1]} {a[2][0]}., {aleatorio.choice(afiliacoes)}' for a in autores_artigo),
+            ' '.join(resumo) if aleatorio.random() < 0.97 else '',
+            '; '.join(aleatorio.sample(palavras_chave, aleatorio.randint(1, 6))) if aleatorio.random() < 0.8 else '',
+            '; '.join(aleatorio.sample(palavras_chave, aleatorio.randint(2, 10))).upper() if aleatorio.random() < 0.6 else '',
+            'CNPq' if aleatorio.random() < 0.3 else '', '', referencias,
+            f'{autores_artigo[0][1]}, {aleatorio.choice(CIDADES)}' if aleatorio.random() < 0.5 else '',
+            '', aleatorio.choice(['INPA', 'Elsevier', 'Springer']), '0044-5967', 'English', 'Acta Amaz.',
+            'Article', 'Final', 'All Open Access' if aleatorio.random() < 0.4 else '', 'Scopus', f'2-s2.0-{85000000000 + indice}',
+        ]
+
+    # Cada exportação é escrita por vez; os repetidos vão para a exportação seguinte
+    destino = {indice: aleatorio.randrange(len(ARQUIVOS_SCOPUS)) for indice in range(quantidade_artigos)}
+    repetidos = {indice for indice in range(quantidade_artigos) if aleatorio.random() < FRACAO_REPETIDOS}
+    linhas_repetidas = {posicao: [] for posicao in range(len(ARQUIVOS_SCOPUS))}
+    for posicao, nome in enumerate(ARQUIVOS_SCOPUS):
+        def linhas():
+            yield from linhas_repetidas[posicao]
+            for indice in (i for i, d in destino.items() if d == posicao):
+                linha = artigo(indice)
+                if indice in repetidos:
+                    linhas_repetidas[(posicao + 1) % len(ARQUIVOS_SCOPUS)].append(linha)
+                yield linha
+        _escrever_csv(caminho_raw / 'scopus_input' / f'{nome}.csv', COLUNAS_SCOPUS, linhas())
+    # Repetidos da última exportação vão para a primeira: acrescentados ao final dela
+    with open(caminho_raw / 'scopus_input' / f'{ARQUIVOS_SCOPUS[0]}.csv', 'a', newline='', encoding='utf-8') as arquivo:
+        csv.writer(arquivo).writerows(linhas_repetidas[0])
+
+
+def gerar_espacenet(caminho_raw, especies, quantidade_patentes, aleatorio):
+    """Exportações da Espacenet (';') e a lista manual de espécies por patente."""
+    pessoas = [f'{_palavra(aleatorio).upper()} {_palavra(aleatorio).upper()} [{aleatorio.choice(PAISES)}]' for _ in range(quantidade_patentes * 3)]
+    empresas = [
+        f'{_palavra(aleatorio, 2, 4).upper()} {aleatorio.choice(SUFIXOS_EMPRESA)} [{aleatorio.choice(PAISES)}]'
+        for _ in range(quantidade_patentes // 2 + 5)
+    ]
+    ipcs = [
+        f"{aleatorio.choice('ABCDEFGH')}{aleatorio.randint(1, 99):02d}{aleatorio.choice('BCDGKLMNPQ')}"
+        f"{aleatorio.randint(1, 99)}/{aleatorio.choice(['00', '02', '10', '185', '9789'])}"
+        for _ in range(max(300, quantidade_patentes * 3))
+    ]
+    patentes, manual = [], []
+    for indice in range(quantidade_patentes):
+        publicacoes = [
+            f'{aleatorio.choice(PAISES[:7])}{2000000000 + indice * 7 + k}{aleatorio.choice(["A1", "A2", "B1", "B2"])}'
+            for k in range(1 if aleatorio.random() < 0.8 else 2)
+        ]
+        especie = aleatorio.choice(especies)
+        patentes.append([
+            str(indice + 1), f'COMPOSITION COMPRISING EXTRACT OF {especie.upper()}',
+            ', '.join(aleatorio.sample(pessoas, aleatorio.randint(0, 4))), ', '.join(aleatorio.sample(empresas, aleatorio.randint(0, 2))),
+            ','.join(publicacoes), _data(aleatorio) if aleatorio.random() < 0.95 else '',
+            ', '.join(aleatorio.sample(ipcs, aleatorio.randint(0, 6))), ', '.join(aleatorio.sample(ipcs, aleatorio.randint(0, 3))),
+            ','.join(_data(aleatorio) for _ in publicacoes), _data(aleatorio), str(60000000 + indice), '',
+        ])
+        if aleatorio.random() < 0.45:
+            manual.append([publicacoes[0], f'An extract of {especie} is disclosed', especie])
+
+    for posicao, nome in enumerate(ARQUIVOS_ESPACENET):
+        linhas = patentes[posicao::len(ARQUIVOS_ESPACENET)]
+        _escrever_csv(caminho_raw / 'espacenet_input' / f'{nome}.csv', COLUNAS_ESPACENET + [''], linhas, separador=';')
+    _escrever_csv(caminho_raw / 'espacenet_resumo_plantas.csv', ['Publication_number', 'Abstract', 'planta_levantada_manualmente'], manual)
+
+
+def gerar_dados_brutos(caminho_dados, escala=1.0, semente=42):
+    """
+    Escreve os dados brutos sintéticos em `<caminho_dados>/raw`.
+
+    Args:
+        caminho_dados (Path): Pasta de dados (a mesma usada em OBSERVATORIO_PASTA_DADOS).
+        escala (float): Múltiplo do volume atual (VOLUME_BASE).
+        semente (int): Semente do gerador pseudoaleatório.
+
+    Returns:
+        dict: Quantidades geradas (artigos, patentes, espécies, avaliações) e total de bytes.
+    """
+    caminho_raw = Path(caminho_dados) / 'raw'
+    aleatorio = random.Random(semente)
+    volumes = {chave: _volume(chave, escala) for chave in VOLUME_BASE}
+    especies = gerar_especies(volumes['especies'], aleatorio)
+    gerar_cncflora(caminho_raw, especies, volumes['avaliacoes'], aleatorio)
+    gerar_scopus(caminho_raw, especies, volumes['artigos'], aleatorio)
+    gerar_espacenet(caminho_raw, especies, volumes['patentes'], aleatorio)
+    volumes['bytes'] = sum(caminho.stat().st_size for caminho in caminho_raw.rglob('*') if caminho.is_file())
+    return volumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('destino', type=Path, help="Pasta de dados (os arquivos vão para <destino>/raw).")
+    parser.add_argument('--escala', type=float, default=1.0, help="Múltiplo do volume atual.")
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+    volumes = gerar_dados_brutos(args.destino, args.escala, args.semente)
+    print(
+        f"{volumes['artigos']} artigos, {volumes['patentes']} patentes, {volumes['especies']} espécies, "
+        f"{volumes['avaliacoes']} avaliações ({volumes['bytes'] / 2**20:.1f} MB) em {args.destino / 'raw'}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# scripts/consultas.py
+"""
+Consultas entre fontes sobre o banco analítico (data/processed/observatorio.sqlite, criado por
+scripts/criar_banco.py). Cada função recebe uma conexão e parâmetros e devolve um DataFrame; os
+filtros usam colunas indexadas no banco.
+
+Uso:
+    python scripts/consultas.py ameacadas-com-patentes --categorias CR EN
+    python scripts/consultas.py resumo "Euterpe oleracea"
+    python scripts/consultas.py instituicoes "Euterpe oleracea" --todas
+    python scripts/consultas.py ipc A61K
+"""
+import argparse
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from criar_banco import CAMINHO_BANCO
+
+# Categorias de ameaça da IUCN usadas pela CNCFlora (Criticamente em Perigo, Em Perigo, Vulnerável)
+CATEGORIAS_AMEACADAS = ('CR', 'EN', 'VU')
+
+
+def conectar(caminho_banco=CAMINHO_BANCO):
+    """Abre o banco só para leitura."""
+    if not caminho_banco.exists():
+        raise FileNotFoundError(f"Banco não encontrado: '{caminho_banco}'. Rode scripts/criar_banco.py antes.")
+    return sqlite3.connect(f'{caminho_banco.resolve().as_uri()}?mode=ro', uri=True)
+
+
+def _marcadores(valores):
+    return ', '.join('?' * len(valores))
+
+
+def especies_ameacadas_com_patentes(conexao, categorias=CATEGORIAS_AMEACADAS):
+    """
+    Espécies cuja avaliação mais recente está numa das categorias e com ao menos uma patente, com
+    as contagens (uma linha por espécie, como em vw_resumo_especie).
+    """
+    categorias = list(categorias)
+    consulta = f"""
+        SELECT especie_id, nome_cientifico, categoria_risco, patentes, artigos
+        FROM vw_resumo_especie
+        WHERE patentes > 0 AND categoria_risco IN ({_marcadores(categorias)})
+        ORDER BY patentes DESC, nome_cientifico
+    """
+    return pd.read_sql_query(consulta, conexao, params=categorias)
+
+
+def especies_em_todas_as_fontes(conexao):
+    """Espécies com artigo (Scopus), patente (Espacenet) e avaliação (CNCFlora)."""
+    consulta = """
+        SELECT especie_id, nome_cientifico, artigos, patentes, categoria_risco
+        FROM vw_resumo_especie
+        WHERE artigos > 0 AND patentes > 0 AND categoria_risco IS NOT NULL
+        ORDER BY artigos + patentes DESC, nome_cientifico
+    """
+    return pd.read_sql_query(consulta, conexao)
+
+
+def resumo_especie(conexao, nome_cientifico):
+    """Artigos, patentes e categoria de risco mais recente de uma espécie."""
+    consulta = "SELECT * FROM vw_resumo_especie WHERE nome_cientifico = ?"
+    return pd.read_sql_query(consulta, conexao, params=[nome_cientifico])
+
+
+def artigos_da_especie(conexao, nome_cientifico, ano_inicio=None, ano_fim=None):
+    """Artigos da Scopus ligados à espécie, opcionalmente num intervalo de anos."""
+    consulta = "SELECT article_id, title, year, source_title, score FROM vw_especie_artigos WHERE nome_cientifico = ?"
+    parametros = [nome_cientifico]
+    if ano_inicio is not None:
+        consulta += " AND year >= ?"
+        parametros.append(ano_inicio)
+    if ano_fim is not None:
+        consulta += " AND year <= ?"
+        parametros.append(ano_fim)
+    return pd.read_sql_query(consulta + " ORDER BY year DESC, article_id", conexao, params=parametros)
+
+
+def patentes_da_especie(conexao, nome_cientifico, pais=None):
+    """Patentes ligadas à espécie, opcionalmente só as com um país (código ISO, ex: 'BR')."""
+    consulta = """
+        SELECT DISTINCT v.publication_number, v.title, v.family_number, v.ano_prioridade
+        FROM vw_especie_patentes v
+    """
+    parametros = []
+    if pais is not None:
+        consulta += """
+            JOIN pon_patente_country pc ON pc.publication_number = v.publication_number
+            JOIN dim_country c ON c.country_id = pc.country_id AND c.country_code = ?
+        """
+        parametros.append(pais)
+    consulta += " WHERE v.nome_cientifico = ? ORDER BY v.ano_prioridade DESC, v.publication_number"
+    parametros.append(nome_cientifico)
+    return pd.read_sql_query(consulta, conexao, params=parametros)
+
+
+def especies_por_pais(conexao, pais, origem=None):
+    """Espécies citadas em patentes de um país (código ISO), opcionalmente por origem (ex: 'Applicant')."""
+    consulta = """
+        SELECT e.especie_id, e.nome_cientifico, COUNT(DISTINCT pe.publication_number) AS patentes
+        FROM dim_country c
+        JOIN pon_patente_country pc ON pc.country_id = c.country_id
+        JOIN pon_patente_especie pe ON pe.publication_number = pc.publication_number
+        JOIN dim_especies_mestre e ON e.especie_id = pe.especie_id
+        WHERE c.country_code = ?
+    """
+    parametros = [pais]
+    if origem is not None:
+        consulta += " AND pc.origin = ?"
+        parametros.append(origem)
+    consulta += " GROUP BY e.especie_id, e.nome_cientifico ORDER BY patentes DESC, e.nome_cientifico"
+    return pd.read_sql_query(consulta, conexao, params=parametros)
+
+
+def instituicoes_da_especie(conexao, nome_cientifico, so_em_ambas=True):
+    """
+    Organizações (dim_organizacao) com artigos e patentes sobre a espécie; sem `so_em_ambas`,
+    também as que só publicam ou só patenteiam.
+    """
+    consulta = """
+        SELECT d.organizacao_id, d.nome_organizacao,
+               COUNT(DISTINCT CASE WHEN d.tipo = 'artigo' THEN d.documento END) AS artigos,
+               COUNT(DISTINCT CASE WHEN d.tipo = 'patente' THEN d.documento END) AS patentes
+        FROM dim_especies_mestre e
+        JOIN (
+            SELECT especie_id, 'artigo' AS tipo, article_id AS documento FROM pon_artigo_especie
+            UNION ALL
+            SELECT especie_id, 'patente' AS tipo, publication_number AS documento FROM pon_patente_especie
+        ) pe ON pe.especie_id = e.especie_id
+        JOIN vw_organizacao_documentos d ON d.tipo = pe.tipo AND d.documento = pe.documento
+        WHERE e.nome_cientifico = ?
+        GROUP BY d.organizacao_id, d.nome_organizacao
+    """
+    if so_em_ambas:
+        consulta += " HAVING artigos > 0 AND patentes > 0"
+    consulta += " ORDER BY artigos + patentes DESC, d.nome_organizacao"
+    return pd.read_sql_query(consulta, conexao, params=[nome_cientifico])
+
+
+def subniveis_ipc(conexao, codigo=None):
+    """Nós IPC logo abaixo de um código (sem código, as seções), com o número de patentes de cada um."""
+    consulta = """
+        SELECT n.codigo, n.nivel, n.descricao,
+               (SELECT COUNT(*) FROM pon_patente_ipc_nivel p WHERE p.ipc_nivel_id = n.ipc_nivel_id) AS patentes
+        FROM dim_ipc_niveis n
+    """
+    if codigo is None:
+        consulta += " WHERE n.ipc_nivel_pai_id IS NULL"
+        parametros = []
+    else:
+        consulta += " JOIN dim_ipc_niveis pai ON pai.ipc_nivel_id = n.ipc_nivel_pai_id WHERE pai.codigo = ?"
+        parametros = [codigo]
+    return pd.read_sql_query(consulta + " ORDER BY patentes DESC, n.codigo", conexao, params=parametros)
+
+
+# Subcomando da linha de comando -> consulta
+CONSULTAS = {
+    'ameacadas-com-patentes': especies_ameacadas_com_patentes,
+    'todas-as-fontes': especies_em_todas_as_fontes,
+    'resumo': resumo_especie,
+    'artigos': artigos_da_especie,
+    'patentes': patentes_da_especie,
+    'por-pais': especies_por_pais,
+    'instituicoes': instituicoes_da_especie,
+    'ipc': subniveis_ipc,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas entre fontes sobre o banco analítico do observatório.")
+    subcomandos = parser.add_subparsers(dest='consulta', required=True)
+    ameacadas = subcomandos.add_parser('ameacadas-com-patentes', help=especies_ameacadas_com_patentes.__doc__)
+    ameacadas.add_argument('--categorias', nargs='+', default=list(CATEGORIAS_AMEACADAS))
+    subcomandos.add_parser('todas-as-fontes', help=especies_em_todas_as_fontes.__doc__)
+    resumo = subcomandos.add_parser('resumo', help=resumo_especie.__doc__)
+    resumo.add_argument('nome_cientifico')
+    artigos = subcomandos.add_parser('artigos', help=artigos_da_especie.__doc__)
+    artigos.add_argument('nome_cientifico')
+    artigos.add_argument('--ano-inicio', type=int)
+    artigos.add_argument('--ano-fim', type=int)
+    patentes = subcomandos.add_parser('patentes', help=patentes_da_especie.__doc__)
+    patentes.add_argument('nome_cientifico')
+    patentes.add_argument('--pais')
+    por_pais = subcomandos.add_parser('por-pais', help=especies_por_pais.__doc__)
+    por_pais.add_argument('pais')
+    por_pais.add_argument('--origem')
+    instituicoes = subcomandos.add_parser('instituicoes', help=instituicoes_da_especie.__doc__)
+    instituicoes.add_argument('nome_cientifico')
+    instituicoes.add_argument('--todas', dest='so_em_ambas', action='store_false', help="Inclui as que só publicam ou só patenteiam.")
+    ipc = subcomandos.add_parser('ipc', help=subniveis_ipc.__doc__)
+    ipc.add_argument('codigo', nargs='?', help="Seção, classe, subclasse ou grupo (ex: A61K, A61K36/00).")
+    args = vars(parser.parse_args())
+
+    funcao = CONSULTAS[args.pop('consulta')]
+    with closing(conectar()) as conexao:
+        resultado = funcao(conexao, **args)
+    with pd.option_context('display.max_rows', 100, 'display.width', 200):
+        print(resultado.to_string(index=False) if not resultado.empty else "Nenhum resultado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+# scripts/criar_agregados.py
+"""
+Tabelas agregadas (cubos) para os painéis do Looker Studio, a partir do modelo estrela já gravado
+em data/processed/: em vez de somar as linhas das pontes a cada visualização, o painel lê alguns
+milhares de linhas já contadas.
+
+Cada cubo é particionado por uma coluna (ex: ano). A atualização é incremental em dois níveis:
+  1. se nenhum arquivo de entrada do cubo mudou desde a última execução, o cubo não é refeito;
+  2. se algum mudou, as linhas de detalhe (as junções, antes da contagem) recebem uma impressão
+     digital por partição, e só as partições novas ou com impressão diferente são recontadas; as
+     demais linhas vêm do cubo anterior.
+"""
+import argparse
+import hashlib
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from utils.constants import CAMINHO_DADOS_PROCESSADOS
+from utils.data_processing import ler_tabela, salvar_tabelas, tabela_existe
+from utils.manifesto import carregar_manifesto, descrever_arquivo, salvar_manifesto
+from utils.telemetria import instrumentar
+
+CAMINHO_AGREGADOS = CAMINHO_DADOS_PROCESSADOS / 'agregados'
+CAMINHO_ESTADO_AGREGADOS = CAMINHO_AGREGADOS / 'estado_agregados.json'
+# Versão das regras dos cubos: mudá-la refaz todos os cubos na próxima execução
+VERSAO_AGREGADOS = 2
+# Avaliação sem ameaça cadastrada (mesmo marcador de ausência da CNCFlora)
+SEM_AMEACA = 'NAO INFORMADO'
+
+
+@dataclass
+class Cubo:
+    """
+    Tabela agregada do painel.
+
+    Args:
+        nome (str): Nome da tabela gravada em data/processed/agregados/.
+        entradas (tuple): Tabelas lidas (caminhos relativos a data/processed/, sem extensão).
+        detalhar (callable): Recebe {entrada: DataFrame} e devolve as linhas de detalhe.
+        dimensoes (list): Colunas do agrupamento (a primeira é a partição).
+        contar (str): Coluna cujos valores distintos são contados em cada grupo.
+        medida (str): Nome da coluna com a contagem.
+        colunas_entrada (dict): Colunas lidas de cada entrada.
+    """
+    nome: str
+    entradas: tuple
+    detalhar: object
+    dimensoes: list
+    contar: str
+    medida: str
+    colunas_entrada: dict = field(default_factory=dict)
+
+    @property
+    def particao(self):
+        return self.dimensoes[0]
+
+    def __str__(self):
+        return self.nome
+
+
+# ==============================================================================
+# LINHAS DE DETALHE DE CADA CUBO
+# ==============================================================================
+
+def _detalhe_artigos_especie_ano(tabelas):
+    ponte = tabelas['pon_artigo_especie'][['article_id', 'especie_id']]
+    artigos = tabelas['scopus_dados_limpos_temp'].rename(columns={'eid': 'article_id', 'year': 'ano'})
+    detalhe = ponte.merge(artigos[['article_id', 'ano']], on='article_id', how='inner')
+    return detalhe.merge(tabelas['dim_especies_mestre'].drop_duplicates(subset=['especie_id']), on='especie_id', how='left')
+
+
+def _detalhe_patentes_especie_pais_ano(tabelas):
+    detalhe = tabelas['espacenet/pon_patente_especie'].merge(
+        tabelas['espacenet/pon_patente_country'], on='publication_number', how='inner'
+    )
+    paises = tabelas['espacenet/dim_country'].drop_duplicates(subset=['country_id'])
+    detalhe = detalhe.merge(paises, on='country_id', how='left').drop(columns=['country_id'])
+    # Patentes sem ano de prioridade ficam no cubo, com o ano nulo
+    anos = tabelas['espacenet/pon_patente_ano_prioridade'].rename(columns={'ano': 'ano_prioridade'})
+    detalhe = detalhe.merge(anos, on='publication_number', how='left')
+    detalhe['ano_prioridade'] = detalhe['ano_prioridade'].astype('Int64')
+    return detalhe.merge(tabelas['dim_especies_mestre'].drop_duplicates(subset=['especie_id']), on='especie_id', how='left')
+
+
+def _detalhe_avaliacoes_grupo_categoria_ameaca(tabelas):
+    avaliacoes = tabelas['cncflora/fato_gorda_cncflora']
+    ameacas = tabelas['cncflora/pon_avaliacao_ameaca'].merge(
+        tabelas['cncflora/dim_ameacas'].drop_duplicates(subset=['ameaca_id']), on='ameaca_id', how='left'
+    )
+    detalhe = avaliacoes.merge(ameacas[['avaliacao_id', 'ameaca']], on='avaliacao_id', how='left')
+    detalhe['ameaca'] = detalhe['ameaca'].fillna(SEM_AMEACA)
+    return detalhe
+
+
+def _detalhe_ipc_secao_classe(tabelas):
+    detalhe = tabelas['espacenet/pon_patente_ipc'].merge(
+        tabelas['espacenet/dim_ipc'].drop_duplicates(subset=['ipc_id']), on='ipc_id', how='inner'
+    )
+    # Seção (letra) e classe (letra + dois dígitos) do código IPC, ex: A61K36/00 -> A, A61
+    detalhe['secao'] = detalhe['ipc_code'].str[:1]
+    detalhe['classe'] = detalhe['ipc_code'].str[:3]
+    return detalhe
+
+
+CUBOS = [
+    Cubo(
+        'agg_artigos_especie_ano', ('pon_artigo_especie', 'scopus_dados_limpos_temp', 'dim_especies_mestre'),
+        _detalhe_artigos_especie_ano, ['ano', 'especie_id', 'nome_cientifico'], 'article_id', 'artigos',
+        colunas_entrada={
+            'pon_artigo_especie': ['article_id', 'especie_id'], 'scopus_dados_limpos_temp': ['eid', 'year'],
+            'dim_especies_mestre': ['especie_id', 'nome_cientifico'],
+        },
+    ),
+    Cubo(
+        'agg_patentes_especie_pais_ano',
+        ('espacenet/pon_patente_especie', 'espacenet/pon_patente_country', 'espacenet/dim_country',
+         'espacenet/pon_patente_ano_prioridade', 'dim_especies_mestre'),
+        _detalhe_patentes_especie_pais_ano,
+        ['ano_prioridade', 'especie_id', 'nome_cientifico', 'country_code', 'country_name', 'origin'],
+        'publication_number', 'patentes',
+        colunas_entrada={'dim_especies_mestre': ['especie_id', 'nome_cientifico']},
+    ),
+    Cubo(
+        'agg_avaliacoes_grupo_categoria_ameaca',
+        ('cncflora/fato_gorda_cncflora', 'cncflora/pon_avaliacao_ameaca', 'cncflora/dim_ameacas'),
+        _detalhe_avaliacoes_grupo_categoria_ameaca, ['grupo_nome', 'categoria_risco', 'ameaca'], 'avaliacao_id', 'avaliacoes',
+        colunas_entrada={'cncflora/fato_gorda_cncflora': ['avaliacao_id', 'grupo_nome', 'categoria_risco']},
+    ),
+    Cubo(
+        'agg_ipc_secao_classe', ('espacenet/pon_patente_ipc', 'espacenet/dim_ipc'),
+        _detalhe_ipc_secao_classe, ['secao', 'classe'], 'publication_number', 'patentes',
+    ),
+]
+
+
+# ==============================================================================
+# ATUALIZAÇÃO POR PARTIÇÃO
+# ==============================================================================
+
+def _descrever_entradas(cubo, anteriores):
+    """Tamanho, mtime e hash dos arquivos de cada entrada (o hash é reaproveitado se nada mudou)."""
+    descricoes = {}
+    for entrada in cubo.entradas:
+        for extensao in ('.csv', '.parquet'):
+            caminho = (CAMINHO_DADOS_PROCESSADOS / entrada).with_suffix(extensao)
+            if not caminho.exists():
+                continue
+            chave = f'{entrada}{extensao}'
+            anterior = anteriores.get(chave)
+            info = caminho.stat()
+            mesmo_arquivo = anterior and anterior['tamanho'] == info.st_size and anterior['mtime'] == info.st_mtime_ns
+            descricoes[chave] = descrever_arquivo(caminho, anterior['hash'] if mesmo_arquivo else None)
+    return descricoes
+
+
+def _chaves_particao(valores):
+    """
+    Valor de cada linha da partição como texto, independente do tipo da coluna: o cubo anterior
+    lido do CSV traz os anos com nulos como float (2023.0) e o detalhe, como Int64 (2023).
+    """
+    if pd.api.types.is_float_dtype(valores):
+        inteiros = valores.dropna()
+        if (inteiros == np.floor(inteiros)).all():
+            valores = valores.astype('Int64')
+    return valores.astype(object).where(valores.notna(), None).map(str)
+
+
+def _alinhar_tipos(anterior, referencia):
+    """Converte as colunas do cubo anterior (relido do disco) para os tipos das linhas recontadas."""
+    for coluna in anterior.columns.intersection(referencia.columns):
+        if anterior[coluna].dtype != referencia[coluna].dtype:
+            try:
+                anterior[coluna] = anterior[coluna].astype(referencia[coluna].dtype)
+            except (TypeError, ValueError):
+                pass
+    return anterior
+
+
+def impressoes_particoes(detalhe, particao):
+    """
+    Impressão digital de cada partição: hash das linhas de detalhe, independente da ordem delas.
+
+    Returns:
+        dict[str, str]: Valor da partição (texto) -> impressão.
+    """
+    if detalhe.empty:
+        return {}
+    hashes = pd.util.hash_pandas_object(detalhe[sorted(detalhe.columns)], index=False).to_numpy()
+    codigos, chaves = pd.factorize(_chaves_particao(detalhe[particao]))
+    impressoes = {}
+    for codigo, chave in enumerate(chaves):
+        linhas = np.sort(hashes[codigos == codigo])
+        impressoes[chave] = hashlib.blake2b(linhas.tobytes(), digest_size=16).hexdigest()
+    return impressoes
+
+
+def agregar(detalhe, cubo):
+    """Contagem de valores distintos de `cubo.contar` por grupo, ordenada pelas dimensões."""
+    colunas = cubo.dimensoes + [cubo.contar]
+    agregado = (
+        detalhe[colunas].drop_duplicates()
+        .groupby(cubo.dimensoes, dropna=False, sort=False).size().rename(cubo.medida).reset_index()
+    )
+    return agregado
+
+
+def _ordenar(agregado, cubo):
+    return agregado.sort_values(cubo.dimensoes, kind='stable', na_position='last', ignore_index=True)
+
+
+@instrumentar(parametro_rotulo='cubo')
+def atualizar_cubo(cubo, estado_anterior, completo=False):
+    """
+    Atualiza um cubo, recontando só as partições cujas linhas de detalhe mudaram.
+
+    Args:
+        cubo (Cubo): Definição do cubo.
+        estado_anterior (dict | None): Estado salvo do cubo (entradas e impressões das partições).
+        completo (bool): Ignora o estado e reconta todas as partições.
+
+    Returns:
+        (pd.DataFrame | None, dict): O cubo (None se não precisou ser refeito) e o novo estado.
+    """
+    estado_anterior = None if completo else estado_anterior
+    if estado_anterior and estado_anterior.get('versao') != VERSAO_AGREGADOS:
+        estado_anterior = None
+    caminho_cubo = CAMINHO_AGREGADOS / cubo.nome
+    entradas = _descrever_entradas(cubo, (estado_anterior or {}).get('entradas', {}))
+    if estado_anterior and entradas == estado_anterior['entradas'] and tabela_existe(caminho_cubo):
+        print(f"Cubo '{cubo.nome}': entradas inalteradas, mantido.")
+        return None, estado_anterior
+
+    tabelas = {
+        entrada: ler_tabela(CAMINHO_DADOS_PROCESSADOS / entrada, colunas=cubo.colunas_entrada.get(entrada))
+        for entrada in cubo.entradas
+    }
+    detalhe = cubo.detalhar(tabelas)
+    impressoes = impressoes_particoes(detalhe, cubo.particao)
+
+    anteriores = (estado_anterior or {}).get('particoes', {})
+    if anteriores and tabela_existe(caminho_cubo):
+        alteradas = {chave for chave, impressao in impressoes.items() if anteriores.get(chave) != impressao}
+        removidas = set(anteriores) - set(impressoes)
+        cubo_anterior = ler_tabela(caminho_cubo)
+        mantidas = cubo_anterior[~_chaves_particao(cubo_anterior[cubo.particao]).isin(alteradas | removidas)]
+    else:
+        alteradas, removidas, mantidas = set(impressoes), set(), None
+
+    recontadas = agregar(detalhe[_chaves_particao(detalhe[cubo.particao]).isin(alteradas)], cubo)
+    if mantidas is not None:
+        mantidas = _alinhar_tipos(mantidas.copy(), recontadas)
+    partes = [parte for parte in (mantidas, recontadas) if parte is not None and not parte.empty]
+    agregado = _ordenar(pd.concat(partes, ignore_index=True) if partes else recontadas, cubo)
+    print(
+        f"Cubo '{cubo.nome}': {len(alteradas)} de {len(impressoes)} partições recontadas"
+        f"{f', {len(removidas)} removidas' if removidas else ''} ({len(agregado)} linhas)."
+    )
+    estado = {'versao': VERSAO_AGREGADOS, 'entradas': entradas, 'particoes': impressoes}
+    return agregado, estado
+
+
+@instrumentar
+def criar_agregados(completo=False):
+    """
+    Atualiza os cubos cujas entradas existem e grava o estado da atualização por partição.
+
+    Args:
+        completo (bool): Reconta todos os cubos, ignorando o estado salvo.
+    """
+    print("Atualizando as tabelas agregadas do painel...")
+    estado = carregar_manifesto(CAMINHO_ESTADO_AGREGADOS) or {}
+    for cubo in CUBOS:
+        ausentes = [entrada for entrada in cubo.entradas if not tabela_existe(CAMINHO_DADOS_PROCESSADOS / entrada)]
+        if ausentes:
+            print(f"Cubo '{cubo.nome}' ignorado: entradas ausentes {ausentes}.")
+            continue
+        agregado, estado[cubo.nome] = atualizar_cubo(cubo, estado.get(cubo.nome), completo=completo)
+        if agregado is not None:
+            salvar_tabelas({cubo.nome: agregado}, CAMINHO_AGREGADOS)
+            # O estado só avança depois do cubo gravado
+            salvar_manifesto(estado, CAMINHO_ESTADO_AGREGADOS)
+    salvar_manifesto(estado, CAMINHO_ESTADO_AGREGADOS)
+
+
+def executar_etapa_agregados():
+    """Etapa 'agregados' do pipeline: roda depois das etapas que gravam as tabelas de entrada."""
+    criar_agregados()
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualiza as tabelas agregadas do painel do Looker Studio.")
+    parser.add_argument('--completo', action='store_true', help="Reconta todas as partições de todos os cubos.")
+    args = parser.parse_args()
+    criar_agregados(completo=args.completo)
+    print(f"\nTabelas agregadas salvas em: {CAMINHO_AGREGADOS}")
+
+
+if __name__ == "__main__":
+    main()
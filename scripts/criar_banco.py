@@ -0,0 +1,262 @@
+# scripts/criar_banco.py
+"""
+Banco analítico local (SQLite) com o modelo estrela das três fontes, para consultas que cruzam
+Scopus, CNCFlora e Espacenet sem recarregar e juntar os CSVs (ver scripts/consultas.py).
+
+Todas as dimensões, fatos e pontes de data/processed/ são inseridos em lote num único arquivo,
+com as chaves inteiras declaradas como INTEGER, chave primária nas dimensões e índice em cada
+chave estrangeira. As visões `vw_especie_*` ligam as fontes pela dim_especies_mestre; a
+`vw_organizacao_documentos`, pela dim_organizacao (scripts/resolver_entidades.py).
+
+O banco é montado num arquivo temporário e só substitui o anterior quando está completo.
+"""
+import argparse
+import sqlite3
+
+import pandas as pd
+
+from utils.constants import CAMINHO_DADOS_PROCESSADOS
+from utils.data_processing import ler_tabela, tabela_existe
+from utils.telemetria import instrumentar, registrar_gravacao
+
+CAMINHO_BANCO = CAMINHO_DADOS_PROCESSADOS / 'observatorio.sqlite'
+
+# Tabelas carregadas (caminho relativo a data/processed/, sem extensão); o nome no banco é o do arquivo
+TABELAS = [
+    # Scopus
+    'scopus_dados_limpos_temp',
+    'dim_autores_scopus', 'pon_artigo_autores_scopus',
+    'dim_afiliacoes_scopus', 'pon_artigo_afiliacoes_scopus',
+    'dim_keywords_scopus', 'pon_artigo_keywords_scopus',
+    'dim_index_keywords_scopus', 'pon_artigo_index_keywords_scopus',
+    # Unificação
+    'dim_especies_mestre', 'pon_artigo_especie',
+    # CNCFlora
+    'cncflora/fato_gorda_cncflora',
+    'cncflora/dim_ameacas', 'cncflora/pon_avaliacao_ameaca',
+    'cncflora/dim_acoes_conservacao', 'cncflora/pon_avaliacao_acao',
+    # Espacenet
+    'espacenet/fato_patentes_espacenet',
+    'espacenet/dim_parties', 'espacenet/pon_patente_party',
+    'espacenet/dim_country', 'espacenet/pon_patente_country',
+    'espacenet/dim_ipc', 'espacenet/pon_patente_ipc',
+    'espacenet/dim_ipc_niveis', 'espacenet/dim_ipc_hierarquia', 'espacenet/pon_patente_ipc_nivel',
+    'espacenet/pon_patente_especie',
+    'espacenet/pon_patente_ano_publicacao', 'espacenet/pon_patente_ano_prioridade',
+    'espacenet/pon_patente_ano_primeira_publicacao',
+    # Organizações e pessoas conformes entre Scopus e Espacenet
+    'entidades/dim_organizacao', 'entidades/pon_organizacao_afiliacao_scopus', 'entidades/pon_organizacao_party',
+    'entidades/dim_pessoa', 'entidades/pon_pessoa_autor_scopus', 'entidades/pon_pessoa_party',
+]
+
+# Arquivos lidos pela etapa (o formato mais recente de cada tabela é o carregado)
+ARQUIVOS_ENTRADA = tuple(
+    CAMINHO_DADOS_PROCESSADOS / f'{tabela}{extensao}' for tabela in TABELAS for extensao in ('.csv', '.parquet')
+)
+
+# Chave primária de cada tabela de entidade (declarada só se os valores forem únicos e não nulos)
+CHAVES_PRIMARIAS = {
+    'scopus_dados_limpos_temp': 'eid',
+    'dim_autores_scopus': 'authors_id',
+    'dim_afiliacoes_scopus': 'affiliation_id',
+    'dim_keywords_scopus': 'keyword_id',
+    'dim_index_keywords_scopus': 'index_keyword_id',
+    'dim_especies_mestre': 'especie_id',
+    'fato_gorda_cncflora': 'avaliacao_id',
+    'dim_ameacas': 'ameaca_id',
+    'dim_acoes_conservacao': 'acao_conservacao_id',
+    'fato_patentes_espacenet': 'publication_number',
+    'dim_parties': 'party_id',
+    'dim_country': 'country_id',
+    'dim_ipc': 'ipc_id',
+    'dim_ipc_niveis': 'ipc_nivel_id',
+    'dim_ipc_hierarquia': 'ipc_id',
+    'dim_organizacao': 'organizacao_id',
+    'dim_pessoa': 'pessoa_id',
+}
+
+# Colunas que referenciam outra tabela: recebem índice em toda tabela onde não são a chave primária.
+# O nome científico liga a CNCFlora à dim_especies_mestre (os IDs das duas vêm do mesmo nome);
+# 'ano' não é chave, mas é o filtro mais comum das pontes de data da Espacenet.
+CHAVES_ESTRANGEIRAS = [
+    'eid', 'article_id', 'authors_id', 'affiliation_id', 'keyword_id', 'index_keyword_id',
+    'especie_id', 'nome_cientifico', 'avaliacao_id', 'ameaca_id', 'acao_conservacao_id',
+    'publication_number', 'party_id', 'country_id', 'ipc_id', 'ano', 'organizacao_id', 'pessoa_id',
+    'ipc_nivel_id', 'ipc_nivel_pai_id', 'ipc_secao_id', 'ipc_classe_id', 'ipc_subclasse_id', 'ipc_grupo_principal_id',
+    'ipc_subgrupo_id',
+]
+
+VISOES = {
+    'vw_especie_artigos': """
+        SELECT e.especie_id, e.nome_cientifico, p.article_id, a.title, a.year, a.source_title, p.score
+        FROM dim_especies_mestre e
+        JOIN pon_artigo_especie p ON p.especie_id = e.especie_id
+        LEFT JOIN scopus_dados_limpos_temp a ON a.eid = p.article_id
+    """,
+    'vw_especie_patentes': """
+        SELECT e.especie_id, e.nome_cientifico, p.publication_number, f.title, f.family_number, a.ano AS ano_prioridade
+        FROM dim_especies_mestre e
+        JOIN pon_patente_especie p ON p.especie_id = e.especie_id
+        LEFT JOIN fato_patentes_espacenet f ON f.publication_number = p.publication_number
+        LEFT JOIN pon_patente_ano_prioridade a ON a.publication_number = p.publication_number
+    """,
+    'vw_especie_avaliacoes': """
+        SELECT e.especie_id, e.nome_cientifico, f.avaliacao_id, f.categoria_risco, f.grupo_nome,
+               f.grupo_taxonomico, f.data_avaliacao
+        FROM dim_especies_mestre e
+        JOIN fato_gorda_cncflora f ON f.nome_cientifico = e.nome_cientifico
+    """,
+    'vw_resumo_especie': """
+        SELECT e.especie_id, e.nome_cientifico,
+               (SELECT COUNT(DISTINCT p.article_id) FROM pon_artigo_especie p WHERE p.especie_id = e.especie_id) AS artigos,
+               (SELECT COUNT(DISTINCT p.publication_number) FROM pon_patente_especie p WHERE p.especie_id = e.especie_id) AS patentes,
+               (SELECT f.categoria_risco FROM fato_gorda_cncflora f WHERE f.nome_cientifico = e.nome_cientifico
+                ORDER BY f.data_avaliacao DESC LIMIT 1) AS categoria_risco
+        FROM dim_especies_mestre e
+    """,
+    # Artigos e patentes de cada organização conforme, pelas pontes às afiliações e às parties
+    'vw_organizacao_documentos': """
+        SELECT o.organizacao_id, o.nome_organizacao, 'artigo' AS tipo, pa.article_id AS documento
+        FROM dim_organizacao o
+        JOIN pon_organizacao_afiliacao_scopus oa ON oa.organizacao_id = o.organizacao_id
+        JOIN pon_artigo_afiliacoes_scopus pa ON pa.affiliation_id = oa.affiliation_id
+        UNION
+        SELECT o.organizacao_id, o.nome_organizacao, 'patente' AS tipo, pp.publication_number AS documento
+        FROM dim_organizacao o
+        JOIN pon_organizacao_party op ON op.organizacao_id = o.organizacao_id
+        JOIN pon_patente_party pp ON pp.party_id = op.party_id
+    """,
+}
+
+
+def tipo_sqlite(dtype):
+    """Tipo da coluna no banco a partir do dtype do pandas (inteiros, inclusive Int64, viram INTEGER)."""
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _nome_no_banco(tabela):
+    return tabela.rsplit('/', 1)[-1]
+
+
+def _chave_primaria(nome, df):
+    coluna = CHAVES_PRIMARIAS.get(nome)
+    if coluna is None or coluna not in df.columns:
+        return None
+    valores = df[coluna]
+    if valores.isna().any() or valores.duplicated().any():
+        print(f"  Aviso: '{nome}.{coluna}' tem valores nulos ou repetidos; a chave primária não será declarada.")
+        return None
+    return coluna
+
+
+def _linhas(df):
+    """Tuplas com tipos nativos do Python (o sqlite3 não aceita escalares do numpy nem pd.NA)."""
+    colunas = [df[coluna].astype(object).where(df[coluna].notna(), None).tolist() for coluna in df.columns]
+    return zip(*colunas)
+
+
+@instrumentar(parametro_rotulo='nome')
+def inserir_tabela(conexao, nome, df):
+    """
+    Cria a tabela com colunas tipadas e insere as linhas em lote.
+
+    Returns:
+        list[str]: Colunas indexáveis (chaves estrangeiras) da tabela.
+    """
+    chave = _chave_primaria(nome, df)
+    definicoes = []
+    for coluna in df.columns:
+        definicao = f'"{coluna}" {tipo_sqlite(df[coluna].dtype)}'
+        if coluna == chave:
+            definicao += ' PRIMARY KEY'
+        definicoes.append(definicao)
+    conexao.execute(f'CREATE TABLE "{nome}" ({", ".join(definicoes)})')
+    marcadores = ', '.join('?' * len(df.columns))
+    conexao.executemany(f'INSERT INTO "{nome}" VALUES ({marcadores})', _linhas(df))
+    return [coluna for coluna in df.columns if coluna in CHAVES_ESTRANGEIRAS and coluna != chave]
+
+
+def criar_indices(conexao, nome, colunas):
+    for coluna in colunas:
+        conexao.execute(f'CREATE INDEX "ix_{nome}_{coluna}" ON "{nome}" ("{coluna}")')
+
+
+def criar_visoes(conexao):
+    """Cria as visões cujas tabelas foram todas carregadas."""
+    for nome, consulta in VISOES.items():
+        try:
+            conexao.execute(f'CREATE VIEW "{nome}" AS {consulta}')
+            conexao.execute(f'SELECT * FROM "{nome}" LIMIT 0')
+        except sqlite3.OperationalError as erro:
+            conexao.execute(f'DROP VIEW IF EXISTS "{nome}"')
+            print(f"  Visão '{nome}' não criada: {erro}.")
+
+
+@instrumentar
+def criar_banco(caminho_banco=CAMINHO_BANCO, caminho_processados=CAMINHO_DADOS_PROCESSADOS):
+    """
+    Monta o banco SQLite a partir das tabelas gravadas em data/processed/.
+
+    Args:
+        caminho_banco (Path): Arquivo do banco (substituído ao final).
+        caminho_processados (Path): Pasta com as tabelas processadas.
+
+    Returns:
+        dict[str, int]: Linhas inseridas por tabela.
+    """
+    print("Criando o banco analítico (SQLite)...")
+    caminho_banco.parent.mkdir(parents=True, exist_ok=True)
+    caminho_temp = caminho_banco.with_suffix(caminho_banco.suffix + '.tmp')
+    caminho_temp.unlink(missing_ok=True)
+
+    linhas = {}
+    conexao = sqlite3.connect(caminho_temp)
+    try:
+        # O arquivo é temporário até o fim: sem diário nem fsync durante a carga
+        conexao.execute('PRAGMA journal_mode = OFF')
+        conexao.execute('PRAGMA synchronous = OFF')
+        indices = {}
+        with conexao:
+            for tabela in TABELAS:
+                caminho_tabela = caminho_processados / tabela
+                if not tabela_existe(caminho_tabela):
+                    print(f"  Tabela '{tabela}' não encontrada; ignorada.")
+                    continue
+                nome = _nome_no_banco(tabela)
+                df = ler_tabela(caminho_tabela)
+                indices[nome] = inserir_tabela(conexao, nome, df)
+                linhas[nome] = len(df)
+            # Índices depois da carga: construir de uma vez é mais rápido que atualizar a cada linha
+            for nome, colunas in indices.items():
+                criar_indices(conexao, nome, colunas)
+            criar_visoes(conexao)
+        conexao.execute('ANALYZE')
+    except BaseException:
+        conexao.close()
+        caminho_temp.unlink(missing_ok=True)
+        raise
+    conexao.close()
+    caminho_temp.replace(caminho_banco)
+    registrar_gravacao(sum(linhas.values()), [caminho_banco])
+    print(f"Banco salvo em '{caminho_banco}': {len(linhas)} tabelas, {sum(linhas.values())} linhas.")
+    return linhas
+
+
+def executar_etapa_banco():
+    """Etapa 'banco' do pipeline: roda depois das etapas que gravam as tabelas carregadas."""
+    criar_banco()
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monta o banco analítico SQLite a partir de data/processed/.")
+    parser.parse_args()
+    criar_banco()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,224 @@
-import subprocess
+import argparse
+import os
 import sys
-from pathlib import Path
+import time
+from functools import partial
 
-def run_script(script_path):
-    """Executa um script Python e verifica se houve erros."""
-    print(f"\n--- Executando: {script_path.name} ---")
-    
-    python_executable = sys.executable
-    
-    process = subprocess.Popen(
-        [python_executable, str(script_path)],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        encoding='utf-8',
-        errors='replace'
-    )
+import criar_agregados
+import criar_banco
+import processar_cncflora
+import processar_espacenet
+import processar_scopus
+import resolver_entidades
+import unificar_fontes
+from utils.cache_etapas import LIMITE_CACHE_MB, CacheEtapas
+from utils.constants import CAMINHO_DADOS_PROCESSADOS, CAMINHO_DADOS_RAW
+from utils.data_processing import FORMATOS_SUPORTADOS, VARIAVEL_FORMATOS_SAIDA
+from utils.exportacao import VARIAVEL_LOG_ALTERACOES
+from utils.intermediarios import ler_intermediaria
+from utils.pipeline import Etapa, executar_pipeline
+from utils.telemetria import (
+    carregar_tempos_anteriores, encontrar_regressoes, formatar_resumo, montar_relatorio, salvar_relatorio,
+)
+
+# Relatórios de execução (tempo, CPU, memória, linhas e bytes de cada etapa), um JSON por execução
+CAMINHO_RELATORIOS = CAMINHO_DADOS_PROCESSADOS / 'relatorios'
+# Cache das etapas (arquivos gravados e artefatos de cada etapa, pela chave das suas entradas)
+CAMINHO_CACHE_ETAPAS = CAMINHO_DADOS_PROCESSADOS / 'cache' / 'etapas'
 
-    while True:
-        output = process.stdout.readline()
-        if output == '' and process.poll() is not None:
-            break
-        if output:
-            print(output.strip())
+# Arquivos brutos lidos por cada fonte (entram na chave do cache das etapas)
+RAW_SCOPUS = CAMINHO_DADOS_RAW / 'scopus_input'
+RAW_CNCFLORA = CAMINHO_DADOS_RAW / 'cncflora'
+RAW_ESPACENET = CAMINHO_DADOS_RAW / 'espacenet_input'
+RAW_ESPECIES_ESPACENET = CAMINHO_DADOS_RAW / 'espacenet_resumo_plantas.csv'
 
-    return_code = process.poll()
+# --- GRAFO DE ETAPAS ---
+# Cada etapa declara o que consome e o que produz; etapas independentes rodam em paralelo.
+def montar_etapas(incremental=False, busca_aproximada=False, espacenet_em_blocos=None, ligacao_automatica=True,
+                  processos_scopus=None):
+    """
+    Monta o grafo de etapas do pipeline com os parâmetros da linha de comando.
 
-    if return_code != 0:
-        print(f"\nERRO: O script {script_path.name} falhou com o código de saída {return_code}.")
-        return False
+    Com `espacenet_em_blocos` (linhas por bloco), a Espacenet é lida e processada em blocos numa
+    única etapa, sem manter a tabela inteira em memória. Sem `ligacao_automatica`, a ponte
+    patente-espécie vem só da lista manual. `processos_scopus` limita os processos que montam os
+    modelos da Scopus (padrão: todos os núcleos).
+    """
+    if espacenet_em_blocos:
+        espacenet_inicio = [
+            Etapa(
+                'espacenet_em_blocos', partial(processar_espacenet.executar_etapa_espacenet_em_blocos, tamanho_bloco=espacenet_em_blocos),
+                arquivos=(RAW_ESPACENET, processar_espacenet.CAMINHO_DESCRICOES_IPC)
+            ),
+        ]
+        espacenet_fim = [
+            # A ligação automática relê a tabela fato gravada pela etapa em blocos
+            Etapa(
+                'espacenet_especies',
+                partial(processar_espacenet.executar_etapa_ponte_especies_espacenet, ligacao_automatica=ligacao_automatica),
+                entradas=('dim_especies_mestre',), apos=('espacenet_em_blocos',),
+                arquivos=(
+                    RAW_ESPECIES_ESPACENET,
+                    *(processar_espacenet.CAMINHO_FATO_ESPACENET.with_suffix(extensao) for extensao in ('.csv', '.parquet')),
+                ),
+            ),
+        ]
     else:
-        print(f"--- Sucesso: {script_path.name} concluído. ---")
-        return True
+        espacenet_inicio = [
+            Etapa('espacenet_base', processar_espacenet.executar_etapa_base_espacenet, saidas=('espacenet_limpo',), arquivos=(RAW_ESPACENET,)),
+        ]
+        espacenet_fim = [
+            Etapa(
+                'espacenet_dimensoes', processar_espacenet.executar_etapa_dimensoes_espacenet, entradas=('espacenet_limpo',),
+                arquivos=(processar_espacenet.CAMINHO_DESCRICOES_IPC,)
+            ),
+            Etapa(
+                'espacenet_especies',
+                partial(processar_espacenet.executar_etapa_especies_espacenet, ligacao_automatica=ligacao_automatica),
+                entradas=('espacenet_limpo', 'dim_especies_mestre'), arquivos=(RAW_ESPECIES_ESPACENET,)
+            ),
+        ]
+    etapas = [
+        Etapa(
+            'scopus', partial(processar_scopus.executar_etapa_scopus, incremental=incremental, n_processos=processos_scopus),
+            saidas=('scopus_dados_limpos',), arquivos=(RAW_SCOPUS,)
+        ),
+        Etapa('cncflora', processar_cncflora.executar_etapa_cncflora, saidas=('dim_especies_cncflora',), arquivos=(RAW_CNCFLORA,)),
+        *espacenet_inicio,
+        Etapa(
+            'unificacao', partial(unificar_fontes.executar_etapa_unificacao, busca_aproximada=busca_aproximada),
+            entradas=('scopus_dados_limpos', 'dim_especies_cncflora'), saidas=('dim_especies_mestre',)
+        ),
+        *espacenet_fim,
+        # Lê do disco as dimensões de autores, afiliações e parties
+        Etapa(
+            'entidades', resolver_entidades.executar_etapa_entidades,
+            apos=('scopus', 'espacenet_em_blocos' if espacenet_em_blocos else 'espacenet_dimensoes'),
+            arquivos=resolver_entidades.ARQUIVOS_ENTRADA
+        ),
+    ]
+    # Os cubos do painel e o banco analítico leem do disco as tabelas gravadas pelas demais etapas
+    gravadoras = tuple(etapa.nome for etapa in etapas)
+    return etapas + [
+        # Os cubos já se atualizam por partição e guardam estado próprio: ficam fora do cache
+        Etapa('agregados', criar_agregados.executar_etapa_agregados, apos=gravadoras, cache=False),
+        Etapa('banco', criar_banco.executar_etapa_banco, apos=gravadoras, arquivos=criar_banco.ARQUIVOS_ENTRADA),
+    ]
+
+ETAPAS = montar_etapas()
+# Nomes aceitos por --etapa (o modo em blocos troca as etapas da Espacenet)
+NOMES_ETAPAS = list(dict.fromkeys(
+    etapa.nome for etapa in ETAPAS + montar_etapas(espacenet_em_blocos=processar_espacenet.TAMANHO_BLOCO_PADRAO)
+))
+
+# --- COMO OBTER CADA ARTEFATO QUANDO SUA ETAPA NÃO FAZ PARTE DA EXECUÇÃO (ex: --etapa) ---
+CARREGADORES = {
+    'scopus_dados_limpos': lambda: ler_intermediaria(unificar_fontes.CAMINHO_SCOPUS_LIMPO, colunas=unificar_fontes.COLUNAS_SCOPUS_BUSCA),
+    'dim_especies_cncflora': lambda: ler_intermediaria(unificar_fontes.CAMINHO_ESPECIES_CNCFLORA, colunas=unificar_fontes.COLUNAS_ESPECIES_CNCFLORA),
+    'dim_especies_mestre': lambda: ler_intermediaria(
+        processar_espacenet.CAMINHO_ESPECIES_MESTRE, colunas=processar_espacenet.COLUNAS_ESPECIES_MESTRE
+    ),
+    'espacenet_limpo': lambda: processar_espacenet.executar_etapa_base_espacenet()['espacenet_limpo'],
+}
 
 def main():
     """
     Orquestrador principal que executa todo o pipeline de ETL de dados.
     """
+    parser = argparse.ArgumentParser(description="Pipeline de dados do Observatório de CT&I.")
+    parser.add_argument(
+        '--etapa', action='append', choices=NOMES_ETAPAS,
+        help="Executa apenas esta etapa (pode ser repetido); entradas de outras etapas são lidas do disco."
+    )
+    parser.add_argument('--incremental', action='store_true', help="Scopus: processa apenas arquivos brutos novos ou alterados.")
+    parser.add_argument(
+        '--processos-scopus', type=int, default=None, metavar='N',
+        help="Scopus: processos que montam autores, afiliações e palavras-chave, com os artigos particionados pelo eid (padrão: todos os núcleos)."
+    )
+    parser.add_argument(
+        '--busca-aproximada', action='store_true',
+        help="Unificação: liga também nomes de espécies abreviados ou com erros de grafia (requer rapidfuzz)."
+    )
+    parser.add_argument(
+        '--espacenet-em-blocos', type=int, nargs='?', const=processar_espacenet.TAMANHO_BLOCO_PADRAO, default=None, metavar='LINHAS',
+        help=f"Espacenet: lê e processa os arquivos brutos em blocos de LINHAS linhas (padrão: {processar_espacenet.TAMANHO_BLOCO_PADRAO}), com memória limitada."
+    )
+    parser.add_argument(
+        '--sem-ligacao-automatica', action='store_true',
+        help="Espacenet: liga patentes e espécies só pela lista manual, sem buscar os nomes nos títulos e resumos."
+    )
+    parser.add_argument(
+        '--forcar', nargs='*', choices=NOMES_ETAPAS, default=None, metavar='ETAPA',
+        help="Executa estas etapas (ou todas, sem nomes) mesmo que o resultado esteja no cache, e o regrava."
+    )
+    parser.add_argument('--sem-cache', action='store_true', help="Não consulta nem grava o cache das etapas.")
+    parser.add_argument(
+        '--limite-cache', type=int, default=LIMITE_CACHE_MB, metavar='MB',
+        help=f"Tamanho máximo do cache das etapas; as entradas menos usadas saem primeiro (padrão: {LIMITE_CACHE_MB} MB)."
+    )
+    parser.add_argument('--workers', type=int, default=None, help="Etapas simultâneas (1 = sequencial, no mesmo processo).")
+    parser.add_argument(
+        '--formatos', nargs='+', choices=FORMATOS_SUPORTADOS, default=None,
+        help="Formatos de saída (padrão: csv e parquet, se o pyarrow estiver instalado). O CSV é o usado pelo Looker Studio."
+    )
+    parser.add_argument(
+        '--log-alteracoes', action='store_true',
+        help="Registra as chaves inseridas, removidas e alteradas de cada tabela regravada em "
+             "data/processed/relatorios/alteracoes_exportacao.jsonl (para sincronizar só as diferenças)."
+    )
+    parser.add_argument(
+        '--limite-regressao', type=float, default=None, metavar='FATOR',
+        help="Falha se alguma etapa levar mais que FATOR vezes o tempo da última execução bem-sucedida em que ela "
+             "rodou, sem vir do cache (ex: 1.5)."
+    )
+    args = parser.parse_args()
+    if args.espacenet_em_blocos is not None and args.espacenet_em_blocos < 1:
+        parser.error("--espacenet-em-blocos precisa de um tamanho de bloco positivo.")
+    if args.processos_scopus is not None and args.processos_scopus < 1:
+        parser.error("--processos-scopus precisa de pelo menos um processo.")
+    etapas = montar_etapas(
+        args.incremental, args.busca_aproximada, args.espacenet_em_blocos, not args.sem_ligacao_automatica, args.processos_scopus
+    )
+    fora_do_modo = set(args.etapa or []) - {etapa.nome for etapa in etapas}
+    if fora_do_modo:
+        parser.error(f"etapa(s) {sorted(fora_do_modo)} não fazem parte do grafo neste modo.")
+    if args.formatos:
+        os.environ[VARIAVEL_FORMATOS_SAIDA] = ','.join(args.formatos)
+    if args.log_alteracoes:
+        os.environ[VARIAVEL_LOG_ALTERACOES] = '1'
+    cache = None
+    if not args.sem_cache:
+        # --forcar sem nomes vale para todas as etapas
+        forcar = frozenset(args.forcar or (etapa.nome for etapa in etapas)) if args.forcar is not None else frozenset()
+        cache = CacheEtapas(CAMINHO_CACHE_ETAPAS, limite_bytes=args.limite_cache * 2**20, forcar=forcar)
+
     print("=================================================")
     print("=== INICIANDO O PIPELINE DE DADOS DO OBSERVATÓRIO ===")
     print("=================================================")
-    
-    scripts_dir = Path("scripts")
-    
-    # --- ORDEM DE EXECUÇÃO CORRIGIDA ---
-    scripts_para_executar = [
-        scripts_dir / 'processar_scopus.py',
-        scripts_dir / 'processar_cncflora.py',
-        scripts_dir / 'unificar_fontes.py',       # <-- Roda em 3º para criar a dim_especies_mestre
-        scripts_dir / 'processar_espacenet.py'    # <-- Roda por último, pois depende da unificação
-    ]
-    # ------------------------------------
-    
-    for script in scripts_para_executar:
-        if not script.exists():
-            print(f"\nERRO: O arquivo de script não foi encontrado em '{script}'. Verifique a estrutura de pastas.")
-            print("Pipeline interrompido.")
-            return
 
-        if not run_script(script):
-            print("\nPipeline interrompido devido a um erro.")
-            return
+    medicoes = []
+    tempos_anteriores = carregar_tempos_anteriores(CAMINHO_RELATORIOS)
+    inicio = time.perf_counter()
+    sucesso = executar_pipeline(
+        etapas, CARREGADORES,
+        somente=args.etapa, max_workers=args.workers, medicoes=medicoes, cache=cache
+    )
+    relatorio = montar_relatorio(medicoes, sucesso, time.perf_counter() - inicio, argumentos=sys.argv[1:])
+    caminho_relatorio = salvar_relatorio(relatorio, CAMINHO_RELATORIOS)
+    print("\n--- Resumo da execução ---")
+    print(formatar_resumo(relatorio))
+    print(f"Relatório salvo em: {caminho_relatorio}")
+
+    if not sucesso:
+        print("\nPipeline interrompido devido a um erro.")
+        sys.exit(1)
+
+    if args.limite_regressao is not None:
+        regressoes = encontrar_regressoes(relatorio, tempos_anteriores, args.limite_regressao)
+        for etapa, antes, agora in regressoes:
+            print(f"REGRESSÃO: etapa '{etapa}' levou {agora:.1f}s (antes: {antes:.1f}s, limite: {args.limite_regressao:g}x).")
+        if regressoes:
+            sys.exit(1)
 
     print("\n================================================")
     print("=== PIPELINE DE DADOS CONCLUÍDO COM SUCESSO! ===")
@@ -68,4 +226,4 @@ def main():
     print("Todos os arquivos processados estão na pasta 'data/processed/'.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
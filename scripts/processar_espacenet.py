@@ -1,27 +1,63 @@
+import contextlib
+import io
+from itertools import chain, repeat
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 from pathlib import Path
 import unicodedata
 import re
 
+from utils.busca_especies import AutomatoEspecies, buscar_especies
+from utils.carregamento import COLUNA_ORIGEM, carregar_csvs, iterar_blocos_csvs
+from utils.chaves import gerar_chaves, inserir_chave
+from utils.constants import CAMINHO_DADOS_RAW, CAMINHO_DADOS_PROCESSADOS
+from utils.data_processing import GravadorTabela, ler_tabela, salvar_tabelas
+from utils.intermediarios import ler_intermediaria, materializar
+from utils.multivalor import dimensao_e_ponte, explodir_multivalor
+from utils.telemetria import instrumentar
+
 # ==============================================================================
 # ETAPA 1: FUNÇÕES DE CARREGAMENTO E LIMPEZA
 # ==============================================================================
 
+# Colunas da exportação que nenhuma etapa usa (a CPC é descartada da tabela fato)
+COLUNAS_NAO_USADAS = {'cpc'}
+
+def _padronizar_nome_coluna(col):
+    col = str(col)
+    col_normalizada = unicodedata.normalize('NFKD', col).encode('ascii', 'ignore').decode('utf-8')
+    col_minuscula = col_normalizada.lower()
+    col_com_underscore = col_minuscula.replace(' ', '_').replace('-', '_')
+    return re.sub(r'[^a-z0-9_]', '', col_com_underscore)
+
+def _coluna_usada(nome_coluna):
+    return 'unnamed' not in nome_coluna and nome_coluna not in COLUNAS_NAO_USADAS
+
+@instrumentar
 def carregar_dados_espacenet(caminho_pasta_raw):
-    """Carrega e consolida todos os arquivos CSV da pasta de entrada da Espacenet."""
+    """
+    Carrega (em paralelo) e consolida todos os arquivos CSV da pasta de entrada da Espacenet.
+
+    Os campos são lidos como texto, só com as colunas usadas, e uma patente presente em mais de
+    uma exportação é mantida uma única vez (primeira ocorrência, na ordem dos nomes dos arquivos).
+    """
     print("Iniciando carregamento dos dados da Espacenet...")
     caminho_pasta = Path(caminho_pasta_raw)
-    arquivos_csv = list(caminho_pasta.glob('*.csv'))
+    arquivos_csv = sorted(caminho_pasta.glob('*.csv'))
     
     if not arquivos_csv:
         print(f"ERRO: Nenhum arquivo CSV encontrado em '{caminho_pasta}'")
         return None
         
-    lista_dfs = [pd.read_csv(f, sep=';') for f in arquivos_csv]
-    df_consolidado = pd.concat(lista_dfs, ignore_index=True)
+    df_consolidado = carregar_csvs(
+        arquivos_csv, coluna_chave='publication_number', caminho_base=caminho_pasta, separador=';',
+        selecionar_coluna=_coluna_usada, padronizar_coluna=_padronizar_nome_coluna, coluna_origem=COLUNA_ORIGEM,
+    )
     print(f"Arquivos consolidados com sucesso! Total de {len(df_consolidado)} registros.")
     return df_consolidado
 
+@instrumentar
 def limpeza_inicial_espacenet(df):
     """Realiza a limpeza estrutural inicial: remove colunas, padroniza nomes e trata nulos."""
     print("Iniciando limpeza estrutural...")
@@ -30,15 +66,7 @@ def limpeza_inicial_espacenet(df):
     colunas_unnamed = [col for col in df_limpo.columns if 'unnamed' in str(col).lower()]
     df_limpo = df_limpo.drop(columns=colunas_unnamed)
     
-    novas_colunas = []
-    for col in df_limpo.columns:
-        col = str(col)
-        col_normalizada = unicodedata.normalize('NFKD', col).encode('ascii', 'ignore').decode('utf-8')
-        col_minuscula = col_normalizada.lower()
-        col_com_underscore = col_minuscula.replace(' ', '_').replace('-', '_')
-        col_final = re.sub(r'[^a-z0-9_]', '', col_com_underscore)
-        novas_colunas.append(col_final)
-    df_limpo.columns = novas_colunas
+    df_limpo.columns = [_padronizar_nome_coluna(col) for col in df_limpo.columns]
     
     colunas_para_tratar = ['inventors', 'applicants', 'ipc', 'cpc', 'publication_number', 'publication_date']
     for col in colunas_para_tratar:
@@ -52,149 +80,584 @@ def limpeza_inicial_espacenet(df):
 # ETAPA 2: FUNÇÕES DE MODELAGEM DIMENSIONAL
 # ==============================================================================
 
-def criar_modelo_parties(df_limpo):
-    """Cria a dimensão de Parties (Inventores e Requerentes) e sua tabela ponte."""
+# Coluna multivalorada -> papel gravado na ponte patente-party
+PAPEIS_PARTIES = {'inventors': 'inventor', 'applicants': 'applicant'}
+# Código de país entre colchetes no nome da party (ex: "SILVA, JOAO [BR]")
+PADRAO_PAIS_PARTY = r'\[([A-Z]{2})\]'
+
+@instrumentar
+def tokenizar_parties(df_limpo):
+    """
+    Separa inventores e requerentes uma única vez, para o modelo de parties e o de países.
+
+    O código de país é extraído de cada nome distinto (não de cada ocorrência) e as duas colunas
+    de texto saem categóricas, com os códigos apontando para os valores distintos.
+
+    Returns:
+        pd.DataFrame: [publication_number, role, party_nome, country_code], uma linha por party
+        de cada patente, na ordem das colunas, das linhas e dos nomes dentro de cada célula.
+    """
+    parties = explodir_multivalor(
+        df_limpo, 'publication_number', PAPEIS_PARTIES, ',', ausente='NAO INFORMADO', coluna_papel='role',
+        coluna_valor='party_nome',
+    )
+    nomes = parties['party_nome'].cat
+    paises = pd.Categorical(nomes.categories.str.extract(PADRAO_PAIS_PARTY, expand=False))
+    parties['country_code'] = pd.Categorical.from_codes(
+        paises.codes.take(nomes.codes) if len(paises) else np.empty(0, dtype=np.int8), dtype=paises.dtype
+    )
+    return parties
+
+@instrumentar
+def criar_modelo_parties(df_limpo, parties=None):
+    """
+    Cria a dimensão de Parties (Inventores e Requerentes) e sua tabela ponte.
+
+    Args:
+        parties (pd.DataFrame, optional): Saída de `tokenizar_parties`, quando já calculada.
+    """
     print("Criando modelo de Parties...")
-    df_melted = df_limpo.melt(id_vars=['publication_number'], value_vars=['inventors', 'applicants'], var_name='role', value_name='party_string')
-    df_melted = df_melted[df_melted['party_string'] != 'NAO INFORMADO']
-    df_melted['party_string'] = df_melted['party_string'].str.split(',')
-    df_explodido = df_melted.explode('party_string')
-    df_explodido['party_string'] = df_explodido['party_string'].str.strip()
-    df_explodido = df_explodido[df_explodido['party_string'] != '']
-    
-    dim_parties = pd.DataFrame(df_explodido['party_string'].unique(), columns=['party_nome'])
-    dim_parties.reset_index(inplace=True); dim_parties.rename(columns={'index': 'party_id'}, inplace=True)
-    
-    pon_patente_party = pd.merge(df_explodido, dim_parties, left_on='party_string', right_on='party_nome', how='left')
-    pon_patente_party['role'] = pon_patente_party['role'].str.replace('s', '')
-    pon_patente_party = pon_patente_party[['publication_number', 'party_id', 'role']].drop_duplicates()
+    if parties is None:
+        parties = tokenizar_parties(df_limpo)
+    # Inventores e requerentes compartilham a dimensão
+    dim_parties, pon_patente_party = dimensao_e_ponte(
+        parties[['publication_number', 'role', 'party_nome']], 'publication_number', 'party_nome', 'party', coluna_nome='party_nome'
+    )
+    pon_patente_party = pon_patente_party[['publication_number', 'party_id', 'role']]
     
     return dim_parties, pon_patente_party
 
-def criar_modelo_country(df_limpo, country_codes_dict):
-    """Cria a dimensão de Países e sua tabela ponte."""
+@instrumentar
+def criar_modelo_country(df_limpo, country_codes_dict, parties=None):
+    """
+    Cria a dimensão de Países e sua tabela ponte.
+
+    Os países vêm do prefixo do número de publicação e do código entre colchetes de cada party;
+    os códigos fora de `country_codes_dict` são descartados. A consulta ao dicionário é feita
+    pelas categorias (o tipo categórico dos códigos da dimensão), sem merge pelo texto.
+
+    Args:
+        parties (pd.DataFrame, optional): Saída de `tokenizar_parties`, quando já calculada.
+    """
     print("Criando modelo de Países...")
+    if parties is None:
+        parties = tokenizar_parties(df_limpo)
     dim_country = pd.DataFrame(country_codes_dict.items(), columns=['country_code', 'country_name'])
-    dim_country.reset_index(inplace=True); dim_country.rename(columns={'index': 'country_id'}, inplace=True)
-    
-    df_from_pub = df_limpo[['publication_number']].copy(); df_from_pub['country_code'] = df_from_pub['publication_number'].str[:2]; df_from_pub['origin'] = 'Publication'
-    
-    df_from_parties = df_limpo[['publication_number', 'inventors', 'applicants']].copy()
-    df_melted_parties = df_from_parties.melt(id_vars=['publication_number'], value_vars=['inventors', 'applicants'], var_name='origin')
-    df_melted_parties['value'] = df_melted_parties['value'].str.split(',')
-    df_exploded_parties = df_melted_parties.explode('value')
-    df_exploded_parties['country_code'] = df_exploded_parties['value'].str.extract(r'\[([A-Z]{2})\]')
-    df_exploded_parties['origin'] = df_exploded_parties['origin'].str.replace('s', '').str.capitalize()
-
-    df_relations = pd.concat([df_from_pub[['publication_number', 'country_code', 'origin']], df_exploded_parties[['publication_number', 'country_code', 'origin']]]).dropna(subset=['country_code'])
-    df_relations = df_relations[df_relations['country_code'].isin(country_codes_dict.keys())]
-
-    pon_patente_country = pd.merge(df_relations, dim_country, on='country_code', how='left')
-    pon_patente_country = pon_patente_country[['publication_number', 'country_id', 'origin']].drop_duplicates()
+    dim_country = inserir_chave(dim_country, 'country_id', 'country_code', 'country')
+    tipo_country = pd.CategoricalDtype(dim_country['country_code'])
+
+    # Publicação primeiro, depois as parties (inventores, depois requerentes)
+    codigos = np.concatenate([
+        pd.Categorical(df_limpo['publication_number'].str[:2], dtype=tipo_country).codes,
+        parties['country_code'].cat.set_categories(tipo_country.categories).cat.codes.to_numpy(),
+    ])
+    origens = np.concatenate([
+        np.full(len(df_limpo), 'Publication', dtype=object),
+        parties['role'].map({papel: papel.capitalize() for papel in PAPEIS_PARTIES.values()}).to_numpy(dtype=object),
+    ])
+    publicacoes = np.concatenate([df_limpo['publication_number'].to_numpy(dtype=object), parties['publication_number'].to_numpy(dtype=object)])
+    validos = codigos >= 0
+
+    pon_patente_country = pd.DataFrame({
+        'publication_number': publicacoes[validos],
+        'country_id': dim_country['country_id'].array.take(codigos[validos]),
+        'origin': origens[validos],
+    }).drop_duplicates()
     
     return dim_country, pon_patente_country
 
+def _limpar_codigos_ipc(codigos):
+    return codigos.str.upper().str.strip().str.replace('-', '', regex=False).str.replace(' ', '', regex=False)
+
+@instrumentar
 def criar_modelo_ipc(df_limpo):
     """Cria a dimensão de Classificação IPC e sua tabela ponte."""
     print("Criando modelo de IPC...")
-    def clean_ipc_code(ipc_code_str):
-        if pd.isna(ipc_code_str) or not isinstance(ipc_code_str, str): return None
-        return ipc_code_str.upper().strip().replace('-', '').replace(' ', '')
-
-    df_ipc_trab = df_limpo[['publication_number', 'ipc']].copy()
-    df_ipc_trab = df_ipc_trab[df_ipc_trab['ipc'] != 'NAO INFORMADO']
-    df_ipc_trab['ipc'] = df_ipc_trab['ipc'].str.split(',')
-    df_ipc_explodido = df_ipc_trab.explode('ipc')
-    df_ipc_explodido['ipc_code_normalizado'] = df_ipc_explodido['ipc'].apply(clean_ipc_code)
-    df_ipc_explodido.dropna(subset=['ipc_code_normalizado'], inplace=True)
-    df_ipc_explodido = df_ipc_explodido[df_ipc_explodido['ipc_code_normalizado'] != '']
-    
-    dim_ipc = pd.DataFrame(df_ipc_explodido['ipc_code_normalizado'].unique(), columns=['ipc_code'])
-    dim_ipc.reset_index(inplace=True); dim_ipc.rename(columns={'index': 'ipc_id'}, inplace=True)
-    
-    pon_patente_ipc = pd.merge(df_ipc_explodido, dim_ipc, left_on='ipc_code_normalizado', right_on='ipc_code', how='left')
-    pon_patente_ipc = pon_patente_ipc[['publication_number', 'ipc_id']].drop_duplicates()
+    ocorrencias = explodir_multivalor(df_limpo, 'publication_number', 'ipc', ',', normalizar=_limpar_codigos_ipc, ausente='NAO INFORMADO')
+    dim_ipc, pon_patente_ipc = dimensao_e_ponte(ocorrencias, 'publication_number', 'valor', 'ipc', coluna_nome='ipc_code')
     
     return dim_ipc, pon_patente_ipc
 
-def criar_ligacao_especies_e_fato(df_limpo, df_manual, dim_especies_mestre):
-    """Cria a ponte patente-espécie (usando a lista manual) e a tabela fato final."""
-    print("Criando ligação com espécies e a tabela fato...")
-    # Criar ponte Patente-Espécie
+# Código IPC: seção (letra), classe (2 dígitos), subclasse (letra) e, quando há, grupo principal / subgrupo
+PADRAO_IPC = r'^(?P<secao>[A-H])(?P<classe>\d{2})(?P<subclasse>[A-Z])(?:(?P<grupo>\d{1,4})/(?P<subgrupo>\d+))?'
+# Símbolo no formato de 14 caracteres da WIPO: subclasse, grupo com 4 dígitos e subgrupo com 6 (A61K0036185000)
+PADRAO_IPC_WIPO = r'^(?P<subclasse>[A-H]\d{2}[A-Z])(?P<grupo>\d{4})(?P<subgrupo>\d{6})$'
+NIVEIS_IPC = ['secao', 'classe', 'subclasse', 'grupo_principal', 'subgrupo']
+# Descrições locais dos símbolos IPC (opcional; ex: extraídas do esquema publicado pela WIPO)
+CAMINHO_DESCRICOES_IPC = CAMINHO_DADOS_RAW / 'ipc_descricoes.csv'
+
+def decompor_codigos_ipc(codigos):
+    """
+    Código de cada nível da hierarquia IPC (A61K36/185 -> A, A61, A61K, A61K36/00, A61K36/185).
+
+    O subgrupo '/00' é o próprio grupo principal; códigos fora do padrão ficam nulos em todos os
+    níveis e códigos só com a subclasse (C12N), nos dois últimos.
+
+    Returns:
+        pd.DataFrame: Uma coluna por nível (NIVEIS_IPC), alinhada aos códigos.
+    """
+    partes = codigos.str.extract(PADRAO_IPC)
+    classe = partes['secao'] + partes['classe']
+    subclasse = classe + partes['subclasse']
+    grupo = subclasse + partes['grupo'].str.lstrip('0')
+    return pd.DataFrame({
+        'secao': partes['secao'], 'classe': classe, 'subclasse': subclasse,
+        'grupo_principal': grupo + '/00', 'subgrupo': grupo + '/' + partes['subgrupo'],
+    })
+
+def carregar_descricoes_ipc(caminho=CAMINHO_DESCRICOES_IPC):
+    """
+    Lê as descrições locais dos símbolos IPC, se o arquivo existir.
+
+    O CSV tem as colunas 'codigo' e 'descricao'; o código pode estar no formato da dimensão
+    (A61K36/185) ou no de 14 caracteres da WIPO (A61K0036185000).
+
+    Returns:
+        pd.Series | None: Descrição indexada pelo código no formato da dimensão.
+    """
+    if not Path(caminho).exists():
+        print(f"Descrições IPC não encontradas em '{caminho}'; a hierarquia fica sem descrições.")
+        return None
+    df = pd.read_csv(caminho, dtype=str, usecols=['codigo', 'descricao'])
+    codigos = _limpar_codigos_ipc(df['codigo'])
+    wipo = codigos.str.extract(PADRAO_IPC_WIPO)
+    convertidos = (
+        wipo['subclasse'] + wipo['grupo'].str.lstrip('0') + '/' + wipo['subgrupo'].str[:2] + wipo['subgrupo'].str[2:].str.rstrip('0')
+    )
+    codigos = convertidos.where(wipo['subclasse'].notna(), codigos)
+    return pd.Series(df['descricao'].to_numpy(), index=codigos.to_numpy()).dropna().groupby(level=0).first()
+
+@instrumentar
+def criar_hierarquia_ipc(dim_ipc, pon_patente_ipc, descricoes=None):
+    """
+    Decompõe uma única vez os códigos da dim_ipc nos níveis da hierarquia e agrega a ponte
+    patente-IPC em cada nível, para que os agrupamentos por seção, classe, subclasse ou grupo
+    sejam buscas por chave em vez de recortes de texto na ponte.
+
+    Args:
+        dim_ipc (pd.DataFrame): Dimensão [ipc_id, ipc_code] (criar_modelo_ipc).
+        pon_patente_ipc (pd.DataFrame): Ponte [publication_number, ipc_id].
+        descricoes (pd.Series, optional): Descrição por código (carregar_descricoes_ipc).
+
+    Returns:
+        (pd.DataFrame, pd.DataFrame, pd.DataFrame):
+            - dim_ipc_niveis [ipc_nivel_id, nivel, codigo, ipc_nivel_pai_id, descricao]: um nó
+              por código distinto de cada nível;
+            - dim_ipc_hierarquia [ipc_id, <nivel>, ipc_<nivel>_id...]: os níveis de cada código;
+            - pon_patente_ipc_nivel [publication_number, ipc_nivel_id]: patente e cada nó acima
+              dos seus códigos, sem repetições.
+    """
+    print("Criando hierarquia IPC...")
+    niveis = decompor_codigos_ipc(dim_ipc['ipc_code'])
+    pais = [None, *NIVEIS_IPC[:-1]]
+    # Do nível mais alto ao mais baixo: o subgrupo '/00' fica como o grupo principal que ele é
+    nos = pd.concat([
+        pd.DataFrame({'nivel': nivel, 'codigo': niveis[nivel], 'codigo_pai': niveis[pai] if pai else None})
+        for nivel, pai in zip(NIVEIS_IPC, pais)
+    ], ignore_index=True).dropna(subset=['codigo']).drop_duplicates('codigo', ignore_index=True)
+    ids = gerar_chaves(nos['codigo'], 'ipc_nivel').array
+    indice_nos = pd.Index(nos['codigo'])
+
+    def chaves_dos_codigos(codigos):
+        # Pelas posições (sem passar por float, que perderia dígitos das chaves de 64 bits)
+        return ids.take(indice_nos.get_indexer(codigos), allow_fill=True)
+
+    dim_ipc_niveis = pd.DataFrame({
+        'ipc_nivel_id': ids,
+        'nivel': nos['nivel'].to_numpy(),
+        'codigo': nos['codigo'].to_numpy(),
+        'ipc_nivel_pai_id': chaves_dos_codigos(nos['codigo_pai']),
+        'descricao': nos['codigo'].map(descricoes) if descricoes is not None else None,
+    })
+
+    dim_ipc_hierarquia = pd.DataFrame({'ipc_id': dim_ipc['ipc_id'].array})
+    for nivel in NIVEIS_IPC:
+        dim_ipc_hierarquia[nivel] = niveis[nivel].to_numpy()
+        dim_ipc_hierarquia[f'ipc_{nivel}_id'] = chaves_dos_codigos(niveis[nivel])
+
+    posicoes = pd.Index(dim_ipc_hierarquia['ipc_id']).get_indexer(pon_patente_ipc['ipc_id'])
+    validos = posicoes >= 0
+    posicoes = posicoes[validos]
+    publicacoes = pon_patente_ipc['publication_number'].to_numpy(dtype=object)[validos]
+    pon_patente_ipc_nivel = pd.concat([
+        pd.DataFrame({
+            'publication_number': publicacoes,
+            'ipc_nivel_id': dim_ipc_hierarquia[f'ipc_{nivel}_id'].array.take(posicoes),
+        })
+        for nivel in NIVEIS_IPC
+    ], ignore_index=True).dropna(subset=['ipc_nivel_id']).drop_duplicates(ignore_index=True)
+
+    return dim_ipc_niveis, dim_ipc_hierarquia, pon_patente_ipc_nivel
+
+# Colunas de texto da exportação varridas pela ligação automática com as espécies (as ausentes são ignoradas)
+COLUNAS_TEXTO_ESPECIES = ['title', 'abstract']
+# Tipo de cada ligação da ponte patente-espécie
+LIGACAO_MANUAL = 'manual'
+LIGACAO_AUTOMATICA = 'automatica'
+
+@instrumentar
+def ligar_especies_automaticamente(df_patentes, dim_especies_mestre, n_processos=None):
+    """
+    Ligações patente-espécie pelos nomes científicos citados no título e no resumo de cada patente.
+
+    Os nomes da dimensão mestre são procurados com o autômato de utils/busca_especies.py (uma
+    passada por texto, sem diferenciar caixa nem acentos), em paralelo por blocos de patentes.
+
+    Returns:
+        pd.DataFrame: [publication_number, especie_id], sem pares repetidos.
+    """
+    colunas = [coluna for coluna in COLUNAS_TEXTO_ESPECIES if coluna in df_patentes.columns]
+    especies = dim_especies_mestre.dropna(subset=['nome_cientifico']).drop_duplicates(subset=['nome_cientifico'])
+    if not colunas or df_patentes.empty or especies.empty:
+        return pd.DataFrame({'publication_number': pd.Series(dtype=object), 'especie_id': pd.Series(dtype='Int64')})
+    textos = df_patentes[colunas[0]].fillna('').astype(str)
+    for coluna in colunas[1:]:
+        textos = textos + ' ' + df_patentes[coluna].fillna('').astype(str)
+
+    automato = AutomatoEspecies(especies['nome_cientifico'])
+    print(f"Buscando {len(automato.nomes)} nomes de espécies em {len(textos)} patentes ({', '.join(colunas)})...")
+    encontrados = buscar_especies(textos.tolist(), automato, n_processos=n_processos, canonicos=True)
+    ligacoes = pd.DataFrame({
+        'publication_number': np.repeat(df_patentes['publication_number'].to_numpy(dtype=object), list(map(len, encontrados))),
+        'nome_cientifico': list(chain.from_iterable(encontrados)),
+    })
+    ids = especies.set_index('nome_cientifico')['especie_id']
+    ligacoes['especie_id'] = ids.reindex(ligacoes['nome_cientifico']).array
+    return ligacoes[['publication_number', 'especie_id']].drop_duplicates().reset_index(drop=True)
+
+def _numeros_publicacao(publicacoes):
+    """Números de publicação de cada célula (uma patente pode listar vários, separados por vírgula)."""
+    return publicacoes.astype(str).str.split(',').explode().str.strip()
+
+def criar_ponte_especies(df_manual, dim_especies_mestre, ligacoes_automaticas=None):
+    """
+    Ponte patente-espécie a partir da lista manual (patente, resumo, nome científico) e, quando
+    dadas, das ligações automáticas.
+
+    A lista manual prevalece: uma patente que aparece nela (por qualquer um dos seus números de
+    publicação) fica só com as espécies da lista. A coluna `tipo_ligacao` diz a origem de cada
+    ligação (LIGACAO_MANUAL ou LIGACAO_AUTOMATICA).
+    """
     df_manual_padronizado = df_manual.copy()
     df_manual_padronizado.columns = ['publication_number', 'abstract', 'nome_cientifico']
     pon_patente_especie = pd.merge(df_manual_padronizado, dim_especies_mestre, on='nome_cientifico', how='left')
     pon_patente_especie = pon_patente_especie[['publication_number', 'especie_id']].drop_duplicates().dropna()
-    
-    # Criar pontes de data
-    tabelas_ponte_data = {}
-    colunas_de_data = {'earliest_priority': 'ano_prioridade', 'publication_date': 'ano_publicacao', 'earliest_publication': 'ano_primeira_publicacao'}
-    for col_original, nome_ponte in colunas_de_data.items():
-        if col_original in df_limpo.columns:
-            df_data_trab = df_limpo[['publication_number', col_original]].copy().dropna(subset=[col_original])
-            df_data_trab[col_original] = df_data_trab[col_original].astype(str).str.split(',')
-            df_data_explodido = df_data_trab.explode(col_original)
-            df_data_explodido['ano'] = pd.to_datetime(df_data_explodido[col_original], errors='coerce').dt.year
-            df_data_explodido.dropna(subset=['ano'], inplace=True)
-            df_data_explodido['ano'] = df_data_explodido['ano'].astype(int)
-            tabelas_ponte_data[f'pon_patente_{nome_ponte}'] = df_data_explodido[['publication_number', 'ano']].drop_duplicates()
-
-    # Criar Tabela Fato
+    pon_patente_especie['tipo_ligacao'] = LIGACAO_MANUAL
+    if ligacoes_automaticas is None or ligacoes_automaticas.empty:
+        return pon_patente_especie
+
+    curadas = set(_numeros_publicacao(df_manual_padronizado['publication_number'].dropna()))
+    numeros = _numeros_publicacao(ligacoes_automaticas['publication_number'])
+    na_lista_manual = numeros.isin(curadas).groupby(level=0).any()
+    automaticas = ligacoes_automaticas[~na_lista_manual.reindex(ligacoes_automaticas.index, fill_value=False)]
+    print(f"{len(automaticas)} ligações automáticas patente-espécie ({len(ligacoes_automaticas) - len(automaticas)} "
+          f"descartadas por patentes da lista manual).")
+    return pd.concat(
+        [pon_patente_especie, automaticas.assign(tipo_ligacao=LIGACAO_AUTOMATICA)], ignore_index=True
+    )
+
+# Coluna de datas -> sufixo da ponte patente-ano
+COLUNAS_DE_DATA = {'earliest_priority': 'ano_prioridade', 'publication_date': 'ano_publicacao', 'earliest_publication': 'ano_primeira_publicacao'}
+# Textos que o pd.to_datetime trata como data ausente ao inferir o formato
+TEXTOS_SEM_DATA = {'', 'NaT', 'nat', 'NAT', 'nan', 'NaN', 'NAN', 'now', 'today'}
+
+def _formato_datas(datas):
+    """
+    Formato que o pd.to_datetime inferiria para as datas (pela primeira não nula); 'mixed' quando
+    ela não tem formato reconhecível e None quando não há datas.
+    """
+    for data in datas:
+        if isinstance(data, str) and data not in TEXTOS_SEM_DATA:
+            return guess_datetime_format(data) or 'mixed'
+        if not pd.isna(data):
+            return None
+    return None
+
+def _anos(datas, formato):
+    """Ano de cada data (NaN quando o pd.to_datetime não a reconhece no formato)."""
+    return pd.to_datetime(datas, errors='coerce', format=formato).year.to_numpy(dtype=float)
+
+@instrumentar
+def criar_pontes_data(df_limpo, formatos=None):
+    """
+    Pontes patente-ano de cada coluna de data (as colunas guardam listas de datas separadas por vírgula).
+
+    As três colunas são tratadas numa só passada: as células são unidas e separadas de uma vez,
+    cada formato de data é convertido numa única chamada do pd.to_datetime (parser vetorizado
+    em C quando o formato é fixo, como o AAAA-MM-DD da Espacenet) e os pares repetidos são
+    removidos juntos. O resultado é o mesmo de separar, explodir e converter coluna a coluna.
+
+    Args:
+        formatos (dict, optional): Formato de cada coluna para o pd.to_datetime; as colunas ainda
+            sem formato recebem o inferido aqui. No processamento em blocos, fixa em todos os
+            blocos o formato do primeiro, como se a tabela fosse processada inteira.
+    """
+    formatos = {} if formatos is None else formatos
+    colunas = [coluna for coluna in COLUNAS_DE_DATA if coluna in df_limpo.columns]
+    celulas, linhas_celulas, origens_celulas = [], [], []
+    for origem, coluna in enumerate(colunas):
+        presentes = df_limpo[coluna].notna().to_numpy()
+        valores = df_limpo[coluna][presentes].astype(str).tolist()
+        celulas.extend(valores)
+        linhas_celulas.append(np.flatnonzero(presentes))
+        origens_celulas.append(np.full(len(valores), origem))
+    # Uma célula com k vírgulas vira k + 1 datas (como str.split(',') + explode)
+    datas = np.array(','.join(celulas).split(','), dtype=object) if celulas else np.empty(0, dtype=object)
+    quantidades = np.fromiter(map(str.count, celulas, repeat(',')), dtype=np.int64, count=len(celulas)) + 1
+    linhas = np.repeat(np.concatenate(linhas_celulas or [np.empty(0, dtype=np.int64)]), quantidades)
+    origens = np.repeat(np.concatenate(origens_celulas or [np.empty(0, dtype=np.int64)]), quantidades)
+
+    # Colunas com o mesmo formato são convertidas juntas; sem formato (None), o pd.to_datetime
+    # infere pela primeira data, então cada coluna vai sozinha
+    grupos = {}
+    for origem, coluna in enumerate(colunas):
+        if formatos.get(coluna) is None:
+            formatos[coluna] = _formato_datas(datas[origens == origem])
+        chave = formatos[coluna] if formatos[coluna] is not None else ('coluna', origem)
+        grupos.setdefault(chave, []).append(origem)
+    anos = np.full(len(datas), np.nan)
+    for origens_grupo in grupos.values():
+        no_grupo = np.isin(origens, origens_grupo)
+        anos[no_grupo] = _anos(datas[no_grupo], formatos[colunas[origens_grupo[0]]])
+
+    validas = ~np.isnan(anos)
+    pontes = pd.DataFrame({
+        'origem': origens[validas],
+        'publication_number': df_limpo['publication_number'].to_numpy()[linhas[validas]],
+        'ano': anos[validas].astype(np.int64),
+    }).drop_duplicates()
+    return {
+        f'pon_patente_{COLUNAS_DE_DATA[coluna]}': pontes.loc[pontes['origem'] == origem, ['publication_number', 'ano']]
+        for origem, coluna in enumerate(colunas)
+    }
+
+def criar_fato_patentes(df_limpo):
+    """Tabela fato: a tabela limpa sem as colunas multivaloradas (já modeladas nas pontes)."""
     colunas_para_remover = ['inventors', 'applicants', 'ipc', 'cpc', 'earliest_priority', 'publication_date', 'earliest_publication']
     colunas_existentes = [col for col in colunas_para_remover if col in df_limpo.columns]
-    fato_patentes_espacenet = df_limpo.drop(columns=colunas_existentes)
+    return df_limpo.drop(columns=colunas_existentes)
+
+@instrumentar
+def criar_ligacao_especies_e_fato(df_limpo, df_manual, dim_especies_mestre, ligacao_automatica=True):
+    """
+    Cria a ponte patente-espécie (lista manual e, com `ligacao_automatica`, as espécies citadas
+    nos títulos e resumos) e a tabela fato final.
+    """
+    print("Criando ligação com espécies e a tabela fato...")
+    ligacoes = ligar_especies_automaticamente(df_limpo, dim_especies_mestre) if ligacao_automatica else None
+    pon_patente_especie = criar_ponte_especies(df_manual, dim_especies_mestre, ligacoes)
+    tabelas_ponte_data = criar_pontes_data(df_limpo)
+    fato_patentes_espacenet = criar_fato_patentes(df_limpo)
     
     return fato_patentes_espacenet, pon_patente_especie, tabelas_ponte_data
 
 # ==============================================================================
-# FUNÇÃO PRINCIPAL (ORQUESTRADOR)
+# PROCESSAMENTO EM BLOCOS (MEMÓRIA LIMITADA)
 # ==============================================================================
 
-def main():
-    """Função principal que orquestra todo o processo para a Espacenet."""
-    # Definição de Caminhos
-    caminho_script = Path(__file__).parent
-    caminho_repo_raiz = caminho_script.parent
-    caminho_dados_raw = caminho_repo_raiz / 'data' / 'raw'
-    caminho_dados_processados = caminho_repo_raiz / 'data' / 'processed'
-    
-    # Dicionário de Países
-    COUNTRY_CODES = {'AR': 'Argentina', 'AT': 'Áustria', 'AU': 'Austrália', 'BR': 'Brasil', 'CA': 'Canadá', 'CH': 'Suíça', 'CN': 'China', 'DE': 'Alemanha', 'DK': 'Dinamarca', 'EP': 'Organização Europeia de Patentes (OPE/EPO)', 'ES': 'Espanha', 'FR': 'França', 'GB': 'Reino Unido', 'IL': 'Israel', 'IN': 'India', 'JP': 'Japão', 'KR': 'Coreia do Sul', 'RU': 'Federação Russa', 'US': 'Estados Unidos da América', 'WO': 'Organização Mundial da Propriedade Intelectual (OMPI/WIPO)', 'ZA': 'África do Sul'} # Versão resumida
+# Linhas lidas por bloco no modo em blocos
+TAMANHO_BLOCO_PADRAO = 50000
+# Pontes com pares repetidos removidos (drop_duplicates) no processamento da tabela inteira
+PONTES_SEM_REPETIDOS = (
+    'pon_patente_party', 'pon_patente_country', 'pon_patente_ipc', 'pon_patente_ipc_nivel',
+    *(f'pon_patente_{nome_ponte}' for nome_ponte in COLUNAS_DE_DATA.values()),
+)
+# Número de publicação nulo na origem, depois da limpeza (astype(str))
+PUBLICACAO_AUSENTE = 'nan'
+
+def _acumular_dimensao(partes, vistos, dim_df, coluna_nome):
+    """Guarda só as linhas da dimensão do bloco com valores ainda não vistos (primeira aparição)."""
+    novos = dim_df[~dim_df[coluna_nome].isin(vistos)]
+    vistos.update(novos[coluna_nome])
+    partes.append(novos)
+
+@instrumentar
+def processar_espacenet_em_blocos(caminho_pasta_raw, caminho_saida, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Processa as exportações da Espacenet em blocos de linhas, com memória limitada pelo bloco.
+
+    Cada bloco passa pela mesma limpeza e pelos mesmos modelos do processamento da tabela
+    inteira; as linhas das pontes e da tabela fato são gravadas aos blocos e as dimensões são
+    acumuladas pelos valores distintos. O resultado tem as mesmas linhas do processamento em
+    memória (a ordem das linhas pode mudar, pois cada bloco é gravado inteiro antes do seguinte).
+
+    Returns:
+        int | None: Número de patentes processadas, ou None se não houver arquivos.
+    """
+    print(f"Iniciando processamento em blocos da Espacenet ({tamanho_bloco} linhas por bloco)...")
+    caminho_pasta = Path(caminho_pasta_raw)
+    arquivos_csv = sorted(caminho_pasta.glob('*.csv'))
+    if not arquivos_csv:
+        print(f"ERRO: Nenhum arquivo CSV encontrado em '{caminho_pasta}'")
+        return None
+    blocos = iterar_blocos_csvs(
+        arquivos_csv, tamanho_bloco, coluna_chave='publication_number', caminho_base=caminho_pasta, separador=';',
+        selecionar_coluna=_coluna_usada, padronizar_coluna=_padronizar_nome_coluna, coluna_origem=COLUNA_ORIGEM,
+    )
+
+    dimensoes = {
+        'dim_parties': ([], set(), 'party_nome'), 'dim_ipc': ([], set(), 'ipc_code'),
+        'dim_ipc_niveis': ([], set(), 'codigo'), 'dim_ipc_hierarquia': ([], set(), 'ipc_id'),
+    }
+    descricoes_ipc = carregar_descricoes_ipc()
+    dim_country = None
+    formatos_data = {}
+    # Só patentes sem número (nulo na origem) se repetem entre blocos; os pares gravados delas são
+    # lembrados para que as pontes fiquem sem repetidos, como na tabela inteira
+    pares_sem_numero = {nome: set() for nome in PONTES_SEM_REPETIDOS}
+    total = 0
+    with contextlib.ExitStack() as pilha:
+        gravadores = {}
+
+        def gravar(nome, df):
+            if nome not in gravadores:
+                gravadores[nome] = pilha.enter_context(GravadorTabela(caminho_saida, nome))
+            if nome in pares_sem_numero:
+                sem_numero = df['publication_number'] == PUBLICACAO_AUSENTE
+                if sem_numero.any():
+                    pares = list(df[sem_numero].itertuples(index=False, name=None))
+                    repetidas = pd.Series(False, index=df.index)
+                    repetidas[sem_numero] = [par in pares_sem_numero[nome] for par in pares]
+                    pares_sem_numero[nome].update(pares)
+                    df = df[~repetidas]
+            gravadores[nome].escrever(df)
+
+        for numero, bloco in enumerate(blocos, start=1):
+            with contextlib.redirect_stdout(io.StringIO()):
+                df_limpo = limpeza_inicial_espacenet(bloco)
+                parties = tokenizar_parties(df_limpo)
+                dim_parties, pon_patente_party = criar_modelo_parties(df_limpo, parties)
+                dim_country, pon_patente_country = criar_modelo_country(df_limpo, COUNTRY_CODES, parties)
+                dim_ipc, pon_patente_ipc = criar_modelo_ipc(df_limpo)
+                dim_ipc_niveis, dim_ipc_hierarquia, pon_patente_ipc_nivel = criar_hierarquia_ipc(dim_ipc, pon_patente_ipc, descricoes_ipc)
+                pontes_data = criar_pontes_data(df_limpo, formatos_data)
+                fato_patentes = criar_fato_patentes(df_limpo)
+            for nome, dim_df in (
+                ('dim_parties', dim_parties), ('dim_ipc', dim_ipc),
+                ('dim_ipc_niveis', dim_ipc_niveis), ('dim_ipc_hierarquia', dim_ipc_hierarquia),
+            ):
+                _acumular_dimensao(*dimensoes[nome][:2], dim_df, dimensoes[nome][2])
+            for nome, df in {
+                'pon_patente_party': pon_patente_party, 'pon_patente_country': pon_patente_country,
+                'pon_patente_ipc': pon_patente_ipc, 'pon_patente_ipc_nivel': pon_patente_ipc_nivel, **pontes_data, 'fato_patentes_espacenet': fato_patentes,
+            }.items():
+                gravar(nome, df)
+            total += len(df_limpo)
+            print(f"  Bloco {numero}: {len(df_limpo)} patentes ({total} no total).")
+
+    tabelas_dimensoes = {nome: pd.concat(partes, ignore_index=True) for nome, (partes, _, _) in dimensoes.items() if partes}
+    tabelas_dimensoes['dim_country'] = dim_country
+    salvar_tabelas(tabelas_dimensoes, caminho_saida)
+    print(f"Processamento em blocos concluído: {total} patentes.")
+    return total
+
+# ==============================================================================
+# ETAPAS DO PIPELINE E FUNÇÃO PRINCIPAL (ORQUESTRADOR)
+# ==============================================================================
+
+# Dicionário de Países
+COUNTRY_CODES = {'AR': 'Argentina', 'AT': 'Áustria', 'AU': 'Austrália', 'BR': 'Brasil', 'CA': 'Canadá', 'CH': 'Suíça', 'CN': 'China', 'DE': 'Alemanha', 'DK': 'Dinamarca', 'EP': 'Organização Europeia de Patentes (OPE/EPO)', 'ES': 'Espanha', 'FR': 'França', 'GB': 'Reino Unido', 'IL': 'Israel', 'IN': 'India', 'JP': 'Japão', 'KR': 'Coreia do Sul', 'RU': 'Federação Russa', 'US': 'Estados Unidos da América', 'WO': 'Organização Mundial da Propriedade Intelectual (OMPI/WIPO)', 'ZA': 'África do Sul'} # Versão resumida
+
+CAMINHO_SAIDA_ESPACENET = CAMINHO_DADOS_PROCESSADOS / 'espacenet'
+# Tabela fato (sem extensão), relida no modo em blocos pela ligação automática com as espécies
+CAMINHO_FATO_ESPACENET = CAMINHO_SAIDA_ESPACENET / 'fato_patentes_espacenet'
+# Dimensão mestre de espécies gravada pela unificação (repositório de intermediárias) e colunas usadas
+CAMINHO_ESPECIES_MESTRE = CAMINHO_DADOS_PROCESSADOS / 'dim_especies_mestre'
+COLUNAS_ESPECIES_MESTRE = ['especie_id', 'nome_cientifico']
+
+def executar_etapa_base_espacenet():
+    """
+    Etapa 'espacenet_base': carga e limpeza inicial das exportações da Espacenet.
+
+    Returns:
+        dict: {'espacenet_limpo': DataFrame limpo}, consumido pelas demais etapas da Espacenet.
+    """
+    df_espacenet = carregar_dados_espacenet(CAMINHO_DADOS_RAW / 'espacenet_input')
+    if df_espacenet is None:
+        raise FileNotFoundError(f"Nenhum arquivo CSV encontrado em '{CAMINHO_DADOS_RAW / 'espacenet_input'}'.")
+    return {'espacenet_limpo': limpeza_inicial_espacenet(df_espacenet)}
+
+def executar_etapa_dimensoes_espacenet(espacenet_limpo):
+    """Etapa 'espacenet_dimensoes': parties, países e IPC (não dependem da dimensão mestre de espécies)."""
+    # Inventores e requerentes são separados uma vez para os dois modelos
+    parties = tokenizar_parties(espacenet_limpo)
+    dim_parties, pon_patente_party = criar_modelo_parties(espacenet_limpo, parties)
+    dim_country, pon_patente_country = criar_modelo_country(espacenet_limpo, COUNTRY_CODES, parties)
+    del parties
+    dim_ipc, pon_patente_ipc = criar_modelo_ipc(espacenet_limpo)
+    dim_ipc_niveis, dim_ipc_hierarquia, pon_patente_ipc_nivel = criar_hierarquia_ipc(
+        dim_ipc, pon_patente_ipc, carregar_descricoes_ipc()
+    )
 
-    # Carga e Limpeza Inicial
-    df_espacenet = carregar_dados_espacenet(caminho_dados_raw / 'espacenet_input')
-    if df_espacenet is None: return
-    df_espacenet_limpo = limpeza_inicial_espacenet(df_espacenet)
-    
-    # Criação das Dimensões e Pontes
-    dim_parties, pon_patente_party = criar_modelo_parties(df_espacenet_limpo)
-    dim_country, pon_patente_country = criar_modelo_country(df_espacenet_limpo, COUNTRY_CODES)
-    dim_ipc, pon_patente_ipc = criar_modelo_ipc(df_espacenet_limpo)
-    
-    # Carregar arquivos manuais e mestre para a etapa final
-    df_manual = pd.read_csv(caminho_dados_raw / 'espacenet_resumo_plantas.csv')
-    dim_especies_mestre = pd.read_csv(caminho_dados_processados / 'dim_especies_mestre.csv')
-    
-    fato_patentes, pon_especie, pontes_data = criar_ligacao_especies_e_fato(df_espacenet_limpo, df_manual, dim_especies_mestre)
-    
-    # Salvar todos os arquivos
-    caminho_saida = caminho_dados_processados / 'espacenet'
-    caminho_saida.mkdir(parents=True, exist_ok=True)
-    
     tabelas_para_salvar = {
-        "fato_patentes_espacenet": fato_patentes, "dim_parties": dim_parties, "pon_patente_party": pon_patente_party,
-        "dim_country": dim_country, "pon_patente_country": pon_patente_country, "dim_ipc": dim_ipc,
-        "pon_patente_ipc": pon_patente_ipc, "pon_patente_especie": pon_especie
+        "dim_parties": dim_parties, "pon_patente_party": pon_patente_party,
+        "dim_country": dim_country, "pon_patente_country": pon_patente_country,
+        "dim_ipc": dim_ipc, "pon_patente_ipc": pon_patente_ipc,
+        "dim_ipc_niveis": dim_ipc_niveis, "dim_ipc_hierarquia": dim_ipc_hierarquia, "pon_patente_ipc_nivel": pon_patente_ipc_nivel,
     }
+    print("\n--- Salvando dimensões da Espacenet ---")
+    salvar_tabelas(tabelas_para_salvar, CAMINHO_SAIDA_ESPACENET)
+    return {}
+
+def executar_etapa_especies_espacenet(espacenet_limpo, dim_especies_mestre, ligacao_automatica=True):
+    """Etapa 'espacenet_especies': ponte patente-espécie, pontes de data e tabela fato."""
+    dim_especies_mestre = materializar(dim_especies_mestre, COLUNAS_ESPECIES_MESTRE)
+    # Carregar arquivo manual para a etapa final
+    df_manual = pd.read_csv(CAMINHO_DADOS_RAW / 'espacenet_resumo_plantas.csv')
+
+    fato_patentes, pon_especie, pontes_data = criar_ligacao_especies_e_fato(
+        espacenet_limpo, df_manual, dim_especies_mestre, ligacao_automatica
+    )
+
+    tabelas_para_salvar = {"fato_patentes_espacenet": fato_patentes, "pon_patente_especie": pon_especie}
     tabelas_para_salvar.update(pontes_data)
-    
-    print("\n--- Salvando todos os arquivos processados ---")
-    for nome, df in tabelas_para_salvar.items():
-        if df is not None:
-            df.to_csv(caminho_saida / f"{nome}.csv", index=False)
-            print(f"Salvo: {nome}.csv")
-    
-    print(f"\nProcessamento da Espacenet concluído. Arquivos salvos em: {caminho_saida}")
+
+    print("\n--- Salvando fato e pontes de espécies/datas da Espacenet ---")
+    salvar_tabelas(tabelas_para_salvar, CAMINHO_SAIDA_ESPACENET)
+    return {}
+
+def executar_etapa_espacenet_em_blocos(tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Etapa 'espacenet_em_blocos' (modo --espacenet-em-blocos): substitui 'espacenet_base' e
+    'espacenet_dimensoes' e grava também a tabela fato e as pontes de data, lendo os arquivos
+    brutos em blocos de `tamanho_bloco` linhas em vez de carregá-los inteiros.
+    """
+    total = processar_espacenet_em_blocos(CAMINHO_DADOS_RAW / 'espacenet_input', CAMINHO_SAIDA_ESPACENET, tamanho_bloco)
+    if total is None:
+        raise FileNotFoundError(f"Nenhum arquivo CSV encontrado em '{CAMINHO_DADOS_RAW / 'espacenet_input'}'.")
+    return {}
+
+def executar_etapa_ponte_especies_espacenet(dim_especies_mestre, ligacao_automatica=True):
+    """
+    Etapa 'espacenet_especies' do modo em blocos: só a ponte patente-espécie (a fato já foi
+    gravada; os títulos e resumos da ligação automática são lidos dela).
+    """
+    dim_especies_mestre = materializar(dim_especies_mestre, COLUNAS_ESPECIES_MESTRE)
+    df_manual = pd.read_csv(CAMINHO_DADOS_RAW / 'espacenet_resumo_plantas.csv')
+    ligacoes = None
+    if ligacao_automatica:
+        patentes = ler_tabela(CAMINHO_FATO_ESPACENET, colunas=['publication_number', *COLUNAS_TEXTO_ESPECIES])
+        ligacoes = ligar_especies_automaticamente(patentes, dim_especies_mestre)
+        del patentes
+    print("\n--- Salvando ponte patente-espécie da Espacenet ---")
+    salvar_tabelas({"pon_patente_especie": criar_ponte_especies(df_manual, dim_especies_mestre, ligacoes)}, CAMINHO_SAIDA_ESPACENET)
+    return {}
+
+def main():
+    """Função principal que orquestra todo o processo para a Espacenet."""
+    try:
+        espacenet_limpo = executar_etapa_base_espacenet()['espacenet_limpo']
+    except FileNotFoundError as e:
+        print(f"ERRO: {e}")
+        return
+
+    executar_etapa_dimensoes_espacenet(espacenet_limpo)
+
+    # Carregar a dimensão mestre gerada pela unificação
+    dim_especies_mestre = ler_intermediaria(CAMINHO_ESPECIES_MESTRE, colunas=COLUNAS_ESPECIES_MESTRE)
+    executar_etapa_especies_espacenet(espacenet_limpo, dim_especies_mestre)
+
+    print(f"\nProcessamento da Espacenet concluído. Arquivos salvos em: {CAMINHO_SAIDA_ESPACENET}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
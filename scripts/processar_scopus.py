@@ -1,43 +1,110 @@
+import argparse
+import contextlib
+import io
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import unicodedata
 import re
-import uuid
+
+from utils.afiliacoes import (
+    COLUNAS_RESULTADO as COLUNAS_AFILIACAO, acrescentar_ao_cache, carregar_cache_afiliacoes, normalizar_afiliacoes,
+    normalizar_com_cache, salvar_cache_afiliacoes,
+)
+from utils.carregamento import COLUNA_ORIGEM, carregar_csvs, consolidar_sem_repetidos, iterar_csvs
+from utils.chaves import inserir_chave
+from utils.constants import CAMINHO_DADOS_RAW, CAMINHO_DADOS_PROCESSADOS
+from utils.data_processing import ler_tabela, salvar_tabelas, tabela_existe
+from utils.deduplicacao import linhas_repetidas
+from utils.intermediarios import abrir_intermediaria, ler_intermediaria, publicar_intermediaria
+from utils.multivalor import dimensao_e_ponte, explodir_multivalor
+from utils.manifesto import carregar_manifesto, comparar_com_manifesto, descrever_arquivo, salvar_manifesto
+from utils.telemetria import instrumentar, registrar_gravacao
+
+# Percentual máximo de valores ausentes para uma coluna ser mantida
+LIMIAR_AUSENCIA = 60.0
+COLUNAS_NUMERICAS = ['year', 'volume', 'issue', 'page_start', 'page_end', 'page_count', 'cited_by']
+
+# Colunas largas da exportação que nenhuma etapa usa; não chegam a ser lidas
+COLUNAS_NAO_USADAS = {'references', 'authors_with_affiliations', 'correspondence_address', 'funding_details', 'funding_texts'}
+# Um artigo em várias exportações fica com a cópia mais recente: a exportação não traz data, mas a
+# contagem de citações só cresce entre exportações (no empate, vale a ordem dos arquivos)
+COLUNA_RECENCIA = 'cited_by'
+
+def _padronizar_nome_coluna(col):
+    col = str(col)
+    col_normalizada = unicodedata.normalize('NFKD', col).encode('ascii', 'ignore').decode('utf-8')
+    col_minuscula = col_normalizada.lower()
+    col_com_underscore = col_minuscula.replace(' ', '_').replace('-', '_')
+    return re.sub(r'[^\w_]', '', col_com_underscore)
+
+def _coluna_usada(nome_coluna):
+    return nome_coluna not in COLUNAS_NAO_USADAS
+
+def _opcoes_leitura(caminho_pasta_raw):
+    return {
+        'caminho_base': Path(caminho_pasta_raw), 'selecionar_coluna': _coluna_usada,
+        'padronizar_coluna': _padronizar_nome_coluna, 'coluna_origem': COLUNA_ORIGEM,
+    }
+
+def listar_arquivos_scopus(caminho_pasta_raw):
+    """CSVs brutos da Scopus em ordem fixa (define qual cópia de um artigo repetido é mantida)."""
+    return sorted(Path(caminho_pasta_raw).rglob('*.csv'))
 
 # (As funções de limpeza e as de criação de modelos de autores/afiliações continuam aqui)
-def carregar_e_consolidar_dados(caminho_pasta_raw):
+def carregar_arquivos_scopus(arquivos_csv, caminho_pasta_raw):
+    """Lê (em paralelo) cada CSV bruto da Scopus separadamente, preservando a ordem recebida."""
+    return dict(iterar_csvs(arquivos_csv, **_opcoes_leitura(caminho_pasta_raw)))
+
+def consolidar_dados(dfs_por_arquivo):
+    """Concatena os arquivos lidos, mantendo uma cópia de cada eid (a mais recente; ver COLUNA_RECENCIA)."""
+    df_completo = consolidar_sem_repetidos(dfs_por_arquivo.values(), 'eid', COLUNA_RECENCIA)
+    print(f"Dados consolidados com sucesso. Total de {len(df_completo)} linhas.")
+    return df_completo
+
+@instrumentar
+def carregar_e_consolidar_dados(caminho_pasta_raw, ao_carregar=None):
     print("Iniciando a consolidação dos dados brutos...")
-    caminho_base = Path(caminho_pasta_raw)
-    arquivos_csv = list(caminho_base.rglob('*.csv'))
+    arquivos_csv = listar_arquivos_scopus(caminho_pasta_raw)
     if not arquivos_csv:
-        print(f"ERRO: Nenhum arquivo CSV encontrado em '{caminho_base}'.")
+        print(f"ERRO: Nenhum arquivo CSV encontrado em '{caminho_pasta_raw}'.")
         return None
-    lista_dfs = [pd.read_csv(f, dtype=str) for f in arquivos_csv]
-    df_completo = pd.concat(lista_dfs, ignore_index=True)
+    df_completo = carregar_csvs(
+        arquivos_csv, coluna_chave='eid', ao_carregar=ao_carregar, coluna_recencia=COLUNA_RECENCIA,
+        **_opcoes_leitura(caminho_pasta_raw),
+    )
     print(f"Dados consolidados com sucesso. Total de {len(df_completo)} linhas.")
     return df_completo
 
 def padronizar_nomes_colunas(df):
     print("Nomes das colunas padronizados.")
-    novas_colunas = []
-    for col in df.columns:
-        col = str(col)
-        col_normalizada = unicodedata.normalize('NFKD', col).encode('ascii', 'ignore').decode('utf-8')
-        col_minuscula = col_normalizada.lower()
-        col_com_underscore = col_minuscula.replace(' ', '_').replace('-', '_')
-        col_final = re.sub(r'[^\w_]', '', col_com_underscore)
-        novas_colunas.append(col_final)
-    df.columns = novas_colunas
+    df.columns = [_padronizar_nome_coluna(col) for col in df.columns]
     return df
 
-def limpar_dataframe_scopus(df):
+@instrumentar
+def limpar_dataframe_scopus(df, colunas_mantidas=None):
+    """
+    Limpa o DataFrame consolidado da Scopus.
+
+    Args:
+        df (pd.DataFrame): Dados brutos com nomes de colunas padronizados.
+        colunas_mantidas (list, optional): Colunas já decididas pela regra de LIMIAR_AUSENCIA% a
+            partir das estatísticas por arquivo (antes do descarte de eids repetidos). Quando
+            omitido, a regra é aplicada ao próprio `df`.
+    """
     print("Iniciando limpeza do DataFrame...")
     df = df.copy()
-    limiar = 60.0
-    percentual_ausente = (df.isnull().sum() / len(df)) * 100
-    colunas_para_remover = percentual_ausente[percentual_ausente > limiar].index.tolist()
-    df = df.drop(columns=colunas_para_remover)
-    print(f"Colunas com mais de {limiar}% de ausência foram removidas.")
+    if colunas_mantidas is None:
+        limiar = LIMIAR_AUSENCIA
+        percentual_ausente = (df.isnull().sum() / len(df)) * 100
+        colunas_para_remover = percentual_ausente[percentual_ausente > limiar].index.tolist()
+        df = df.drop(columns=colunas_para_remover)
+        print(f"Colunas com mais de {limiar}% de ausência foram removidas.")
+    else:
+        df = df.reindex(columns=colunas_mantidas).astype(object)
+        print(f"Mantidas {len(colunas_mantidas)} colunas com até {LIMIAR_AUSENCIA}% de ausência.")
     for coluna in df.columns:
         if df[coluna].isnull().any():
             if df[coluna].dtype == 'object':
@@ -45,47 +112,130 @@ def limpar_dataframe_scopus(df):
             else:
                 df[coluna] = df[coluna].fillna(0)
     print("Valores ausentes restantes foram preenchidos.")
-    colunas_para_converter = ['year', 'volume', 'issue', 'page_start', 'page_end', 'page_count', 'cited_by']
-    for coluna in colunas_para_converter:
+    for coluna in COLUNAS_NUMERICAS:
         if coluna in df.columns:
             df[coluna] = pd.to_numeric(df[coluna], errors='coerce').fillna(0).astype(int)
     print("Tipos de dados corrigidos.")
-    num_duplicatas = df.duplicated().sum()
+    # Uma impressão digital de 64 bits por linha, em vez de comparar o texto de todas as colunas
+    repetidas = linhas_repetidas(df)
+    num_duplicatas = int(repetidas.sum())
     if num_duplicatas > 0:
-        df = df.drop_duplicates(keep='first')
+        df = df[~repetidas]
         print(f"{num_duplicatas} linhas duplicadas foram removidas.")
     print("Limpeza do DataFrame concluída.")
     return df
 
-def criar_modelo_autores(df_limpo):
-    print("Iniciando a criação do modelo de autores (versão robusta)...")
-    # (código da função omitido por brevidade, mas continua o mesmo)
+def _ordenar_por_eid(df):
+    """Ordem canônica (estável) por artigo: torna os representantes das dimensões independentes da ordem dos arquivos."""
+    if df is None or 'eid' not in df.columns:
+        return df
+    return df.sort_values('eid', kind='stable', ignore_index=True)
+
+# ID que a Scopus anexa a cada nome completo: "Silva, João (57190000000)"
+PADRAO_ID_NO_NOME = re.compile(r'\((\d+)\)')
+PADRAO_ID_FINAL_NOME = re.compile(r'\s*\(\d+\)$')
+
+def _separar_lista(valor):
+    """Mesmo resultado de `re.split(r'\\s*;\\s*', valor)`, sem regex; [] para valores nulos."""
+    if not isinstance(valor, str):
+        return []
+    partes = valor.split(';')
+    if len(partes) == 1:
+        return partes
+    limpas = [parte.strip() for parte in partes]
+    limpas[0], limpas[-1] = partes[0].rstrip(), partes[-1].lstrip()
+    return limpas
+
+def _nomes_na_mesma_posicao(ids, entradas):
+    """Nomes limpos quando cada entrada termina com o ID da mesma posição (caso comum); senão None."""
+    if len(ids) != len(entradas):
+        return None
+    nomes = []
+    for id_autor, entrada in zip(ids, entradas):
+        sufixo = f'({id_autor})'
+        # Único parêntese da entrada: o ID embutido é exatamente o desta posição
+        if not (id_autor.isdecimal() and entrada.endswith(sufixo) and entrada.find('(') == len(entrada) - len(sufixo)):
+            return None
+        nomes.append(entrada[:-len(sufixo)].strip().upper())
+    return nomes
+
+def _id_no_nome(entrada):
+    id_no_nome = PADRAO_ID_NO_NOME.search(entrada)
+    return id_no_nome.group(1) if id_no_nome else None
+
+def _nomes_por_id(ids, entradas):
+    """Para cada ID, os nomes cujo ID embutido é ele (na ordem das entradas); [nulo] se não houver."""
+    nomes_por_id = {}
+    for entrada in entradas:
+        id_no_nome = _id_no_nome(entrada)
+        if id_no_nome is not None:
+            nome = PADRAO_ID_FINAL_NOME.sub('', entrada).strip().upper()
+            nomes_por_id.setdefault(id_no_nome, []).append(nome)
+    return [nomes_por_id.get(id_autor, [np.nan]) for id_autor in ids]
+
+def _alinhar_autores(df_limpo):
+    """Ocorrências de autoria e contagens de anomalias (listas de tamanhos diferentes, IDs fora de posição)."""
     colunas_autores = ['eid', 'authors', 'authors_id', 'author_full_names']
     if not all(col in df_limpo.columns for col in colunas_autores):
-        return None, None
-    df_autores_trab = df_limpo[colunas_autores].copy()
-    df_sobrenomes = df_autores_trab[['eid', 'authors']].copy()
-    df_sobrenomes['authors'] = df_sobrenomes['authors'].str.replace(r'\s*\(\d+\)', '', regex=True)
-    df_sobrenomes['authors'] = df_sobrenomes['authors'].str.split(r'\s*;\s*', regex=True)
-    df_sobrenomes = df_sobrenomes.explode('authors').dropna(subset=['authors'])
-    df_sobrenomes['author_index'] = df_sobrenomes.groupby('eid').cumcount()
-    df_nomes_completos = df_autores_trab[['eid', 'author_full_names']].copy()
-    df_nomes_completos['author_full_names'] = df_nomes_completos['author_full_names'].str.split(r'\s*;\s*', regex=True)
-    df_nomes_completos = df_nomes_completos.explode('author_full_names').dropna(subset=['author_full_names'])
-    df_nomes_completos['author_index'] = df_nomes_completos.groupby('eid').cumcount()
-    df_nomes_completos['id_from_name'] = df_nomes_completos['author_full_names'].str.extract(r'\((\d+)\)')
-    df_nomes_completos['author_full_names'] = df_nomes_completos['author_full_names'].str.replace(r'\s*\(\d+\)$', '', regex=True).str.strip()
-    df_ids = df_autores_trab[['eid', 'authors_id']].copy()
-    df_ids['authors_id'] = df_ids['authors_id'].str.split(r'\s*;\s*', regex=True)
-    df_ids = df_ids.explode('authors_id').dropna(subset=['authors_id'])
-    df_nomes_alinhados = pd.merge(df_sobrenomes, df_nomes_completos, on=['eid', 'author_index'], how='outer')
-    df_alinhado = pd.merge(
-        df_nomes_alinhados, df_ids,
-        left_on=['eid', 'id_from_name'], right_on=['eid', 'authors_id'],
-        how='right'
-    )
-    df_alinhado['author_full_names'].fillna(df_alinhado['authors'], inplace=True)
-    df_alinhado['author_full_names'] = df_alinhado['author_full_names'].str.upper()
+        return None, (0, 0)
+
+    eids, posicoes, ids_autores, nomes_autores = [], [], [], []
+    tamanhos_diferentes = ids_fora_de_posicao = 0
+    colunas = (df_limpo[col].tolist() for col in colunas_autores)
+    for eid, sobrenomes, ids_brutos, nomes_brutos in zip(*colunas):
+        ids = _separar_lista(ids_brutos)
+        entradas = _separar_lista(nomes_brutos)
+        nomes = _nomes_na_mesma_posicao(ids, entradas)
+        if nomes is not None:
+            eids.extend([eid] * len(ids))
+            posicoes.extend(range(len(ids)))
+            ids_autores.extend(ids)
+            nomes_autores.extend(nomes)
+        else:
+            for posicao, (id_autor, nomes_do_id) in enumerate(zip(ids, _nomes_por_id(ids, entradas))):
+                for nome in nomes_do_id:
+                    eids.append(eid)
+                    posicoes.append(posicao)
+                    ids_autores.append(id_autor)
+                    nomes_autores.append(nome)
+
+        # Autoria não informada não é anomalia de alinhamento
+        if 'nao_informado' in (ids_brutos, nomes_brutos):
+            continue
+        if len(ids) != len(entradas) or len(_separar_lista(sobrenomes)) != len(ids):
+            tamanhos_diferentes += 1
+        elif nomes is None and [_id_no_nome(entrada) for entrada in entradas] != ids:
+            ids_fora_de_posicao += 1
+
+    df_alinhado = pd.DataFrame({
+        'eid': eids, 'posicao': posicoes, 'authors_id': ids_autores, 'author_full_names': nomes_autores,
+    })
+    return df_alinhado, (tamanhos_diferentes, ids_fora_de_posicao)
+
+def _informar_anomalias_autores(tamanhos_diferentes, ids_fora_de_posicao):
+    if tamanhos_diferentes or ids_fora_de_posicao:
+        print(
+            f"Anomalias no alinhamento de autores: {tamanhos_diferentes} artigos com listas de tamanhos "
+            f"diferentes, {ids_fora_de_posicao} com IDs fora de posição (alinhados pelo ID)."
+        )
+
+@instrumentar
+def _ocorrencias_autores(df_limpo):
+    """
+    Uma linha por autoria: (eid, posicao, authors_id, author_full_names).
+
+    Percorre cada artigo uma única vez, separando as listas de IDs e de nomes completos e
+    juntando-as por posição. Quando as listas têm tamanhos diferentes ou o ID embutido no nome não
+    é o da mesma posição, o nome de cada ID é procurado pelo ID dentro do artigo (sem nome, fica
+    nulo); esses artigos são contados e informados como anomalias.
+    """
+    print("Iniciando a criação do modelo de autores (versão robusta)...")
+    df_alinhado, anomalias = _alinhar_autores(df_limpo)
+    _informar_anomalias_autores(*anomalias)
+    return df_alinhado
+
+@instrumentar
+def _modelo_autores(df_alinhado):
     dim_autores = df_alinhado[['authors_id', 'author_full_names']].copy()
     dim_autores.rename(columns={'author_full_names': 'nome_completo'}, inplace=True)
     dim_autores = dim_autores.drop_duplicates(subset=['authors_id']).dropna(subset=['authors_id'])
@@ -96,43 +246,49 @@ def criar_modelo_autores(df_limpo):
     print(f"Criada pon_artigo_autores com {len(pon_artigo_autores)} relações.")
     return dim_autores, pon_artigo_autores
 
-def _parse_e_normalizar_afiliacao(texto_afiliacao):
-    if not isinstance(texto_afiliacao, str):
-        return 'NAO_INFORMADO', 'NAO_INFORMADO', 'NAO_INFORMADO'
-    partes = texto_afiliacao.split(',', 1)
-    nome_instituicao = partes[0].strip()
-    endereco = partes[1].strip() if len(partes) > 1 else 'NAO_INFORMADO'
-    texto_sem_acentos = unicodedata.normalize('NFKD', nome_instituicao).encode('ascii', 'ignore').decode('utf-8')
-    nome_normalizado = re.sub(r'[.,;:"()]', '', texto_sem_acentos.upper())
-    nome_normalizado = re.sub(r'\s+', ' ', nome_normalizado).strip()
-    siglas = re.findall(r'\b([A-Z]{2,6})\b', nome_instituicao)
-    if siglas:
-        sigla = siglas[-1]
-    else:
-        siglas_parenteses = re.findall(r'\(([A-Z\.]+)\)', nome_instituicao)
-        sigla = siglas_parenteses[-1].replace('.', '') if siglas_parenteses else 'SEM SIGLA'
-    return nome_normalizado, endereco, sigla
+@instrumentar
+def criar_modelo_autores(df_limpo):
+    df_alinhado = _ocorrencias_autores(df_limpo)
+    if df_alinhado is None:
+        return None, None
+    return _modelo_autores(df_alinhado)
 
-def criar_modelo_afiliacoes(df_limpo):
-    print("Iniciando a criação do modelo de afiliações (com separação de endereço)...")
-    # (código da função omitido por brevidade, mas continua o mesmo)
+def _explodir_afiliacoes(df_limpo):
+    """Uma linha por (eid, texto da afiliação); None quando faltam colunas."""
     if 'affiliations' not in df_limpo.columns or 'eid' not in df_limpo.columns:
-        return None, None
+        return None
     df_afiliacoes_trab = df_limpo[['eid', 'affiliations']].copy()
     df_afiliacoes_trab = df_afiliacoes_trab[df_afiliacoes_trab['affiliations'] != 'nao_informado']
     df_afiliacoes_trab['affiliations'] = df_afiliacoes_trab['affiliations'].str.split('; ')
     df_explodido = df_afiliacoes_trab.explode('affiliations', ignore_index=True)
     df_explodido.rename(columns={'affiliations': 'affiliation_full_text'}, inplace=True)
     df_explodido.dropna(subset=['affiliation_full_text'], inplace=True)
+    return df_explodido
+
+def _normalizar_ocorrencias_afiliacoes(df_explodido, normalizar=normalizar_afiliacoes):
+    """Acrescenta nome normalizado, endereço e sigla; `normalizar` recebe os textos distintos."""
     textos_unicos_df = pd.DataFrame(df_explodido['affiliation_full_text'].drop_duplicates())
-    parsed_data = textos_unicos_df['affiliation_full_text'].apply(_parse_e_normalizar_afiliacao)
-    textos_unicos_df[['nome_normalizado', 'endereco', 'sigla']] = pd.DataFrame(parsed_data.tolist(), index=textos_unicos_df.index)
+    textos_unicos_df[COLUNAS_AFILIACAO] = normalizar(textos_unicos_df['affiliation_full_text'])
+    return pd.merge(df_explodido, textos_unicos_df, on='affiliation_full_text', how='left')
+
+@instrumentar
+def _ocorrencias_afiliacoes(df_limpo):
+    """Uma linha por (eid, texto da afiliação), já com nome normalizado, endereço e sigla."""
+    print("Iniciando a criação do modelo de afiliações (com separação de endereço)...")
+    df_explodido = _explodir_afiliacoes(df_limpo)
+    if df_explodido is None:
+        return None
+    return _normalizar_ocorrencias_afiliacoes(df_explodido)
+
+@instrumentar
+def _modelo_afiliacoes(df_explodido):
+    textos_unicos_df = df_explodido[['affiliation_full_text', 'nome_normalizado', 'endereco', 'sigla']].drop_duplicates(subset=['affiliation_full_text'])
     dim_afiliacoes = textos_unicos_df.drop_duplicates(subset=['nome_normalizado'])
-    dim_afiliacoes['affiliation_id'] = [str(uuid.uuid4()) for _ in range(len(dim_afiliacoes))]
+    dim_afiliacoes = inserir_chave(dim_afiliacoes, 'affiliation_id', 'nome_normalizado', 'afiliacao')
     dim_afiliacoes = dim_afiliacoes[['affiliation_id', 'nome_normalizado', 'sigla', 'endereco', 'affiliation_full_text']]
     print(f"Criada dim_afiliacoes com {len(dim_afiliacoes)} afiliações únicas (após normalização).")
     pon_artigo_afiliacoes = pd.merge(
-        df_explodido, dim_afiliacoes[['affiliation_id', 'affiliation_full_text']],
+        df_explodido[['eid', 'affiliation_full_text']], dim_afiliacoes[['affiliation_id', 'affiliation_full_text']],
         on='affiliation_full_text', how='left'
     )
     pon_artigo_afiliacoes = pon_artigo_afiliacoes[['eid', 'affiliation_id']].drop_duplicates().dropna()
@@ -140,8 +296,43 @@ def criar_modelo_afiliacoes(df_limpo):
     print(f"Criada pon_artigo_afiliacoes com {len(pon_artigo_afiliacoes)} relações.")
     return dim_afiliacoes, pon_artigo_afiliacoes
 
+@instrumentar
+def criar_modelo_afiliacoes(df_limpo):
+    df_explodido = _ocorrencias_afiliacoes(df_limpo)
+    if df_explodido is None:
+        return None, None
+    return _modelo_afiliacoes(df_explodido)
+
+def _padronizar_valor_generico(valores):
+    return valores.str.upper().str.strip()
+
+@instrumentar(parametro_rotulo='nome_coluna')
+def _ocorrencias_generico(df_limpo, nome_coluna):
+    """Uma linha por (eid, valor padronizado) da coluna multivalorada."""
+    print(f"Iniciando criação do modelo genérico para '{nome_coluna}'...")
+    
+    if nome_coluna not in df_limpo.columns or 'eid' not in df_limpo.columns:
+        print(f"Aviso: Coluna '{nome_coluna}' ou 'eid' não encontrada. Pulando.")
+        return None
+
+    # Padroniza os valores (ex: caixa alta); valores vazios (ex: "a; ;b") são mantidos
+    return explodir_multivalor(
+        df_limpo, 'eid', nome_coluna, ';', normalizar=_padronizar_valor_generico, ausente='nao_informado',
+        descartar_vazios=False, coluna_valor=nome_coluna,
+    )
+
+@instrumentar(parametro_rotulo='nome_entidade')
+def _modelo_generico(df_explodido, nome_coluna, nome_entidade):
+    # Dimensão pelos valores distintos; a ponte indexa os IDs pelos códigos das ocorrências
+    dim_df, pon_df = dimensao_e_ponte(df_explodido, 'eid', nome_coluna, nome_entidade)
+    print(f"Criada dim_{nome_entidade} com {len(dim_df)} valores únicos.")
+    pon_df = pon_df.rename(columns={'eid': 'article_id'})
+    print(f"Criada pon_artigo_{nome_entidade} com {len(pon_df)} relações.")
+    
+    return dim_df, pon_df
 
 # --- FUNÇÃO GENÉRICA NOVA ---
+@instrumentar(parametro_rotulo='nome_entidade')
 def criar_modelo_generico(df_limpo, nome_coluna, nome_entidade):
     """
     Função genérica para criar uma dimensão e uma tabela ponte a partir de uma coluna multivalorada.
@@ -154,92 +345,417 @@ def criar_modelo_generico(df_limpo, nome_coluna, nome_entidade):
     Returns:
         (pd.DataFrame, pd.DataFrame): A tabela de dimensão e a tabela ponte.
     """
-    print(f"Iniciando criação do modelo genérico para '{nome_coluna}'...")
-    
-    if nome_coluna not in df_limpo.columns or 'eid' not in df_limpo.columns:
-        print(f"Aviso: Coluna '{nome_coluna}' ou 'eid' não encontrada. Pulando.")
+    df_explodido = _ocorrencias_generico(df_limpo, nome_coluna)
+    if df_explodido is None:
         return None, None
+    return _modelo_generico(df_explodido, nome_coluna, nome_entidade)
+
+# ==============================================================================
+# MODELOS A PARTIR DAS OCORRÊNCIAS (COMPARTILHADO PELOS MODOS COMPLETO E INCREMENTAL)
+# ==============================================================================
 
-    df_trab = df_limpo[['eid', nome_coluna]].copy()
-    df_trab = df_trab[df_trab[nome_coluna] != 'nao_informado']
+# Modelos da Scopus: nome -> (dimensão, ponte, coluna de origem p/ o modelo genérico)
+MODELOS_SCOPUS = {
+    'autores': ('dim_autores_scopus', 'pon_artigo_autores_scopus', None),
+    'afiliacoes': ('dim_afiliacoes_scopus', 'pon_artigo_afiliacoes_scopus', None),
+    # Modelo genérico: a chave é o nome da entidade singular; a coluna, a original multivalorada
+    'keyword': ('dim_keywords_scopus', 'pon_artigo_keywords_scopus', 'author_keywords'),
+    'index_keyword': ('dim_index_keywords_scopus', 'pon_artigo_index_keywords_scopus', 'index_keywords'),
+}
 
-    df_trab[nome_coluna] = df_trab[nome_coluna].str.split(r'\s*;\s*', regex=True)
-    df_explodido = df_trab.explode(nome_coluna, ignore_index=True)
-    df_explodido.dropna(subset=[nome_coluna], inplace=True)
-    
-    # Padroniza os valores (ex: caixa alta)
-    df_explodido[nome_coluna] = df_explodido[nome_coluna].str.upper().str.strip()
-
-    # Cria a tabela de dimensão
-    valores_unicos = df_explodido[nome_coluna].drop_duplicates().tolist()
-    dim_df = pd.DataFrame(valores_unicos, columns=[nome_entidade])
-    dim_df[f'{nome_entidade}_id'] = [str(uuid.uuid4()) for _ in range(len(dim_df))]
-    dim_df = dim_df[[f'{nome_entidade}_id', nome_entidade]]
-    print(f"Criada dim_{nome_entidade} com {len(dim_df)} valores únicos.")
+# Colunas lidas pela montagem das ocorrências (as únicas enviadas aos processos do modo particionado)
+COLUNAS_OCORRENCIAS = ['eid', 'authors', 'authors_id', 'author_full_names', 'affiliations'] + [
+    coluna for _, _, coluna in MODELOS_SCOPUS.values() if coluna is not None
+]
+# Abaixo disto as ocorrências são montadas no processo atual (o pool não compensa)
+MINIMO_ARTIGOS_PARTICIONAR = 5000
 
-    # Cria a tabela ponte
-    pon_df = pd.merge(df_explodido, dim_df, left_on=nome_coluna, right_on=nome_entidade, how='left')
-    pon_df = pon_df[['eid', f'{nome_entidade}_id']].drop_duplicates()
-    pon_df.rename(columns={'eid': 'article_id'}, inplace=True)
-    print(f"Criada pon_artigo_{nome_entidade} com {len(pon_df)} relações.")
-    
-    return dim_df, pon_df
+def _ocorrencias_genericas(df_limpo):
+    return {
+        entidade: _ocorrencias_generico(df_limpo, coluna)
+        for entidade, (_, _, coluna) in MODELOS_SCOPUS.items() if coluna is not None
+    }
+
+def _ocorrencias_fragmento(df_fragmento):
+    """
+    Ocorrências de um fragmento, no processo trabalhador; as afiliações saem só separadas.
+
+    Returns:
+        (dict, tuple): Ocorrências por modelo e contagens de anomalias dos autores.
+    """
+    # As mensagens de cada modelo são dadas uma vez, pelo processo principal
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_autores, anomalias = _alinhar_autores(df_fragmento)
+        ocorrencias = {'autores': df_autores, 'afiliacoes': _explodir_afiliacoes(df_fragmento), **_ocorrencias_genericas(df_fragmento)}
+    return ocorrencias, anomalias
+
+def _normalizar_bloco_afiliacoes(textos):
+    """Normalização (sem cache) de um bloco de textos distintos, no processo trabalhador."""
+    return normalizar_afiliacoes(pd.Series(textos, dtype=object), caminho_cache=None).set_axis(pd.Index(textos, name='texto'))
+
+def _fragmentos_por_eid(df_limpo, n_fragmentos):
+    """
+    Partição dos artigos pelo eid: todas as linhas de um eid caem no mesmo fragmento, na ordem original.
+
+    No lugar do eid, os fragmentos levam a posição da linha na tabela (inteiros são mais baratos de
+    enviar e ordenar que os textos); ao reunir os fragmentos, ela dá o eid e a ordem canônica.
+
+    Returns:
+        (list[pd.DataFrame], np.ndarray, np.ndarray): Fragmentos não vazios, o eid de cada linha e
+        o posto de cada linha na ordem de `_ordenar_por_eid`.
+    """
+    colunas = [coluna for coluna in COLUNAS_OCORRENCIAS if coluna in df_limpo.columns]
+    codigos, eids = pd.factorize(df_limpo['eid'], sort=True)
+    # Nulos por último, como em `_ordenar_por_eid`
+    codigos = np.where(codigos < 0, len(eids), codigos)
+    postos = np.empty(len(codigos), dtype=np.int64)
+    postos[np.argsort(codigos, kind='stable')] = np.arange(len(codigos))
+    df_posicoes = df_limpo[colunas].assign(eid=np.arange(len(df_limpo)))
+    fragmento = codigos % n_fragmentos
+    fragmentos = [df_posicoes[fragmento == numero] for numero in range(n_fragmentos)]
+    return [df for df in fragmentos if len(df)], df_limpo['eid'].to_numpy(dtype=object), postos
+
+def _reunir_fragmentos(partes, eids, postos):
+    """Concatena as ocorrências dos fragmentos de um modelo na ordem canônica por eid."""
+    partes = [df for df in partes if df is not None]
+    if not partes:
+        return None
+    df = pd.concat(partes, ignore_index=True)
+    linhas = df['eid'].to_numpy()
+    ordem = np.argsort(postos.take(linhas), kind='stable')
+    # Categorias na ordem de aparição pela ordem das linhas, como num só processo
+    categoricas = {}
+    na_ordem_das_linhas = np.argsort(linhas, kind='stable')
+    for coluna in df.columns:
+        if isinstance(partes[0][coluna].dtype, pd.CategoricalDtype):
+            codigos = np.empty(len(df), dtype=np.int64)
+            codigos[na_ordem_das_linhas], distintos = pd.factorize(df[coluna].to_numpy(dtype=object)[na_ordem_das_linhas])
+            categoricas[coluna] = pd.Categorical.from_codes(codigos.take(ordem), categories=pd.Index(distintos, dtype=object))
+    df = df.take(ordem).reset_index(drop=True)
+    df['eid'] = eids.take(linhas.take(ordem))
+    for coluna, valores in categoricas.items():
+        df[coluna] = valores
+    return df
+
+def _normalizar_afiliacoes_particionadas(afiliacoes, executor, n_processos):
+    """
+    Normaliza as afiliações reunidas: os textos ausentes do cache são normalizados uma única vez
+    (um texto presente em vários fragmentos não se repete), em blocos distribuídos pelo pool, e
+    gravados no cache de uma vez.
+    """
+    cache = carregar_cache_afiliacoes()
+    distintos = afiliacoes['affiliation_full_text'].drop_duplicates()
+    faltantes = distintos[~distintos.isin(cache.index)].tolist()
+    if faltantes:
+        blocos = [bloco.tolist() for bloco in np.array_split(np.array(faltantes, dtype=object), n_processos) if len(bloco)]
+        cache = acrescentar_ao_cache(cache, pd.concat(executor.map(_normalizar_bloco_afiliacoes, blocos)))
+        salvar_cache_afiliacoes(cache, vistos=distintos)
+    print(f"Afiliações normalizadas: {len(distintos) - len(faltantes)} do cache, {len(faltantes)} novas.")
+    return _normalizar_ocorrencias_afiliacoes(afiliacoes, normalizar=lambda textos: normalizar_com_cache(textos, cache)[0])
+
+def _ocorrencias_particionadas(df_limpo, n_processos):
+    """
+    `criar_ocorrencias_scopus` com os artigos particionados pelo eid num pool de processos.
+
+    Cada fragmento alinha os seus autores e separa as suas afiliações e palavras-chave; o processo
+    principal reúne os fragmentos na ordem canônica por eid (a mesma de uma execução num só
+    processo), soma as anomalias dos autores e normaliza as afiliações reunidas. As chaves das
+    dimensões são hashes do nome (ver `inserir_chave`), então as dimensões e pontes montadas sobre
+    as ocorrências reunidas saem iguais às de um só processo.
+    """
+    fragmentos, eids, postos = _fragmentos_por_eid(df_limpo, n_processos)
+    print(f"Montando as ocorrências da Scopus em {len(fragmentos)} fragmentos com {n_processos} processos...")
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        resultados = list(executor.map(_ocorrencias_fragmento, fragmentos))
+        _informar_anomalias_autores(*(sum(contagens) for contagens in zip(*(anomalias for _, anomalias in resultados))))
+        ocorrencias = {
+            entidade: _reunir_fragmentos([parte[entidade] for parte, _ in resultados], eids, postos) for entidade in resultados[0][0]
+        }
+        if ocorrencias['afiliacoes'] is not None:
+            ocorrencias['afiliacoes'] = _normalizar_afiliacoes_particionadas(ocorrencias['afiliacoes'], executor, n_processos)
+    return ocorrencias
+
+@instrumentar
+def criar_ocorrencias_scopus(df_limpo, n_processos=None):
+    """
+    Tabelas longas (uma linha por artigo x entidade) de cada modelo; None quando faltam colunas.
+
+    Args:
+        df_limpo (pd.DataFrame): Tabela limpa da Scopus.
+        n_processos (int, optional): Processos do modo particionado (ver `_ocorrencias_particionadas`).
+            None usa todos os núcleos; 1 monta tudo no processo atual. O resultado é o mesmo.
+    """
+    n_processos = n_processos or os.cpu_count() or 1
+    if n_processos > 1 and len(df_limpo) >= MINIMO_ARTIGOS_PARTICIONAR and 'eid' in df_limpo.columns:
+        return _ocorrencias_particionadas(df_limpo, n_processos)
+    ocorrencias = {
+        'autores': _ocorrencias_autores(df_limpo),
+        'afiliacoes': _ocorrencias_afiliacoes(df_limpo),
+        **_ocorrencias_genericas(df_limpo),
+    }
+    return {entidade: _ordenar_por_eid(df) for entidade, df in ocorrencias.items()}
+
+@instrumentar
+def criar_tabelas_scopus(ocorrencias):
+    """Cria as dimensões e pontes da Scopus a partir das ocorrências (saída de `criar_ocorrencias_scopus`)."""
+    tabelas_finais = {}
+    for entidade, (nome_dim, nome_pon, coluna) in MODELOS_SCOPUS.items():
+        df_ocorrencias = ocorrencias.get(entidade)
+        if df_ocorrencias is None:
+            tabelas_finais[nome_dim], tabelas_finais[nome_pon] = None, None
+            continue
+        if entidade == 'autores':
+            dim, pon = _modelo_autores(df_ocorrencias)
+        elif entidade == 'afiliacoes':
+            dim, pon = _modelo_afiliacoes(df_ocorrencias)
+        else:
+            dim, pon = _modelo_generico(df_ocorrencias, coluna, entidade)
+        tabelas_finais[nome_dim], tabelas_finais[nome_pon] = dim, pon
+    return tabelas_finais
+
+# ==============================================================================
+# MODO INCREMENTAL (MANIFESTO DE ARQUIVOS BRUTOS)
+# ==============================================================================
+
+# Estado do modo incremental: manifesto dos arquivos brutos e ocorrências de cada modelo
+CAMINHO_ESTADO_INCREMENTAL = CAMINHO_DADOS_PROCESSADOS / 'scopus_incremental'
+CAMINHO_MANIFESTO = CAMINHO_ESTADO_INCREMENTAL / 'manifesto.json'
+# Sobreposição entre as exportações (artigos presentes em mais de um arquivo)
+CAMINHO_RELATORIO_SOBREPOSICAO = CAMINHO_DADOS_PROCESSADOS / 'relatorios' / 'scopus_sobreposicao.csv'
+
+def _descrever_conteudo(df_raw):
+    """Estatísticas de um arquivo bruto usadas pelo manifesto (linhas, não nulos por coluna e EIDs)."""
+    colunas = [_padronizar_nome_coluna(col) for col in df_raw.columns]
+    nao_nulos = dict(zip(colunas, (int(n) for n in df_raw.notna().sum())))
+    eids = []
+    if 'eid' in colunas:
+        eids = sorted(df_raw.iloc[:, colunas.index('eid')].fillna('nao_informado').unique().tolist())
+    return {'linhas': len(df_raw), 'nao_nulos': nao_nulos, 'eids': eids}
+
+def _colunas_mantidas_pelo_limiar(descricoes):
+    """Aplica a regra de LIMIAR_AUSENCIA ao corpus inteiro a partir das estatísticas por arquivo."""
+    total = sum(descricao['linhas'] for descricao in descricoes.values())
+    nao_nulos = {}
+    for descricao in descricoes.values():
+        for coluna, quantidade in descricao['nao_nulos'].items():
+            nao_nulos[coluna] = nao_nulos.get(coluna, 0) + quantidade
+    return {coluna for coluna, quantidade in nao_nulos.items() if ((total - quantidade) / total) * 100 <= LIMIAR_AUSENCIA}
+
+def relatorio_sobreposicao(descricoes, df_limpo):
+    """
+    Quanto as exportações se sobrepõem, a partir dos EIDs de cada arquivo (estatísticas do manifesto).
+
+    Returns:
+        pd.DataFrame: Por arquivo: linhas, EIDs distintos, exclusivos e compartilhados com outro
+        arquivo, e artigos cuja cópia mantida veio dele.
+    """
+    arquivos = sorted(descricoes)
+    presencas = pd.Series([eid for arquivo in arquivos for eid in descricoes[arquivo]['eids']], dtype=object)
+    em_varios = set(presencas[presencas.duplicated()])
+    mantidos = df_limpo[COLUNA_ORIGEM].value_counts() if COLUNA_ORIGEM in df_limpo.columns else pd.Series(dtype=int)
+    linhas = []
+    for arquivo in arquivos:
+        eids = descricoes[arquivo]['eids']
+        compartilhados = sum(eid in em_varios for eid in eids)
+        linhas.append({
+            'arquivo': arquivo, 'linhas': descricoes[arquivo]['linhas'], 'eids': len(eids),
+            'eids_exclusivos': len(eids) - compartilhados, 'eids_compartilhados': compartilhados,
+            'percentual_compartilhado': round(100 * compartilhados / len(eids), 2) if eids else 0.0,
+            'artigos_mantidos': int(mantidos.get(arquivo, 0)),
+        })
+    relatorio = pd.DataFrame(linhas, columns=[
+        'arquivo', 'linhas', 'eids', 'eids_exclusivos', 'eids_compartilhados', 'percentual_compartilhado', 'artigos_mantidos',
+    ])
+    distintos = presencas.nunique()
+    print(f"Sobreposição entre exportações: {len(em_varios)} de {distintos} artigos em mais de um arquivo.")
+    if em_varios:
+        print(relatorio.to_string(index=False))
+    return relatorio
+
+def _salvar_relatorio_sobreposicao(descricoes, df_limpo):
+    relatorio = relatorio_sobreposicao(descricoes, df_limpo)
+    CAMINHO_RELATORIO_SOBREPOSICAO.parent.mkdir(parents=True, exist_ok=True)
+    relatorio.to_csv(CAMINHO_RELATORIO_SOBREPOSICAO, index=False)
+    registrar_gravacao(len(relatorio), [CAMINHO_RELATORIO_SOBREPOSICAO])
+
+def _salvar_estado_incremental(entradas_arquivos, descricoes, colunas, ocorrencias):
+    CAMINHO_ESTADO_INCREMENTAL.mkdir(parents=True, exist_ok=True)
+    for entidade in MODELOS_SCOPUS:
+        caminho = CAMINHO_ESTADO_INCREMENTAL / f'ocorrencias_{entidade}.pkl'
+        if ocorrencias.get(entidade) is not None:
+            ocorrencias[entidade].to_pickle(caminho)
+        elif caminho.exists():
+            caminho.unlink()
+    arquivos = {relativo: {**entrada, **descricoes[relativo]} for relativo, entrada in entradas_arquivos.items()}
+    salvar_manifesto({'colunas': list(colunas), 'arquivos': arquivos}, CAMINHO_MANIFESTO)
+
+@instrumentar
+def atualizar_scopus_incremental(caminho_dados_raw, caminho_dados_processados, n_processos=None):
+    """
+    Atualiza as tabelas da Scopus processando apenas os arquivos brutos novos ou alterados.
+
+    Os artigos afetados (presentes em arquivos novos, alterados ou removidos) são relidos de
+    todos os arquivos atuais que os contêm; suas linhas e ocorrências substituem as anteriores e
+    as dimensões/pontes são derivadas das ocorrências acumuladas, sem reprocessar o corpus.
+
+    Returns:
+        dict | None: Mesmo retorno de `executar_etapa_scopus`, ou None quando é preciso uma
+        reconstrução completa (sem estado salvo ou conjunto de colunas alterado).
+    """
+    manifesto = carregar_manifesto(CAMINHO_MANIFESTO)
+    caminho_limpo = caminho_dados_processados / 'scopus_dados_limpos_temp'
+    if manifesto is None or not tabela_existe(caminho_limpo):
+        print("Estado incremental ausente.")
+        return None
+
+    arquivos_csv = listar_arquivos_scopus(caminho_dados_raw)
+    if not arquivos_csv:
+        raise FileNotFoundError(f"Nenhum arquivo CSV encontrado em '{caminho_dados_raw}'.")
+    situacao = comparar_com_manifesto(arquivos_csv, caminho_dados_raw, manifesto['arquivos'])
+    print(
+        f"Arquivos brutos: {len(situacao['novos'])} novos, {len(situacao['alterados'])} alterados, "
+        f"{len(situacao['removidos'])} removidos, {len(situacao['inalterados'])} inalterados."
+    )
+
+    descricoes = {relativo: manifesto['arquivos'][relativo] for relativo in situacao['inalterados']}
+    modificados = situacao['novos'] + situacao['alterados']
+    lidos = carregar_arquivos_scopus([caminho_dados_raw / relativo for relativo in modificados], caminho_dados_raw)
+    for caminho, df_raw in lidos.items():
+        descricoes[caminho.relative_to(caminho_dados_raw).as_posix()] = _descrever_conteudo(df_raw)
+
+    if not modificados and not situacao['removidos']:
+        print("Nenhuma alteração nos dados brutos da Scopus.")
+        arquivos = {r: {**e, **descricoes[r]} for r, e in situacao['entradas'].items()}
+        salvar_manifesto({'colunas': manifesto['colunas'], 'arquivos': arquivos}, CAMINHO_MANIFESTO)
+        return {'scopus_dados_limpos': abrir_intermediaria(caminho_limpo) or ler_tabela(caminho_limpo)}
+
+    if _colunas_mantidas_pelo_limiar(descricoes) != set(manifesto['colunas']):
+        print("O conjunto de colunas mantidas pela regra de ausência mudou.")
+        return None
+
+    ocorrencias_existentes = {}
+    for entidade in MODELOS_SCOPUS:
+        caminho = CAMINHO_ESTADO_INCREMENTAL / f'ocorrencias_{entidade}.pkl'
+        ocorrencias_existentes[entidade] = pd.read_pickle(caminho) if caminho.exists() else None
+
+    # --- Artigos afetados e arquivos inalterados que também os contêm ---
+    eids_afetados = set()
+    for relativo in situacao['alterados'] + situacao['removidos']:
+        eids_afetados.update(manifesto['arquivos'][relativo]['eids'])
+    for relativo in modificados:
+        eids_afetados.update(descricoes[relativo]['eids'])
+    sobrepostos = [r for r in situacao['inalterados'] if eids_afetados.intersection(descricoes[r]['eids'])]
+    lidos.update(carregar_arquivos_scopus([caminho_dados_raw / relativo for relativo in sobrepostos], caminho_dados_raw))
+    print(f"{len(eids_afetados)} artigos afetados ({len(sobrepostos)} arquivos inalterados relidos por sobreposição).")
+
+    # Mesma ordem de arquivos da reconstrução completa
+    ordem = [f for f in arquivos_csv if f in lidos]
+    if ordem:
+        df_afetado = consolidar_dados({f: lidos[f] for f in ordem})
+        df_afetado = df_afetado[df_afetado['eid'].fillna('nao_informado').isin(eids_afetados)]
+        df_afetado_limpo = limpar_dataframe_scopus(df_afetado, colunas_mantidas=manifesto['colunas'])
+    else:
+        df_afetado_limpo = pd.DataFrame(columns=manifesto['colunas'])
+
+    # --- Tabela limpa: troca as linhas dos artigos afetados ---
+    df_existente = ler_intermediaria(caminho_limpo, dtype=str, keep_default_na=False)
+    df_existente = df_existente[~df_existente['eid'].isin(eids_afetados)]
+    for coluna in COLUNAS_NUMERICAS:
+        if coluna in df_existente.columns:
+            df_existente[coluna] = df_existente[coluna].astype(int)
+    df_final_limpo = _ordenar_por_eid(pd.concat([df_existente, df_afetado_limpo], ignore_index=True))
+
+    # --- Ocorrências: troca as dos artigos afetados e deriva dimensões/pontes ---
+    ocorrencias_novas = criar_ocorrencias_scopus(df_afetado_limpo, n_processos)
+    ocorrencias = {}
+    for entidade, df_existentes in ocorrencias_existentes.items():
+        partes = [df for df in (df_existentes, ocorrencias_novas.get(entidade)) if df is not None]
+        if df_existentes is not None:
+            partes[0] = df_existentes[~df_existentes['eid'].isin(eids_afetados)]
+        ocorrencias[entidade] = _ordenar_por_eid(pd.concat(partes, ignore_index=True)) if partes else None
+
+    tabelas_finais = criar_tabelas_scopus(ocorrencias)
+    tabelas_finais['scopus_dados_limpos_temp'] = df_final_limpo
+
+    print("\n--- Salvando arquivos atualizados ---")
+    salvar_tabelas(tabelas_finais, caminho_dados_processados)
+    _salvar_estado_incremental(situacao['entradas'], descricoes, manifesto['colunas'], ocorrencias)
+    _salvar_relatorio_sobreposicao(descricoes, df_final_limpo)
+    return {'scopus_dados_limpos': publicar_intermediaria(df_final_limpo, caminho_limpo, exportada=True)}
 
 # ==============================================================================
 # FUNÇÃO PRINCIPAL (ORQUESTRADOR - ATUALIZADO)
 # ==============================================================================
 
-def main():
-    """Função principal que orquestra todo o processo."""
-    caminho_script = Path(__file__).parent
-    caminho_repo_raiz = caminho_script.parent
-    caminho_dados_raw = caminho_repo_raiz / 'data' / 'raw' / 'scopus_input'
-    caminho_dados_processados = caminho_repo_raiz / 'data' / 'processed'
+def executar_etapa_scopus(incremental=False, n_processos=None):
+    """
+    Etapa 'scopus' do pipeline: carrega, limpa, modela e salva os dados da Scopus.
+
+    Args:
+        incremental (bool): Processa apenas os arquivos brutos novos/alterados/removidos desde a
+            última execução (ver `atualizar_scopus_incremental`), recorrendo à reconstrução
+            completa quando necessário.
+        n_processos (int, optional): Processos que montam as ocorrências, com os artigos
+            particionados pelo eid (None: todos os núcleos; 1: no processo atual).
+
+    Returns:
+        dict: {'scopus_dados_limpos': tabela limpa (`TabelaIntermediaria`, ou o DataFrame sem o
+        pyarrow)}, consumida pela unificação.
+    """
+    caminho_dados_raw = CAMINHO_DADOS_RAW / 'scopus_input'
+    caminho_dados_processados = CAMINHO_DADOS_PROCESSADOS
     caminho_dados_processados.mkdir(parents=True, exist_ok=True)
+
+    if incremental:
+        print("Iniciando atualização incremental da Scopus...")
+        resultado = atualizar_scopus_incremental(caminho_dados_raw, caminho_dados_processados, n_processos)
+        if resultado is not None:
+            print(f"\nAtualização incremental concluída. Arquivos salvos em: {caminho_dados_processados}")
+            return resultado
+        print("Executando reconstrução completa.")
+
+    # Estatísticas de cada arquivo antes do descarte de eids repetidos (manifesto e regra de ausência)
+    descricoes = {}
+    def descrever(caminho, df_arquivo):
+        descricoes[caminho.relative_to(caminho_dados_raw).as_posix()] = _descrever_conteudo(df_arquivo)
+
+    df_raw = carregar_e_consolidar_dados(caminho_dados_raw, ao_carregar=descrever)
+    if df_raw is None:
+        raise FileNotFoundError(f"Nenhum arquivo CSV encontrado em '{caminho_dados_raw}'.")
+
+    mantidas = _colunas_mantidas_pelo_limiar(descricoes)
+    colunas = [coluna for coluna in df_raw.columns if coluna in mantidas]
+    df_final_limpo = _ordenar_por_eid(limpar_dataframe_scopus(df_raw, colunas_mantidas=colunas))
     
-    df_raw = carregar_e_consolidar_dados(caminho_dados_raw)
-    
-    if df_raw is not None:
-        df_padronizado = padronizar_nomes_colunas(df_raw)
-        df_final_limpo = limpar_dataframe_scopus(df_padronizado)
-        
-        # --- Dicionário para guardar todas as tabelas geradas ---
-        tabelas_finais = {}
-        
-        # --- Executa a criação dos modelos dimensionais ---
-        dim_autores, pon_artigo_autores = criar_modelo_autores(df_final_limpo)
-        tabelas_finais['dim_autores_scopus'] = dim_autores
-        tabelas_finais['pon_artigo_autores_scopus'] = pon_artigo_autores
-        
-        dim_afiliacoes, pon_artigo_afiliacoes = criar_modelo_afiliacoes(df_final_limpo)
-        tabelas_finais['dim_afiliacoes_scopus'] = dim_afiliacoes
-        tabelas_finais['pon_artigo_afiliacoes_scopus'] = pon_artigo_afiliacoes
-
-        # --- Usa a função genérica para as demais dimensões ---
-        # Lista de tuplas: (nome_da_coluna_original, nome_da_entidade_singular)
-        colunas_genericas_para_processar = [
-            ('author_keywords', 'keyword'),
-            ('index_keywords', 'index_keyword')
-        ]
-        
-        for coluna, entidade in colunas_genericas_para_processar:
-            dim_gen, pon_gen = criar_modelo_generico(df_final_limpo, coluna, entidade)
-            tabelas_finais[f'dim_{entidade}s_scopus'] = dim_gen # ex: dim_keywords_scopus
-            tabelas_finais[f'pon_artigo_{entidade}s_scopus'] = pon_gen # ex: pon_artigo_keywords_scopus
-            
-        # --- Salva todos os arquivos finais ---
-        print("\n--- Salvando todos os arquivos processados ---")
-        for nome_tabela, df_tabela in tabelas_finais.items():
-            if df_tabela is not None:
-                caminho_saida = caminho_dados_processados / f'{nome_tabela}.csv'
-                df_tabela.to_csv(caminho_saida, index=False)
-                print(f"Salvo: {nome_tabela}.csv")
+    ocorrencias = criar_ocorrencias_scopus(df_final_limpo, n_processos)
+    tabelas_finais = criar_tabelas_scopus(ocorrencias)
         
-        # O DataFrame principal (futura tabela fato) ainda precisa ser ajustado
-        df_final_limpo.to_csv(caminho_dados_processados / 'scopus_dados_limpos_temp.csv', index=False)
-        print(f"Salvo: scopus_dados_limpos_temp.csv")
+    # O DataFrame principal (futura tabela fato) ainda precisa ser ajustado
+    tabelas_finais['scopus_dados_limpos_temp'] = df_final_limpo
 
-        print(f"\nProcessamento concluído. Arquivos salvos em: {caminho_dados_processados}")
+    # --- Salva todos os arquivos finais ---
+    print("\n--- Salvando todos os arquivos processados ---")
+    salvar_tabelas(tabelas_finais, caminho_dados_processados)
+
+    entradas = {relativo: descrever_arquivo(caminho_dados_raw / relativo) for relativo in descricoes}
+    _salvar_estado_incremental(entradas, descricoes, df_final_limpo.columns, ocorrencias)
+    _salvar_relatorio_sobreposicao(descricoes, df_final_limpo)
+
+    print(f"\nProcessamento concluído. Arquivos salvos em: {caminho_dados_processados}")
+    # A unificação lê a tabela limpa do repositório de intermediárias, sem reler o CSV
+    limpo = publicar_intermediaria(df_final_limpo, caminho_dados_processados / 'scopus_dados_limpos_temp', exportada=True)
+    return {'scopus_dados_limpos': limpo}
+
+def main():
+    """Função principal que orquestra todo o processo."""
+    parser = argparse.ArgumentParser(description="Processa os dados brutos da Scopus.")
+    parser.add_argument('--incremental', action='store_true', help="Processa apenas arquivos novos ou alterados.")
+    parser.add_argument('--processos', type=int, default=None, help="Processos que montam os modelos (padrão: todos os núcleos).")
+    args = parser.parse_args()
+    try:
+        executar_etapa_scopus(incremental=args.incremental, n_processos=args.processos)
+    except FileNotFoundError as e:
+        print(f"ERRO: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,192 @@
+# scripts/resolver_entidades.py
+"""
+Dimensões conformes de organizações e pessoas entre a Scopus e a Espacenet.
+
+As afiliações da Scopus e as parties da Espacenet com cara de organização (UNIV, INST, LTDA...)
+formam a `dim_organizacao`; os autores da Scopus e as demais parties formam a `dim_pessoa`. Os
+registros de cada tipo são agrupados por similaridade dos nomes normalizados, pontuando só os
+pares das blocagens (ver utils/resolucao_entidades.py). Autores com IDs diferentes na Scopus
+nunca são juntados, porque a Scopus já os distingue.
+
+Cada dimensão tem pontes de volta para os registros das fontes, com o score de cada nome contra
+o nome que representa o grupo:
+  - pon_organizacao_afiliacao_scopus, pon_organizacao_party;
+  - pon_pessoa_autor_scopus, pon_pessoa_party.
+As contagens da blocagem (pares possíveis, candidatos e aceitos) e o recall estimado vão para
+data/processed/relatorios/entidades_blocagem.csv.
+"""
+import argparse
+
+import pandas as pd
+
+from utils.chaves import gerar_chaves
+from utils.constants import CAMINHO_DADOS_PROCESSADOS
+from utils.data_processing import ler_tabela, salvar_tabelas, tabela_existe
+from utils.resolucao_entidades import (
+    LIMIAR_ORGANIZACAO, LIMIAR_PESSOA, TOKENS_GENERICOS, eh_organizacao, normalizar_organizacao, normalizar_pessoa,
+    process, resolver_entidades,
+)
+from utils.telemetria import registrar_gravacao
+
+CAMINHO_SAIDA_ENTIDADES = CAMINHO_DADOS_PROCESSADOS / 'entidades'
+CAMINHO_RELATORIO_BLOCAGEM = CAMINHO_DADOS_PROCESSADOS / 'relatorios' / 'entidades_blocagem.csv'
+
+# Tabelas lidas (caminho sem extensão) e colunas usadas de cada uma
+ENTRADAS = {
+    'afiliacoes': (CAMINHO_DADOS_PROCESSADOS / 'dim_afiliacoes_scopus', ['affiliation_id', 'nome_normalizado', 'sigla']),
+    'autores': (CAMINHO_DADOS_PROCESSADOS / 'dim_autores_scopus', ['authors_id', 'nome_completo']),
+    'parties': (CAMINHO_DADOS_PROCESSADOS / 'espacenet' / 'dim_parties', ['party_id', 'party_nome']),
+}
+ARQUIVOS_ENTRADA = tuple(
+    caminho.with_suffix(extensao) for caminho, _ in ENTRADAS.values() for extensao in ('.csv', '.parquet')
+)
+
+# Nomes normalizados que não identificam ninguém (ex: 'nao_informado' da Scopus)
+NOMES_AUSENTES = {'', 'NAO INFORMADO'}
+
+# Fonte de cada registro -> (ponte gravada, coluna do ID na fonte)
+PONTES = {
+    'organizacao': {'scopus': ('pon_organizacao_afiliacao_scopus', 'affiliation_id'), 'espacenet': ('pon_organizacao_party', 'party_id')},
+    'pessoa': {'scopus': ('pon_pessoa_autor_scopus', 'authors_id'), 'espacenet': ('pon_pessoa_party', 'party_id')},
+}
+
+
+def _registros(fonte, ids, nomes, normalizados):
+    registros = pd.DataFrame({'fonte': fonte, 'id_fonte': ids, 'nome': nomes, 'nome_normalizado': normalizados})
+    return registros[~registros['nome_normalizado'].isin(NOMES_AUSENTES)]
+
+
+def separar_registros(afiliacoes, autores, parties):
+    """
+    Registros de organizações e de pessoas das três dimensões, com o nome normalizado.
+
+    A Scopus vem antes da Espacenet: no empate, o nome da Scopus representa o grupo.
+
+    Returns:
+        dict: 'organizacao' e 'pessoa' -> DataFrame [fonte, id_fonte, nome, nome_normalizado].
+    """
+    nomes_parties = parties['party_nome'].astype(str).str.replace(r'\s*\[[A-Z]{2}\]\s*$', '', regex=True)
+    organizacao = parties['party_nome'].map(eh_organizacao).astype(bool)
+    siglas = afiliacoes['sigla'].where(afiliacoes['sigla'].map(lambda s: isinstance(s, str)), None)
+    return {
+        'organizacao': pd.concat([
+            _registros(
+                'scopus', afiliacoes['affiliation_id'], afiliacoes['nome_normalizado'],
+                [normalizar_organizacao(nome, sigla) for nome, sigla in zip(afiliacoes['nome_normalizado'], siglas)],
+            ),
+            _registros(
+                'espacenet', parties.loc[organizacao, 'party_id'], nomes_parties[organizacao],
+                [normalizar_organizacao(nome) for nome in nomes_parties[organizacao]],
+            ),
+        ], ignore_index=True),
+        'pessoa': pd.concat([
+            _registros('scopus', autores['authors_id'], autores['nome_completo'], [normalizar_pessoa(n) for n in autores['nome_completo']]),
+            _registros(
+                'espacenet', parties.loc[~organizacao, 'party_id'], nomes_parties[~organizacao],
+                [normalizar_pessoa(nome) for nome in nomes_parties[~organizacao]],
+            ),
+        ], ignore_index=True),
+    }
+
+
+def criar_dimensao_conforme(registros, entidade, limiar, distintos=None, genericos=frozenset(), n_threads=-1):
+    """
+    Agrupa os registros de um tipo de entidade e monta a dimensão conforme e as pontes às fontes.
+
+    Returns:
+        (pd.DataFrame, dict[str, pd.DataFrame], dict): Dimensão [<entidade>_id,
+        nome_<entidade>, fontes, registros], pontes por nome de tabela e estatísticas da blocagem.
+    """
+    resolvidos, estatisticas = resolver_entidades(
+        registros['nome_normalizado'].tolist(), distintos, limiar, genericos, rotulo=entidade, n_threads=n_threads
+    )
+    registros = registros.reset_index(drop=True).assign(
+        grupo=resolvidos['grupo'].to_numpy(), representante=resolvidos['representante'].to_numpy(), score=resolvidos['score'].to_numpy()
+    )
+    coluna_id = f'{entidade}_id'
+    # O ID vem do registro que representa o grupo: o mesmo grupo tem o mesmo ID entre execuções
+    representantes = registros.loc[registros['representante'].drop_duplicates()]
+    ids = gerar_chaves(representantes[['fonte', 'id_fonte']].astype(str), entidade)
+    registros[coluna_id] = pd.Series(ids.to_numpy(), index=representantes['grupo']).reindex(registros['grupo']).to_numpy()
+
+    fontes = registros.groupby('grupo', sort=False)['fonte'].agg(lambda valores: ';'.join(sorted(set(valores), reverse=True)))
+    dimensao = pd.DataFrame({
+        coluna_id: ids.to_numpy(),
+        f'nome_{entidade}': representantes['nome'].to_numpy(),
+        'fontes': fontes.reindex(representantes['grupo']).to_numpy(),
+        'registros': registros['grupo'].value_counts().reindex(representantes['grupo']).to_numpy(),
+    })
+    dimensao[coluna_id] = dimensao[coluna_id].astype('Int64')
+
+    pontes = {}
+    for fonte, (tabela, coluna_fonte) in PONTES[entidade].items():
+        da_fonte = registros[registros['fonte'] == fonte]
+        pontes[tabela] = pd.DataFrame({
+            coluna_id: da_fonte[coluna_id].astype('Int64').to_numpy(),
+            coluna_fonte: da_fonte['id_fonte'].to_numpy(),
+            'score': da_fonte['score'].to_numpy(),
+        })
+    return dimensao, pontes, estatisticas
+
+
+def _informar_blocagem(entidade, estatisticas):
+    recall = estatisticas['recall_blocagem']
+    reducao = 1 - estatisticas['pares_candidatos'] / estatisticas['pares_possiveis'] if estatisticas['pares_possiveis'] else 0.0
+    print(
+        f"{entidade}: {estatisticas['registros']} registros, {estatisticas['pares_candidatos']} pares candidatos "
+        f"de {estatisticas['pares_possiveis']} possíveis ({reducao:.2%} evitados), {estatisticas['pares_aceitos']} aceitos, "
+        f"{estatisticas['grupos']} entidades; recall estimado da blocagem: "
+        f"{'sem pares na amostra' if recall is None else f'{recall:.1%}'} ({estatisticas['pares_amostra']} pares na amostra)."
+    )
+
+
+def resolver_organizacoes_e_pessoas(n_threads=-1):
+    """
+    Lê as dimensões da Scopus e da Espacenet e grava as dimensões conformes, as pontes e o
+    relatório da blocagem.
+
+    Returns:
+        dict[str, pd.DataFrame] | None: Tabelas gravadas, ou None se faltar alguma entrada.
+    """
+    print("Resolvendo organizações e pessoas entre a Scopus e a Espacenet...")
+    faltando = [str(caminho) for caminho, _ in ENTRADAS.values() if not tabela_existe(caminho)]
+    if faltando:
+        print(f"Tabelas de entrada ausentes ({', '.join(faltando)}); resolução de entidades ignorada.")
+        return None
+    entradas = {nome: ler_tabela(caminho, colunas=colunas) for nome, (caminho, colunas) in ENTRADAS.items()}
+    registros = separar_registros(entradas['afiliacoes'], entradas['autores'], entradas['parties'])
+
+    tabelas, relatorio = {}, []
+    for entidade, limiar, genericos in (('organizacao', LIMIAR_ORGANIZACAO, TOKENS_GENERICOS), ('pessoa', LIMIAR_PESSOA, frozenset())):
+        # Autores com IDs diferentes na Scopus são pessoas diferentes
+        distintos = (registros[entidade]['fonte'] == 'scopus').to_numpy() if entidade == 'pessoa' else None
+        dimensao, pontes, estatisticas = criar_dimensao_conforme(registros[entidade], entidade, limiar, distintos, genericos, n_threads)
+        _informar_blocagem(entidade, estatisticas)
+        tabelas[f'dim_{entidade}'] = dimensao
+        tabelas.update(pontes)
+        relatorio.append({'entidade': entidade, 'limiar': limiar, **estatisticas})
+
+    salvar_tabelas(tabelas, CAMINHO_SAIDA_ENTIDADES)
+    CAMINHO_RELATORIO_BLOCAGEM.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(relatorio).to_csv(CAMINHO_RELATORIO_BLOCAGEM, index=False)
+    registrar_gravacao(len(relatorio), [CAMINHO_RELATORIO_BLOCAGEM])
+    return tabelas
+
+
+def executar_etapa_entidades():
+    """Etapa 'entidades' do pipeline: roda depois das etapas que gravam as dimensões de autores, afiliações e parties."""
+    if process is None:
+        print("Aviso: o rapidfuzz não está instalado; resolução de entidades ignorada (pip install rapidfuzz).")
+        return {}
+    resolver_organizacoes_e_pessoas()
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dimensões conformes de organizações e pessoas entre a Scopus e a Espacenet.")
+    parser.parse_args()
+    executar_etapa_entidades()
+
+
+if __name__ == "__main__":
+    main()
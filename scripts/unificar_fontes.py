@@ -1,64 +1,107 @@
 # scripts/unificar_fontes.py (VERSÃO CORRIGIDA)
 import pandas as pd
-from pathlib import Path
-import re
 import sys # <-- Importar a biblioteca sys
 
-def unificar_fontes_e_criar_ligacoes():
+from utils.chaves import inserir_chave
+from utils.constants import CAMINHO_DADOS_PROCESSADOS
+from utils.data_processing import salvar_tabelas
+from utils.intermediarios import ler_intermediaria, materializar, publicar_intermediaria
+from utils.busca_especies import AutomatoEspecies, buscar_especies
+from utils.busca_aproximada import ligar_especies_aproximadas
+
+# Tabelas intermediárias (sem extensão: lidas do repositório em Arrow IPC ou, sem ele, em Parquet ou CSV)
+CAMINHO_SCOPUS_LIMPO = CAMINHO_DADOS_PROCESSADOS / 'scopus_dados_limpos_temp'
+CAMINHO_ESPECIES_CNCFLORA = CAMINHO_DADOS_PROCESSADOS / 'cncflora' / 'dim_especies_cncflora_temp'
+CAMINHO_ESPECIES_MESTRE = CAMINHO_DADOS_PROCESSADOS / 'dim_especies_mestre'
+
+# Únicas colunas usadas de cada entrada
+COLUNAS_SCOPUS_BUSCA = ['eid', 'article_id', 'title', 'abstract']
+COLUNAS_ESPECIES_CNCFLORA = ['nome_cientifico']
+
+# Score das ligações pelo nome exato (as aproximadas ficam entre o limiar e 100)
+SCORE_EXATO = 100.0
+
+def unificar_fontes_e_criar_ligacoes(df_scopus_limpo=None, df_especies_cncflora=None, busca_aproximada=False):
     """
     Lê os dados processados, cria a dimensão de espécies unificada e a tabela ponte artigo-espécie.
+
+    As entradas podem vir do orquestrador (DataFrames ou referências do repositório de
+    intermediárias, das quais só as colunas usadas são lidas); quando omitidas, são lidas das
+    tabelas intermediárias gravadas pelos scripts da Scopus e da CNCFlora.
+
+    Com `busca_aproximada`, os artigos também são ligados às espécies da CNCFlora citadas de forma
+    abreviada ("E. oleracea") ou com erro de grafia (ver utils/busca_aproximada.py); a coluna
+    `score` da ponte indica a similaridade de cada ligação.
+
+    Returns:
+        dict: {'dim_especies_mestre': dimensão mestre de espécies (`TabelaIntermediaria`, ou o
+        DataFrame sem o pyarrow)}, consumida pela Espacenet.
     """
     print("Iniciando o processo de unificação das fontes de dados...")
 
-    caminho_script = Path(__file__).parent
-    caminho_repo_raiz = caminho_script.parent
-    caminho_processados = caminho_repo_raiz / 'data' / 'processed'
-    
-    caminho_scopus_limpo = caminho_processados / 'scopus_dados_limpos_temp.csv'
-    caminho_especies_cncflora = caminho_processados / 'cncflora' / 'dim_especies_cncflora_temp.csv'
+    caminho_processados = CAMINHO_DADOS_PROCESSADOS
 
-    try:
-        df_scopus_limpo = pd.read_csv(caminho_scopus_limpo)
-        df_especies_cncflora = pd.read_csv(caminho_especies_cncflora)
-        print("Arquivos processados da Scopus e CNCFlora carregados com sucesso.")
-    except FileNotFoundError as e:
-        print(f"ERRO: Não foi possível encontrar um dos arquivos de entrada: {e}")
-        print("Certifique-se de que os scripts anteriores foram executados com sucesso.")
-        sys.exit(1) # <-- CORREÇÃO: Força o script a parar com um código de erro
+    if df_scopus_limpo is None or df_especies_cncflora is None:
+        try:
+            df_scopus_limpo = ler_intermediaria(CAMINHO_SCOPUS_LIMPO, colunas=COLUNAS_SCOPUS_BUSCA)
+            df_especies_cncflora = ler_intermediaria(CAMINHO_ESPECIES_CNCFLORA, colunas=COLUNAS_ESPECIES_CNCFLORA)
+            print("Arquivos processados da Scopus e CNCFlora carregados com sucesso.")
+        except FileNotFoundError as e:
+            print(f"ERRO: Não foi possível encontrar um dos arquivos de entrada: {e}")
+            print("Certifique-se de que os scripts anteriores foram executados com sucesso.")
+            sys.exit(1) # <-- CORREÇÃO: Força o script a parar com um código de erro
+
+    # Trabalha sobre uma projeção própria: a entrada pode ser compartilhada com outras etapas
+    df_scopus_limpo = materializar(df_scopus_limpo, COLUNAS_SCOPUS_BUSCA).copy()
+    df_especies_cncflora = materializar(df_especies_cncflora, COLUNAS_ESPECIES_CNCFLORA)
 
     # (O resto da função continua o mesmo)
     lista_de_plantas = df_especies_cncflora['nome_cientifico'].dropna().unique().tolist()
-    regex_pattern = r'\b(' + '|'.join(re.escape(nome) for nome in lista_de_plantas) + r')\b'
+    automato = AutomatoEspecies(lista_de_plantas)
     print(f"Buscando por {len(lista_de_plantas)} nomes de plantas nos artigos da Scopus...")
     if 'eid' in df_scopus_limpo.columns:
         df_scopus_limpo.rename(columns={'eid': 'article_id'}, inplace=True)
     df_scopus_limpo['texto_busca'] = (df_scopus_limpo['title'].fillna('') + ' ' + df_scopus_limpo['abstract'].fillna(''))
-    df_scopus_limpo['especies_encontradas'] = df_scopus_limpo['texto_busca'].str.findall(regex_pattern, flags=re.IGNORECASE)
+    df_scopus_limpo['especies_encontradas'] = pd.Series(
+        buscar_especies(df_scopus_limpo['texto_busca'].tolist(), automato),
+        index=df_scopus_limpo.index
+    )
     df_scopus_com_especies = df_scopus_limpo[df_scopus_limpo['especies_encontradas'].apply(lambda x: len(x) > 0)]
     pon_artigo_especie_temp = df_scopus_com_especies[['article_id', 'especies_encontradas']].explode('especies_encontradas')
     pon_artigo_especie_temp.rename(columns={'especies_encontradas': 'nome_cientifico'}, inplace=True)
+    pon_artigo_especie_temp['score'] = SCORE_EXATO
+    if busca_aproximada:
+        print("Buscando nomes abreviados ou com erros de grafia (busca aproximada)...")
+        ligacoes = ligar_especies_aproximadas(df_scopus_limpo['texto_busca'].tolist(), lista_de_plantas)
+        ligacoes['article_id'] = df_scopus_limpo['article_id'].to_numpy()[ligacoes['posicao'].to_numpy()]
+        print(f"{len(ligacoes)} ligações artigo-espécie encontradas pela busca aproximada.")
+        pon_artigo_especie_temp = pd.concat(
+            [pon_artigo_especie_temp, ligacoes[['article_id', 'nome_cientifico', 'score']]], ignore_index=True
+        )
     especies_scopus = pd.DataFrame(pon_artigo_especie_temp['nome_cientifico'].unique(), columns=['nome_cientifico'])
     dim_especies_mestre = pd.concat([df_especies_cncflora[['nome_cientifico']], especies_scopus], ignore_index=True)
     dim_especies_mestre.drop_duplicates(inplace=True)
     dim_especies_mestre.reset_index(drop=True, inplace=True)
-    dim_especies_mestre.reset_index(inplace=True)
-    dim_especies_mestre.rename(columns={'index': 'especie_id'}, inplace=True)
+    # Mesmo espaço de IDs da dimensão de espécies da CNCFlora
+    dim_especies_mestre = inserir_chave(dim_especies_mestre, 'especie_id', 'nome_cientifico', 'especie')
     print("Dimensão Mestre de Espécies criada.")
     pon_artigo_especie = pd.merge(
         pon_artigo_especie_temp,
         dim_especies_mestre,
         on='nome_cientifico',
         how='left'
-    )[['article_id', 'especie_id']].drop_duplicates()
+    )
+    # Um par artigo-espécie achado mais de uma vez fica com o maior score
+    pon_artigo_especie = pon_artigo_especie.groupby(['article_id', 'especie_id'], sort=False, as_index=False)['score'].max()
     print("Tabela Ponte Artigo-Espécie criada.")
 
-    caminho_dim_especies = caminho_processados / 'dim_especies_mestre.csv'
-    caminho_ponte_artigo_especie = caminho_processados / 'pon_artigo_especie.csv'
-    dim_especies_mestre.to_csv(caminho_dim_especies, index=False)
-    pon_artigo_especie.to_csv(caminho_ponte_artigo_especie, index=False)
+    salvar_tabelas({'dim_especies_mestre': dim_especies_mestre, 'pon_artigo_especie': pon_artigo_especie}, caminho_processados)
     print("\n--- Processo de unificação concluído! ---")
-    print(f"Salvo: {caminho_dim_especies.name}")
-    print(f"Salvo: {caminho_ponte_artigo_especie.name}")
+    return {'dim_especies_mestre': publicar_intermediaria(dim_especies_mestre, CAMINHO_ESPECIES_MESTRE, exportada=True)}
+
+def executar_etapa_unificacao(scopus_dados_limpos, dim_especies_cncflora, busca_aproximada=False):
+    """Etapa 'unificacao' do pipeline, com as entradas recebidas em memória."""
+    return unificar_fontes_e_criar_ligacoes(scopus_dados_limpos, dim_especies_cncflora, busca_aproximada=busca_aproximada)
 
 if __name__ == "__main__":
-    unificar_fontes_e_criar_ligacoes()
\ No newline at end of file
+    unificar_fontes_e_criar_ligacoes(busca_aproximada='--busca-aproximada' in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,155 @@
+# scripts/utils/afiliacoes.py
+"""
+Normalização dos textos de afiliação da Scopus: nome normalizado, endereço e sigla.
+
+`normalizar_afiliacao` trata um texto; `normalizar_afiliacoes` trata uma Series inteira, passando
+uma única vez por cada texto distinto e guardando o resultado em um cache persistente indexado
+pelo texto bruto: nas execuções seguintes, só os textos ainda não vistos são processados. O nome
+do arquivo do cache leva a assinatura da regra (código de `normalizar_afiliacao` e padrões), de
+modo que mudar a regra começa um cache novo; o cache guarda no máximo `LIMITE_CACHE_AFILIACOES`
+textos, descartando os vistos há mais tempo.
+
+O custo de cada texto está quase todo nas expressões regulares, então uma passada única com os
+padrões pré-compilados é tão rápida quanto encadear os acessores `.str` do pandas (cada um deles
+é um laço próprio sobre a coluna); o ganho real vem de não repetir textos já normalizados.
+"""
+import hashlib
+import inspect
+import re
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+from utils.constants import CAMINHO_DADOS_PROCESSADOS
+
+AUSENTE = 'NAO_INFORMADO'
+SEM_SIGLA = 'SEM SIGLA'
+COLUNAS_RESULTADO = ['nome_normalizado', 'endereco', 'sigla']
+
+# Textos mantidos no cache persistente (os vistos há mais tempo saem primeiro)
+LIMITE_CACHE_AFILIACOES = 1_000_000
+
+PADRAO_PONTUACAO = re.compile(r'[.,;:"()]')
+PADRAO_ESPACOS = re.compile(r'\s+')
+PADRAO_SIGLA = re.compile(r'\b([A-Z]{2,6})\b')
+PADRAO_SIGLA_PARENTESES = re.compile(r'\(([A-Z\.]+)\)')
+
+
+def normalizar_afiliacao(texto_afiliacao):
+    """Separa um texto de afiliação em (nome normalizado, endereço, sigla)."""
+    if not isinstance(texto_afiliacao, str):
+        return AUSENTE, AUSENTE, AUSENTE
+    partes = texto_afiliacao.split(',', 1)
+    nome_instituicao = partes[0].strip()
+    endereco = partes[1].strip() if len(partes) > 1 else AUSENTE
+    texto_sem_acentos = unicodedata.normalize('NFKD', nome_instituicao).encode('ascii', 'ignore').decode('utf-8')
+    nome_normalizado = PADRAO_PONTUACAO.sub('', texto_sem_acentos.upper())
+    nome_normalizado = PADRAO_ESPACOS.sub(' ', nome_normalizado).strip()
+    siglas = PADRAO_SIGLA.findall(nome_instituicao)
+    if siglas:
+        sigla = siglas[-1]
+    else:
+        siglas_parenteses = PADRAO_SIGLA_PARENTESES.findall(nome_instituicao)
+        sigla = siglas_parenteses[-1].replace('.', '') if siglas_parenteses else SEM_SIGLA
+    return nome_normalizado, endereco, sigla
+
+
+def assinatura_normalizacao():
+    """Hash do código de `normalizar_afiliacao`, dos padrões e dos marcadores que ela usa."""
+    partes = [inspect.getsource(normalizar_afiliacao), AUSENTE, SEM_SIGLA, *COLUNAS_RESULTADO]
+    partes += [f'{padrao.pattern}|{padrao.flags}' for padrao in (PADRAO_PONTUACAO, PADRAO_ESPACOS, PADRAO_SIGLA, PADRAO_SIGLA_PARENTESES)]
+    return hashlib.blake2b('\n'.join(partes).encode('utf-8'), digest_size=8).hexdigest()
+
+
+# A assinatura faz parte do nome do arquivo: mudar a regra de normalização começa um cache novo
+CAMINHO_CACHE_AFILIACOES = CAMINHO_DADOS_PROCESSADOS / 'cache' / f'afiliacoes_normalizadas_{assinatura_normalizacao()}.pkl'
+
+
+def _normalizar_textos(textos):
+    """`normalizar_afiliacao` para cada texto (str) de um Index, em um DataFrame indexado por ele."""
+    return pd.DataFrame(
+        [normalizar_afiliacao(texto) for texto in textos], index=textos, columns=COLUNAS_RESULTADO, dtype=object
+    )
+
+
+def carregar_cache_afiliacoes(caminho_cache=CAMINHO_CACHE_AFILIACOES):
+    """Cache persistente (texto bruto -> colunas normalizadas); vazio se ainda não existir."""
+    caminho_cache = Path(caminho_cache)
+    if caminho_cache.exists():
+        return pd.read_pickle(caminho_cache)
+    return pd.DataFrame(columns=COLUNAS_RESULTADO, index=pd.Index([], name='texto', dtype=object), dtype=object)
+
+
+def salvar_cache_afiliacoes(cache, caminho_cache=CAMINHO_CACHE_AFILIACOES, vistos=None):
+    """
+    Grava o cache de forma atômica (arquivo temporário + rename) e apaga os caches de outras regras.
+
+    Args:
+        vistos (pd.Index, optional): Textos usados nesta execução; vão para o fim do cache, de modo
+            que, acima de `LIMITE_CACHE_AFILIACOES` textos, saiam primeiro os vistos há mais tempo.
+    """
+    caminho_cache = Path(caminho_cache)
+    caminho_cache.parent.mkdir(parents=True, exist_ok=True)
+    if vistos is not None:
+        usados = cache.index.isin(vistos)
+        cache = pd.concat([cache[~usados], cache[usados]])
+    cache = cache.iloc[-LIMITE_CACHE_AFILIACOES:]
+    caminho_temp = caminho_cache.with_suffix(caminho_cache.suffix + '.tmp')
+    cache.to_pickle(caminho_temp)
+    caminho_temp.replace(caminho_cache)
+    for antigo in caminho_cache.parent.glob('afiliacoes_normalizadas_*.pkl'):
+        if antigo != caminho_cache:
+            antigo.unlink(missing_ok=True)
+
+
+def normalizar_afiliacoes(textos, caminho_cache=CAMINHO_CACHE_AFILIACOES):
+    """
+    Aplica `normalizar_afiliacao` a uma Series de textos de afiliação.
+
+    Args:
+        textos (pd.Series): Textos brutos (valores não textuais resultam em NAO_INFORMADO).
+        caminho_cache (Path, optional): Cache persistente; None desativa o cache.
+
+    Returns:
+        pd.DataFrame: Colunas nome_normalizado, endereco e sigla, com o mesmo índice de `textos`.
+    """
+    cache = carregar_cache_afiliacoes(caminho_cache) if caminho_cache is not None else None
+    resultado, novos, do_cache = normalizar_com_cache(textos, cache)
+    if caminho_cache is not None and (do_cache or len(novos)):
+        if len(novos):
+            salvar_cache_afiliacoes(acrescentar_ao_cache(cache, novos), caminho_cache, vistos=textos.unique())
+        print(f"Afiliações normalizadas: {do_cache} do cache, {len(novos)} novas.")
+    return resultado
+
+
+def normalizar_com_cache(textos, cache):
+    """
+    `normalizar_afiliacoes` com um cache já carregado, sem gravá-lo (ex: num processo trabalhador).
+
+    Returns:
+        (pd.DataFrame, pd.DataFrame, int): Resultado (como em `normalizar_afiliacoes`), os textos
+        que faltavam no cache já normalizados e quantos textos distintos vieram do cache.
+    """
+    resultado = pd.DataFrame(AUSENTE, index=textos.index, columns=COLUNAS_RESULTADO, dtype=object)
+    eh_texto = textos.map(lambda valor: isinstance(valor, str)).astype(bool)
+    unicos = pd.Index(textos[eh_texto].unique(), name='texto')
+    if unicos.empty:
+        return resultado, _normalizar_textos(unicos), 0
+
+    if cache is None or cache.empty:
+        faltantes = unicos
+    else:
+        faltantes = unicos[~unicos.isin(cache.index)]
+
+    novos = _normalizar_textos(faltantes)
+    consulta = acrescentar_ao_cache(cache, novos) if len(novos) else cache
+    resultado.loc[eh_texto, COLUNAS_RESULTADO] = consulta.reindex(textos[eh_texto]).to_numpy()
+    return resultado, novos, len(unicos) - len(faltantes)
+
+
+def acrescentar_ao_cache(cache, novos):
+    """Cache com os textos novos ao final (os já presentes não são repetidos)."""
+    if cache is None or cache.empty:
+        return novos
+    return pd.concat([cache, novos[~novos.index.isin(cache.index)]])
@@ -0,0 +1,152 @@
+# scripts/utils/busca_aproximada.py
+"""
+Ligação aproximada de espécies (nomes abreviados ou com erros de grafia) com o RapidFuzz.
+
+Os candidatos são trechos "Gênero epíteto" ou "G. epíteto" extraídos dos textos. Cada candidato
+só é comparado com as espécies do seu bloco (inicial do gênero + prefixo do epíteto), e cada bloco
+é pontuado de uma vez com `rapidfuzz.process.cdist`, em todos os núcleos. Candidatos repetidos
+são pontuados uma única vez e os blocos têm poucas espécies, então o custo cresce com o tamanho do
+corpus, e não com espécies x palavras.
+
+Limitação da blocagem: erros de grafia nas primeiras letras do epíteto não são encontrados.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from utils.telemetria import instrumentar
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover - dependência opcional
+    fuzz = process = None
+
+LIMIAR_SIMILARIDADE = 90.0
+TAMANHO_PREFIXO_EPITETO = 3
+# Gênero por extenso ("Euterpe") ou abreviado ("E."), seguido do epíteto em minúsculas
+PADRAO_CANDIDATO = re.compile(r'(?<![\w.])([A-Z]\.|[A-Z][^\W\d_]+)\s+([^\W\d_A-Z][^\W\d_]*(?:-[^\W\d_]+)?)(?!\w)')
+
+
+def _dobrar(texto):
+    """Minúsculas e sem acentos (forma de comparação)."""
+    if texto.isascii():
+        return texto.lower()
+    base = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in base if not unicodedata.combining(c))
+
+
+def _formas(genero, epiteto, abreviado):
+    return f'{genero[0]}. {epiteto}' if abreviado else f'{genero} {epiteto}'
+
+
+def indexar_especies(nomes, tamanho_prefixo=TAMANHO_PREFIXO_EPITETO):
+    """
+    Agrupa os binômios por bloco (inicial do gênero, prefixo do epíteto).
+
+    Returns:
+        dict: bloco -> {'nomes': [nome científico], 'extenso': [forma], 'abreviado': [forma]}.
+        Nomes com o mesmo binômio (ex: variedades) ficam representados pelo primeiro da lista.
+    """
+    blocos, vistos = {}, set()
+    for nome in nomes:
+        if not isinstance(nome, str):
+            continue
+        partes = _dobrar(nome).split()
+        if len(partes) < 2 or len(partes[1]) < tamanho_prefixo or (partes[0], partes[1]) in vistos:
+            continue
+        genero, epiteto = partes[0], partes[1]
+        vistos.add((genero, epiteto))
+        bloco = blocos.setdefault((genero[0], epiteto[:tamanho_prefixo]), {'nomes': [], 'extenso': [], 'abreviado': []})
+        bloco['nomes'].append(nome)
+        bloco['extenso'].append(_formas(genero, epiteto, False))
+        bloco['abreviado'].append(_formas(genero, epiteto, True))
+    return blocos
+
+
+def extrair_candidatos(textos, blocos, tamanho_prefixo=TAMANHO_PREFIXO_EPITETO):
+    """
+    Trechos candidatos cujo bloco tem alguma espécie.
+
+    Returns:
+        list[tuple]: (posição do texto, bloco, abreviado, forma de comparação).
+    """
+    candidatos = []
+    # Trecho -> (bloco, abreviado, forma) ou None; trechos se repetem muito entre textos
+    vistos = {}
+    for posicao, texto in enumerate(textos):
+        if not isinstance(texto, str):
+            continue
+        for trecho in PADRAO_CANDIDATO.findall(texto):
+            if trecho not in vistos:
+                genero, epiteto = trecho
+                abreviado = genero.endswith('.')
+                genero, epiteto = _dobrar(genero.rstrip('.')), _dobrar(epiteto)
+                bloco = (genero[0], epiteto[:tamanho_prefixo])
+                valido = len(epiteto) >= tamanho_prefixo and bloco in blocos
+                vistos[trecho] = (bloco, abreviado, _formas(genero, epiteto, abreviado)) if valido else None
+            candidato = vistos[trecho]
+            if candidato is not None:
+                candidatos.append((posicao, *candidato))
+    return candidatos
+
+
+def pontuar_candidatos(candidatos, blocos, limiar=LIMIAR_SIMILARIDADE, n_threads=-1):
+    """
+    Pontua cada forma distinta contra as espécies do seu bloco (um `cdist` por bloco e tipo de forma).
+
+    Returns:
+        dict: (bloco, abreviado, forma) -> (nome científico, score). Formas abaixo do limiar ou
+        empatadas entre espécies diferentes (ex: "E. oleracea" com dois gêneros em E) ficam de fora.
+    """
+    consultas = {}
+    for _, bloco, abreviado, forma in candidatos:
+        consultas.setdefault((bloco, abreviado), {})[forma] = None
+
+    melhores = {}
+    for (bloco, abreviado), formas in consultas.items():
+        formas = list(formas)
+        especies = blocos[bloco]
+        escolhas = especies['abreviado' if abreviado else 'extenso']
+        matriz = process.cdist(formas, escolhas, scorer=fuzz.ratio, score_cutoff=limiar, workers=n_threads, dtype=np.float32)
+        maximos = matriz.max(axis=1)
+        empates = (matriz == maximos[:, None]).sum(axis=1)
+        for forma, indice, score, n_empates in zip(formas, matriz.argmax(axis=1), maximos, empates):
+            if score >= limiar and n_empates == 1:
+                melhores[(bloco, abreviado, forma)] = (especies['nomes'][indice], round(float(score), 2))
+    return melhores
+
+
+@instrumentar
+def ligar_especies_aproximadas(textos, nomes, limiar=LIMIAR_SIMILARIDADE, tamanho_prefixo=TAMANHO_PREFIXO_EPITETO, n_threads=-1):
+    """
+    Liga textos a espécies por similaridade, incluindo nomes abreviados e com erros de grafia.
+
+    Args:
+        textos (list[str]): Textos a varrer (ex: título + resumo de cada artigo).
+        nomes (list[str]): Nomes científicos de referência.
+        limiar (float): Score mínimo (0-100, `fuzz.ratio`) para aceitar a ligação.
+        tamanho_prefixo (int): Letras do epíteto usadas na blocagem.
+        n_threads (int): Threads do `cdist` (-1 = todos os núcleos).
+
+    Returns:
+        pd.DataFrame: posicao (índice do texto em `textos`), nome_cientifico e score, com o maior
+        score de cada par (texto, espécie).
+
+    Raises:
+        ImportError: Se o RapidFuzz não estiver instalado.
+    """
+    if process is None:
+        raise ImportError("A busca aproximada de espécies requer o pacote rapidfuzz (pip install rapidfuzz).")
+    blocos = indexar_especies(nomes, tamanho_prefixo)
+    candidatos = extrair_candidatos(textos, blocos, tamanho_prefixo)
+    melhores = pontuar_candidatos(candidatos, blocos, limiar, n_threads)
+
+    ligacoes = []
+    for posicao, bloco, abreviado, forma in candidatos:
+        encontrado = melhores.get((bloco, abreviado, forma))
+        if encontrado is not None:
+            ligacoes.append((posicao, *encontrado))
+    df = pd.DataFrame(ligacoes, columns=['posicao', 'nome_cientifico', 'score'])
+    return df.groupby(['posicao', 'nome_cientifico'], sort=False, as_index=False)['score'].max()
@@ -0,0 +1,196 @@
+# scripts/utils/busca_especies.py
+"""
+Motor de busca de múltiplos padrões (Aho-Corasick) para localizar nomes de espécies em textos.
+
+O autômato é construído uma única vez a partir da lista de nomes científicos e percorre cada
+texto em uma só passada, independentemente do número de espécies. A semântica reproduz a da
+busca por regex `\\b(nome1|nome2|...)\\b` com `re.IGNORECASE`: respeita fronteiras de palavra,
+não sobrepõe ocorrências e, quando dois nomes começam na mesma posição, vence o que aparece
+primeiro na lista (como na alternância do regex).
+"""
+import os
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.telemetria import instrumentar
+
+_AUTOMATO_TRABALHADOR = None
+
+
+def _dobrar_caractere(caractere, ignorar_acentos):
+    """Converte um caractere para sua forma de comparação, sempre com tamanho 1 (preserva offsets)."""
+    minusculo = caractere.lower()
+    if len(minusculo) != 1:
+        minusculo = caractere
+    if ignorar_acentos and not minusculo.isascii():
+        base = unicodedata.normalize('NFKD', minusculo)
+        sem_acentos = ''.join(c for c in base if not unicodedata.combining(c))
+        if len(sem_acentos) == 1:
+            return sem_acentos
+    return minusculo
+
+
+def _e_caractere_de_palavra(caractere):
+    """Mesma definição de `\\w` usada pelo módulo `re` para strings."""
+    return caractere.isalnum() or caractere == '_'
+
+
+class AutomatoEspecies:
+    """
+    Autômato Aho-Corasick sobre os nomes de espécies, com dobra de caixa e (opcionalmente) de acentos.
+
+    Args:
+        nomes (iterable): Nomes científicos na ordem de prioridade.
+        ignorar_acentos (bool): Se True, 'Euterpe olerácea' também casa com 'Euterpe oleracea'.
+    """
+
+    def __init__(self, nomes, ignorar_acentos=True):
+        self.nomes = [nome for nome in nomes if isinstance(nome, str) and nome != '']
+        self.ignorar_acentos = ignorar_acentos
+        self._cache_dobra = {}
+
+        # Trie: transições, índice do nome que termina no estado e comprimento desse nome
+        self._transicoes = [{}]
+        self._terminal = [-1]
+        self._comprimento = [0]
+        for indice, nome in enumerate(self.nomes):
+            estado = 0
+            for caractere in self._dobrar(nome):
+                proximo = self._transicoes[estado].get(caractere)
+                if proximo is None:
+                    proximo = len(self._transicoes)
+                    self._transicoes[estado][caractere] = proximo
+                    self._transicoes.append({})
+                    self._terminal.append(-1)
+                    self._comprimento.append(self._comprimento[estado] + 1)
+                estado = proximo
+            # Nomes que só diferem por caixa/acento: mantém o primeiro, como o regex faria
+            if self._terminal[estado] == -1:
+                self._terminal[estado] = indice
+
+        # Links de falha e de saída (próximo estado terminal na cadeia de falhas), em largura
+        self._falha = [0] * len(self._transicoes)
+        self._saida = [-1] * len(self._transicoes)
+        fila = list(self._transicoes[0].values())
+        for estado in fila:
+            for caractere, filho in self._transicoes[estado].items():
+                fila.append(filho)
+                falha = self._falha[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falha[filho] = destino if destino != filho else 0
+                alvo = self._falha[filho]
+                self._saida[filho] = alvo if self._terminal[alvo] != -1 else self._saida[alvo]
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['_cache_dobra'] = {}
+        return estado
+
+    def _dobrar(self, texto):
+        if texto.isascii():
+            return texto.lower()
+        cache = self._cache_dobra
+        partes = []
+        for caractere in texto:
+            dobrado = cache.get(caractere)
+            if dobrado is None:
+                dobrado = cache[caractere] = _dobrar_caractere(caractere, self.ignorar_acentos)
+            partes.append(dobrado)
+        return ''.join(partes)
+
+    def encontrar(self, texto):
+        """
+        Localiza as ocorrências de espécies em um texto.
+
+        Returns:
+            list[tuple[int, int, int]]: (início, fim, índice do nome em `self.nomes`), com `fim`
+            exclusivo, em ordem de posição e sem sobreposição.
+        """
+        if not isinstance(texto, str) or not texto:
+            return []
+        transicoes, falhas, terminal = self._transicoes, self._falha, self._terminal
+        saida, comprimento = self._saida, self._comprimento
+        tamanho_texto = len(texto)
+
+        candidatos = []
+        estado = 0
+        for posicao, caractere in enumerate(self._dobrar(texto)):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            if not estado:
+                continue
+            fim = posicao + 1
+            encontrado = estado if terminal[estado] != -1 else saida[estado]
+            while encontrado != -1:
+                inicio = fim - comprimento[encontrado]
+                if self._tem_fronteira(texto, inicio, tamanho_texto) and self._tem_fronteira(texto, fim, tamanho_texto):
+                    candidatos.append((inicio, terminal[encontrado], fim))
+                encontrado = saida[encontrado]
+
+        # Seleção "mais à esquerda, primeiro da lista", sem sobreposição (semântica do re.findall)
+        candidatos.sort()
+        ocorrencias = []
+        limite = 0
+        for inicio, indice, fim in candidatos:
+            if inicio >= limite:
+                ocorrencias.append((inicio, fim, indice))
+                limite = fim
+        return ocorrencias
+
+    @staticmethod
+    def _tem_fronteira(texto, posicao, tamanho_texto):
+        antes = posicao > 0 and _e_caractere_de_palavra(texto[posicao - 1])
+        depois = posicao < tamanho_texto and _e_caractere_de_palavra(texto[posicao])
+        return antes != depois
+
+    def encontrar_trechos(self, texto):
+        """Equivalente a `re.findall`: devolve o trecho original de cada ocorrência."""
+        return [texto[inicio:fim] for inicio, fim, _ in self.encontrar(texto)]
+
+    def encontrar_nomes(self, texto):
+        """Nome da lista (como em `self.nomes`) de cada ocorrência, qualquer que seja a grafia no texto."""
+        return [self.nomes[indice] for _, _, indice in self.encontrar(texto)]
+
+
+def _inicializar_trabalhador(automato):
+    global _AUTOMATO_TRABALHADOR
+    _AUTOMATO_TRABALHADOR = automato
+
+
+def _processar_bloco(textos, canonicos=False):
+    encontrar = _AUTOMATO_TRABALHADOR.encontrar_nomes if canonicos else _AUTOMATO_TRABALHADOR.encontrar_trechos
+    return [encontrar(texto) for texto in textos]
+
+
+@instrumentar
+def buscar_especies(textos, automato, n_processos=None, tamanho_bloco=2000, canonicos=False):
+    """
+    Aplica o autômato a uma coleção de textos, opcionalmente em paralelo por blocos.
+
+    Args:
+        textos (list[str]): Textos a varrer (ex: título + resumo de cada artigo).
+        automato (AutomatoEspecies): Autômato já construído.
+        n_processos (int, optional): Processos do pool. None usa todos os núcleos; 1 roda no processo atual.
+        tamanho_bloco (int): Quantidade de textos enviada a cada processo por vez.
+        canonicos (bool): Devolve o nome da lista em vez do trecho do texto (ex: 'Euterpe oleracea'
+            para 'EUTERPE OLERACEA' num título em maiúsculas).
+
+    Returns:
+        list[list[str]]: Para cada texto, a lista de trechos encontrados (como `re.findall`), ou
+        de nomes, com `canonicos`.
+    """
+    textos = list(textos)
+    n_processos = n_processos or os.cpu_count() or 1
+    if n_processos == 1 or len(textos) <= tamanho_bloco:
+        encontrar = automato.encontrar_nomes if canonicos else automato.encontrar_trechos
+        return [encontrar(texto) for texto in textos]
+
+    blocos = [textos[i:i + tamanho_bloco] for i in range(0, len(textos), tamanho_bloco)]
+    resultado = []
+    with ProcessPoolExecutor(max_workers=n_processos, initializer=_inicializar_trabalhador, initargs=(automato,)) as executor:
+        for trechos_bloco in executor.map(_processar_bloco, blocos, [canonicos] * len(blocos)):
+            resultado.extend(trechos_bloco)
+    return resultado
@@ -0,0 +1,267 @@
+# scripts/utils/cache_etapas.py
+"""
+Cache endereçado por conteúdo das etapas do pipeline.
+
+A chave de uma etapa é o hash de tudo que determina o seu resultado:
+  - os arquivos que ela lê (`Etapa.arquivos`), pelo SHA-256 do conteúdo;
+  - os artefatos recebidos de outras etapas, pela chave da etapa que os produziu (ou pelo hash
+    do DataFrame, quando vêm de um carregador);
+  - os parâmetros: argumentos do `partial` (menos os de ARGUMENTOS_SEM_EFEITO, como o número de
+    processos), formatos de saída e as constantes em maiúsculas dos módulos do projeto que a
+    etapa usa (ex: COUNTRY_CODES, LIMIAR_AUSENCIA);
+  - o código-fonte desses módulos.
+
+Quando a chave já está no cache, os arquivos que a etapa gravou (os registrados por
+`registrar_gravacao`) são copiados de volta e os artefatos devolvidos são lidos do pickle, sem
+executar a etapa. As entradas menos usadas recentemente são removidas quando o cache passa do
+limite de tamanho.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from utils.constants import CAMINHO_DADOS
+from utils.data_processing import formatos_saida
+from utils.manifesto import carregar_manifesto, descrever_arquivo, salvar_manifesto
+
+# Limite padrão do cache em disco (MB)
+LIMITE_CACHE_MB = 2048
+# Muda quando o formato das entradas do cache muda
+VERSAO_CACHE_ETAPAS = 1
+# Argumentos que só mudam como a etapa executa, não o resultado: ficam fora da chave
+ARGUMENTOS_SEM_EFEITO = frozenset({'n_processos'})
+# Pasta com os módulos do projeto (scripts/): só o código e as constantes deles entram na chave
+_RAIZ_CODIGO = Path(__file__).resolve().parents[1]
+
+
+def _canonico(valor):
+    """Forma serializável e estável de um parâmetro (conjuntos ordenados; objetos opacos pelo tipo)."""
+    if isinstance(valor, dict):
+        return {str(chave): _canonico(item) for chave, item in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_canonico(item) for item in valor]
+    if isinstance(valor, (set, frozenset)):
+        return sorted((_canonico(item) for item in valor), key=repr)
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return valor
+    if isinstance(valor, Path):
+        return str(valor)
+    if isinstance(valor, re.Pattern):
+        return [valor.pattern, valor.flags]
+    return f'<{type(valor).__name__}>'
+
+
+def _desembrulhar(funcao):
+    """Função de fato e argumentos (posicionais e nomeados) fixados por `functools.partial`."""
+    posicionais, nomeados = [], {}
+    while isinstance(funcao, functools.partial):
+        posicionais = list(funcao.args) + posicionais
+        nomeados = {**funcao.keywords, **nomeados}
+        funcao = funcao.func
+    nomeados = {nome: valor for nome, valor in nomeados.items() if nome not in ARGUMENTOS_SEM_EFEITO}
+    return funcao, {'posicionais': posicionais, 'nomeados': nomeados}
+
+
+def modulos_do_projeto(funcao):
+    """Módulos de scripts/ alcançáveis a partir da função, pelos nomes que cada módulo importa."""
+    pilha, encontrados = [inspect.getmodule(funcao)], {}
+    while pilha:
+        modulo = pilha.pop()
+        arquivo = getattr(modulo, '__file__', None)
+        if modulo is None or arquivo is None or modulo.__name__ in encontrados:
+            continue
+        if _RAIZ_CODIGO not in Path(arquivo).resolve().parents:
+            continue
+        encontrados[modulo.__name__] = modulo
+        for valor in list(vars(modulo).values()):
+            pilha.append(valor if inspect.ismodule(valor) else inspect.getmodule(valor))
+    return [encontrados[nome] for nome in sorted(encontrados)]
+
+
+def hash_dataframe(df):
+    """Hash do conteúdo de um DataFrame (colunas, tipos, índice e valores)."""
+    resumo = hashlib.blake2b(digest_size=16)
+    resumo.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    resumo.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return resumo.hexdigest()
+
+
+def hash_artefato(chave_etapa, artefato):
+    """Identidade de um artefato produzido por uma etapa com a chave dada."""
+    return hashlib.blake2b(f'{chave_etapa}:{artefato}'.encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class CacheEtapas:
+    """
+    Cache das etapas em disco.
+
+    Args:
+        pasta (Path): Pasta do cache (uma subpasta por chave).
+        limite_bytes (int): Tamanho máximo; as entradas menos usadas recentemente saem primeiro.
+        forcar (frozenset): Etapas executadas mesmo com a chave no cache (o resultado é regravado).
+        raiz (Path): Pasta de dados; os arquivos gravados são guardados relativos a ela.
+    """
+    pasta: Path
+    limite_bytes: int = LIMITE_CACHE_MB * 2**20
+    forcar: frozenset = field(default_factory=frozenset)
+    raiz: Path = CAMINHO_DADOS
+
+    @property
+    def _caminho_hashes(self):
+        return self.pasta / 'hashes_arquivos.json'
+
+    def _hashes_arquivos(self, arquivos):
+        """SHA-256 dos arquivos, recalculado só para os que mudaram de tamanho ou mtime."""
+        anteriores = carregar_manifesto(self._caminho_hashes) or {}
+        atuais, mudou = {}, False
+        for arquivo in arquivos:
+            chave = str(arquivo)
+            anterior = anteriores.get(chave)
+            info = arquivo.stat()
+            if anterior and anterior['tamanho'] == info.st_size and anterior['mtime'] == info.st_mtime_ns:
+                atuais[chave] = anterior
+            else:
+                atuais[chave] = descrever_arquivo(arquivo)
+                mudou = True
+        if mudou:
+            # Etapas em paralelo podem gravar ao mesmo tempo; no pior caso um hash é recalculado depois
+            salvar_manifesto({**anteriores, **atuais}, self._caminho_hashes)
+        return {chave: entrada['hash'] for chave, entrada in atuais.items()}
+
+    def _listar_arquivos(self, caminhos):
+        arquivos, ausentes = [], []
+        for caminho in map(Path, caminhos):
+            if caminho.is_dir():
+                arquivos.extend(sorted(item for item in caminho.rglob('*') if item.is_file()))
+            elif caminho.exists():
+                arquivos.append(caminho)
+            else:
+                ausentes.append(str(caminho))
+        return arquivos, ausentes
+
+    def chave(self, etapa, hashes_entradas):
+        """
+        Chave da etapa, ou None se alguma entrada não tiver identidade conhecida.
+
+        Args:
+            etapa (Etapa): Etapa do pipeline.
+            hashes_entradas (dict[str, str | None]): Identidade de cada artefato recebido.
+        """
+        if any(hashes_entradas.get(artefato) is None for artefato in etapa.entradas):
+            return None
+        funcao, argumentos = _desembrulhar(etapa.funcao)
+        modulos = modulos_do_projeto(funcao)
+        arquivos, ausentes = self._listar_arquivos(etapa.arquivos)
+        descricao = {
+            'versao': VERSAO_CACHE_ETAPAS,
+            'etapa': etapa.nome,
+            'funcao': f'{funcao.__module__}.{funcao.__qualname__}',
+            'argumentos': _canonico(argumentos),
+            'formatos': list(formatos_saida()),
+            'entradas': {artefato: hashes_entradas[artefato] for artefato in etapa.entradas},
+            'arquivos': self._hashes_arquivos(arquivos),
+            'ausentes': ausentes,
+            'codigo': {
+                modulo.__name__: hashlib.sha256(Path(modulo.__file__).read_bytes()).hexdigest() for modulo in modulos
+            },
+            'constantes': {
+                modulo.__name__: {nome: _canonico(valor) for nome, valor in vars(modulo).items() if nome.isupper()}
+                for modulo in modulos
+            },
+        }
+        texto = json.dumps(descricao, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def _entrada(self, chave):
+        return self.pasta / chave[:2] / chave
+
+    def contem(self, chave):
+        return (self._entrada(chave) / 'entrada.json').exists()
+
+    def restaurar(self, chave):
+        """
+        Copia de volta os arquivos gravados pela etapa e devolve os artefatos (None se a entrada
+        sumiu ou está incompleta).
+
+        Os arquivos voltam com o mtime da gravação original; um arquivo que ainda está no disco
+        com esse tamanho e mtime não é copiado de novo (e continua "inalterado" para quem compara
+        tamanho e mtime, como os cubos do painel).
+        """
+        pasta = self._entrada(chave)
+        try:
+            entrada = carregar_manifesto(pasta / 'entrada.json')
+            if entrada is None:
+                return None
+            for relativo, (tamanho, mtime) in entrada['arquivos'].items():
+                destino = self.raiz / relativo
+                if destino.exists() and destino.stat().st_size == tamanho and destino.stat().st_mtime_ns == mtime:
+                    continue
+                destino.parent.mkdir(parents=True, exist_ok=True)
+                temporario = destino.with_name(destino.name + '.tmp')
+                shutil.copyfile(pasta / 'arquivos' / relativo, temporario)
+                os.utime(temporario, ns=(mtime, mtime))
+                temporario.replace(destino)
+            with open(pasta / 'saidas.pkl', 'rb') as arquivo:
+                saidas = pickle.load(arquivo)
+            # O mtime da entrada marca o último uso (ordem de remoção)
+            os.utime(pasta / 'entrada.json')
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, ValueError):
+            return None
+        return saidas
+
+    def guardar(self, chave, etapa, saidas, gravados):
+        """Guarda os arquivos gravados e os artefatos da etapa e aplica o limite de tamanho."""
+        destino = self._entrada(chave)
+        arquivos = {}
+        for caminho in dict.fromkeys(Path(caminho).resolve() for caminho in gravados):
+            if self.raiz.resolve() not in caminho.parents:
+                print(f"Cache: '{caminho}' fica fora de '{self.raiz}'; etapa '{etapa}' não guardada.")
+                return
+            info = caminho.stat()
+            arquivos[caminho.relative_to(self.raiz.resolve()).as_posix()] = [info.st_size, info.st_mtime_ns]
+        temporario = destino.with_name(f'{chave}.tmp-{os.getpid()}')
+        shutil.rmtree(temporario, ignore_errors=True)
+        try:
+            temporario.mkdir(parents=True)
+            for relativo in arquivos:
+                (temporario / 'arquivos' / relativo).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self.raiz / relativo, temporario / 'arquivos' / relativo)
+            with open(temporario / 'saidas.pkl', 'wb') as arquivo:
+                pickle.dump(saidas, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+            tamanho = sum(item.stat().st_size for item in temporario.rglob('*') if item.is_file())
+            salvar_manifesto(
+                {'etapa': etapa, 'arquivos': arquivos, 'bytes': tamanho, 'criado_em': time.time()},
+                temporario / 'entrada.json',
+            )
+            shutil.rmtree(destino, ignore_errors=True)
+            temporario.replace(destino)
+        except OSError as erro:
+            shutil.rmtree(temporario, ignore_errors=True)
+            print(f"Cache: não foi possível guardar a etapa '{etapa}': {erro}")
+            return
+        self.aplicar_limite()
+
+    def aplicar_limite(self):
+        """Remove as entradas menos usadas recentemente até o cache caber no limite."""
+        entradas = []
+        for marcador in self.pasta.glob('*/*/entrada.json'):
+            entrada = carregar_manifesto(marcador) or {}
+            entradas.append((marcador.stat().st_mtime_ns, entrada.get('bytes', 0), entrada.get('etapa'), marcador.parent))
+        total = sum(tamanho for _, tamanho, _, _ in entradas)
+        for _, tamanho, etapa, pasta in sorted(entradas, key=lambda item: item[0]):
+            if total <= self.limite_bytes:
+                break
+            shutil.rmtree(pasta, ignore_errors=True)
+            total -= tamanho
+            print(f"Cache: entrada da etapa '{etapa}' removida ({tamanho / 2**20:.1f} MB) para respeitar o limite.")
@@ -0,0 +1,299 @@
+# scripts/utils/carregamento.py
+"""
+Carga paralela dos CSVs brutos (Scopus e Espacenet).
+
+Os arquivos são lidos em um pool de processos, no máximo `max_em_voo` por vez, e entregues na
+ordem recebida. Cada arquivo traz só as colunas selecionadas, todas como texto, e uma coluna com o
+arquivo de origem. Na consolidação, as linhas cuja chave (eid / publication_number) já apareceu
+são descartadas antes do concat, para que exportações sobrepostas não inflem a memória; com uma
+coluna de recência (ex: citações na Scopus), a cópia mais recente substitui a anterior.
+
+`iterar_blocos_csvs` entrega as mesmas linhas em blocos de tamanho fixo, lidos um por vez, para
+processamentos com memória limitada (ex: Espacenet com --espacenet-em-blocos).
+
+Quando o pyarrow está instalado, o parser dele é usado (com campos entre aspas contendo quebras
+de linha); se falhar em algum arquivo, ou sem o pyarrow, a leitura cai no `pd.read_csv`.
+"""
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - dependência opcional
+    pa = pa_csv = None
+
+COLUNA_ORIGEM = 'arquivo_origem'
+# Mesmos marcadores de ausência que o pd.read_csv usa por padrão
+VALORES_AUSENTES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+
+def _nomes_colunas(caminho, separador):
+    """Cabeçalho com os mesmos nomes que o pandas daria (vazios e repetidos)."""
+    with open(caminho, newline='', encoding='utf-8-sig') as arquivo:
+        cabecalho = next(csv.reader(arquivo, delimiter=separador), [])
+    nomes, vistos = [], {}
+    for i, nome in enumerate(cabecalho):
+        nome = nome or f'Unnamed: {i}'
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f'{nome}.{vistos[nome]}'
+        else:
+            vistos[nome] = 0
+        nomes.append(nome)
+    return nomes
+
+
+def _colunas_lidas(caminho, separador, selecionar_coluna=None, padronizar_coluna=None):
+    """Pares (nome bruto, nome padronizado) das colunas selecionadas, na ordem do arquivo."""
+    nomes_brutos = _nomes_colunas(caminho, separador)
+    padronizados = [padronizar_coluna(nome) if padronizar_coluna else nome for nome in nomes_brutos]
+    return [(bruto, nome) for bruto, nome in zip(nomes_brutos, padronizados) if selecionar_coluna is None or selecionar_coluna(nome)]
+
+
+def _ler_com_pyarrow(caminho, separador, colunas):
+    nomes = _nomes_colunas(caminho, separador)
+    tabela = pa_csv.read_csv(
+        caminho,
+        read_options=pa_csv.ReadOptions(column_names=nomes, skip_rows=1),
+        parse_options=pa_csv.ParseOptions(delimiter=separador, newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=colunas, column_types={nome: pa.string() for nome in colunas},
+            null_values=VALORES_AUSENTES, strings_can_be_null=True,
+        ),
+    )
+    df = tabela.to_pandas()
+    # None -> NaN, como no pd.read_csv
+    return df.where(df.notna(), np.nan)
+
+
+def ler_csv_bruto(caminho, separador=',', selecionar_coluna=None, padronizar_coluna=None, coluna_origem=None, origem=None):
+    """
+    Lê um CSV bruto inteiro como texto.
+
+    Args:
+        caminho (Path): Arquivo CSV.
+        separador (str): Delimitador de campos.
+        selecionar_coluna (callable, optional): Recebe o nome (já padronizado) e diz se a coluna é lida.
+        padronizar_coluna (callable, optional): Padronização aplicada aos nomes das colunas.
+        coluna_origem (str, optional): Nome da coluna que recebe `origem` em todas as linhas.
+        origem (str, optional): Identificação do arquivo (padrão: nome do arquivo).
+
+    Returns:
+        (pd.DataFrame, dict): Os dados e as estatísticas da leitura (linhas, bytes, segundos, motor).
+    """
+    inicio = time.perf_counter()
+    colunas = [bruto for bruto, _ in _colunas_lidas(caminho, separador, selecionar_coluna, padronizar_coluna)]
+
+    df, motor = None, 'pandas'
+    if pa_csv is not None:
+        try:
+            df, motor = _ler_com_pyarrow(caminho, separador, colunas), 'pyarrow'
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df = None
+    if df is None:
+        selecionadas = set(colunas)
+        df = pd.read_csv(caminho, sep=separador, dtype=str, usecols=lambda nome: nome in selecionadas)
+        df = df[colunas]
+
+    if padronizar_coluna:
+        df.columns = [padronizar_coluna(nome) for nome in df.columns]
+    if coluna_origem:
+        df[coluna_origem] = origem or Path(caminho).name
+    estatisticas = {
+        'linhas': len(df), 'bytes': Path(caminho).stat().st_size,
+        'segundos': time.perf_counter() - inicio, 'motor': motor,
+    }
+    return df, estatisticas
+
+
+def iterar_csvs(arquivos, caminho_base=None, n_processos=None, max_em_voo=None, **opcoes_leitura):
+    """
+    Lê vários CSVs em paralelo e os entrega na ordem de `arquivos`.
+
+    Args:
+        arquivos (list[Path]): Arquivos a ler.
+        caminho_base (Path, optional): Pasta usada para identificar a origem (caminho relativo).
+        n_processos (int, optional): Tamanho do pool (padrão: núcleos disponíveis; 1 lê no processo atual).
+        max_em_voo (int, optional): Máximo de arquivos lidos ou aguardando consumo ao mesmo tempo
+            (padrão: 2 x n_processos), o que limita o pico de memória.
+        **opcoes_leitura: Repassadas a `ler_csv_bruto`.
+
+    Yields:
+        (Path, pd.DataFrame): Cada arquivo e seus dados.
+    """
+    arquivos = [Path(arquivo) for arquivo in arquivos]
+    n_processos = max(1, min(n_processos or os.cpu_count() or 1, len(arquivos) or 1))
+    max_em_voo = max(1, max_em_voo or 2 * n_processos)
+
+    def origem(arquivo):
+        return arquivo.relative_to(caminho_base).as_posix() if caminho_base else arquivo.name
+
+    def relatar(arquivo, estatisticas):
+        megabytes = estatisticas['bytes'] / 2**20
+        vazao = megabytes / estatisticas['segundos'] if estatisticas['segundos'] else float('inf')
+        print(
+            f"  {origem(arquivo)}: {estatisticas['linhas']} linhas, {megabytes:.1f} MB em "
+            f"{estatisticas['segundos']:.2f}s ({vazao:.1f} MB/s, {estatisticas['motor']})"
+        )
+
+    if n_processos == 1:
+        for arquivo in arquivos:
+            df, estatisticas = ler_csv_bruto(arquivo, origem=origem(arquivo), **opcoes_leitura)
+            relatar(arquivo, estatisticas)
+            yield arquivo, df
+        return
+
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        pendentes = deque()
+        proximos = iter(arquivos)
+        for arquivo in proximos:
+            pendentes.append((arquivo, executor.submit(ler_csv_bruto, arquivo, origem=origem(arquivo), **opcoes_leitura)))
+            if len(pendentes) >= max_em_voo:
+                break
+        while pendentes:
+            arquivo, futuro = pendentes.popleft()
+            df, estatisticas = futuro.result()
+            proximo = next(proximos, None)
+            if proximo is not None:
+                pendentes.append((proximo, executor.submit(ler_csv_bruto, proximo, origem=origem(proximo), **opcoes_leitura)))
+            relatar(arquivo, estatisticas)
+            yield arquivo, df
+
+
+def _recencias(df, coluna_recencia):
+    """Recência numérica de cada linha (-inf quando ausente ou não numérica; 0 sem coluna de recência)."""
+    if coluna_recencia is None or coluna_recencia not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[coluna_recencia], errors='coerce').fillna(-np.inf).to_numpy(dtype=float)
+
+
+def consolidar_sem_repetidos(dfs, coluna_chave=None, coluna_recencia=None):
+    """
+    Concatena os DataFrames na ordem recebida, mantendo uma só linha de cada chave.
+
+    Sem `coluna_recencia`, fica a primeira linha de cada chave. Com ela, fica a cópia mais recente
+    (maior valor numérico na coluna; no empate, a primeira). Linhas sem chave (nula) são sempre
+    mantidas. O descarte acontece arquivo a arquivo, antes do concat, então a memória cresce com o
+    número de chaves distintas e não com as sobreposições.
+    """
+    partes, donos, substituidas, descartadas = [], {}, {}, 0
+    for df in dfs:
+        if coluna_chave and coluna_chave in df.columns:
+            chaves = df[coluna_chave]
+            presentes = chaves.notna().to_numpy()
+            # Melhor cópia de cada chave no arquivo: maior recência, a primeira no empate
+            candidatas = pd.DataFrame({
+                'chave': chaves.to_numpy()[presentes], 'ordem': -_recencias(df, coluna_recencia)[presentes],
+                'posicao': np.flatnonzero(presentes),
+            }).sort_values('ordem', kind='stable').drop_duplicates('chave')
+            anteriores = [donos.get(chave) for chave in candidatas['chave']]
+            vencem = [
+                anterior is None or -ordem > anterior[1]
+                for anterior, ordem in zip(anteriores, candidatas['ordem'])
+            ]
+            for chave, anterior, ordem, vence in zip(candidatas['chave'], anteriores, candidatas['ordem'], vencem):
+                if vence:
+                    if anterior is not None:
+                        substituidas.setdefault(anterior[0], set()).add(chave)
+                    donos[chave] = (len(partes), -ordem)
+            mantidas = ~presentes
+            mantidas[candidatas['posicao'].to_numpy()[np.array(vencem, dtype=bool)]] = True
+            descartadas += int((~mantidas).sum())
+            df = df[mantidas]
+        partes.append(df)
+    # Cópias já guardadas que perderam para uma mais recente de um arquivo seguinte
+    for indice, chaves_substituidas in substituidas.items():
+        partes[indice] = partes[indice][~partes[indice][coluna_chave].isin(chaves_substituidas)]
+        descartadas += len(chaves_substituidas)
+    if descartadas:
+        detalhe = f" ({sum(map(len, substituidas.values()))} por uma cópia mais recente)" if substituidas else ""
+        print(f"{descartadas} linhas com '{coluna_chave}' repetido descartadas na consolidação{detalhe}.")
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes, ignore_index=True)
+
+
+def carregar_csvs(arquivos, coluna_chave=None, ao_carregar=None, coluna_recencia=None, **opcoes):
+    """
+    Lê (em paralelo) e consolida CSVs brutos, sem chaves repetidas entre arquivos.
+
+    Args:
+        arquivos (list[Path]): Arquivos a ler, na ordem de prioridade (a primeira ocorrência vence,
+            salvo com `coluna_recencia`).
+        coluna_chave (str, optional): Coluna (nome já padronizado) usada no descarte de repetidos.
+        ao_carregar (callable, optional): Chamada com (arquivo, DataFrame) antes do descarte
+            (ex: estatísticas por arquivo para um manifesto).
+        coluna_recencia (str, optional): Entre cópias da mesma chave, fica a de maior valor
+            nesta coluna (ver `consolidar_sem_repetidos`).
+        **opcoes: Repassadas a `iterar_csvs` / `ler_csv_bruto`.
+    """
+    def lidos():
+        for arquivo, df in iterar_csvs(arquivos, **opcoes):
+            if ao_carregar:
+                ao_carregar(arquivo, df)
+            yield df
+
+    return consolidar_sem_repetidos(lidos(), coluna_chave, coluna_recencia)
+
+
+def iterar_blocos_csvs(arquivos, tamanho_bloco, coluna_chave=None, caminho_base=None, separador=',',
+                       selecionar_coluna=None, padronizar_coluna=None, coluna_origem=None):
+    """
+    Lê CSVs brutos em blocos de até `tamanho_bloco` linhas, com as mesmas linhas de `carregar_csvs`.
+
+    Todos os blocos têm as mesmas colunas, na ordem em que o concat de `carregar_csvs` as poria (as
+    ausentes num arquivo ficam nulas), e as linhas cuja chave já apareceu num bloco anterior são
+    descartadas. A memória fica limitada a um bloco e ao conjunto de chaves vistas.
+
+    Args:
+        arquivos (list[Path]): Arquivos a ler, na ordem de prioridade (a primeira ocorrência vence).
+        tamanho_bloco (int): Máximo de linhas lidas por vez.
+        coluna_chave (str, optional): Coluna (nome já padronizado) usada no descarte de repetidos.
+        Demais argumentos: como em `ler_csv_bruto` (a origem é o caminho relativo a `caminho_base`).
+
+    Yields:
+        pd.DataFrame: Cada bloco não vazio, já sem as linhas repetidas.
+    """
+    arquivos = [Path(arquivo) for arquivo in arquivos]
+    lidas = {arquivo: _colunas_lidas(arquivo, separador, selecionar_coluna, padronizar_coluna) for arquivo in arquivos}
+    colunas = []
+    for arquivo in arquivos:
+        for nome in [nome for _, nome in lidas[arquivo]] + ([coluna_origem] if coluna_origem else []):
+            if nome not in colunas:
+                colunas.append(nome)
+
+    vistos, descartadas = set(), 0
+    for arquivo in arquivos:
+        brutas = [bruto for bruto, _ in lidas[arquivo]]
+        selecionadas = set(brutas)
+        leitor = pd.read_csv(arquivo, sep=separador, dtype=str, usecols=lambda nome: nome in selecionadas, chunksize=tamanho_bloco)
+        for bloco in leitor:
+            bloco = bloco[brutas]
+            bloco.columns = [nome for _, nome in lidas[arquivo]]
+            if coluna_origem:
+                bloco[coluna_origem] = arquivo.relative_to(caminho_base).as_posix() if caminho_base else arquivo.name
+            if coluna_chave and coluna_chave in bloco.columns:
+                chaves = bloco[coluna_chave]
+                repetidas = chaves.notna() & (chaves.duplicated() | chaves.isin(vistos))
+                descartadas += int(repetidas.sum())
+                vistos.update(chaves.dropna().unique())
+                bloco = bloco[~repetidas]
+            if bloco.empty:
+                continue
+            ausentes = [coluna for coluna in colunas if coluna not in bloco.columns]
+            bloco = bloco.reindex(columns=colunas)
+            bloco[ausentes] = bloco[ausentes].astype(object)
+            yield bloco.reset_index(drop=True)
+    if descartadas:
+        print(f"{descartadas} linhas com '{coluna_chave}' repetido descartadas na leitura em blocos.")
@@ -0,0 +1,86 @@
+# scripts/utils/chaves.py
+"""
+Chaves substitutas determinísticas para as dimensões e pontes do modelo.
+
+O ID de uma entidade é um hash de 64 bits (BLAKE2b) da sua chave natural, prefixada pelo tipo de
+entidade. Assim a mesma entidade recebe o mesmo ID em todas as execuções e em todas as fontes (ex:
+uma espécie da CNCFlora e a mesma espécie encontrada na Scopus), sem depender da ordem das linhas.
+
+Os IDs usam 63 bits, para caber em inteiros com sinal (int64 / INT64), e são devolvidos no tipo
+inteiro anulável do pandas ('Int64'): depois de um merge com linhas sem correspondência a coluna
+continua inteira, em vez de virar float e perder precisão.
+"""
+import hashlib
+import unicodedata
+
+import pandas as pd
+
+# Separa o tipo de entidade e os campos de uma chave composta antes do hash
+SEPARADOR_CAMPOS = '\x1f'
+
+
+def normalizar_chave(valor):
+    """Forma canônica de um campo da chave natural (texto Unicode NFC, sem espaços nas pontas)."""
+    return unicodedata.normalize('NFC', str(valor)).strip()
+
+
+def gerar_chave(entidade, *campos):
+    """ID inteiro de uma única entidade a partir dos campos da sua chave natural."""
+    texto = SEPARADOR_CAMPOS.join([entidade, *(normalizar_chave(campo) for campo in campos)])
+    digest = hashlib.blake2b(texto.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') >> 1
+
+
+def gerar_chaves(valores, entidade):
+    """
+    Gera os IDs de uma coluna de chaves naturais, verificando colisões.
+
+    Args:
+        valores (pd.Series | pd.DataFrame): Chave natural de cada linha; um DataFrame representa
+            uma chave composta (uma coluna por campo).
+        entidade (str): Tipo de entidade (ex: 'especie', 'keyword'), que separa os espaços de IDs.
+
+    Returns:
+        pd.Series: IDs ('Int64') alinhados ao índice de `valores`.
+
+    Raises:
+        ValueError: Se duas chaves naturais diferentes produzirem o mesmo ID.
+    """
+    if isinstance(valores, pd.DataFrame):
+        chaves_naturais = list(valores.itertuples(index=False, name=None))
+    else:
+        valores = pd.Series(valores)
+        chaves_naturais = [(valor,) for valor in valores]
+
+    normalizadas = [tuple(normalizar_chave(campo) for campo in chave) for chave in chaves_naturais]
+
+    # O hash é calculado uma vez por chave natural distinta
+    ids_por_chave = {}
+    donos = {}
+    for normalizada in normalizadas:
+        if normalizada in ids_por_chave:
+            continue
+        id_gerado = gerar_chave(entidade, *normalizada)
+        if id_gerado in donos:
+            raise ValueError(
+                f"Colisão de chaves em '{entidade}': {donos[id_gerado]!r} e {normalizada!r} geram o ID {id_gerado}."
+            )
+        donos[id_gerado] = normalizada
+        ids_por_chave[normalizada] = id_gerado
+
+    return pd.Series([ids_por_chave[chave] for chave in normalizadas], index=valores.index, dtype='Int64')
+
+
+def inserir_chave(df, coluna_id, colunas_naturais, entidade):
+    """
+    Insere a coluna de ID como primeira coluna de uma dimensão.
+
+    Args:
+        df (pd.DataFrame): Dimensão (uma linha por entidade).
+        coluna_id (str): Nome da nova coluna (ex: 'keyword_id').
+        colunas_naturais (str | list[str]): Coluna(s) que formam a chave natural.
+        entidade (str): Tipo de entidade passado a `gerar_chaves`.
+    """
+    df = df.copy()
+    df.insert(0, coluna_id, gerar_chaves(df[colunas_naturais], entidade))
+    return df
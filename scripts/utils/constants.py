@@ -0,0 +1,11 @@
+# scripts/utils/constants.py
+"""Caminhos e parâmetros compartilhados pelos scripts do pipeline."""
+import os
+from pathlib import Path
+
+CAMINHO_REPO_RAIZ = Path(__file__).resolve().parents[2]
+# Pasta de dados alternativa (ex: dados sintéticos dos benchmarks de escala); padrão: data/ na raiz
+VARIAVEL_PASTA_DADOS = 'OBSERVATORIO_PASTA_DADOS'
+CAMINHO_DADOS = Path(os.environ.get(VARIAVEL_PASTA_DADOS) or CAMINHO_REPO_RAIZ / 'data')
+CAMINHO_DADOS_RAW = CAMINHO_DADOS / 'raw'
+CAMINHO_DADOS_PROCESSADOS = CAMINHO_DADOS / 'processed'
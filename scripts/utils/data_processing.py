@@ -0,0 +1,234 @@
+# scripts/utils/data_processing.py
+"""
+Funções auxiliares de processamento compartilhadas entre as fontes.
+
+As tabelas são gravadas nos formatos de saída configurados: CSV (exportação para o Looker Studio)
+e/ou Parquet (colunar, com strings em dicionário, chaves inteiras tipadas e compressão), usado
+pelas etapas seguintes para ler só as colunas de que precisam. O Parquet depende do pyarrow;
+sem ele, tudo continua em CSV.
+
+`GravadorTabela` grava uma tabela aos blocos (CSV por acréscimo, Parquet um row group por bloco),
+para tabelas que não são montadas inteiras em memória.
+
+As duas formas só regravam os formatos cujo conteúdo mudou, sempre por arquivo temporário e rename
+(ver utils/exportacao.py).
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from utils.exportacao import ExportacaoTabela, gravar_atomicamente
+from utils.telemetria import instrumentar, registrar_arquivos_mantidos, registrar_gravacao
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependência opcional
+    pa = pq = None
+
+FORMATOS_SUPORTADOS = ('csv', 'parquet')
+# Variável de ambiente com os formatos de saída separados por vírgula (ex: "csv,parquet"); é lida a
+# cada gravação para valer também nos processos das etapas em paralelo
+VARIAVEL_FORMATOS_SAIDA = 'OBSERVATORIO_FORMATOS_SAIDA'
+COMPRESSAO_PARQUET = 'zstd'
+
+
+def formatos_saida():
+    """Formatos de saída em uso (padrão: CSV e, se o pyarrow estiver instalado, Parquet)."""
+    configurado = os.environ.get(VARIAVEL_FORMATOS_SAIDA)
+    if not configurado:
+        return ['csv', 'parquet'] if pq is not None else ['csv']
+    formatos = [formato.strip().lower() for formato in configurado.split(',') if formato.strip()]
+    invalidos = set(formatos) - set(FORMATOS_SUPORTADOS)
+    if invalidos:
+        raise ValueError(f"Formatos de saída desconhecidos: {sorted(invalidos)}.")
+    if 'parquet' in formatos and pq is None:
+        raise ImportError("O formato 'parquet' requer o pacote pyarrow (pip install pyarrow).")
+    return formatos
+
+
+def para_arrow(df):
+    """Converte para uma tabela Arrow; colunas de texto com tipos misturados viram texto."""
+    df = df.copy()
+    for coluna in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[coluna], skipna=True) not in ('string', 'empty'):
+            df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def salvar_parquet(df, caminho):
+    """Grava um DataFrame em Parquet com as strings em dicionário e compressão."""
+    tabela = para_arrow(df)
+    colunas_texto = [campo.name for campo in tabela.schema if pa.types.is_string(campo.type)]
+    pq.write_table(tabela, caminho, compression=COMPRESSAO_PARQUET, use_dictionary=colunas_texto or False)
+
+
+@instrumentar
+def salvar_tabelas(tabelas, caminho_saida, formatos=None):
+    """
+    Salva um dicionário de tabelas nos formatos de saída, ignorando as que não foram geradas (None).
+
+    Um formato cujo arquivo já tem o mesmo conteúdo não é regravado (mantém o mtime); os demais
+    são gravados num temporário e trocados de uma vez.
+
+    Args:
+        tabelas (dict[str, pd.DataFrame]): Nome do arquivo (sem extensão) -> tabela.
+        caminho_saida (Path): Pasta de destino (criada se não existir).
+        formatos (list[str], optional): Sobrepõe `formatos_saida()`.
+    """
+    caminho_saida = Path(caminho_saida)
+    caminho_saida.mkdir(parents=True, exist_ok=True)
+    formatos = formatos or formatos_saida()
+    for nome, df in tabelas.items():
+        if df is not None:
+            exportacao = ExportacaoTabela(caminho_saida / nome, formatos)
+            exportacao.atualizar(df)
+            alterados = exportacao.formatos_alterados()
+            gravados, mantidos = [], []
+            for formato in formatos:
+                destino = caminho_saida / f"{nome}.{formato}"
+                if formato not in alterados:
+                    mantidos.append(destino)
+                    print(f"Inalterado: {nome}.{formato}")
+                    continue
+                if formato == 'csv':
+                    gravar_atomicamente(destino, lambda caminho: df.to_csv(caminho, index=False))
+                else:
+                    gravar_atomicamente(destino, lambda caminho: salvar_parquet(df, caminho))
+                gravados.append(destino)
+                print(f"Salvo: {nome}.{formato}")
+            exportacao.concluir(gravados)
+            if gravados:
+                registrar_gravacao(len(df), gravados)
+            registrar_arquivos_mantidos(mantidos)
+
+
+class GravadorTabela:
+    """
+    Grava uma tabela bloco a bloco nos formatos de saída, sem mantê-la inteira em memória.
+
+    Os arquivos são escritos com o sufixo '.tmp' e só substituem os anteriores em `fechar`, e só
+    nos formatos cujo conteúdo mudou; usado como gerenciador de contexto, uma exceção descarta os
+    temporários. Todos os blocos devem ter as colunas do primeiro.
+    """
+
+    def __init__(self, caminho_saida, nome, formatos=None):
+        self.caminho_saida = Path(caminho_saida)
+        self.caminho_saida.mkdir(parents=True, exist_ok=True)
+        self.nome = nome
+        self.formatos = formatos or formatos_saida()
+        self.linhas = 0
+        self._colunas = None
+        self._escritor_parquet = None
+        self._exportacao = ExportacaoTabela(self.caminho_saida / nome, self.formatos)
+
+    def _caminho(self, formato, temporario=True):
+        return self.caminho_saida / (f"{self.nome}.{formato}.tmp" if temporario else f"{self.nome}.{formato}")
+
+    def escrever(self, df):
+        """Acrescenta um bloco à tabela."""
+        primeiro = self._colunas is None
+        if primeiro:
+            self._colunas = list(df.columns)
+        df = df[self._colunas]
+        self._exportacao.atualizar(df)
+        if 'csv' in self.formatos:
+            df.to_csv(self._caminho('csv'), mode='w' if primeiro else 'a', header=primeiro, index=False)
+        if 'parquet' in self.formatos:
+            tabela = para_arrow(df)
+            if self._escritor_parquet is None:
+                # Colunas só com nulos no primeiro bloco ficam como texto
+                esquema = pa.schema(
+                    [campo.with_type(pa.string()) if pa.types.is_null(campo.type) else campo for campo in tabela.schema],
+                    metadata=tabela.schema.metadata,
+                )
+                colunas_texto = [campo.name for campo in esquema if pa.types.is_string(campo.type)]
+                self._escritor_parquet = pq.ParquetWriter(
+                    self._caminho('parquet'), esquema, compression=COMPRESSAO_PARQUET, use_dictionary=colunas_texto or False
+                )
+            self._escritor_parquet.write_table(tabela.cast(self._escritor_parquet.schema))
+        self.linhas += len(df)
+
+    def fechar(self):
+        """Conclui a gravação, trocando os arquivos anteriores pelos novos."""
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+        if self._colunas is None:
+            return
+        alterados = self._exportacao.formatos_alterados()
+        gravados, mantidos = [], []
+        for formato in self.formatos:
+            if formato not in alterados:
+                self._caminho(formato).unlink(missing_ok=True)
+                mantidos.append(self._caminho(formato, temporario=False))
+                print(f"Inalterado: {self.nome}.{formato} ({self.linhas} linhas, em blocos)")
+                continue
+            self._caminho(formato).replace(self._caminho(formato, temporario=False))
+            gravados.append(self._caminho(formato, temporario=False))
+            print(f"Salvo: {self.nome}.{formato} ({self.linhas} linhas, em blocos)")
+        self._exportacao.concluir(gravados)
+        if gravados:
+            registrar_gravacao(self.linhas, gravados)
+        registrar_arquivos_mantidos(mantidos)
+
+    def descartar(self):
+        """Interrompe a gravação e remove os arquivos temporários."""
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+        for formato in self.formatos:
+            self._caminho(formato).unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, rastreamento):
+        if tipo_excecao is None:
+            self.fechar()
+        else:
+            self.descartar()
+        return False
+
+
+def arquivo_tabela(caminho_tabela):
+    """Arquivo da tabela (caminho sem extensão) no formato gravado mais recentemente, ou None."""
+    caminho_tabela = Path(caminho_tabela)
+    candidatos = [caminho_tabela.with_suffix('.csv')]
+    if pq is not None:
+        candidatos.append(caminho_tabela.with_suffix('.parquet'))
+    existentes = [caminho for caminho in candidatos if caminho.exists()]
+    if not existentes:
+        return None
+    # Em caso de empate o Parquet (último da lista) é preferido
+    return max(existentes, key=lambda caminho: caminho.stat().st_mtime_ns)
+
+
+def tabela_existe(caminho_tabela):
+    """Indica se a tabela (caminho sem extensão) foi gravada em algum formato legível."""
+    return arquivo_tabela(caminho_tabela) is not None
+
+
+def ler_tabela(caminho_tabela, colunas=None, **opcoes_csv):
+    """
+    Lê uma tabela gravada por `salvar_tabelas`, no formato mais recente disponível.
+
+    Args:
+        caminho_tabela (Path): Caminho da tabela sem extensão.
+        colunas (list[str], optional): Lê só estas colunas (as ausentes na tabela são ignoradas).
+        **opcoes_csv: Repassadas ao `pd.read_csv` quando a leitura cai no CSV.
+
+    Raises:
+        FileNotFoundError: Se a tabela não existir em nenhum formato.
+    """
+    arquivo = arquivo_tabela(caminho_tabela)
+    if arquivo is None:
+        raise FileNotFoundError(f"Tabela não encontrada: '{Path(caminho_tabela).with_suffix('.csv')}'.")
+    if arquivo.suffix == '.parquet':
+        if colunas is not None:
+            disponiveis = set(pq.read_schema(arquivo).names)
+            colunas = [coluna for coluna in colunas if coluna in disponiveis]
+        return pq.read_table(arquivo, columns=colunas).to_pandas()
+    if colunas is not None:
+        selecionadas = set(colunas)
+        opcoes_csv['usecols'] = lambda coluna: coluna in selecionadas
+    return pd.read_csv(arquivo, **opcoes_csv)
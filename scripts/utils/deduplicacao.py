@@ -0,0 +1,60 @@
+# scripts/utils/deduplicacao.py
+"""
+Detecção de linhas repetidas por impressão digital.
+
+`df.duplicated()` seguido de `drop_duplicates()` compara o texto de todas as colunas duas vezes,
+o que pesa em tabelas largas (títulos, resumos, afiliações). Aqui cada linha é resumida uma vez
+num hash de 64 bits (o `pd.util.hash_array` de cada coluna, combinados) e só as linhas cujo hash se repete são
+comparadas pelo conteúdo, o que mantém o resultado exato mesmo se dois conteúdos diferentes
+colidirem.
+
+O hash é calculado em blocos de linhas: o `hash_array` do pandas guarda uma cópia codificada de
+cada texto do que está resumindo, e em blocos essa cópia não passa do tamanho de um bloco.
+"""
+import numpy as np
+import pandas as pd
+
+# Linhas resumidas por vez (limita a cópia dos textos feita pelo hash_array)
+LINHAS_POR_BLOCO = 8192
+# Multiplicador ímpar que combina os hashes das colunas (a ordem das colunas conta)
+_MULTIPLICADOR = np.uint64(0x100000001B3)
+
+
+def impressao_digital_linhas(df, colunas=None):
+    """
+    Hash de 64 bits do conteúdo de cada linha (sem o índice).
+
+    Args:
+        df (pd.DataFrame): Tabela.
+        colunas (list[str], optional): Colunas consideradas (padrão: todas).
+
+    Returns:
+        np.ndarray: Um uint64 por linha, na ordem das linhas.
+    """
+    valores = [df[coluna].to_numpy() for coluna in (df.columns if colunas is None else colunas)]
+    impressoes = np.zeros(len(df), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for inicio in range(0, len(df), LINHAS_POR_BLOCO):
+            fim = inicio + LINHAS_POR_BLOCO
+            combinado = np.zeros(min(fim, len(df)) - inicio, dtype=np.uint64)
+            for coluna in valores:
+                combinado = combinado * _MULTIPLICADOR ^ pd.util.hash_array(coluna[inicio:fim], categorize=False)
+            impressoes[inicio:fim] = combinado
+    return impressoes
+
+
+def linhas_repetidas(df, colunas=None):
+    """
+    Máscara das linhas iguais a uma linha anterior, como `df.duplicated(keep='first')`.
+
+    Returns:
+        np.ndarray: True nas cópias que devem ser descartadas.
+    """
+    impressoes = impressao_digital_linhas(df, colunas)
+    repetidas = np.zeros(len(df), dtype=bool)
+    candidatas = pd.Series(impressoes).duplicated(keep=False).to_numpy()
+    if candidatas.any():
+        # Linhas iguais têm o mesmo hash: comparar só as candidatas dá o mesmo resultado
+        subconjunto = df.loc[candidatas] if colunas is None else df.loc[candidatas, colunas]
+        repetidas[candidatas] = subconjunto.duplicated(keep='first').to_numpy()
+    return repetidas
@@ -0,0 +1,253 @@
+# scripts/utils/exportacao.py
+"""
+Exportação por diferença das tabelas de saída (usada por `salvar_tabelas` e `GravadorTabela`).
+
+O conteúdo de cada tabela é resumido por um hash por linha (pd.util.hash_pandas_object), agrupado
+em blocos de `LINHAS_POR_BLOCO` linhas, e por um hash da tabela calculado a partir dos blocos, dos
+nomes e dos tipos das colunas. O manifesto da tabela, em data/processed/exportacao/, guarda esses
+hashes e o tamanho e o mtime de cada arquivo gravado. Um formato cujo arquivo ainda é o do
+manifesto e cujo conteúdo não mudou não é regravado: o arquivo fica intacto, com o mtime antigo,
+e quem sincroniza por data de modificação (ex: as fontes do Looker Studio) não recarrega a tabela.
+Os formatos que mudaram são gravados num arquivo temporário e trocados de uma vez (rename).
+
+Com o log de alterações ligado (OBSERVATORIO_LOG_ALTERACOES=1, ou `--log-alteracoes` no main.py),
+cada tabela cujo conteúdo mudou acrescenta uma linha JSON a
+data/processed/relatorios/alteracoes_exportacao.jsonl com as chaves inseridas, removidas e
+alteradas desde a gravação anterior. A chave é a primeira coluna, se ela for única e sem nulos
+(ex: 'especie_id' nas dimensões), ou a linha inteira (ex: as pontes). As chaves da última gravação
+ficam ao lado do manifesto; sem elas (primeira gravação com o log, log desligado na gravação
+anterior, arquivo trocado por fora ou outra chave), a linha pede a recarga completa da tabela.
+Tabelas gravadas fora de data/processed/ não têm manifesto e são sempre regravadas.
+"""
+import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.constants import CAMINHO_DADOS_PROCESSADOS
+from utils.manifesto import carregar_manifesto, salvar_manifesto
+
+CAMINHO_MANIFESTOS_EXPORTACAO = CAMINHO_DADOS_PROCESSADOS / 'exportacao'
+CAMINHO_LOG_ALTERACOES = CAMINHO_DADOS_PROCESSADOS / 'relatorios' / 'alteracoes_exportacao.jsonl'
+# Variável de ambiente que liga o log de alterações; é lida a cada gravação para valer também nos
+# processos das etapas em paralelo
+VARIAVEL_LOG_ALTERACOES = 'OBSERVATORIO_LOG_ALTERACOES'
+LINHAS_POR_BLOCO = 65536
+COLUNA_HASH = '_hash_linha'
+
+
+def log_alteracoes_ativo():
+    """Indica se o log de alterações está ligado."""
+    return os.environ.get(VARIAVEL_LOG_ALTERACOES, '').strip().lower() in ('1', 'true', 'sim')
+
+
+def gravar_atomicamente(destino, gravar):
+    """
+    Grava um arquivo num temporário ao lado do destino e o troca de uma vez (rename), para que
+    quem lê nunca encontre o arquivo pela metade.
+
+    Args:
+        destino (Path): Arquivo final.
+        gravar (Callable[[Path], None]): Escreve o conteúdo no caminho recebido.
+    """
+    destino = Path(destino)
+    temporario = destino.with_name(f'{destino.name}.tmp-{os.getpid()}')
+    try:
+        gravar(temporario)
+        temporario.replace(destino)
+    finally:
+        temporario.unlink(missing_ok=True)
+
+
+def hash_linhas(df):
+    """Hash (uint64) do conteúdo de cada linha, sem o índice."""
+    try:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        # Células com valores não hasheáveis (ex: listas) são comparadas pelo texto
+        return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+class HashTabela:
+    """Hash do conteúdo de uma tabela recebida inteira ou aos blocos, na ordem das linhas."""
+
+    def __init__(self):
+        self.colunas = None
+        self.linhas = 0
+        self.blocos = []
+        self._pendentes = []
+
+    def atualizar(self, df):
+        """Acrescenta linhas; devolve o hash de cada uma."""
+        if self.colunas is None:
+            self.colunas = [[str(coluna), str(tipo)] for coluna, tipo in df.dtypes.items()]
+        hashes = hash_linhas(df)
+        self._pendentes.append(hashes)
+        self.linhas += len(hashes)
+        pendentes = np.concatenate(self._pendentes)
+        completos = len(pendentes) // LINHAS_POR_BLOCO * LINHAS_POR_BLOCO
+        for inicio in range(0, completos, LINHAS_POR_BLOCO):
+            self.blocos.append(self._resumir(pendentes[inicio:inicio + LINHAS_POR_BLOCO]))
+        self._pendentes = [pendentes[completos:]]
+        return hashes
+
+    @staticmethod
+    def _resumir(hashes):
+        return hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+
+    def finalizar(self):
+        """Hash da tabela (fecha o último bloco incompleto)."""
+        restantes = np.concatenate(self._pendentes) if self._pendentes else np.empty(0, dtype=np.uint64)
+        if len(restantes):
+            self.blocos.append(self._resumir(restantes))
+        self._pendentes = []
+        resumo = hashlib.blake2b(json.dumps(self.colunas or []).encode(), digest_size=16)
+        for bloco in self.blocos:
+            resumo.update(bytes.fromhex(bloco))
+        return resumo.hexdigest()
+
+
+def _caminho_relativo(caminho_tabela):
+    """Caminho da tabela relativo a data/processed/ (ex: 'espacenet/dim_ipc'), ou None fora dela."""
+    try:
+        return Path(caminho_tabela).resolve().relative_to(CAMINHO_DADOS_PROCESSADOS.resolve()).as_posix()
+    except ValueError:
+        return None
+
+
+def _arquivo_confere(caminho, registro):
+    """Indica se o arquivo ainda é o registrado no manifesto (mesmo tamanho e mtime)."""
+    try:
+        info = Path(caminho).stat()
+    except FileNotFoundError:
+        return False
+    return info.st_size == registro.get('tamanho') and info.st_mtime_ns == registro.get('mtime')
+
+
+def _colunas_chave(df):
+    primeira = df.columns[0]
+    if df[primeira].notna().all() and df[primeira].is_unique:
+        return [primeira]
+    return list(df.columns)
+
+
+def _valores(df):
+    valores = json.loads(df.to_json(orient='values', date_format='iso'))
+    return [linha[0] for linha in valores] if df.shape[1] == 1 else valores
+
+
+class ExportacaoTabela:
+    """
+    Decide quais formatos de uma tabela regravar e, depois da gravação, atualiza o manifesto e o
+    log de alterações.
+
+    Uso: `atualizar` com a tabela inteira ou com cada bloco, `formatos_alterados` para saber o que
+    gravar e `concluir` com os arquivos gravados.
+    """
+
+    def __init__(self, caminho_tabela, formatos):
+        self.caminho_tabela = Path(caminho_tabela)
+        self.formatos = list(formatos)
+        self.relativo = _caminho_relativo(self.caminho_tabela)
+        self.caminho_manifesto = CAMINHO_MANIFESTOS_EXPORTACAO / f'{self.relativo}.json' if self.relativo else None
+        self.anterior = carregar_manifesto(self.caminho_manifesto) if self.caminho_manifesto else None
+        self.hash = HashTabela()
+        self.hash_tabela = None
+        self._trocados_por_fora = False
+        # Com o log, as linhas e seus hashes são guardados para o diff com a gravação anterior
+        self._partes = [] if log_alteracoes_ativo() and self.caminho_manifesto else None
+
+    def atualizar(self, df):
+        """Acrescenta linhas da tabela (inteira ou um bloco)."""
+        hashes = self.hash.atualizar(df)
+        if self._partes is not None:
+            self._partes.append((df, hashes))
+
+    def formatos_alterados(self):
+        """Formatos a gravar: os sem arquivo igual ao do manifesto ou com conteúdo diferente."""
+        self.hash_tabela = self.hash.finalizar()
+        registros = (self.anterior or {}).get('formatos', {})
+        conferem = {
+            formato: _arquivo_confere(self.caminho_tabela.with_suffix(f'.{formato}'), registro)
+            for formato, registro in registros.items()
+        }
+        # Um arquivo trocado fora da exportação pode ter sido sincronizado: o diff não vale para ele
+        self._trocados_por_fora = not all(conferem.values())
+        return [
+            formato for formato in self.formatos
+            if not (conferem.get(formato) and registros[formato].get('hash') == self.hash_tabela)
+        ]
+
+    def blocos_alterados(self):
+        """Blocos de linhas cujo hash difere do da gravação anterior (todos, sem manifesto)."""
+        anteriores = (self.anterior or {}).get('blocos', [])
+        return sum(
+            1 for posicao, bloco in enumerate(self.hash.blocos) if posicao >= len(anteriores) or anteriores[posicao] != bloco
+        )
+
+    def concluir(self, gravados):
+        """Registra os arquivos gravados no manifesto e, se o conteúdo mudou, as alterações no log."""
+        if self.caminho_manifesto is None:
+            return
+        anterior = self.anterior or {}
+        mudou = anterior.get('hash') != self.hash_tabela
+        formatos = dict(anterior.get('formatos', {}))
+        for caminho in gravados:
+            info = Path(caminho).stat()
+            formatos[Path(caminho).suffix[1:]] = {'hash': self.hash_tabela, 'tamanho': info.st_size, 'mtime': info.st_mtime_ns}
+        hash_chaves = anterior.get('hash_chaves')
+        if self._partes is not None and (mudou or hash_chaves != self.hash_tabela):
+            self._atualizar_chaves(anterior, registrar=mudou)
+            hash_chaves = self.hash_tabela
+        salvar_manifesto({
+            'hash': self.hash_tabela, 'linhas': self.hash.linhas, 'colunas': self.hash.colunas,
+            'linhas_por_bloco': LINHAS_POR_BLOCO, 'blocos': self.hash.blocos, 'formatos': formatos,
+            'hash_chaves': hash_chaves,
+        }, self.caminho_manifesto)
+
+    def _atualizar_chaves(self, anterior, registrar):
+        """
+        Guarda as chaves e os hashes das linhas gravadas e, com `registrar`, acrescenta ao log as
+        diferenças para as chaves da gravação anterior.
+        """
+        df = pd.concat([parte for parte, _ in self._partes], ignore_index=True) if len(self._partes) > 1 else self._partes[0][0]
+        hashes = np.concatenate([hashes for _, hashes in self._partes])
+        chaves = _colunas_chave(df)
+        atual = df[chaves].reset_index(drop=True).assign(**{COLUNA_HASH: hashes})
+        caminho_chaves = CAMINHO_MANIFESTOS_EXPORTACAO / f'{self.relativo}.chaves.pkl'
+
+        if registrar:
+            linha = {
+                'data_hora': datetime.datetime.now().isoformat(timespec='seconds'),
+                'tabela': self.relativo, 'colunas_chave': chaves, 'linhas': len(atual),
+            }
+            # As chaves guardadas só valem se são as do conteúdo que a gravação anterior deixou
+            estado = None
+            if anterior.get('hash_chaves') == anterior.get('hash') and not self._trocados_por_fora and caminho_chaves.exists():
+                estado = pd.read_pickle(caminho_chaves)
+            if estado is None or estado['colunas_chave'] != chaves:
+                linha['recarga_completa'] = True
+            else:
+                comparacao = estado['chaves'].drop_duplicates(chaves).merge(
+                    atual.drop_duplicates(chaves), on=chaves, how='outer', suffixes=('_anterior', '_atual'), indicator=True
+                )
+                alteradas = (comparacao['_merge'] == 'both') & (
+                    comparacao[f'{COLUNA_HASH}_anterior'] != comparacao[f'{COLUNA_HASH}_atual']
+                )
+                linha.update({
+                    'recarga_completa': False,
+                    'inseridas': _valores(comparacao.loc[comparacao['_merge'] == 'right_only', chaves]),
+                    'removidas': _valores(comparacao.loc[comparacao['_merge'] == 'left_only', chaves]),
+                    'alteradas': _valores(comparacao.loc[alteradas, chaves]) if len(chaves) < df.shape[1] else [],
+                })
+            CAMINHO_LOG_ALTERACOES.parent.mkdir(parents=True, exist_ok=True)
+            # Uma única escrita por linha: as etapas em paralelo acrescentam linhas inteiras
+            with open(CAMINHO_LOG_ALTERACOES, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(json.dumps(linha, ensure_ascii=False) + '\n')
+
+        caminho_chaves.parent.mkdir(parents=True, exist_ok=True)
+        gravar_atomicamente(caminho_chaves, lambda caminho: pd.to_pickle({'colunas_chave': chaves, 'chaves': atual}, caminho))
@@ -0,0 +1,134 @@
+# scripts/utils/intermediarios.py
+"""
+Repositório das tabelas intermediárias passadas de uma etapa para a outra.
+
+As tabelas que uma etapa só grava para a seguinte consumir (a tabela limpa da Scopus, as espécies
+da CNCFlora e a dimensão mestre de espécies) ficam em data/processed/intermediarios/ em Arrow IPC
+sem compressão. A leitura abre o arquivo mapeado em memória e converte só as colunas pedidas,
+sem passar por texto: não há parse de CSV nem descompressão de Parquet.
+
+A etapa produtora devolve uma `TabelaIntermediaria` (caminho e número de linhas) no lugar do
+DataFrame, de modo que entre os processos do pipeline só trafega a referência; o consumidor chama
+`materializar` com as colunas de que precisa. Sem o pyarrow, a tabela é salva nos formatos de
+saída e o próprio DataFrame segue em memória, como antes.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from utils.constants import CAMINHO_DADOS_PROCESSADOS
+from utils.data_processing import arquivo_tabela, ler_tabela, pa, para_arrow, salvar_tabelas
+from utils.exportacao import gravar_atomicamente
+from utils.telemetria import registrar_gravacao
+
+CAMINHO_INTERMEDIARIOS = CAMINHO_DADOS_PROCESSADOS / 'intermediarios'
+EXTENSAO_INTERMEDIARIA = '.arrow'
+
+
+@dataclass(frozen=True)
+class TabelaIntermediaria:
+    """
+    Referência a uma tabela intermediária gravada em Arrow IPC.
+
+    Args:
+        caminho (Path): Arquivo .arrow.
+        linhas (int): Número de linhas (usado na telemetria sem abrir o arquivo).
+    """
+    caminho: Path
+    linhas: int
+
+    def ler(self, colunas=None):
+        """
+        Lê a tabela mapeada em memória como DataFrame.
+
+        Args:
+            colunas (list[str], optional): Converte só estas colunas (as ausentes são ignoradas).
+        """
+        # Os buffers da tabela apontam para o mapa, que fica aberto enquanto forem usados
+        tabela = pa.ipc.open_file(pa.memory_map(str(self.caminho))).read_all()
+        if colunas is not None:
+            tabela = tabela.select([coluna for coluna in colunas if coluna in tabela.schema.names])
+        return tabela.to_pandas()
+
+
+def caminho_intermediaria(caminho_tabela):
+    """Arquivo Arrow IPC da tabela intermediária (caminho da tabela sem extensão)."""
+    return CAMINHO_INTERMEDIARIOS / f'{Path(caminho_tabela).name}{EXTENSAO_INTERMEDIARIA}'
+
+
+def publicar_intermediaria(df, caminho_tabela, exportada=False):
+    """
+    Grava uma tabela intermediária em Arrow IPC e devolve a referência a ela.
+
+    A gravação é atômica (arquivo temporário renomeado), para que um consumidor nunca mapeie um
+    arquivo pela metade. Sem o pyarrow, a tabela é salva nos formatos de saída em `caminho_tabela`
+    (a menos que já tenha sido, `exportada`) e o próprio DataFrame é devolvido.
+
+    Args:
+        df (pd.DataFrame): Tabela a publicar.
+        caminho_tabela (Path): Caminho da tabela sem extensão; o nome identifica a intermediária.
+        exportada (bool): A tabela também foi salva por `salvar_tabelas` (CSV/Parquet).
+
+    Returns:
+        TabelaIntermediaria | pd.DataFrame
+    """
+    caminho_tabela = Path(caminho_tabela)
+    if pa is None:
+        if not exportada:
+            salvar_tabelas({caminho_tabela.name: df}, caminho_tabela.parent)
+        return df
+    destino = caminho_intermediaria(caminho_tabela)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tabela = para_arrow(df)
+
+    def gravar(caminho):
+        with pa.OSFile(str(caminho), 'wb') as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+
+    gravar_atomicamente(destino, gravar)
+    registrar_gravacao(len(df), [destino])
+    return TabelaIntermediaria(destino, len(df))
+
+
+def abrir_intermediaria(caminho_tabela):
+    """
+    Referência à tabela intermediária em disco, ou None se ela não existe ou é mais antiga que a
+    tabela salva nos formatos de saída (gravada sem o repositório, ex: por uma versão anterior).
+    """
+    arquivo = caminho_intermediaria(caminho_tabela)
+    if pa is None or not arquivo.exists():
+        return None
+    exportada = arquivo_tabela(caminho_tabela)
+    if exportada is not None and exportada.stat().st_mtime_ns > arquivo.stat().st_mtime_ns:
+        return None
+    leitor = pa.ipc.open_file(pa.memory_map(str(arquivo)))
+    linhas = sum(leitor.get_batch(i).num_rows for i in range(leitor.num_record_batches))
+    return TabelaIntermediaria(arquivo, linhas)
+
+
+def ler_intermediaria(caminho_tabela, colunas=None, **opcoes_csv):
+    """
+    Lê uma tabela intermediária pelo repositório; sem ele, pela tabela salva (`ler_tabela`).
+
+    Args:
+        caminho_tabela (Path): Caminho da tabela sem extensão.
+        colunas (list[str], optional): Lê só estas colunas (as ausentes são ignoradas).
+        **opcoes_csv: Repassadas ao `ler_tabela` quando a leitura cai no CSV.
+
+    Raises:
+        FileNotFoundError: Se a tabela não existir em nenhum formato.
+    """
+    referencia = abrir_intermediaria(caminho_tabela)
+    if referencia is None:
+        return ler_tabela(caminho_tabela, colunas=colunas, **opcoes_csv)
+    return referencia.ler(colunas)
+
+
+def materializar(artefato, colunas=None):
+    """DataFrame de um artefato recebido de outra etapa (referência ou DataFrame em memória)."""
+    if isinstance(artefato, TabelaIntermediaria):
+        return artefato.ler(colunas)
+    if colunas is None or not isinstance(artefato, pd.DataFrame):
+        return artefato
+    return artefato[[coluna for coluna in colunas if coluna in artefato.columns]]
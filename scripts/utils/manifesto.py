@@ -0,0 +1,85 @@
+# scripts/utils/manifesto.py
+"""
+Manifesto de arquivos brutos (tamanho, mtime e hash de conteúdo) para processamento incremental.
+
+O hash só é recalculado quando tamanho ou mtime mudam; um arquivo apenas "tocado" (mesmo
+conteúdo, mtime novo) continua sendo tratado como inalterado.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+
+def calcular_hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """SHA-256 do conteúdo do arquivo, lido em blocos."""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def carregar_manifesto(caminho_manifesto):
+    """Lê o manifesto salvo; devolve None se ainda não existir."""
+    caminho_manifesto = Path(caminho_manifesto)
+    if not caminho_manifesto.exists():
+        return None
+    with open(caminho_manifesto, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def salvar_manifesto(manifesto, caminho_manifesto):
+    """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+    caminho_manifesto = Path(caminho_manifesto)
+    caminho_manifesto.parent.mkdir(parents=True, exist_ok=True)
+    caminho_temp = caminho_manifesto.with_suffix(caminho_manifesto.suffix + '.tmp')
+    with open(caminho_temp, 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=1, sort_keys=True)
+    caminho_temp.replace(caminho_manifesto)
+
+
+def descrever_arquivo(caminho, hash_conteudo=None):
+    """Entrada do manifesto para um arquivo (tamanho, mtime e hash)."""
+    info = Path(caminho).stat()
+    return {
+        'tamanho': info.st_size,
+        'mtime': info.st_mtime_ns,
+        'hash': hash_conteudo or calcular_hash_arquivo(caminho),
+    }
+
+
+def comparar_com_manifesto(arquivos, caminho_base, entradas_anteriores):
+    """
+    Classifica os arquivos atuais em relação às entradas do manifesto anterior.
+
+    Args:
+        arquivos (list[Path]): Arquivos presentes agora.
+        caminho_base (Path): Pasta de referência para as chaves relativas do manifesto.
+        entradas_anteriores (dict): {caminho_relativo: entrada} do manifesto anterior.
+
+    Returns:
+        dict: Listas de caminhos relativos em 'novos', 'alterados', 'removidos' e 'inalterados',
+        e em 'entradas' a descrição atual (tamanho/mtime/hash) de cada arquivo presente.
+    """
+    caminho_base = Path(caminho_base)
+    resultado = {'novos': [], 'alterados': [], 'removidos': [], 'inalterados': [], 'entradas': {}}
+    presentes = set()
+    for arquivo in arquivos:
+        relativo = Path(arquivo).relative_to(caminho_base).as_posix()
+        presentes.add(relativo)
+        anterior = entradas_anteriores.get(relativo)
+        info = Path(arquivo).stat()
+        if anterior and anterior['tamanho'] == info.st_size and anterior['mtime'] == info.st_mtime_ns:
+            resultado['inalterados'].append(relativo)
+            resultado['entradas'][relativo] = {k: anterior[k] for k in ('tamanho', 'mtime', 'hash')}
+            continue
+        entrada = descrever_arquivo(arquivo)
+        resultado['entradas'][relativo] = entrada
+        if anterior is None:
+            resultado['novos'].append(relativo)
+        elif anterior['hash'] == entrada['hash']:
+            resultado['inalterados'].append(relativo)
+        else:
+            resultado['alterados'].append(relativo)
+    resultado['removidos'] = sorted(set(entradas_anteriores) - presentes)
+    return resultado
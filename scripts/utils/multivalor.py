@@ -0,0 +1,117 @@
+# scripts/utils/multivalor.py
+"""
+Dimensão e tabela ponte a partir de colunas multivaloradas (ex: "a; b; c"), usadas pelas três
+fontes: palavras-chave da Scopus, ações e ameaças da CNCFlora, parties e IPC da Espacenet.
+
+`explodir_multivalor` separa os valores e os fatora numa única passada: cada valor bruto distinto
+é normalizado uma vez e as ocorrências saem com o código do valor normalizado (coluna categórica),
+em ordem de primeira aparição. `dimensao_e_ponte` monta a dimensão pelos valores distintos e a
+ponte indexando os IDs pelos códigos, sem juntar as ocorrências à dimensão pelo texto (o merge de
+strings que cada fonte fazia antes).
+
+Várias colunas podem ser tratadas numa mesma passada, compartilhando a dimensão; a coluna de papel
+indica de qual coluna veio cada ocorrência (ex: inventor ou requerente).
+"""
+import numpy as np
+import pandas as pd
+
+from utils.chaves import inserir_chave
+
+
+def normalizar_espacos(valores):
+    """Normalizador padrão: remove os espaços das pontas."""
+    return valores.str.strip()
+
+
+def explodir_multivalor(df, coluna_id, colunas, delimitador, normalizar=normalizar_espacos, ausente=None,
+                        descartar_vazios=True, coluna_papel=None, coluna_valor='valor'):
+    """
+    Uma linha por (registro, valor) das colunas multivaloradas.
+
+    Args:
+        df (pd.DataFrame): Tabela de origem.
+        coluna_id (str): Identificador do registro, repetido em cada ocorrência (ex: 'eid').
+        colunas (str | list[str] | dict[str, str]): Coluna(s) multivalorada(s); um dict associa
+            cada coluna ao rótulo gravado em `coluna_papel`.
+        delimitador (str): Separador literal dos valores.
+        normalizar (callable): Recebe uma Series com os valores brutos distintos e devolve os
+            normalizados (nulos são descartados).
+        ausente (str, optional): Marcador de célula sem valor (ex: 'NAO INFORMADO'), ignorado.
+        descartar_vazios (bool): Descarta valores que ficam vazios após a normalização.
+        coluna_papel (str, optional): Coluna com o rótulo da coluna de origem de cada ocorrência.
+        coluna_valor (str): Nome da coluna com o valor normalizado (categórica).
+
+    Returns:
+        pd.DataFrame: [coluna_id, (coluna_papel), coluna_valor], na ordem das colunas, das linhas
+        e dos valores dentro de cada célula.
+    """
+    if isinstance(colunas, str):
+        colunas = [colunas]
+    papeis = colunas if isinstance(colunas, dict) else {coluna: coluna for coluna in colunas}
+
+    posicoes, valores, rotulos = [], [], []
+    for coluna, papel in papeis.items():
+        serie = df[coluna].reset_index(drop=True)
+        if ausente is not None:
+            serie = serie[serie != ausente]
+        explodida = serie.str.split(delimitador, regex=False).explode()
+        posicoes.append(explodida.index.to_numpy())
+        valores.append(explodida.to_numpy())
+        rotulos.append(np.full(len(explodida), papel, dtype=object))
+    posicoes = np.concatenate(posicoes) if posicoes else np.empty(0, dtype=np.int64)
+    valores = np.concatenate(valores) if valores else np.empty(0, dtype=object)
+
+    # Normaliza cada valor bruto distinto uma vez; os códigos seguem a primeira aparição
+    codigos_brutos, brutos = pd.factorize(valores)
+    normalizados = normalizar(pd.Series(brutos, dtype=object))
+    if descartar_vazios:
+        normalizados = normalizados.mask(normalizados == '')
+    codigos_normalizados, distintos = pd.factorize(normalizados.to_numpy())
+    codigos = np.where(codigos_brutos >= 0, codigos_normalizados.take(codigos_brutos) if len(brutos) else -1, -1)
+    validos = codigos >= 0
+
+    ocorrencias = pd.DataFrame({coluna_id: df[coluna_id].iloc[posicoes[validos]].reset_index(drop=True)})
+    if coluna_papel is not None:
+        ocorrencias[coluna_papel] = np.concatenate(rotulos)[validos] if rotulos else np.empty(0, dtype=object)
+    ocorrencias[coluna_valor] = pd.Categorical.from_codes(codigos[validos], categories=pd.Index(distintos, dtype=object))
+    return ocorrencias
+
+
+def _fatorar(valores):
+    """Códigos e valores distintos em ordem de primeira aparição (categórica: sem rever o texto)."""
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        codigos, usados = pd.factorize(valores.cat.codes.to_numpy())
+        return codigos, valores.cat.categories.to_numpy(dtype=object).take(usados)
+    codigos, distintos = pd.factorize(valores.to_numpy(dtype=object))
+    return codigos, distintos
+
+
+def dimensao_e_ponte(ocorrencias, coluna_id, coluna_valor, nome_entidade, coluna_nome=None, deduplicar=True):
+    """
+    Dimensão dos valores distintos e ponte registro-valor a partir das ocorrências.
+
+    Args:
+        ocorrencias (pd.DataFrame): Saída de `explodir_multivalor` (ou qualquer tabela longa com
+            `coluna_id` e `coluna_valor`; nulos na coluna de valor são descartados).
+        coluna_id (str): Identificador do registro.
+        coluna_valor (str): Coluna com os valores.
+        nome_entidade (str): Tipo de entidade das chaves ('<nome_entidade>_id' na dimensão e na ponte).
+        coluna_nome (str, optional): Nome da coluna de valores na dimensão (padrão: `nome_entidade`).
+        deduplicar (bool): Remove pares repetidos da ponte.
+
+    Returns:
+        (pd.DataFrame, pd.DataFrame): Dimensão ['<nome_entidade>_id', coluna_nome] e ponte com as
+        demais colunas das ocorrências e '<nome_entidade>_id' no lugar de `coluna_valor`.
+    """
+    coluna_nome = coluna_nome or nome_entidade
+    coluna_chave = f'{nome_entidade}_id'
+    codigos, distintos = _fatorar(ocorrencias[coluna_valor])
+    dim_df = inserir_chave(pd.DataFrame({coluna_nome: distintos}), coluna_chave, coluna_nome, nome_entidade)
+
+    validos = codigos >= 0
+    pon_df = ocorrencias.drop(columns=coluna_valor)[validos].assign(
+        **{coluna_chave: dim_df[coluna_chave].array.take(codigos[validos])}
+    )
+    if deduplicar:
+        pon_df = pon_df.drop_duplicates()
+    return dim_df, pon_df
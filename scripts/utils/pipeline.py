@@ -0,0 +1,207 @@
+# scripts/utils/pipeline.py
+"""
+Agendador em processo para o grafo de etapas do pipeline.
+
+Cada etapa declara os artefatos que consome (`entradas`) e os que produz (`saidas`). As etapas
+cujas entradas já estão disponíveis rodam ao mesmo tempo em um pool de processos e os
+DataFrames passam de uma etapa para a outra em memória, sem reescrever e reler CSVs.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+import os
+import time
+
+from utils.cache_etapas import hash_artefato, hash_dataframe
+from utils.telemetria import capturar_gravacoes, contar_linhas, medir
+
+
+@dataclass
+class Etapa:
+    """
+    Nó do grafo do pipeline.
+
+    Args:
+        nome (str): Identificador da etapa (usado na linha de comando).
+        funcao (callable): Função de nível de módulo chamada com as entradas como argumentos
+            nomeados; deve devolver um dict com (pelo menos) os artefatos de `saidas`.
+        entradas (tuple): Nomes dos artefatos consumidos.
+        saidas (tuple): Nomes dos artefatos produzidos.
+        apos (tuple): Etapas que, quando fazem parte da execução, precisam terminar antes desta
+            (dependência só de ordem, para etapas que leem do disco o que as outras gravam).
+        arquivos (tuple): Arquivos ou pastas lidos pela etapa (entram na chave do cache).
+        cache (bool): Se o resultado da etapa pode ser restaurado do cache (`utils.cache_etapas`).
+    """
+    nome: str
+    funcao: object
+    entradas: tuple = field(default_factory=tuple)
+    saidas: tuple = field(default_factory=tuple)
+    apos: tuple = field(default_factory=tuple)
+    arquivos: tuple = field(default_factory=tuple)
+    cache: bool = True
+
+
+def validar_grafo(etapas):
+    """Garante nomes únicos, um único produtor por artefato e ausência de ciclos."""
+    nomes = [etapa.nome for etapa in etapas]
+    if len(nomes) != len(set(nomes)):
+        raise ValueError("Há etapas com nomes repetidos no pipeline.")
+    produtores = {}
+    for etapa in etapas:
+        for artefato in etapa.saidas:
+            if artefato in produtores:
+                raise ValueError(f"O artefato '{artefato}' é produzido por '{produtores[artefato]}' e '{etapa.nome}'.")
+            produtores[artefato] = etapa.nome
+
+    desconhecidas = {nome for etapa in etapas for nome in etapa.apos} - set(nomes)
+    if desconhecidas:
+        raise ValueError(f"Dependências de ordem com etapas inexistentes: {sorted(desconhecidas)}.")
+    pendentes = {
+        etapa.nome: {produtores[a] for a in etapa.entradas if a in produtores} | set(etapa.apos) for etapa in etapas
+    }
+    concluidas = set()
+    while pendentes:
+        prontas = [nome for nome, deps in pendentes.items() if deps <= concluidas]
+        if not prontas:
+            raise ValueError(f"Dependência circular entre as etapas: {sorted(pendentes)}.")
+        for nome in prontas:
+            concluidas.add(nome)
+            del pendentes[nome]
+    return produtores
+
+
+def _executar(etapa, entradas, cache=None, hashes_entradas=None):
+    chave = cache.chave(etapa, hashes_entradas) if cache is not None and etapa.cache else None
+    if chave is not None and etapa.nome not in cache.forcar and cache.contem(chave):
+        with medir(etapa.nome, contar_linhas(entradas)) as medicao:
+            saidas = cache.restaurar(chave)
+            medicao.linhas_saida = contar_linhas(saidas)
+            medicao.restaurada_do_cache = True
+        if saidas is not None:
+            print(f"Etapa '{etapa.nome}' restaurada do cache ({chave[:12]}).")
+            return saidas, medicao, chave
+
+    with medir(etapa.nome, contar_linhas(entradas)) as medicao, capturar_gravacoes() as gravados:
+        resultado = etapa.funcao(**entradas) or {}
+        faltando = [artefato for artefato in etapa.saidas if artefato not in resultado]
+        if faltando:
+            raise RuntimeError(f"A etapa '{etapa.nome}' não produziu os artefatos declarados: {faltando}.")
+        saidas = {artefato: resultado[artefato] for artefato in etapa.saidas}
+        medicao.linhas_saida = contar_linhas(saidas)
+    if chave is not None:
+        cache.guardar(chave, etapa.nome, saidas, gravados)
+    return saidas, medicao, chave
+
+
+def executar_pipeline(etapas, carregadores=None, somente=None, max_workers=None, medicoes=None, cache=None):
+    """
+    Executa o grafo de etapas respeitando as dependências.
+
+    Args:
+        etapas (list[Etapa]): Grafo completo do pipeline.
+        carregadores (dict[str, callable], optional): Como obter um artefato que nenhuma etapa
+            selecionada produz (ex: ler o CSV gravado numa execução anterior).
+        somente (list[str], optional): Executa apenas estas etapas; as entradas vindas de etapas
+            não selecionadas são obtidas pelos `carregadores`.
+        max_workers (int, optional): Tamanho do pool. 1 executa tudo no processo atual.
+        medicoes (list, optional): Recebe a medição (`utils.telemetria.Medicao`) de cada etapa
+            concluída, na ordem de término.
+        cache (utils.cache_etapas.CacheEtapas, optional): Restaura do cache as etapas cuja chave
+            (arquivos lidos, artefatos recebidos, parâmetros e código) não mudou.
+
+    Returns:
+        bool: True se todas as etapas terminaram com sucesso.
+    """
+    validar_grafo(etapas)
+    carregadores = carregadores or {}
+    if somente:
+        desconhecidas = set(somente) - {etapa.nome for etapa in etapas}
+        if desconhecidas:
+            raise ValueError(f"Etapas desconhecidas: {sorted(desconhecidas)}.")
+        etapas = [etapa for etapa in etapas if etapa.nome in somente]
+
+    produzidos = {artefato for etapa in etapas for artefato in etapa.saidas}
+    artefatos = {}
+    # Identidade de cada artefato para a chave do cache (None: produzido por etapa fora do cache)
+    hashes = {}
+    for etapa in etapas:
+        for artefato in etapa.entradas:
+            if artefato not in produzidos and artefato not in artefatos:
+                if artefato not in carregadores:
+                    raise ValueError(f"Nenhuma etapa ou carregador disponível para o artefato '{artefato}'.")
+                print(f"Carregando artefato '{artefato}' de uma execução anterior...")
+                artefatos[artefato] = carregadores[artefato]()
+                if cache is not None:
+                    hashes[artefato] = hash_dataframe(artefatos[artefato])
+
+    # Quantas etapas ainda precisam de cada artefato (para liberar memória assim que possível)
+    consumidores = {}
+    for etapa in etapas:
+        for artefato in etapa.entradas:
+            consumidores[artefato] = consumidores.get(artefato, 0) + 1
+
+    max_workers = max_workers or min(len(etapas), os.cpu_count() or 1) or 1
+    pendentes = list(etapas)
+    inicio_pipeline = time.perf_counter()
+
+    selecionadas = {etapa.nome for etapa in etapas}
+    concluidas = set()
+
+    def prontas():
+        return [
+            etapa for etapa in pendentes
+            if all(artefato in artefatos for artefato in etapa.entradas)
+            and all(nome in concluidas for nome in etapa.apos if nome in selecionadas)
+        ]
+
+    def argumentos(etapa):
+        entradas = {a: artefatos[a] for a in etapa.entradas}
+        return etapa, entradas, cache, {a: hashes.get(a) for a in etapa.entradas}
+
+    def registrar(etapa, saidas, medicao, chave):
+        print(f"--- Sucesso: etapa '{etapa.nome}' concluída em {medicao.segundos:.1f}s. ---")
+        if medicoes is not None:
+            medicoes.append(medicao)
+        artefatos.update(saidas)
+        hashes.update({artefato: hash_artefato(chave, artefato) if chave else None for artefato in saidas})
+        concluidas.add(etapa.nome)
+        for artefato in etapa.entradas:
+            consumidores[artefato] -= 1
+            if consumidores[artefato] == 0:
+                artefatos.pop(artefato, None)
+
+    if max_workers == 1:
+        while pendentes:
+            etapa = prontas()[0]
+            pendentes.remove(etapa)
+            print(f"\n--- Executando etapa: {etapa.nome} ---")
+            try:
+                saidas, medicao, chave = _executar(*argumentos(etapa))
+            except (Exception, SystemExit) as e:
+                print(f"\nERRO: A etapa '{etapa.nome}' falhou: {e}")
+                return False
+            registrar(etapa, saidas, medicao, chave)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            em_execucao = {}
+            while pendentes or em_execucao:
+                for etapa in prontas():
+                    pendentes.remove(etapa)
+                    print(f"\n--- Executando etapa: {etapa.nome} ---")
+                    futuro = executor.submit(_executar, *argumentos(etapa))
+                    em_execucao[futuro] = etapa
+                if not em_execucao:
+                    raise RuntimeError(f"Etapas sem entradas disponíveis: {[etapa.nome for etapa in pendentes]}.")
+                concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    etapa = em_execucao.pop(futuro)
+                    try:
+                        saidas, medicao, chave = futuro.result()
+                    except (Exception, SystemExit) as e:
+                        print(f"\nERRO: A etapa '{etapa.nome}' falhou: {e}")
+                        for restante in em_execucao:
+                            restante.cancel()
+                        return False
+                    registrar(etapa, saidas, medicao, chave)
+
+    print(f"\nTempo total do pipeline: {time.perf_counter() - inicio_pipeline:.1f}s")
+    return True
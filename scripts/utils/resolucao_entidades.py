@@ -0,0 +1,323 @@
+# scripts/utils/resolucao_entidades.py
+"""
+Resolução de entidades entre fontes: agrupa os registros de nomes que se referem à mesma
+organização ou pessoa (afiliações e autores da Scopus, parties da Espacenet).
+
+Os nomes são normalizados (sem acentos e pontuação, em maiúsculas, sem código de país, forma
+jurídica e preposições, com as palavras institucionais abreviadas como na Espacenet: UNIVERSIDADE
+-> UNIV, INSTITUTO -> INST). Os pares candidatos vêm de duas blocagens:
+  - prefixos de tokens: registros que compartilham o prefixo de um token distintivo, ou de um par
+    de tokens consecutivos; blocos maiores que `tamanho_maximo_bloco` (tokens comuns, como
+    SILVA) são descartados, e os pares de tokens cobrem esses casos;
+  - vizinhança ordenada: registros a menos de `janela` posições na ordem alfabética do nome e na
+    do nome com os tokens ordenados (cobre erros no começo do nome e inversões).
+
+Só esses pares são pontuados, com `rapidfuzz.process.cpdist` em todos os núcleos. O custo cresce
+com registros x (tamanho dos blocos + janela), e não com o quadrado dos registros. Os pares acima
+do limiar são unidos em grupos (union-find), do maior score para o menor, sem juntar dois
+registros marcados como distintos (ex: autores com IDs diferentes na Scopus).
+
+A cobertura da blocagem é estimada numa amostra: cada registro sorteado é comparado com todos os
+outros, e o recall é a fração dos pares acima do limiar que a blocagem gerou.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from utils.telemetria import instrumentar
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover - dependência opcional
+    fuzz = process = None
+
+LIMIAR_ORGANIZACAO = 90.0
+LIMIAR_PESSOA = 95.0
+TAMANHO_PREFIXO = 4
+TAMANHO_MAXIMO_BLOCO = 200
+JANELA = 10
+# Registros sorteados para estimar o recall da blocagem (cada um comparado com todos)
+AMOSTRA_RECALL = 300
+# Scores calculados por vez na estimativa do recall (limita a memória da matriz do cdist)
+CELULAS_POR_LOTE = 20_000_000
+
+PADRAO_PAIS = re.compile(r'\[[A-Z]{2}\]')
+PADRAO_NAO_ALFANUMERICO = re.compile(r'[^A-Z0-9 ]+')
+PADRAO_ESPACOS = re.compile(r'\s+')
+
+# Expressões trocadas por uma sigla antes da separação em tokens
+EXPRESSOES_ORGANIZACAO = {
+    'EMPRESA BRASILEIRA DE PESQUISA AGROPECUARIA': 'EMBRAPA',
+    'CONSELHO NACIONAL DE DESENVOLVIMENTO CIENTIFICO E TECNOLOGICO': 'CNPQ',
+}
+# Palavras institucionais -> abreviação (a usada nos nomes da Espacenet)
+ABREVIACOES_ORGANIZACAO = {
+    **dict.fromkeys(['UNIVERSIDADE', 'UNIVERSITY', 'UNIVERSIDAD', 'UNIVERSITE', 'UNIVERSITAT', 'UNIVERSITA'], 'UNIV'),
+    **dict.fromkeys(['INSTITUTO', 'INSTITUTE', 'INSTITUT', 'INSTITUTION'], 'INST'),
+    **dict.fromkeys(['NACIONAL', 'NATIONAL', 'NATL', 'NAC'], 'NAT'),
+    **dict.fromkeys(['FEDERAL'], 'FED'),
+    **dict.fromkeys(['ESTADUAL', 'ESTADO', 'STATE'], 'EST'),
+    **dict.fromkeys(['PESQUISA', 'PESQUISAS', 'RESEARCH', 'RECHERCHE', 'RECH', 'INVESTIGACION'], 'RES'),
+    **dict.fromkeys(['FUNDACAO', 'FOUNDATION', 'FUNDACION', 'FOUND'], 'FUND'),
+    **dict.fromkeys(['LABORATORIO', 'LABORATORY', 'LABORATOIRE', 'LABORATORIES', 'LABS'], 'LAB'),
+    **dict.fromkeys(['CENTRO', 'CENTER', 'CENTRE', 'CENTR'], 'CENT'),
+    **dict.fromkeys(['DEPARTAMENTO', 'DEPARTMENT', 'DEPT'], 'DEP'),
+    **dict.fromkeys(['FACULDADE', 'FACULTY', 'FACULTAD'], 'FAC'),
+    **dict.fromkeys(['TECNOLOGIA', 'TECHNOLOGY', 'TECNOLOGICO', 'TECHNOLOGICAL', 'TECH'], 'TECNOL'),
+    **dict.fromkeys(['CIENCIA', 'CIENCIAS', 'SCIENCE', 'SCIENCES', 'SCI'], 'CIENC'),
+    **dict.fromkeys(['AGRICOLA', 'AGRICULTURA', 'AGRICULTURAL', 'AGRICULTURE', 'AGRIC'], 'AGR'),
+    **dict.fromkeys(['ACADEMIA', 'ACADEMY'], 'ACAD'),
+}
+PREPOSICOES = frozenset({'DE', 'DO', 'DA', 'DOS', 'DAS', 'DEL', 'LA', 'LE', 'OF', 'THE', 'AND', 'E', 'ET', 'Y', 'FOR'})
+FORMAS_JURIDICAS = frozenset({
+    'LTDA', 'SA', 'INC', 'LTD', 'CO', 'CORP', 'CORPORATION', 'GMBH', 'LLC', 'AG', 'SPA', 'BV', 'PLC', 'KK', 'SRL',
+    'SAS', 'EIRELI', 'ME', 'LIMITED', 'COMPANY',
+})
+# Formas jurídicas que também são sobrenomes ou partículas de nomes de pessoas (ex: SA, de Sá): só
+# valem no fim do nome, depois de outro token, e em nomes sem a vírgula de "SOBRENOME, NOME"
+FORMAS_JURIDICAS_AMBIGUAS = frozenset({'SA', 'CO', 'ME', 'AG', 'KK', 'BV'})
+# Tokens (já abreviados) que indicam uma organização entre as parties da Espacenet
+MARCADORES_ORGANIZACAO = (FORMAS_JURIDICAS - FORMAS_JURIDICAS_AMBIGUAS) | frozenset({
+    'UNIV', 'INST', 'FUND', 'LAB', 'CENT', 'DEP', 'FAC', 'RES', 'ACAD', 'EMBRAPA', 'CNPQ', 'MUSEU', 'MUSEUM',
+    'HOSPITAL', 'ASSOC', 'ASSOCIACAO', 'ASSOCIATION', 'SOC', 'SOCIEDADE', 'SOCIETY', 'MINISTERIO', 'MINISTRY',
+    'GOVERNO', 'GOVERNMENT', 'COUNCIL', 'AGENCY', 'IND', 'INDUSTRIA', 'INDUSTRIES', 'PHARMA', 'PHARMACEUTICAL',
+    'COSMETICOS', 'COSMETICS', 'LABORATORIOS', 'EMPRESA', 'COOPERATIVA', 'JARDIM', 'HOLDING', 'GROUP', 'GRUPO',
+})
+# Tokens comuns demais nos nomes de organizações para formar blocos sozinhos
+TOKENS_GENERICOS = frozenset(ABREVIACOES_ORGANIZACAO.values())
+
+
+def _dobrar(nome):
+    """Maiúsculas, sem acentos, sem código de país nem pontuação, com espaços simples."""
+    if not isinstance(nome, str):
+        return ''
+    texto = PADRAO_PAIS.sub(' ', nome.upper())
+    if not texto.isascii():
+        texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return PADRAO_ESPACOS.sub(' ', PADRAO_NAO_ALFANUMERICO.sub(' ', texto)).strip()
+
+
+def tokens_organizacao(nome):
+    """Tokens do nome de uma organização, com as palavras institucionais abreviadas."""
+    texto = _dobrar(nome)
+    for expressao, sigla in EXPRESSOES_ORGANIZACAO.items():
+        if expressao in texto:
+            texto = texto.replace(expressao, sigla)
+    return [ABREVIACOES_ORGANIZACAO.get(token, token) for token in texto.split() if token not in PREPOSICOES]
+
+
+def _forma_juridica_final(nome, tokens):
+    """Indica se o nome termina numa forma jurídica ambígua, como "NATURA SA" (e não "SA, JOAO")."""
+    return len(tokens) > 1 and tokens[-1] in FORMAS_JURIDICAS_AMBIGUAS and ',' not in nome
+
+
+def eh_organizacao(nome):
+    """Indica se o nome de uma party da Espacenet é de uma organização (e não de uma pessoa)."""
+    tokens = tokens_organizacao(nome)
+    return not MARCADORES_ORGANIZACAO.isdisjoint(tokens) or _forma_juridica_final(str(nome), tokens)
+
+
+def normalizar_organizacao(nome, sigla=None):
+    """
+    Forma de comparação do nome de uma organização, sem a forma jurídica.
+
+    Args:
+        nome (str): Nome como aparece na fonte.
+        sigla (str, optional): Sigla que a fonte anexou ao nome (ex: "... DO AMAZONAS UFAM");
+            é removida do fim do nome.
+    """
+    tokens = tokens_organizacao(nome)
+    # As formas ambíguas só saem do fim do nome ("NATURA COSMETICOS SA"; "SA COSMETICOS" fica)
+    while len(tokens) > 1 and tokens[-1] in FORMAS_JURIDICAS:
+        tokens = tokens[:-1]
+    tokens = [token for token in tokens if token not in FORMAS_JURIDICAS - FORMAS_JURIDICAS_AMBIGUAS]
+    if sigla and len(tokens) > 1 and tokens[-1] == sigla:
+        tokens = tokens[:-1]
+    return ' '.join(tokens)
+
+
+def normalizar_pessoa(nome):
+    """Forma de comparação do nome de uma pessoa ("DO NASCIMENTO, CRISTIANO" -> "NASCIMENTO CRISTIANO")."""
+    return ' '.join(token for token in _dobrar(nome).split() if token not in PREPOSICOES)
+
+
+def _chaves_prefixo(nome, tamanho_prefixo, genericos):
+    distintivos = [token for token in nome.split() if token not in genericos] or nome.split()
+    prefixos = [token[:tamanho_prefixo] for token in distintivos]
+    return set(prefixos) | {f'{a} {b}' for a, b in zip(prefixos, prefixos[1:])}
+
+
+def pares_candidatos(nomes, distintos=None, tamanho_prefixo=TAMANHO_PREFIXO, tamanho_maximo_bloco=TAMANHO_MAXIMO_BLOCO,
+                     janela=JANELA, genericos=frozenset()):
+    """
+    Pares de registros a pontuar, pelas blocagens de prefixos de tokens e de vizinhança ordenada.
+
+    Args:
+        nomes (list[str]): Nomes normalizados (vazios não formam pares).
+        distintos (np.ndarray, optional): Registros que não podem ser pareados entre si.
+        genericos (frozenset): Tokens que não formam blocos sozinhos.
+
+    Returns:
+        (np.ndarray, np.ndarray): Posições (i, j) de cada par, com i < j, sem repetição.
+    """
+    n = len(nomes)
+    validos = np.array([bool(nome) for nome in nomes], dtype=bool)
+    esquerda, direita = [], []
+
+    blocos = {}
+    for posicao, nome in enumerate(nomes):
+        if nome:
+            for chave in _chaves_prefixo(nome, tamanho_prefixo, genericos):
+                blocos.setdefault(chave, []).append(posicao)
+    for membros in blocos.values():
+        if 1 < len(membros) <= tamanho_maximo_bloco:
+            membros = np.asarray(membros)
+            i, j = np.triu_indices(len(membros), 1)
+            esquerda.append(membros[i])
+            direita.append(membros[j])
+
+    posicoes = np.flatnonzero(validos)
+    ordenados = np.array([' '.join(sorted(nome.split())) for nome in nomes], dtype=object)
+    for chaves in (np.asarray(nomes, dtype=object), ordenados):
+        ordem = posicoes[np.argsort(chaves[posicoes], kind='stable')]
+        for distancia in range(1, min(janela, len(ordem))):
+            esquerda.append(ordem[:-distancia])
+            direita.append(ordem[distancia:])
+
+    if not esquerda:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    a = np.concatenate(esquerda).astype(np.int64)
+    b = np.concatenate(direita).astype(np.int64)
+    codigos = np.unique(np.minimum(a, b) * n + np.maximum(a, b))
+    i, j = codigos // n, codigos % n
+    manter = i != j
+    if distintos is not None:
+        manter &= ~(distintos[i] & distintos[j])
+    return i[manter], j[manter]
+
+
+def agrupar(n, i, j, scores, distintos=None):
+    """
+    Grupos pelos pares aceitos (union-find), do maior score para o menor; dois grupos com
+    registros `distintos` não são unidos.
+
+    Returns:
+        np.ndarray: Grupo de cada registro (a menor posição do grupo).
+    """
+    pai = np.arange(n)
+    tem_distinto = np.zeros(n, dtype=bool) if distintos is None else distintos.copy()
+
+    def raiz(x):
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    for posicao in np.lexsort((j, i, -scores)):
+        a, b = raiz(i[posicao]), raiz(j[posicao])
+        if a == b or (tem_distinto[a] and tem_distinto[b]):
+            continue
+        a, b = min(a, b), max(a, b)
+        pai[b] = a
+        tem_distinto[a] |= tem_distinto[b]
+    return np.array([raiz(x) for x in range(n)])
+
+
+def estimar_recall(nomes, candidatos, limiar, scorer, distintos=None, amostra=AMOSTRA_RECALL, n_threads=-1, semente=0):
+    """
+    Recall da blocagem numa amostra: fração dos pares acima do limiar (de cada registro sorteado
+    contra todos) que estão entre os candidatos.
+
+    Returns:
+        (float | None, int): Recall (None se a amostra não tem pares acima do limiar) e o número
+        de pares acima do limiar encontrados na amostra.
+    """
+    n = len(nomes)
+    validos = np.flatnonzero([bool(nome) for nome in nomes])
+    if len(validos) < 2:
+        return None, 0
+    sorteados = np.random.default_rng(semente).choice(validos, min(amostra, len(validos)), replace=False)
+    codigos_candidatos = candidatos[0] * n + candidatos[1]
+    escolhas = [nomes[posicao] for posicao in validos]
+    total, encontrados = 0, 0
+    lote = max(1, CELULAS_POR_LOTE // len(validos))
+    for inicio in range(0, len(sorteados), lote):
+        consulta = sorteados[inicio:inicio + lote]
+        matriz = process.cdist(
+            [nomes[posicao] for posicao in consulta], escolhas, scorer=scorer, score_cutoff=limiar, workers=n_threads, dtype=np.float32
+        )
+        linhas, colunas = np.nonzero(matriz >= limiar)
+        a, b = consulta[linhas], validos[colunas]
+        manter = a != b
+        if distintos is not None:
+            manter &= ~(distintos[a] & distintos[b])
+        a, b = a[manter], b[manter]
+        total += len(a)
+        encontrados += int(np.isin(np.minimum(a, b) * n + np.maximum(a, b), codigos_candidatos).sum())
+    return (encontrados / total if total else None), total
+
+
+@instrumentar(parametro_rotulo='rotulo')
+def resolver_entidades(nomes, distintos=None, limiar=LIMIAR_ORGANIZACAO, genericos=frozenset(), rotulo=None,
+                       tamanho_prefixo=TAMANHO_PREFIXO, tamanho_maximo_bloco=TAMANHO_MAXIMO_BLOCO, janela=JANELA,
+                       amostra_recall=AMOSTRA_RECALL, n_threads=-1):
+    """
+    Agrupa registros de nomes normalizados que se referem à mesma entidade.
+
+    Args:
+        nomes (list[str]): Nome normalizado de cada registro (ver `normalizar_organizacao` e
+            `normalizar_pessoa`), na ordem de preferência para representar o grupo.
+        distintos (np.ndarray, optional): Registros que nunca ficam no mesmo grupo entre si.
+        limiar (float): Score mínimo (0-100, `fuzz.token_sort_ratio`) para unir dois registros.
+        genericos (frozenset): Tokens que não formam blocos sozinhos.
+        rotulo (str, optional): Identifica a chamada na telemetria (ex: 'organizacao').
+        amostra_recall (int): Registros sorteados para estimar o recall da blocagem (0 desativa).
+        n_threads (int): Threads do RapidFuzz (-1 = todos os núcleos).
+
+    Returns:
+        (pd.DataFrame, dict): Para cada registro, o grupo, o representante (posição do registro
+        cujo nome é o mais frequente do grupo; no empate, o primeiro) e o score do seu nome
+        contra o do representante; e as estatísticas da blocagem (registros, pares possíveis,
+        candidatos e aceitos, grupos, recall estimado e pares da amostra).
+
+    Raises:
+        ImportError: Se o RapidFuzz não estiver instalado.
+    """
+    if process is None:
+        raise ImportError("A resolução de entidades requer o pacote rapidfuzz (pip install rapidfuzz).")
+    nomes = list(nomes)
+    n = len(nomes)
+    distintos = None if distintos is None else np.asarray(distintos, dtype=bool)
+    scorer = fuzz.token_sort_ratio
+
+    i, j = pares_candidatos(nomes, distintos, tamanho_prefixo, tamanho_maximo_bloco, janela, genericos)
+    scores = np.empty(0, dtype=np.float32)
+    if len(i):
+        scores = process.cpdist(
+            [nomes[x] for x in i], [nomes[x] for x in j], scorer=scorer, score_cutoff=limiar, workers=n_threads, dtype=np.float32
+        )
+    aceitos = scores >= limiar
+    grupos = agrupar(n, i[aceitos], j[aceitos], scores[aceitos], distintos)
+
+    registros = pd.DataFrame({'grupo': grupos, 'nome': nomes, 'posicao': np.arange(n)})
+    frequencia = registros.groupby(['grupo', 'nome'], sort=False)['posicao'].transform('size')
+    representantes = (
+        registros.assign(frequencia=-frequencia).sort_values(['grupo', 'frequencia', 'posicao'])
+        .drop_duplicates('grupo').set_index('grupo')['posicao']
+    )
+    registros['representante'] = representantes.reindex(grupos).to_numpy()
+    registros['score'] = np.round(process.cpdist(
+        nomes, [nomes[x] for x in registros['representante']], scorer=scorer, workers=n_threads, dtype=np.float32
+    ), 2) if n else np.empty(0, dtype=np.float32)
+
+    recall, pares_amostra = (None, 0)
+    if amostra_recall:
+        recall, pares_amostra = estimar_recall(nomes, (i, j), limiar, scorer, distintos, amostra_recall, n_threads)
+    estatisticas = {
+        'registros': n, 'pares_possiveis': n * (n - 1) // 2, 'pares_candidatos': len(i),
+        'pares_aceitos': int(aceitos.sum()), 'grupos': int(registros['grupo'].nunique()),
+        'recall_blocagem': recall, 'pares_amostra': pares_amostra,
+    }
+    return registros[['grupo', 'representante', 'score']], estatisticas
@@ -0,0 +1,324 @@
+# scripts/utils/telemetria.py
+"""
+Medição das etapas do pipeline e das funções que montam os modelos: tempo de relógio, tempo de
+CPU, pico de memória residente (RSS), linhas recebidas e devolvidas, e linhas e bytes gravados.
+
+`medir(nome)` abre uma medição (aninhável: as medições abertas dentro dela viram suas `funcoes`;
+chamadas repetidas da mesma função, como no processamento em blocos, são somadas numa só).
+`instrumentar` mede uma função a cada chamada, contando as linhas dos DataFrames recebidos e
+devolvidos, mas só quando já existe uma medição aberta no processo: fora do pipeline a função
+roda sem custo extra. O pico de memória é o maior RSS do processo e dos seus filhos (ex: o pool
+da carga dos CSVs) amostrado por uma thread enquanto há medições abertas; o tempo de CPU inclui
+o dos processos filhos já encerrados.
+
+O relatório de uma execução (`montar_relatorio`) é gravado em JSON e pode ser comparado com os
+anteriores para detectar etapas que ficaram mais lentas; cada etapa é comparada com a última
+execução em que ela de fato rodou (não foi restaurada do cache).
+"""
+import datetime
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - dependência opcional
+    psutil = None
+
+# Intervalo da amostragem do RSS enquanto há medições abertas
+INTERVALO_AMOSTRAGEM = 0.05
+# Diferenças de tempo abaixo disto não contam como regressão (ruído de etapas curtas)
+MINIMO_SEGUNDOS_REGRESSAO = 1.0
+
+_abertas = []
+# Listas abertas por `capturar_gravacoes`, que recebem os caminhos de cada gravação
+_capturas = []
+_trava = threading.Lock()
+_amostrador = None
+
+
+@dataclass
+class Medicao:
+    """Medição de uma etapa ou função; `funcoes` guarda as medições feitas dentro dela."""
+    nome: str
+    chamadas: int = 1
+    segundos: float = 0.0
+    segundos_cpu: float = 0.0
+    pico_rss_mb: float = None
+    linhas_entrada: int = 0
+    linhas_saida: int = 0
+    linhas_gravadas: int = 0
+    bytes_gravados: int = 0
+    restaurada_do_cache: bool = False
+    funcoes: list = field(default_factory=list)
+
+
+def contar_linhas(valor):
+    """
+    Linhas de um DataFrame/Series ou de uma tabela intermediária (`linhas`); soma as de tuplas e
+    dicts; tamanho de listas.
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return len(valor)
+    if isinstance(valor, dict):
+        return sum(contar_linhas(item) for item in valor.values())
+    if isinstance(valor, tuple):
+        return sum(contar_linhas(item) for item in valor)
+    if isinstance(valor, list):
+        return len(valor)
+    # Referência a uma tabela em disco (utils.intermediarios.TabelaIntermediaria)
+    linhas = getattr(valor, 'linhas', None)
+    return linhas if isinstance(linhas, int) else 0
+
+
+def _rss_mb():
+    if psutil is None:
+        return None
+    processo = psutil.Process()
+    total = processo.memory_info().rss
+    for filho in processo.children(recursive=True):
+        try:
+            total += filho.memory_info().rss
+        except psutil.Error:
+            pass
+    return round(total / 2**20, 1)
+
+
+def _amostrar():
+    rss = _rss_mb()
+    if rss is None:
+        return
+    with _trava:
+        for medicao in _abertas:
+            medicao.pico_rss_mb = max(medicao.pico_rss_mb or 0.0, rss)
+
+
+def _laco_amostragem():
+    while True:
+        time.sleep(INTERVALO_AMOSTRAGEM)
+        if _abertas:
+            _amostrar()
+
+
+def _reiniciar_no_filho():
+    # Processos criados por fork (pools) não herdam a thread de amostragem nem as medições do pai
+    global _trava, _amostrador
+    _abertas.clear()
+    _capturas.clear()
+    _trava = threading.Lock()
+    _amostrador = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_no_filho)
+
+
+def _anexar(pai, medicao):
+    for anterior in pai.funcoes:
+        if anterior.nome == medicao.nome:
+            anterior.chamadas += medicao.chamadas
+            anterior.segundos = round(anterior.segundos + medicao.segundos, 4)
+            anterior.segundos_cpu = round(anterior.segundos_cpu + medicao.segundos_cpu, 4)
+            if medicao.pico_rss_mb is not None:
+                anterior.pico_rss_mb = max(anterior.pico_rss_mb or 0.0, medicao.pico_rss_mb)
+            for campo in ('linhas_entrada', 'linhas_saida', 'linhas_gravadas', 'bytes_gravados'):
+                setattr(anterior, campo, getattr(anterior, campo) + getattr(medicao, campo))
+            for funcao in medicao.funcoes:
+                _anexar(anterior, funcao)
+            return
+    pai.funcoes.append(medicao)
+
+
+def _tempo_cpu():
+    tempos = os.times()
+    return tempos.user + tempos.system + tempos.children_user + tempos.children_system
+
+
+@contextmanager
+def medir(nome, linhas_entrada=0):
+    """
+    Mede o bloco `with`; o objeto `Medicao` devolvido pode receber `linhas_saida`.
+
+    Quando há outra medição aberta, esta é anexada às `funcoes` dela ao terminar.
+    """
+    global _amostrador
+    if psutil is not None and _amostrador is None:
+        _amostrador = threading.Thread(target=_laco_amostragem, daemon=True)
+        _amostrador.start()
+    medicao = Medicao(nome, linhas_entrada=linhas_entrada)
+    pai = _abertas[-1] if _abertas else None
+    with _trava:
+        _abertas.append(medicao)
+    _amostrar()
+    inicio, inicio_cpu = time.perf_counter(), _tempo_cpu()
+    try:
+        yield medicao
+    finally:
+        medicao.segundos = round(time.perf_counter() - inicio, 4)
+        medicao.segundos_cpu = round(_tempo_cpu() - inicio_cpu, 4)
+        _amostrar()
+        with _trava:
+            _abertas.remove(medicao)
+        if pai is not None:
+            _anexar(pai, medicao)
+
+
+def instrumentar(funcao=None, *, parametro_rotulo=None):
+    """
+    Decorador: mede a função quando chamada dentro de uma medição aberta.
+
+    Args:
+        parametro_rotulo (str, optional): Parâmetro cujo valor entra no nome da medição, para
+            distinguir chamadas da mesma função (ex: "criar_dim_e_ponte[ameaca]").
+    """
+    if funcao is None:
+        return functools.partial(instrumentar, parametro_rotulo=parametro_rotulo)
+    assinatura = inspect.signature(funcao)
+
+    @functools.wraps(funcao)
+    def funcao_medida(*args, **kwargs):
+        if not _abertas:
+            return funcao(*args, **kwargs)
+        argumentos = assinatura.bind(*args, **kwargs).arguments
+        nome = funcao.__name__
+        if parametro_rotulo is not None and parametro_rotulo in argumentos:
+            nome = f'{nome}[{argumentos[parametro_rotulo]}]'
+        with medir(nome, sum(contar_linhas(valor) for valor in argumentos.values())) as medicao:
+            resultado = funcao(*args, **kwargs)
+            medicao.linhas_saida = contar_linhas(resultado)
+        return resultado
+
+    return funcao_medida
+
+
+@contextmanager
+def capturar_gravacoes():
+    """Lista (na ordem de gravação) dos arquivos registrados por `registrar_gravacao` dentro do bloco."""
+    caminhos = []
+    _capturas.append(caminhos)
+    try:
+        yield caminhos
+    finally:
+        _capturas.remove(caminhos)
+
+
+def registrar_arquivos_mantidos(caminhos):
+    """
+    Registra arquivos que a etapa produziria mas que ficaram como estavam (conteúdo igual): entram
+    nas capturas (o cache da etapa os guarda), sem contar como linhas e bytes gravados.
+    """
+    for captura in _capturas:
+        captura.extend(Path(caminho) for caminho in caminhos)
+
+
+def registrar_gravacao(linhas, caminhos):
+    """Soma linhas e bytes dos arquivos gravados a todas as medições abertas."""
+    for captura in _capturas:
+        captura.extend(Path(caminho) for caminho in caminhos)
+    if not _abertas:
+        return
+    tamanho = sum(Path(caminho).stat().st_size for caminho in caminhos)
+    with _trava:
+        for medicao in _abertas:
+            medicao.linhas_gravadas += linhas
+            medicao.bytes_gravados += tamanho
+
+
+# ==============================================================================
+# RELATÓRIO DA EXECUÇÃO
+# ==============================================================================
+
+def montar_relatorio(medicoes, sucesso, segundos, **metadados):
+    """Relatório de uma execução do pipeline (medições das etapas, na ordem de término)."""
+    return {
+        'data': datetime.datetime.now().isoformat(timespec='seconds'), 'sucesso': sucesso,
+        'segundos': round(segundos, 2), **metadados, 'etapas': [asdict(medicao) for medicao in medicoes],
+    }
+
+
+def salvar_relatorio(relatorio, pasta):
+    """Grava o relatório em `<pasta>/execucao_<data>.json` e devolve o caminho."""
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminho = pasta / f"execucao_{relatorio['data'].replace(':', '').replace('-', '')}.json"
+    caminho.write_text(json.dumps(relatorio, ensure_ascii=False, indent=2), encoding='utf-8')
+    return caminho
+
+
+def carregar_tempos_anteriores(pasta):
+    """
+    Tempo de cada etapa na execução bem-sucedida mais recente em que ela rodou, em `pasta`.
+
+    Etapas restauradas do cache não contam (levam só o tempo da cópia), nem as de relatórios
+    anteriores à marcação `restaurada_do_cache`, em que não dá para distinguir as duas.
+
+    Returns:
+        dict[str, float]: Nome da etapa -> segundos.
+    """
+    tempos = {}
+    for caminho in sorted(Path(pasta).glob('execucao_*.json'), reverse=True):
+        try:
+            relatorio = json.loads(caminho.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        if not relatorio.get('sucesso'):
+            continue
+        for etapa in relatorio.get('etapas', []):
+            if etapa.get('restaurada_do_cache') is False:
+                tempos.setdefault(etapa['nome'], etapa['segundos'])
+    return tempos
+
+
+def formatar_resumo(relatorio):
+    """Tabela de texto com cada etapa e, recuadas, as funções medidas dentro dela."""
+    linhas = [
+        f"{'etapa / função':<46} {'tempo':>8} {'cpu':>8} {'pico_mb':>8} {'linhas_ent':>11} "
+        f"{'linhas_sai':>11} {'gravadas':>10} {'mb_grav':>8}"
+    ]
+
+    def adicionar(medicao, nivel):
+        pico = '-' if medicao['pico_rss_mb'] is None else f"{medicao['pico_rss_mb']:.0f}"
+        nome = medicao['nome'] if medicao.get('chamadas', 1) == 1 else f"{medicao['nome']} (x{medicao['chamadas']})"
+        if medicao.get('restaurada_do_cache'):
+            nome += ' (cache)'
+        linhas.append(
+            f"{'  ' * nivel + nome:<46.46} {medicao['segundos']:>7.2f}s {medicao['segundos_cpu']:>7.2f}s {pico:>8} "
+            f"{medicao['linhas_entrada']:>11} {medicao['linhas_saida']:>11} {medicao['linhas_gravadas']:>10} "
+            f"{medicao['bytes_gravados'] / 2**20:>8.1f}"
+        )
+        for funcao in medicao['funcoes']:
+            adicionar(funcao, nivel + 1)
+
+    for etapa in relatorio['etapas']:
+        adicionar(etapa, 0)
+    return '\n'.join(linhas)
+
+
+def encontrar_regressoes(relatorio, tempos_anteriores, limite, minimo_segundos=MINIMO_SEGUNDOS_REGRESSAO):
+    """
+    Etapas que rodaram e ficaram mais de `limite` vezes mais lentas que na última vez em que rodaram.
+
+    Args:
+        relatorio (dict): Relatório da execução atual (`montar_relatorio`).
+        tempos_anteriores (dict[str, float]): Tempos de `carregar_tempos_anteriores`.
+
+    Returns:
+        list[tuple]: (etapa, segundos anteriores, segundos atuais); diferenças menores que
+        `minimo_segundos` são ignoradas.
+    """
+    regressoes = []
+    for etapa in relatorio['etapas']:
+        if etapa.get('restaurada_do_cache'):
+            continue
+        antes = tempos_anteriores.get(etapa['nome'])
+        if antes is not None and etapa['segundos'] > limite * antes and etapa['segundos'] - antes >= minimo_segundos:
+            regressoes.append((etapa['nome'], antes, etapa['segundos']))
+    return regressoes